@@ -8,6 +8,7 @@ export interface Health {
   system_version: string
   maximum_protocol_api_version: [major: number, minor: number]
   minimum_protocol_api_version: [major: number, minor: number]
+  analysis_queue_depth?: number
   links: HealthLinks
 }
 
@@ -1,8 +1,13 @@
 """Opentrons analyze CLI."""
 import click
+import logging
+import os
+import time
 
 from anyio import run, Path as AsyncPath
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
 from datetime import datetime, timezone
+from enum import Enum
 from pathlib import Path
 from pydantic import BaseModel
 from typing import Any, Dict, List, Optional, Sequence, Union
@@ -16,7 +21,11 @@ from opentrons.protocol_reader import (
     JsonProtocolConfig,
     ProtocolFilesInvalidError,
 )
-from opentrons.protocol_runner import create_simulating_runner
+from opentrons.protocol_runner import (
+    DurationEstimate,
+    create_simulating_runner,
+    estimate_duration,
+)
 from opentrons.protocol_engine import (
     Command,
     ErrorOccurrence,
@@ -29,6 +38,9 @@ from opentrons.protocol_engine import (
 from opentrons_shared_data.robot.dev_types import RobotType
 
 
+log = logging.getLogger(__name__)
+
+
 @click.command()
 @click.argument(
     "files",
@@ -41,13 +53,42 @@ from opentrons_shared_data.robot.dev_types import RobotType
     help="Return analysis results as machine-readable JSON.",
     type=click.Path(path_type=AsyncPath),
 )
-def analyze(files: Sequence[Path], json_output: Optional[Path]) -> None:
+@click.option(
+    "--batch-output",
+    help=(
+        "Analyze each of FILES as a separate protocol, and write one JSON"
+        " result per protocol, plus summary.json, into this directory."
+        " A directory in FILES is one protocol made of all the files inside it."
+    ),
+    type=click.Path(path_type=Path, file_okay=False, dir_okay=True),
+)
+@click.option(
+    "--jobs",
+    help=(
+        "With --batch-output, how many protocols to analyze at once,"
+        " each in its own process. Defaults to the number of CPUs."
+    ),
+    type=click.IntRange(min=1),
+)
+def analyze(
+    files: Sequence[Path],
+    json_output: Optional[Path],
+    batch_output: Optional[Path],
+    jobs: Optional[int],
+) -> None:
     """Analyze a protocol.
 
     You can use `opentrons analyze` to get a protocol's expected
     equipment and commands.
     """
-    run(_analyze, files, json_output)
+    if batch_output is not None:
+        if json_output is not None:
+            raise click.UsageError(
+                "Use either `--json-output` or `--batch-output`, not both."
+            )
+        _analyze_batch(files, batch_output, jobs or os.cpu_count() or 1)
+    else:
+        run(_analyze, files, json_output)
 
 
 def _get_input_files(files_and_dirs: Sequence[Path]) -> List[Path]:
@@ -66,56 +107,237 @@ async def _analyze(
     files_and_dirs: Sequence[Path],
     json_output: Optional[AsyncPath],
 ) -> None:
-    input_files = _get_input_files(files_and_dirs)
-
     try:
-        protocol_source = await ProtocolReader().read_saved(
-            files=input_files,
-            directory=None,
-        )
+        results = await _analyze_protocol(files_and_dirs)
     except ProtocolFilesInvalidError as error:
         raise click.ClickException(str(error))
 
+    if json_output:
+        await json_output.write_text(
+            results.json(exclude_none=True),
+            encoding="utf-8",
+        )
+
+    else:
+        raise click.UsageError(
+            "Currently, this tool only supports JSON mode. Use `--json-output`."
+        )
+
+
+async def _analyze_protocol(files_and_dirs: Sequence[Path]) -> "AnalyzeResults":
+    input_files = _get_input_files(files_and_dirs)
+
+    protocol_source = await ProtocolReader().read_saved(
+        files=input_files,
+        directory=None,
+    )
+
     runner = await create_simulating_runner(
         robot_type=protocol_source.robot_type, protocol_config=protocol_source.config
     )
     analysis = await runner.run(protocol_source)
 
-    if json_output:
-        results = AnalyzeResults.construct(
-            createdAt=datetime.now(tz=timezone.utc),
-            files=[
-                ProtocolFile.construct(name=f.path.name, role=f.role)
-                for f in protocol_source.files
-            ],
-            config=(
-                JsonConfig.construct(
-                    schemaVersion=protocol_source.config.schema_version
-                )
-                if isinstance(protocol_source.config, JsonProtocolConfig)
-                else PythonConfig.construct(
-                    apiVersion=protocol_source.config.api_version
-                )
-            ),
-            metadata=protocol_source.metadata,
-            robotType=protocol_source.robot_type,
-            commands=analysis.commands,
-            errors=analysis.state_summary.errors,
-            labware=analysis.state_summary.labware,
-            pipettes=analysis.state_summary.pipettes,
-            modules=analysis.state_summary.modules,
-            liquids=analysis.state_summary.liquids,
+    duration_estimate: Optional[DurationEstimate]
+
+    try:
+        duration_estimate = estimate_duration(
+            commands=analysis.commands, robot_type=protocol_source.robot_type
         )
+    except Exception:
+        # The estimate is only a convenience, so don't fail the analysis over it.
+        log.exception("Could not estimate the protocol's duration.")
+        duration_estimate = None
 
-        await json_output.write_text(
-            results.json(exclude_none=True),
+    return AnalyzeResults.construct(
+        createdAt=datetime.now(tz=timezone.utc),
+        files=[
+            ProtocolFile.construct(name=f.path.name, role=f.role)
+            for f in protocol_source.files
+        ],
+        config=(
+            JsonConfig.construct(schemaVersion=protocol_source.config.schema_version)
+            if isinstance(protocol_source.config, JsonProtocolConfig)
+            else PythonConfig.construct(apiVersion=protocol_source.config.api_version)
+        ),
+        metadata=protocol_source.metadata,
+        robotType=protocol_source.robot_type,
+        commands=analysis.commands,
+        errors=analysis.state_summary.errors,
+        labware=analysis.state_summary.labware,
+        pipettes=analysis.state_summary.pipettes,
+        modules=analysis.state_summary.modules,
+        liquids=analysis.state_summary.liquids,
+        durationEstimate=duration_estimate,
+    )
+
+
+def _analyze_batch(
+    files_and_dirs: Sequence[Path],
+    batch_output: Path,
+    jobs: int,
+) -> None:
+    """Analyze every entry of `files_and_dirs` as its own protocol.
+
+    Each worker process analyzes many protocols, so interpreter startup,
+    imports, and the definitions that `opentrons` caches in memory
+    are paid for once per worker instead of once per protocol.
+    """
+    batch_output.mkdir(parents=True, exist_ok=True)
+    output_paths = _get_batch_output_paths(files_and_dirs, batch_output)
+    start_time = time.monotonic()
+    entries: List[Optional[BatchAnalyzeEntry]] = [None] * len(files_and_dirs)
+
+    try:
+        if jobs == 1:
+            for index, (source, output_path) in enumerate(
+                zip(files_and_dirs, output_paths)
+            ):
+                entries[index] = _analyze_batch_entry(source, output_path)
+        else:
+            _analyze_batch_in_pool(files_and_dirs, output_paths, jobs, entries)
+
+    finally:
+        # Write the summary even if the batch was interrupted,
+        # so the protocols that did finish aren't lost.
+        finished_entries = [
+            entry
+            if entry is not None
+            else BatchAnalyzeEntry.construct(
+                source=str(source),
+                status=BatchAnalyzeStatus.ERROR,
+                seconds=0,
+                error="Analysis did not finish.",
+            )
+            for source, entry in zip(files_and_dirs, entries)
+        ]
+        summary = BatchAnalyzeSummary.construct(
+            createdAt=datetime.now(tz=timezone.utc),
+            seconds=time.monotonic() - start_time,
+            protocols=finished_entries,
+        )
+        (batch_output / "summary.json").write_text(
+            summary.json(exclude_none=True),
             encoding="utf-8",
         )
 
-    else:
-        raise click.UsageError(
-            "Currently, this tool only supports JSON mode. Use `--json-output`."
+    problems = []
+    invalid_count = sum(
+        1 for e in finished_entries if e.status == BatchAnalyzeStatus.INVALID
+    )
+    error_count = sum(
+        1 for e in finished_entries if e.status == BatchAnalyzeStatus.ERROR
+    )
+    if invalid_count > 0:
+        problems.append(
+            f"{invalid_count} of {len(finished_entries)} protocols had invalid files."
         )
+    if error_count > 0:
+        problems.append(
+            f"{error_count} of {len(finished_entries)} protocols"
+            f" could not be analyzed."
+        )
+    if problems:
+        raise click.ClickException(
+            " ".join(problems) + f" See {batch_output / 'summary.json'}."
+        )
+
+
+def _analyze_batch_in_pool(
+    files_and_dirs: Sequence[Path],
+    output_paths: Sequence[Path],
+    jobs: int,
+    entries: List[Optional["BatchAnalyzeEntry"]],
+) -> None:
+    """Analyze a batch in worker processes, filling in `entries` as they finish.
+
+    If the pool breaks, for example because a worker was killed, every protocol
+    that hadn't finished yet is recorded as an error instead of stopping the batch.
+    """
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures: Dict["Future[BatchAnalyzeEntry]", int] = {}
+        submit_times: Dict[int, float] = {}
+
+        for index, (source, output_path) in enumerate(
+            zip(files_and_dirs, output_paths)
+        ):
+            submit_times[index] = time.monotonic()
+            try:
+                future = executor.submit(_analyze_batch_entry, source, output_path)
+            except Exception as error:
+                entries[index] = _make_batch_error_entry(
+                    source, submit_times[index], error
+                )
+            else:
+                futures[future] = index
+
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                entries[index] = future.result()
+            except Exception as error:
+                entries[index] = _make_batch_error_entry(
+                    files_and_dirs[index], submit_times[index], error
+                )
+
+
+def _get_batch_output_paths(
+    files_and_dirs: Sequence[Path], batch_output: Path
+) -> List[Path]:
+    output_paths: List[Path] = []
+    used_names = {"summary"}
+
+    for entry in files_and_dirs:
+        name = entry.stem if entry.is_file() else entry.resolve().name
+        unique_name = name
+        suffix = 1
+        while unique_name in used_names:
+            suffix += 1
+            unique_name = f"{name}-{suffix}"
+
+        used_names.add(unique_name)
+        output_paths.append(batch_output / f"{unique_name}.json")
+
+    return output_paths
+
+
+def _analyze_batch_entry(source: Path, output_path: Path) -> "BatchAnalyzeEntry":
+    start_time = time.monotonic()
+
+    try:
+        results = run(_analyze_protocol, [source])
+        output_path.write_text(results.json(exclude_none=True), encoding="utf-8")
+    except ProtocolFilesInvalidError as error:
+        return BatchAnalyzeEntry.construct(
+            source=str(source),
+            status=BatchAnalyzeStatus.INVALID,
+            seconds=time.monotonic() - start_time,
+            error=str(error),
+        )
+    except Exception as error:
+        # One broken protocol, or a bug it triggers, shouldn't stop the batch.
+        return _make_batch_error_entry(source, start_time, error)
+
+    return BatchAnalyzeEntry.construct(
+        source=str(source),
+        output=output_path.name,
+        status=(
+            BatchAnalyzeStatus.NOT_OK
+            if len(results.errors) > 0
+            else BatchAnalyzeStatus.OK
+        ),
+        seconds=time.monotonic() - start_time,
+    )
+
+
+def _make_batch_error_entry(
+    source: Path, start_time: float, error: BaseException
+) -> "BatchAnalyzeEntry":
+    return BatchAnalyzeEntry.construct(
+        source=str(source),
+        status=BatchAnalyzeStatus.ERROR,
+        seconds=time.monotonic() - start_time,
+        error=f"{type(error).__name__}: {error}",
+    )
 
 
 class ProtocolFile(BaseModel):
@@ -153,3 +375,39 @@ class AnalyzeResults(BaseModel):
     modules: List[LoadedModule]
     liquids: List[Liquid]
     errors: List[ErrorOccurrence]
+    durationEstimate: Optional[DurationEstimate] = None
+
+
+class BatchAnalyzeStatus(str, Enum):
+    """Outcome of analyzing one protocol in a batch.
+
+    Properties:
+        OK: The protocol was analyzed without errors.
+        NOT_OK: The protocol was analyzed, but its analysis has errors.
+        INVALID: The protocol's files could not be read, so it wasn't analyzed.
+        ERROR: The protocol could not be analyzed because of an unexpected error,
+            like a crashed worker process.
+    """
+
+    OK = "ok"
+    NOT_OK = "not-ok"
+    INVALID = "invalid"
+    ERROR = "error"
+
+
+class BatchAnalyzeEntry(BaseModel):
+    """The outcome of analyzing one protocol in a batch."""
+
+    source: str
+    output: Optional[str]
+    status: BatchAnalyzeStatus
+    seconds: float
+    error: Optional[str]
+
+
+class BatchAnalyzeSummary(BaseModel):
+    """Summary of a batch of protocol analyses, in the order they were given."""
+
+    createdAt: datetime
+    seconds: float
+    protocols: List[BatchAnalyzeEntry]
@@ -284,6 +284,13 @@ CONFIG_ELEMENTS = (
         ConfigElementType.DIR,
         "The dir where module calibration is stored",
     ),
+    ConfigElement(
+        "protocol_parse_cache_dir",
+        "Protocol Parse Cache Directory",
+        Path("protocol_parse_cache"),
+        ConfigElementType.DIR,
+        "The dir where parsed and compiled Python protocols are cached",
+    ),
 )
 #: The available configuration file elements to modify. All of these can be
 #: changed by editing opentrons.json, where the keys are the name elements,
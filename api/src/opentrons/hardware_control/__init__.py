@@ -12,7 +12,7 @@ functions are available elsewhere.
 from .adapters import SynchronousAdapter
 from .api import API
 from .pause_manager import PauseManager
-from .backends import Controller, Simulator
+from .backends import Simulator
 from .types import CriticalPoint, ExecutionState, Axis, OT3Axis
 from .errors import ExecutionCancelledError, NoTipAttachedError, TipAttachedError
 from .constants import DROP_TIP_RELEASE_DISTANCE
@@ -21,7 +21,7 @@ from .execution_manager import ExecutionManager
 from .threaded_async_lock import ThreadedAsyncLock, ThreadedAsyncForbidden
 from .protocols import HardwareControlInterface
 from .instruments import AbstractInstrument, Gripper
-from typing import Union
+from typing import TYPE_CHECKING, Any, Union
 from .ot3_calibration import OT3Transforms
 from .robot_calibration import RobotCalibration
 
@@ -30,6 +30,9 @@ from .robot_calibration import RobotCalibration
 # and 2. how to properly export an ot2 and ot3 pipette.
 from .instruments.ot2.pipette import Pipette
 
+if TYPE_CHECKING:
+    from .backends import Controller
+
 OT2HardwareControlAPI = HardwareControlInterface[RobotCalibration, Axis]
 OT3HardwareControlAPI = HardwareControlInterface[OT3Transforms, OT3Axis]
 HardwareControlAPI = Union[OT2HardwareControlAPI, OT3HardwareControlAPI]
@@ -60,3 +63,12 @@ __all__ = [
     "ThreadManagedHardware",
     "SyncHardwareAPI",
 ]
+
+
+def __getattr__(attrname: str) -> Any:
+    """Import the Controller lazily. See `backends.__getattr__`."""
+    if attrname == "Controller":
+        from .backends import Controller
+
+        return Controller
+    raise AttributeError(f"module {__name__!r} has no attribute {attrname!r}")
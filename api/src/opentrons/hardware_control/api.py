@@ -17,6 +17,7 @@ from typing import (
     Any,
     TypeVar,
     Mapping,
+    TYPE_CHECKING,
 )
 
 from opentrons_shared_data.pipette import name_config
@@ -31,7 +32,7 @@ from .instruments.ot2.pipette import (
     generate_hardware_configs,
     load_from_config_and_check_skip,
 )
-from .backends import Controller, Simulator
+from .backends.simulator import Simulator
 from .execution_manager import ExecutionManagerProvider
 from .pause_manager import PauseManager
 from .module_control import AttachedModulesControl
@@ -68,6 +69,9 @@ from .motion_utilities import (
 )
 
 
+if TYPE_CHECKING:
+    from .backends.controller import Controller
+
 mod_log = logging.getLogger(__name__)
 
 
@@ -101,7 +105,7 @@ class API(
 
     def __init__(
         self,
-        backend: Union[Controller, Simulator],
+        backend: Union["Controller", Simulator],
         loop: asyncio.AbstractEventLoop,
         config: RobotConfig,
     ) -> None:
@@ -181,6 +185,10 @@ class API(
             checked_config = config
         else:
             checked_config = robot_configs.load_ot2()
+        # Inline import because the Controller pulls in hardware drivers
+        # that simulation never needs.
+        from .backends.controller import Controller
+
         backend = await Controller.build(checked_config)
         backend.set_lights(button=None, rails=False)
 
@@ -2,7 +2,6 @@ import abc
 import asyncio
 import logging
 import re
-from pkg_resources import parse_version
 from typing import ClassVar, Mapping, Optional, cast, TypeVar
 
 from opentrons.config import IS_ROBOT, ROBOT_FIRMWARE_DIR
@@ -87,6 +86,9 @@ class AbstractModule(abc.ABC):
     def has_available_update(self) -> bool:
         """Return whether a newer firmware file is available"""
         if self.device_info and self._bundled_fw:
+            # Imported here because pkg_resources is slow to import.
+            from pkg_resources import parse_version
+
             device_version = parse_version(self.device_info["version"])
             available_version = parse_version(self._bundled_fw.version)
             return cast(bool, available_version > device_version)
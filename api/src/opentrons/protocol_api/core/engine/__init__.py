@@ -1,13 +1,16 @@
 """ProtocolEngine-based Protocol API implementation core."""
+from typing import TYPE_CHECKING, Any
+
 from typing_extensions import Final
 
 from opentrons.protocols.api_support.types import APIVersion
 
-from .protocol import ProtocolCore
-from .instrument import InstrumentCore
-from .labware import LabwareCore
-from .module_core import ModuleCore
-from .well import WellCore
+if TYPE_CHECKING:
+    from .protocol import ProtocolCore
+    from .instrument import InstrumentCore
+    from .labware import LabwareCore
+    from .module_core import ModuleCore
+    from .well import WellCore
 
 ENGINE_CORE_API_VERSION: Final = APIVersion(2, 14)
 
@@ -19,3 +22,34 @@ __all__ = [
     "WellCore",
     "ModuleCore",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import the core implementations lazily.
+
+    They import all of Protocol Engine, which is slow, and which protocols
+    below `ENGINE_CORE_API_VERSION` never use. Keeping them lazy lets the
+    rest of `opentrons.protocol_api` check `ENGINE_CORE_API_VERSION` for free.
+    """
+    if name == "ProtocolCore":
+        from .protocol import ProtocolCore
+
+        return ProtocolCore
+    elif name == "InstrumentCore":
+        from .instrument import InstrumentCore
+
+        return InstrumentCore
+    elif name == "LabwareCore":
+        from .labware import LabwareCore
+
+        return LabwareCore
+    elif name == "ModuleCore":
+        from .module_core import ModuleCore
+
+        return ModuleCore
+    elif name == "WellCore":
+        from .well import WellCore
+
+        return WellCore
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
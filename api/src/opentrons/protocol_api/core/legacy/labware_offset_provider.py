@@ -1,13 +1,15 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from opentrons.hardware_control.modules import ModuleModel as HardwareModuleModel
-from opentrons.protocol_engine import ProtocolEngine, LabwareOffsetLocation, ModuleModel
 from opentrons.types import DeckSlotName, Point
 
 from ..labware import LabwareLoadParams
 
+if TYPE_CHECKING:
+    from opentrons.protocol_engine import ProtocolEngine
+
 
 @dataclass
 class ProvidedLabwareOffset:
@@ -67,7 +69,7 @@ class NullLabwareOffsetProvider(AbstractLabwareOffsetProvider):
 class LabwareOffsetProvider(AbstractLabwareOffsetProvider):
     """Provides a `ProtocolEngine`'s labware offsets."""
 
-    def __init__(self, engine: ProtocolEngine) -> None:
+    def __init__(self, engine: "ProtocolEngine") -> None:
         """Initialize an offset provider with access to ProtocolEngine state."""
         self._labware_view = engine.state_view.labware
 
@@ -81,6 +83,8 @@ class LabwareOffsetProvider(AbstractLabwareOffsetProvider):
 
         See the parent class for param details.
         """
+        from opentrons.protocol_engine import LabwareOffsetLocation, ModuleModel
+
         offset = self._labware_view.find_applicable_labware_offset(
             definition_uri=load_params.as_uri(),
             location=LabwareOffsetLocation(
@@ -1,6 +1,6 @@
 """ProtocolContext factory."""
 import asyncio
-from typing import Any, Dict, Optional, Union, cast
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union, cast
 
 from opentrons_shared_data.labware.dev_types import LabwareDefinition
 
@@ -12,8 +12,6 @@ from opentrons.hardware_control import (
     ThreadManager,
     SynchronousAdapter,
 )
-from opentrons.protocol_engine import ProtocolEngine
-from opentrons.protocol_engine.clients import SyncClient, ChildThreadTransport
 from opentrons.protocols.api_support.types import APIVersion
 from opentrons.protocols.api_support.definitions import MAX_SUPPORTED_VERSION
 
@@ -29,7 +27,11 @@ from .core.legacy.labware_offset_provider import (
     NullLabwareOffsetProvider,
 )
 from .core.legacy_simulator.legacy_protocol_core import LegacyProtocolCoreSimulator
-from .core.engine import ENGINE_CORE_API_VERSION, ProtocolCore
+from .core.engine import ENGINE_CORE_API_VERSION
+
+if TYPE_CHECKING:
+    from opentrons.protocol_engine import ProtocolEngine
+    from .core.engine import ProtocolCore
 
 
 class ProtocolEngineCoreRequiredError(Exception):
@@ -44,7 +46,7 @@ def create_protocol_context(
     *,
     hardware_api: Union[HardwareControlAPI, ThreadManager[HardwareControlAPI]],
     deck_type: str,
-    protocol_engine: Optional[ProtocolEngine] = None,
+    protocol_engine: Optional["ProtocolEngine"] = None,
     protocol_engine_loop: Optional[asyncio.AbstractEventLoop] = None,
     broker: Optional[Broker] = None,
     equipment_broker: Optional[EquipmentBroker[Any]] = None,
@@ -89,7 +91,7 @@ def create_protocol_context(
 
     sync_hardware: SynchronousAdapter[HardwareControlAPI]
     labware_offset_provider: AbstractLabwareOffsetProvider
-    core: Union[ProtocolCore, LegacyProtocolCoreSimulator, LegacyProtocolCore]
+    core: Union["ProtocolCore", LegacyProtocolCoreSimulator, LegacyProtocolCore]
 
     if isinstance(hardware_api, ThreadManager):
         sync_hardware = hardware_api.sync
@@ -109,6 +111,11 @@ def create_protocol_context(
                 "ProtocolEngine PAPI core is enabled, but no ProtocolEngine given."
             )
 
+        # Imported here because Protocol Engine is slow to import,
+        # and protocols below ENGINE_CORE_API_VERSION never need it.
+        from opentrons.protocol_engine.clients import SyncClient, ChildThreadTransport
+        from .core.engine import ProtocolCore
+
         engine_client_transport = ChildThreadTransport(
             engine=protocol_engine, loop=protocol_engine_loop
         )
@@ -146,7 +153,7 @@ def create_protocol_context(
 
     # TODO(mc, 2022-12-06): add API version guard in addition to instance check
     # this swap may happen once `ctx.move_labware` off-deck is implemented
-    deck = None if isinstance(core, ProtocolCore) else cast(Deck, core.get_deck())
+    deck = cast(Deck, core.get_deck()) if isinstance(core, LegacyProtocolCore) else None
 
     return ProtocolContext(
         api_version=api_version,
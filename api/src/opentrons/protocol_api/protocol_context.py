@@ -11,6 +11,7 @@ from typing import (
     Union,
     Mapping,
     cast,
+    TYPE_CHECKING,
 )
 
 from opentrons_shared_data.labware.dev_types import LabwareDefinition
@@ -32,7 +33,6 @@ from opentrons.protocols.api_support.util import (
 from ._types import OffDeckType
 from .core.common import ModuleCore, ProtocolCore
 from .core.core_map import LoadedCoreMap
-from .core.engine.module_core import NonConnectedModuleCore
 from .core.module import (
     AbstractTemperatureModuleCore,
     AbstractMagneticModuleCore,
@@ -41,7 +41,6 @@ from .core.module import (
     AbstractMagneticBlockCore,
 )
 from .core.engine import ENGINE_CORE_API_VERSION
-from .core.engine.protocol import ProtocolCore as ProtocolEngineCore
 from .core.legacy.legacy_protocol_core import LegacyProtocolCore
 
 from . import validation
@@ -58,6 +57,9 @@ from .module_contexts import (
     ModuleContext,
 )
 
+if TYPE_CHECKING:
+    from .core.engine.module_core import NonConnectedModuleCore
+
 
 logger = logging.getLogger(__name__)
 
@@ -650,7 +652,15 @@ class ProtocolContext(CommandPublisher):
         """
         instrument_name = validation.ensure_lowercase_name(instrument_name)
         is_96_channel = instrument_name == "p1000_96"
-        if is_96_channel and isinstance(self._core, ProtocolEngineCore):
+
+        if is_96_channel:
+            # Imported here because the engine core imports all of
+            # Protocol Engine, which is slow, and which legacy protocols never need.
+            from .core.engine.protocol import ProtocolCore as ProtocolEngineCore
+
+            is_96_channel = isinstance(self._core, ProtocolEngineCore)
+
+        if is_96_channel:
             checked_instrument_name = instrument_name
             checked_mount = Mount.LEFT
         else:
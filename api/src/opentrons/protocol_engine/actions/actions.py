@@ -6,7 +6,7 @@ reactions in objects that subscribe to the pipeline, like the StateStore.
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Union
+from typing import Optional, Sequence, Union
 
 from opentrons.protocols.models import LabwareDefinition
 from opentrons.hardware_control.types import DoorState
@@ -97,6 +97,17 @@ class QueueCommandAction:
     request_hash: Optional[str]
 
 
+@dataclass(frozen=True)
+class QueueCommandsAction:
+    """Add a batch of command requests to the queue, in order.
+
+    Equivalent to dispatching each `QueueCommandAction` on its own,
+    but state change notifications are only sent once, for the whole batch.
+    """
+
+    actions: Sequence[QueueCommandAction]
+
+
 @dataclass(frozen=True)
 class UpdateCommandAction:
     """Update a given command."""
@@ -188,6 +199,7 @@ Action = Union[
     HardwareStoppedAction,
     DoorChangeAction,
     QueueCommandAction,
+    QueueCommandsAction,
     UpdateCommandAction,
     FailCommandAction,
     AddLabwareOffsetAction,
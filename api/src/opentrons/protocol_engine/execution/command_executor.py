@@ -95,13 +95,15 @@ class CommandExecutor:
         self._action_dispatcher.dispatch(UpdateCommandAction(command=running_command))
 
         try:
+            # Let the logger format the command's params only if debug logging
+            # is actually enabled, since this runs once for every command.
             log.debug(
-                f"Executing {command.id}, {command.commandType}, {command.params}"
+                "Executing %s, %s, %s", command.id, command.commandType, command.params
             )
             result = await command_impl.execute(command.params)  # type: ignore[arg-type]
 
         except (Exception, asyncio.CancelledError) as error:
-            log.warning(f"Execution of {command.id} failed", exc_info=error)
+            log.warning("Execution of %s failed", command.id, exc_info=error)
 
             # TODO(mc, 2022-11-14): mark command as stopped rather than failed
             # https://opentrons.atlassian.net/browse/RCORE-390
@@ -96,7 +96,14 @@ class HardwareStopper:
         await self._hardware_api.halt()
 
     async def do_stop_and_recover(self, drop_tips_and_home: bool = False) -> None:
-        """Stop and reset the HardwareAPI, optionally dropping tips and homing."""
+        """Stop and reset the HardwareAPI, optionally dropping tips and homing.
+
+        With virtual pipettes, the tips and positions that the engine tracks
+        were never on the hardware, so dropping tips and homing is skipped.
+        """
+        if self._state_store.config.use_virtual_pipettes:
+            drop_tips_and_home = False
+
         if drop_tips_and_home:
             await self._drop_tip()
 
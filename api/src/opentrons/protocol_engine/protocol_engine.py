@@ -1,5 +1,5 @@
 """ProtocolEngine class definition."""
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Sequence
 
 from opentrons.protocols.models import LabwareDefinition
 from opentrons.hardware_control import HardwareControlAPI
@@ -33,6 +33,7 @@ from .actions import (
     FinishAction,
     FinishErrorDetails,
     QueueCommandAction,
+    QueueCommandsAction,
     AddLabwareOffsetAction,
     AddLabwareDefinitionAction,
     AddLiquidAction,
@@ -169,12 +170,62 @@ class ProtocolEngine:
         self._action_dispatcher.dispatch(action)
         return self._state_store.commands.get(command_id)
 
+    def add_commands(
+        self, requests: Sequence[commands.CommandCreate]
+    ) -> List[commands.Command]:
+        """Add several commands to the `ProtocolEngine`'s queue, in order.
+
+        This is equivalent to calling `add_command` for each request,
+        but the whole batch is added to state with a single action.
+        If any request is not allowed, none of them are added.
+
+        Arguments:
+            requests: The command types and payload data used to construct
+                the commands in state.
+
+        Returns:
+            The full, newly queued commands.
+
+        Raises:
+            SetupCommandNotAllowed: a request specified a setup command,
+                but the engine was not idle or paused.
+            RunStoppedError: the run has been stopped, so no new commands
+                may be added.
+        """
+        robot_type = self.state_view.config.robot_type
+        last_hash = self._state_store.commands.get_latest_command_hash()
+        actions: List[QueueCommandAction] = []
+
+        for request in requests:
+            request = slot_standardization.standardize_command(request, robot_type)
+            request_hash = commands.hash_command_params(
+                create=request,
+                last_hash=last_hash,
+            )
+
+            action = self.state_view.commands.validate_action_allowed(
+                QueueCommandAction(
+                    request=request,
+                    request_hash=request_hash,
+                    command_id=self._model_utils.generate_id(),
+                    created_at=self._model_utils.get_timestamp(),
+                )
+            )
+            assert isinstance(action, QueueCommandAction)
+            actions.append(action)
+
+            if action.request_hash is not None:
+                last_hash = action.request_hash
+
+        self._action_dispatcher.dispatch(QueueCommandsAction(actions=actions))
+        return [self._state_store.commands.get(a.command_id) for a in actions]
+
     async def wait_for_command(self, command_id: str) -> None:
         """Wait for a command to be completed.
 
         Will also return if the engine was stopped before it reached the command.
         """
-        await self._state_store.wait_for(
+        await self._state_store.wait_for_command(
             self._state_store.commands.get_command_is_final,
             command_id=command_id,
         )
@@ -1,6 +1,6 @@
 """Abstract state store interfaces."""
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar
+from typing import ClassVar, Generic, Optional, Tuple, Type, TypeVar
 
 from ..actions import Action
 
@@ -21,6 +21,13 @@ class HasState(ABC, Generic[StateT]):
 class HandlesActions(ABC):
     """Abstract interface for an object that reacts to actions."""
 
+    handled_action_types: ClassVar[Optional[Tuple[Type[Action], ...]]] = None
+    """The action types that `handle_action` reacts to.
+
+    Other action types may be skipped by the dispatcher.
+    If `None`, the object must be given every action.
+    """
+
     @abstractmethod
     def handle_action(self, action: Action) -> None:
         """React to a state-change action."""
@@ -1,19 +1,58 @@
 """Simple state change notification interface."""
 import asyncio
+from typing import Dict, Hashable, Iterable, List, Optional
 
 
 class ChangeNotifier:
-    """An interface tto emit or subscribe to state change notifications."""
+    """An interface tto emit or subscribe to state change notifications.
+
+    Subscribers may optionally wait on a key, such as a command ID,
+    so that they are only woken by notifications that concern that key.
+    """
 
     def __init__(self) -> None:
         """Initialize the ChangeNotifier with an internal Event."""
         self._event = asyncio.Event()
+        self._keyed_events: Dict[Hashable, List[asyncio.Event]] = {}
+
+    def notify(self, keys: Optional[Iterable[Hashable]] = None) -> None:
+        """Notify `wait`'ers that the state has changed.
 
-    def notify(self) -> None:
-        """Notify all `wait`'ers that the state has changed."""
+        Arguments:
+            keys: The keys whose state may have changed. Un-keyed `wait`'ers
+                are always notified. If `None`, every keyed `wait`'er is
+                notified as well.
+        """
         self._event.set()
 
-    async def wait(self) -> None:
-        """Wait until the next state change notification."""
-        self._event.clear()
-        await self._event.wait()
+        if keys is None:
+            for events in self._keyed_events.values():
+                for event in events:
+                    event.set()
+        else:
+            for key in keys:
+                for event in self._keyed_events.get(key, ()):
+                    event.set()
+
+    async def wait(self, key: Optional[Hashable] = None) -> None:
+        """Wait until the next state change notification.
+
+        Arguments:
+            key: If specified, only wake up for notifications about this key,
+                or for notifications that aren't limited to any keys.
+        """
+        if key is None:
+            self._event.clear()
+            await self._event.wait()
+            return
+
+        event = asyncio.Event()
+        events = self._keyed_events.setdefault(key, [])
+        events.append(event)
+
+        try:
+            await event.wait()
+        finally:
+            events.remove(event)
+            if len(events) == 0:
+                del self._keyed_events[key]
@@ -15,6 +15,7 @@ from opentrons.hardware_control.types import DoorState
 from ..actions import (
     Action,
     QueueCommandAction,
+    QueueCommandsAction,
     UpdateCommandAction,
     FailCommandAction,
     PlayAction,
@@ -156,12 +157,35 @@ class CommandState:
     This value can be used to generate future hashes.
     """
 
+    latest_final_command_id: Optional[str]
+    """The ID of the last-added command that has succeeded or failed, if any.
+
+    Maintained alongside `commands_by_id` so the "current" command
+    can be found without scanning every command.
+    """
+
+    failed_protocol_command_ids: OrderedSet[str]
+    """The IDs of non-setup commands that have an error, in the order they failed."""
+
 
 class CommandStore(HasState[CommandState], HandlesActions):
     """Command state container."""
 
     _state: CommandState
 
+    handled_action_types = (
+        QueueCommandAction,
+        QueueCommandsAction,
+        UpdateCommandAction,
+        FailCommandAction,
+        PlayAction,
+        PauseAction,
+        StopAction,
+        FinishAction,
+        HardwareStoppedAction,
+        DoorChangeAction,
+    )
+
     def __init__(
         self,
         *,
@@ -183,6 +207,8 @@ class CommandStore(HasState[CommandState], HandlesActions):
             run_completed_at=None,
             run_started_at=None,
             latest_command_hash=None,
+            latest_final_command_id=None,
+            failed_protocol_command_ids=OrderedSet(),
         )
 
     def handle_action(self, action: Action) -> None:  # noqa: C901
@@ -190,39 +216,11 @@ class CommandStore(HasState[CommandState], HandlesActions):
         errors_by_id: Mapping[str, ErrorOccurrence]
 
         if isinstance(action, QueueCommandAction):
-            assert action.command_id not in self._state.commands_by_id
-
-            # TODO(mc, 2021-06-22): mypy has trouble with this automatic
-            # request > command mapping, figure out how to type precisely
-            # (or wait for a future mypy version that can figure it out).
-            # For now, unit tests cover mapping every request type
-            queued_command = action.request._CommandCls.construct(
-                id=action.command_id,
-                key=(
-                    action.request.key
-                    if action.request.key is not None
-                    else (action.request_hash or action.command_id)
-                ),
-                createdAt=action.created_at,
-                params=action.request.params,  # type: ignore[arg-type]
-                intent=action.request.intent,
-                status=CommandStatus.QUEUED,
-            )
-
-            next_index = len(self._state.all_command_ids)
-            self._state.all_command_ids.append(action.command_id)
-            self._state.commands_by_id[queued_command.id] = CommandEntry(
-                index=next_index,
-                command=queued_command,
-            )
-
-            if action.request.intent == CommandIntent.SETUP:
-                self._state.queued_setup_command_ids.add(queued_command.id)
-            else:
-                self._state.queued_command_ids.add(queued_command.id)
+            self._handle_queue_command_action(action)
 
-            if action.request_hash is not None:
-                self._state.latest_command_hash = action.request_hash
+        elif isinstance(action, QueueCommandsAction):
+            for queue_command_action in action.actions:
+                self._handle_queue_command_action(queue_command_action)
 
         # TODO(mc, 2021-12-28): replace "UpdateCommandAction" with explicit
         # state change actions (e.g. RunCommandAction, SucceedCommandAction)
@@ -239,11 +237,13 @@ class CommandStore(HasState[CommandState], HandlesActions):
                     command=command,
                 )
             else:
+                index = prev_entry.index
                 self._state.commands_by_id[command.id] = CommandEntry(
-                    index=prev_entry.index,
+                    index=index,
                     command=command,
                 )
 
+            self._update_final_command_indexes(command=command, index=index)
             self._state.queued_command_ids.discard(command.id)
             self._state.queued_setup_command_ids.discard(command.id)
 
@@ -258,18 +258,22 @@ class CommandStore(HasState[CommandState], HandlesActions):
             )
 
             prev_entry = self._state.commands_by_id[action.command_id]
+            failed_command = prev_entry.command.copy(
+                update={
+                    "error": error_occurrence,
+                    "completedAt": action.failed_at,
+                    "status": CommandStatus.FAILED,
+                }
+            )
             self._state.commands_by_id[action.command_id] = CommandEntry(
                 index=prev_entry.index,
                 # TODO(mc, 2022-06-06): add new "cancelled" status or similar
                 # and don't set `completedAt` in commands other than the
                 # specific one that failed
-                command=prev_entry.command.copy(
-                    update={
-                        "error": error_occurrence,
-                        "completedAt": action.failed_at,
-                        "status": CommandStatus.FAILED,
-                    }
-                ),
+                command=failed_command,
+            )
+            self._update_final_command_indexes(
+                command=failed_command, index=prev_entry.index
             )
 
             if prev_entry.command.intent == CommandIntent.SETUP:
@@ -283,17 +287,23 @@ class CommandStore(HasState[CommandState], HandlesActions):
                 ]
                 self._state.queued_command_ids.clear()
 
+            # Queued commands are failed with a shallow copy that shares
+            # their params, so failing a long queue stays linear and cheap.
+            queued_command_update = {
+                "completedAt": action.failed_at,
+                "status": CommandStatus.FAILED,
+            }
+
             for command_id in other_command_ids_to_fail:
                 prev_entry = self._state.commands_by_id[command_id]
+                failed_command = prev_entry.command.copy(update=queued_command_update)
 
                 self._state.commands_by_id[command_id] = CommandEntry(
                     index=prev_entry.index,
-                    command=prev_entry.command.copy(
-                        update={
-                            "completedAt": action.failed_at,
-                            "status": CommandStatus.FAILED,
-                        }
-                    ),
+                    command=failed_command,
+                )
+                self._update_final_command_indexes(
+                    command=failed_command, index=prev_entry.index
                 )
 
             if self._state.running_command_id == action.command_id:
@@ -365,6 +375,58 @@ class CommandStore(HasState[CommandState], HandlesActions):
                 elif action.door_state == DoorState.CLOSED:
                     self._state.is_door_blocking = False
 
+    def _handle_queue_command_action(self, action: QueueCommandAction) -> None:
+        """Add a queued command to state."""
+        assert action.command_id not in self._state.commands_by_id
+
+        # TODO(mc, 2021-06-22): mypy has trouble with this automatic
+        # request > command mapping, figure out how to type precisely
+        # (or wait for a future mypy version that can figure it out).
+        # For now, unit tests cover mapping every request type
+        queued_command = action.request._CommandCls.construct(
+            id=action.command_id,
+            key=(
+                action.request.key
+                if action.request.key is not None
+                else (action.request_hash or action.command_id)
+            ),
+            createdAt=action.created_at,
+            params=action.request.params,  # type: ignore[arg-type]
+            intent=action.request.intent,
+            status=CommandStatus.QUEUED,
+        )
+
+        next_index = len(self._state.all_command_ids)
+        self._state.all_command_ids.append(action.command_id)
+        self._state.commands_by_id[queued_command.id] = CommandEntry(
+            index=next_index,
+            command=queued_command,
+        )
+
+        if action.request.intent == CommandIntent.SETUP:
+            self._state.queued_setup_command_ids.add(queued_command.id)
+        else:
+            self._state.queued_command_ids.add(queued_command.id)
+
+        if action.request_hash is not None:
+            self._state.latest_command_hash = action.request_hash
+
+    def _update_final_command_indexes(self, command: Command, index: int) -> None:
+        """Keep the final and failed command indexes in sync with a command update."""
+        if command.status in (CommandStatus.SUCCEEDED, CommandStatus.FAILED):
+            latest_final_id = self._state.latest_final_command_id
+
+            if (
+                latest_final_id is None
+                or index >= self._state.commands_by_id[latest_final_id].index
+            ):
+                self._state.latest_final_command_id = command.id
+
+        if command.error is not None and command.intent != CommandIntent.SETUP:
+            self._state.failed_protocol_command_ids.add(command.id)
+        else:
+            self._state.failed_protocol_command_ids.discard(command.id)
+
 
 class CommandView(HasState[CommandState]):
     """Read-only command state view."""
@@ -404,9 +466,6 @@ class CommandView(HasState[CommandState]):
         If the cursor is omitted, a cursor will be selected automatically
         based on the currently running or most recently executed command."
         """
-        # TODO(mc, 2022-01-31): this is not the most performant way to implement
-        # this; if this becomes a problem, change or the underlying data structure
-        # to something that isn't just an OrderedDict
         all_command_ids = self._state.all_command_ids
         commands_by_id = self._state.commands_by_id
         running_command_id = self._state.running_command_id
@@ -452,19 +511,28 @@ class CommandView(HasState[CommandState]):
                 index=entry.index,
             )
 
-        # TODO(mc, 2022-02-07): this is O(n) in the worst case for no good reason.
-        # Resolve prior to JSONv6 support, where this will matter.
-        for reverse_index, cid in enumerate(reversed(self._state.all_command_ids)):
-            if self.get_command_is_final(cid):
-                entry = self._state.commands_by_id[cid]
-                return CurrentCommand(
-                    command_id=entry.command.id,
-                    command_key=entry.command.key,
-                    created_at=entry.command.createdAt,
-                    index=len(self._state.all_command_ids) - reverse_index - 1,
-                )
+        # once the run is stopped, commands that are still queued count as final,
+        # so the last-added command is current if it is not still running
+        current_command_id = self._state.latest_final_command_id
+        all_command_ids = self._state.all_command_ids
 
-        return None
+        if (
+            self._state.run_result is not None
+            and len(all_command_ids) > 0
+            and self.get_command_is_final(all_command_ids[-1])
+        ):
+            current_command_id = all_command_ids[-1]
+
+        if current_command_id is None:
+            return None
+
+        entry = self._state.commands_by_id[current_command_id]
+        return CurrentCommand(
+            command_id=entry.command.id,
+            command_key=entry.command.key,
+            created_at=entry.command.createdAt,
+            index=entry.index,
+        )
 
     def get_next_to_execute(self) -> Optional[str]:
         """Return the next command in line to be executed.
@@ -553,10 +621,17 @@ class CommandView(HasState[CommandState]):
         )
 
         if no_command_running and no_command_to_execute:
-            for command_id in self._state.all_command_ids:
-                command = self._state.commands_by_id[command_id].command
-                if command.error and command.intent != CommandIntent.SETUP:
-                    raise ProtocolCommandFailedError(command.error.detail)
+            failed_command_ids = self._state.failed_protocol_command_ids
+
+            if len(failed_command_ids) > 0:
+                first_failed_id = min(
+                    failed_command_ids,
+                    key=lambda cid: self._state.commands_by_id[cid].index,
+                )
+                error = self._state.commands_by_id[first_failed_id].command.error
+                assert error is not None, "Failed command index out of sync"
+                raise ProtocolCommandFailedError(error.detail)
+
             return True
         else:
             return False
@@ -1,5 +1,5 @@
 """Geometry state getters."""
-from typing import Optional, List, Set, Tuple, Union
+from typing import Dict, Optional, List, Set, Tuple, Union
 
 from opentrons.types import Point, DeckSlotName
 
@@ -29,6 +29,10 @@ from .modules import ModuleView
 from .pipettes import PipetteView
 
 
+# Each well's (x, y, z, depth) from its labware definition, by well name.
+_WellTable = Dict[str, Tuple[float, float, float, float]]
+
+
 # TODO(mc, 2021-06-03): continue evaluation of which selectors should go here
 # vs which selectors should be in LabwareView
 class GeometryView:
@@ -47,15 +51,48 @@ class GeometryView:
         self._modules = module_view
         self._pipettes = pipette_view
 
+        # Values derived only from labware and module state, cached until
+        # either store reports a new generation.
+        self._cache_generation: Optional[Tuple[int, int]] = None
+        self._labware_position_cache: Dict[str, Point] = {}
+        self._labware_highest_z_cache: Dict[str, float] = {}
+        self._all_labware_highest_z: Optional[float] = None
+        self._well_table_cache: Dict[str, Tuple[Point, _WellTable]] = {}
+
+    def _invalidate_stale_cache(self) -> None:
+        """Clear cached geometry if labware or module state has changed."""
+        generation = (self._labware.get_generation(), self._modules.get_generation())
+
+        if generation != self._cache_generation:
+            self._cache_generation = generation
+            self._labware_position_cache.clear()
+            self._labware_highest_z_cache.clear()
+            self._all_labware_highest_z = None
+            self._well_table_cache.clear()
+
     def get_labware_highest_z(self, labware_id: str) -> float:
         """Get the highest Z-point of a labware."""
-        labware_data = self._labware.get(labware_id)
+        self._invalidate_stale_cache()
+        highest_z = self._labware_highest_z_cache.get(labware_id)
 
-        return self._get_highest_z_from_labware_data(labware_data)
+        if highest_z is None:
+            labware_data = self._labware.get(labware_id)
+            highest_z = self._get_highest_z_from_labware_data(labware_data)
+            self._labware_highest_z_cache[labware_id] = highest_z
+
+        return highest_z
 
     # TODO(mc, 2022-06-24): rename this method
     def get_all_labware_highest_z(self) -> float:
         """Get the highest Z-point across all labware."""
+        self._invalidate_stale_cache()
+
+        if self._all_labware_highest_z is None:
+            self._all_labware_highest_z = self._get_all_labware_highest_z()
+
+        return self._all_labware_highest_z
+
+    def _get_all_labware_highest_z(self) -> float:
         highest_labware_z = max(
             (
                 self._get_highest_z_from_labware_data(lw_data)
@@ -192,14 +229,20 @@ class GeometryView:
 
     def get_labware_position(self, labware_id: str) -> Point:
         """Get the calibrated origin of the labware."""
-        origin_pos = self.get_labware_origin_position(labware_id)
-        cal_offset = self._labware.get_labware_offset_vector(labware_id)
+        self._invalidate_stale_cache()
+        labware_pos = self._labware_position_cache.get(labware_id)
+
+        if labware_pos is None:
+            origin_pos = self.get_labware_origin_position(labware_id)
+            cal_offset = self._labware.get_labware_offset_vector(labware_id)
+            labware_pos = Point(
+                x=origin_pos.x + cal_offset.x,
+                y=origin_pos.y + cal_offset.y,
+                z=origin_pos.z + cal_offset.z,
+            )
+            self._labware_position_cache[labware_id] = labware_pos
 
-        return Point(
-            x=origin_pos.x + cal_offset.x,
-            y=origin_pos.y + cal_offset.y,
-            z=origin_pos.z + cal_offset.z,
-        )
+        return labware_pos
 
     def get_well_position(
         self,
@@ -208,24 +251,53 @@ class GeometryView:
         well_location: Optional[WellLocation] = None,
     ) -> Point:
         """Given relative well location in a labware, get absolute position."""
-        labware_pos = self.get_labware_position(labware_id)
-        well_def = self._labware.get_well_definition(labware_id, well_name)
-        well_depth = well_def.depth
-
-        offset = WellOffset(x=0, y=0, z=well_depth)
+        labware_pos, well_table = self._get_well_table(labware_id)
+
+        try:
+            well_x, well_y, well_z, well_depth = well_table[well_name]
+        except KeyError as e:
+            raise errors.WellDoesNotExistError(
+                f"{well_name} does not exist in {labware_id}."
+            ) from e
+
+        offset_x = 0.0
+        offset_y = 0.0
+        offset_z = well_depth
         if well_location is not None:
-            offset = well_location.offset
+            offset_x = well_location.offset.x
+            offset_y = well_location.offset.y
+            offset_z = well_location.offset.z
             if well_location.origin == WellOrigin.TOP:
-                offset = offset.copy(update={"z": offset.z + well_depth})
+                offset_z += well_depth
             elif well_location.origin == WellOrigin.CENTER:
-                offset = offset.copy(update={"z": offset.z + well_depth / 2.0})
+                offset_z += well_depth / 2.0
 
         return Point(
-            x=labware_pos.x + offset.x + well_def.x,
-            y=labware_pos.y + offset.y + well_def.y,
-            z=labware_pos.z + offset.z + well_def.z,
+            x=labware_pos.x + offset_x + well_x,
+            y=labware_pos.y + offset_y + well_y,
+            z=labware_pos.z + offset_z + well_z,
         )
 
+    def _get_well_table(self, labware_id: str) -> Tuple[Point, _WellTable]:
+        """Get a labware's calibrated position and the geometry of all its wells.
+
+        The table is built the first time any of the labware's wells is needed,
+        and reused until labware or module state changes.
+        """
+        self._invalidate_stale_cache()
+        entry = self._well_table_cache.get(labware_id)
+
+        if entry is None:
+            wells = self._labware.get_definition(labware_id).wells
+            well_table = {
+                name: (well_def.x, well_def.y, well_def.z, well_def.depth)
+                for name, well_def in wells.items()
+            }
+            entry = (self.get_labware_position(labware_id), well_table)
+            self._well_table_cache[labware_id] = entry
+
+        return entry
+
     def get_nominal_well_position(
         self,
         labware_id: str,
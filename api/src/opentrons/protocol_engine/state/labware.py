@@ -84,6 +84,53 @@ _RIGHT_SIDE_SLOTS = {
 }
 
 
+# A labware offset's definition URI, followed by the fields of its location.
+LabwareOffsetKey = Tuple[str, DeckSlotName, Optional[ModuleModel], Optional[str]]
+
+
+def get_labware_offset_key(
+    definition_uri: str, location: LabwareOffsetLocation
+) -> LabwareOffsetKey:
+    """Get a hashable key for finding offsets by definition URI and location."""
+    return (
+        definition_uri,
+        location.slotName,
+        location.moduleModel,
+        location.definitionUri,
+    )
+
+
+class DeckSlotGeometry(NamedTuple):
+    """A deck slot's definition, along with its precomputed positions."""
+
+    definition: SlotDefV3
+    position: Point
+    center_position: Point
+
+
+def get_deck_slots_by_id(
+    deck_definition: DeckDefinitionV3,
+) -> Dict[str, DeckSlotGeometry]:
+    """Index a deck definition's slots by slot ID, computing their positions."""
+    deck_slots_by_id = {}
+
+    for slot_def in deck_definition["locations"]["orderedSlots"]:
+        position = slot_def["position"]
+        bounding_box = slot_def["boundingBox"]
+
+        deck_slots_by_id[slot_def["id"]] = DeckSlotGeometry(
+            definition=slot_def,
+            position=Point(x=position[0], y=position[1], z=position[2]),
+            center_position=Point(
+                x=position[0] + bounding_box["xDimension"] / 2,
+                y=position[1] + bounding_box["yDimension"] / 2,
+                z=position[2] + bounding_box["zDimension"] / 2,
+            ),
+        )
+
+    return deck_slots_by_id
+
+
 class LabwareLoadParams(NamedTuple):
     """Parameters required to load a labware in Protocol Engine."""
 
@@ -105,15 +152,32 @@ class LabwareState:
     # We rely on Python 3.7+ preservation of dict insertion order.
     labware_offsets_by_id: Dict[str, LabwareOffset]
 
+    # The ID of the most recently added offset for each definition URI and location.
+    labware_offset_ids_by_key: Dict[LabwareOffsetKey, str]
+
     definitions_by_uri: Dict[str, LabwareDefinition]
     deck_definition: DeckDefinitionV3
 
+    # Indexed by slot ID, which is an OT-2 or OT-3 style slot name
+    # depending on the deck. Derived from deck_definition, which never changes.
+    deck_slots_by_id: Dict[str, DeckSlotGeometry]
+
+    # Incremented whenever any of the above changes,
+    # so that values derived from labware state can be cached.
+    generation: int = 0
+
 
 class LabwareStore(HasState[LabwareState], HandlesActions):
     """Labware state container."""
 
     _state: LabwareState
 
+    handled_action_types = (
+        UpdateCommandAction,
+        AddLabwareOffsetAction,
+        AddLabwareDefinitionAction,
+    )
+
     def __init__(
         self,
         deck_definition: DeckDefinitionV3,
@@ -146,8 +210,10 @@ class LabwareStore(HasState[LabwareState], HandlesActions):
         self._state = LabwareState(
             definitions_by_uri=definitions_by_uri,
             labware_offsets_by_id={},
+            labware_offset_ids_by_key={},
             labware_by_id=labware_by_id,
             deck_definition=deck_definition,
+            deck_slots_by_id=get_deck_slots_by_id(deck_definition),
         )
 
     def handle_action(self, action: Action) -> None:
@@ -156,6 +222,7 @@ class LabwareStore(HasState[LabwareState], HandlesActions):
             self._handle_command(action.command)
 
         elif isinstance(action, AddLabwareOffsetAction):
+            self._state.generation += 1
             labware_offset = LabwareOffset.construct(
                 id=action.labware_offset_id,
                 createdAt=action.created_at,
@@ -166,6 +233,7 @@ class LabwareStore(HasState[LabwareState], HandlesActions):
             self._add_labware_offset(labware_offset)
 
         elif isinstance(action, AddLabwareDefinitionAction):
+            self._state.generation += 1
             uri = uri_from_details(
                 namespace=action.definition.namespace,
                 load_name=action.definition.parameters.loadName,
@@ -176,6 +244,8 @@ class LabwareStore(HasState[LabwareState], HandlesActions):
     def _handle_command(self, command: Command) -> None:
         """Modify state in reaction to a command."""
         if isinstance(command.result, (LoadLabwareResult, LoadAdapterResult)):
+            self._state.generation += 1
+
             # If the labware load refers to an offset, that offset must actually exist.
             if command.result.offsetId is not None:
                 assert command.result.offsetId in self._state.labware_offsets_by_id
@@ -205,6 +275,7 @@ class LabwareStore(HasState[LabwareState], HandlesActions):
             )
 
         elif isinstance(command.result, MoveLabwareResult):
+            self._state.generation += 1
             labware_id = command.params.labwareId
             new_location = command.params.newLocation
             new_offset_id = command.result.offsetId
@@ -222,6 +293,11 @@ class LabwareStore(HasState[LabwareState], HandlesActions):
         assert labware_offset.id not in self._state.labware_offsets_by_id
 
         self._state.labware_offsets_by_id[labware_offset.id] = labware_offset
+        self._state.labware_offset_ids_by_key[
+            get_labware_offset_key(
+                labware_offset.definitionUri, labware_offset.location
+            )
+        ] = labware_offset.id
 
 
 class LabwareView(HasState[LabwareState]):
@@ -246,6 +322,10 @@ class LabwareView(HasState[LabwareState]):
                 f"Labware {labware_id} not found."
             ) from e
 
+    def get_generation(self) -> int:
+        """Get a number that changes whenever labware state changes."""
+        return self._state.generation
+
     def get_id_by_module(self, module_id: str) -> str:
         """Return the ID of the labware loaded on the given module."""
         for labware_id, labware in self.state.labware_by_id.items():
@@ -305,33 +385,24 @@ class LabwareView(HasState[LabwareState]):
 
     def get_slot_definition(self, slot: DeckSlotName) -> SlotDefV3:
         """Get the definition of a slot in the deck."""
-        deck_def = self.get_deck_definition()
-
-        for slot_def in deck_def["locations"]["orderedSlots"]:
-            if slot_def["id"] == slot.id:
-                return slot_def
-
-        raise errors.SlotDoesNotExistError(
-            f"Slot ID {slot.id} does not exist in deck {deck_def['otId']}"
-        )
+        return self._get_deck_slot(slot).definition
 
     def get_slot_position(self, slot: DeckSlotName) -> Point:
         """Get the position of a deck slot."""
-        slot_def = self.get_slot_definition(slot)
-        position = slot_def["position"]
-
-        return Point(x=position[0], y=position[1], z=position[2])
+        return self._get_deck_slot(slot).position
 
     def get_slot_center_position(self, slot: DeckSlotName) -> Point:
         """Get the (x, y, z) position of the center of the slot."""
-        slot_def = self.get_slot_definition(slot)
-        position = slot_def["position"]
+        return self._get_deck_slot(slot).center_position
 
-        return Point(
-            x=position[0] + slot_def["boundingBox"]["xDimension"] / 2,
-            y=position[1] + slot_def["boundingBox"]["yDimension"] / 2,
-            z=position[2] + slot_def["boundingBox"]["zDimension"] / 2,
-        )
+    def _get_deck_slot(self, slot: DeckSlotName) -> DeckSlotGeometry:
+        try:
+            return self._state.deck_slots_by_id[slot.id]
+        except KeyError as e:
+            raise errors.SlotDoesNotExistError(
+                f"Slot ID {slot.id} does not exist in deck"
+                f" {self._state.deck_definition['otId']}"
+            ) from e
 
     def get_definition_by_uri(self, uri: LabwareUri) -> LabwareDefinition:
         """Get the labware definition matching loadName namespace and version."""
@@ -628,14 +699,14 @@ class LabwareView(HasState[LabwareState]):
         This implies that if the location involves a module,
         it will *not* match a module that's compatible but not identical.
         """
-        for candidate in reversed(list(self._state.labware_offsets_by_id.values())):
-            if (
-                candidate.definitionUri == definition_uri
-                and candidate.location == location
-            ):
-                return candidate
+        offset_id = self._state.labware_offset_ids_by_key.get(
+            get_labware_offset_key(definition_uri, location)
+        )
 
-        return None
+        if offset_id is None:
+            return None
+
+        return self._state.labware_offsets_by_id[offset_id]
 
     def get_fixed_trash_id(self) -> str:
         """Get the identifier of labware loaded into the fixed trash location.
@@ -20,6 +20,8 @@ class LiquidStore(HasState[LiquidState], HandlesActions):
 
     _state: LiquidState
 
+    handled_action_types = (AddLiquidAction,)
+
     def __init__(self) -> None:
         """Initialize a liquid store and its state."""
         self._state = LiquidState(liquids_by_id={})
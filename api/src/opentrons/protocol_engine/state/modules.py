@@ -146,12 +146,21 @@ class ModuleState:
     module_offset_by_serial: Dict[str, ModuleOffsetVector]
     """Information about each modules offsets."""
 
+    generation: int = 0
+    """Incremented whenever a module is loaded or calibrated.
+
+    Used to cache values derived from module positions. Changes to
+    module substates, like temperatures, do not increment it.
+    """
+
 
 class ModuleStore(HasState[ModuleState], HandlesActions):
     """Module state container."""
 
     _state: ModuleState
 
+    handled_action_types = (UpdateCommandAction, AddModuleAction)
+
     def __init__(
         self, module_calibration_offsets: Optional[Dict[str, ModuleOffsetVector]] = None
     ) -> None:
@@ -243,6 +252,7 @@ class ModuleStore(HasState[ModuleState], HandlesActions):
         actual_model = definition.model
         live_data = module_live_data["data"] if module_live_data else None
 
+        self._state.generation += 1
         self._state.requested_model_by_id[module_id] = requested_model
         self._state.slot_by_module_id[module_id] = slot_name
         self._state.hardware_by_module_id[module_id] = HardwareModule(
@@ -297,6 +307,7 @@ class ModuleStore(HasState[ModuleState], HandlesActions):
                 module_serial is not None
             ), "Expected a module SN and got None instead."
             self._state.module_offset_by_serial[module_serial] = module_offset
+            self._state.generation += 1
 
     def _handle_heater_shaker_commands(
         self,
@@ -480,6 +491,10 @@ class ModuleView(HasState[ModuleState]):
             serialNumber=attached_module.serial_number,
         )
 
+    def get_generation(self) -> int:
+        """Get a number that changes whenever a module is loaded or calibrated."""
+        return self._state.generation
+
     def get_all(self) -> List[LoadedModule]:
         """Get a list of all module entries in state."""
         return [self.get(mod_id) for mod_id in self._state.slot_by_module_id.keys()]
@@ -94,6 +94,12 @@ class PipetteStore(HasState[PipetteState], HandlesActions):
 
     _state: PipetteState
 
+    handled_action_types = (
+        UpdateCommandAction,
+        SetPipetteMovementSpeedAction,
+        AddPipetteConfigAction,
+    )
+
     def __init__(self) -> None:
         """Initialize a PipetteStore and its state."""
         self._state = PipetteState(
@@ -3,13 +3,23 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from functools import partial
-from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar
+from typing import Any, Callable, Dict, List, Optional, Sequence, Type, TypeVar
 from opentrons.protocol_engine.types import ModuleOffsetVector
 
 from opentrons_shared_data.deck.dev_types import DeckDefinitionV3
 
 from ..resources import DeckFixedLabware
-from ..actions import Action, ActionHandler
+from ..actions import (
+    Action,
+    ActionHandler,
+    QueueCommandAction,
+    QueueCommandsAction,
+    UpdateCommandAction,
+    FailCommandAction,
+    StopAction,
+    FinishAction,
+    HardwareStoppedAction,
+)
 from .abstract_store import HasState, HandlesActions
 from .change_notifier import ChangeNotifier
 from .commands import CommandState, CommandStore, CommandView
@@ -154,14 +164,17 @@ class StateStore(StateView, ActionHandler):
         self._liquid_store = LiquidStore()
         self._tip_store = TipStore()
 
-        self._substores: List[HandlesActions] = [
-            self._command_store,
-            self._pipette_store,
-            self._labware_store,
-            self._module_store,
-            self._liquid_store,
-            self._tip_store,
-        ]
+        # keyed by the names of their fields in `State`
+        self._substores: Dict[str, HandlesActions] = {
+            "commands": self._command_store,
+            "pipettes": self._pipette_store,
+            "labware": self._labware_store,
+            "modules": self._module_store,
+            "liquids": self._liquid_store,
+            "tips": self._tip_store,
+        }
+        self._substore_names_by_action_type: Dict[Type[Action], List[str]] = {}
+        self._handled_action_counts = {name: 0 for name in self._substores}
         self._config = config
         self._change_notifier = change_notifier or ChangeNotifier()
         self._initialize_state()
@@ -171,12 +184,27 @@ class StateStore(StateView, ActionHandler):
 
         Arguments:
             action: An action object representing a state change. Will be
-                passed to all substores so they can react accordingly.
+                passed to every substore that handles its type so they can
+                react accordingly.
         """
-        for substore in self._substores:
-            substore.handle_action(action)
+        substore_names = self._get_substore_names_for_action(action)
 
-        self._update_state_views()
+        for name in substore_names:
+            self._substores[name].handle_action(action)
+            self._handled_action_counts[name] += 1
+
+        self._update_state_views(
+            changed_substore_names=substore_names,
+            changed_command_ids=_get_changed_command_ids(action),
+        )
+
+    def get_handled_action_counts(self) -> Dict[str, int]:
+        """Get the number of actions each substore has handled, for profiling.
+
+        Returns:
+            Action counts, keyed by the substore's field name in `State`.
+        """
+        return dict(self._handled_action_counts)
 
     async def wait_for(
         self,
@@ -237,6 +265,53 @@ class StateStore(StateView, ActionHandler):
 
         return is_done
 
+    async def wait_for_command(
+        self,
+        condition: Callable[[str], Optional[ReturnT]],
+        command_id: str,
+    ) -> ReturnT:
+        """Wait for a condition about a single command to become true.
+
+        Works like `wait_for`, with the same caveats, but `condition` is only
+        re-checked when an action may have changed the given command, rather
+        than on every state change. Use this when `condition` depends only on
+        that command's status and on whether the run has stopped.
+
+        Arguments:
+            condition: A function that takes `command_id` and returns
+                a truthy value when the `await` should resolve.
+            command_id: The command that `condition` is concerned with.
+
+        Returns:
+            The truthy value returned by the `condition` function.
+
+        Raises:
+            The exception raised by the `condition` function, if any.
+        """
+        is_done = condition(command_id)
+
+        while not is_done:
+            await self._change_notifier.wait(command_id)
+            is_done = condition(command_id)
+
+        return is_done
+
+    def _get_substore_names_for_action(self, action: Action) -> List[str]:
+        """Get the names of the substores that handle a given action's type."""
+        action_type = type(action)
+        names = self._substore_names_by_action_type.get(action_type)
+
+        if names is None:
+            names = [
+                name
+                for name, substore in self._substores.items()
+                if substore.handled_action_types is None
+                or action_type in substore.handled_action_types
+            ]
+            self._substore_names_by_action_type[action_type] = names
+
+        return names
+
     def _get_next_state(self) -> State:
         """Get a new instance of the state value object."""
         return State(
@@ -260,6 +335,14 @@ class StateStore(StateView, ActionHandler):
         self._modules = ModuleView(state.modules)
         self._liquid = LiquidView(state.liquids)
         self._tips = TipView(state.tips)
+        self._views_by_substore_name: Dict[str, HasState[Any]] = {
+            "commands": self._commands,
+            "pipettes": self._pipettes,
+            "labware": self._labware,
+            "modules": self._modules,
+            "liquids": self._liquid,
+            "tips": self._tips,
+        }
 
         # Derived states
         self._geometry = GeometryView(
@@ -276,14 +359,44 @@ class StateStore(StateView, ActionHandler):
             module_view=self._modules,
         )
 
-    def _update_state_views(self) -> None:
-        """Update state view interfaces to use latest underlying values."""
+    def _update_state_views(
+        self,
+        changed_substore_names: Sequence[str],
+        changed_command_ids: Optional[Sequence[str]] = None,
+    ) -> None:
+        """Update state view interfaces to use latest underlying values.
+
+        Arguments:
+            changed_substore_names: The substores that handled the action.
+                Only their views are updated.
+            changed_command_ids: The commands that may have changed, used to
+                only wake command waiters that care. If `None`, wake all of them.
+        """
         next_state = self._get_next_state()
         self._state = next_state
-        self._commands._state = next_state.commands
-        self._labware._state = next_state.labware
-        self._pipettes._state = next_state.pipettes
-        self._modules._state = next_state.modules
-        self._liquid._state = next_state.liquids
-        self._tips._state = next_state.tips
-        self._change_notifier.notify()
+
+        for name in changed_substore_names:
+            self._views_by_substore_name[name]._state = getattr(next_state, name)
+
+        self._change_notifier.notify(changed_command_ids)
+
+
+def _get_changed_command_ids(action: Action) -> Optional[List[str]]:
+    """Get the IDs of the commands whose status an action may change.
+
+    Returns:
+        The affected command IDs, or `None` if the action may change
+        the status of any command (e.g. by failing or stopping the run).
+    """
+    if isinstance(action, QueueCommandAction):
+        return [action.command_id]
+    elif isinstance(action, QueueCommandsAction):
+        return [a.command_id for a in action.actions]
+    elif isinstance(action, UpdateCommandAction):
+        return [action.command.id]
+    elif isinstance(
+        action, (FailCommandAction, StopAction, FinishAction, HardwareStoppedAction)
+    ):
+        return None
+    else:
+        return []
@@ -1,6 +1,5 @@
 """Tip state tracking."""
 from dataclasses import dataclass
-from enum import Enum
 from typing import Dict, Optional, List
 
 from .abstract_store import HasState, HandlesActions
@@ -19,22 +18,52 @@ from ..commands import (
 )
 
 
-class TipRackWellState(Enum):
-    """The state of a single tip in a tip rack's well."""
-
-    CLEAN = "clean"
-    USED = "used"
-
-
-TipRackStateByWellName = Dict[str, TipRackWellState]
+@dataclass(frozen=True)
+class TipRackLayout:
+    """The arrangement of wells in a tip rack.
+
+    Wells are numbered in definition order, column by column. Bit N of
+    a tip rack bitmask refers to the well at index N of `well_names`.
+    """
+
+    well_names: List[str]
+    index_by_well_name: Dict[str, int]
+    column_index_by_well: List[int]
+    column_masks: List[int]
+    column_heads: List[str]
+    column_size: Optional[int]
+    all_wells_mask: int
+
+    @classmethod
+    def from_ordering(cls, ordering: List[List[str]]) -> "TipRackLayout":
+        """Build a tip rack layout from a labware definition's well ordering."""
+        well_names = [well_name for column in ordering for well_name in column]
+        column_index_by_well = [
+            column_index for column_index, column in enumerate(ordering) for _ in column
+        ]
+        column_masks = [0 for _ in ordering]
+
+        for well_index, column_index in enumerate(column_index_by_well):
+            column_masks[column_index] |= 1 << well_index
+
+        return cls(
+            well_names=well_names,
+            index_by_well_name={name: i for i, name in enumerate(well_names)},
+            column_index_by_well=column_index_by_well,
+            column_masks=column_masks,
+            column_heads=[column[0] for column in ordering],
+            column_size=len(ordering[0]) if ordering else None,
+            all_wells_mask=(1 << len(well_names)) - 1,
+        )
 
 
 @dataclass
 class TipState:
     """State of all tips."""
 
-    tips_by_labware_id: Dict[str, TipRackStateByWellName]
-    column_by_labware_id: Dict[str, List[List[str]]]
+    layouts_by_labware_id: Dict[str, TipRackLayout]
+    used_tips_by_labware_id: Dict[str, int]
+    """A bitmask of used tips for each tip rack, indexed by `TipRackLayout`."""
     channels_by_pipette_id: Dict[str, int]
     length_by_pipette_id: Dict[str, float]
 
@@ -44,11 +73,17 @@ class TipStore(HasState[TipState], HandlesActions):
 
     _state: TipState
 
+    handled_action_types = (
+        UpdateCommandAction,
+        ResetTipsAction,
+        AddPipetteConfigAction,
+    )
+
     def __init__(self) -> None:
         """Initialize a liquid store and its state."""
         self._state = TipState(
-            tips_by_labware_id={},
-            column_by_labware_id={},
+            layouts_by_labware_id={},
+            used_tips_by_labware_id={},
             channels_by_pipette_id={},
             length_by_pipette_id={},
         )
@@ -59,12 +94,8 @@ class TipStore(HasState[TipState], HandlesActions):
             self._handle_command(action.command)
 
         elif isinstance(action, ResetTipsAction):
-            labware_id = action.labware_id
-
-            for well_name in self._state.tips_by_labware_id[labware_id].keys():
-                self._state.tips_by_labware_id[labware_id][
-                    well_name
-                ] = TipRackWellState.CLEAN
+            if action.labware_id in self._state.used_tips_by_labware_id:
+                self._state.used_tips_by_labware_id[action.labware_id] = 0
 
         elif isinstance(action, AddPipetteConfigAction):
             config = action.config
@@ -77,14 +108,10 @@ class TipStore(HasState[TipState], HandlesActions):
         ):
             labware_id = command.result.labwareId
             definition = command.result.definition
-            self._state.tips_by_labware_id[labware_id] = {
-                well_name: TipRackWellState.CLEAN
-                for column in definition.ordering
-                for well_name in column
-            }
-            self._state.column_by_labware_id[labware_id] = [
-                column for column in definition.ordering
-            ]
+            self._state.layouts_by_labware_id[labware_id] = TipRackLayout.from_ordering(
+                definition.ordering
+            )
+            self._state.used_tips_by_labware_id[labware_id] = 0
 
         elif isinstance(command.result, PickUpTipResult):
             labware_id = command.params.labwareId
@@ -103,22 +130,23 @@ class TipStore(HasState[TipState], HandlesActions):
 
     def _set_used_tips(self, pipette_id: str, well_name: str, labware_id: str) -> None:
         pipette_channels = self._state.channels_by_pipette_id.get(pipette_id)
-        columns = self._state.column_by_labware_id.get(labware_id, [])
-        wells = self._state.tips_by_labware_id.get(labware_id, {})
+        layout = self._state.layouts_by_labware_id.get(labware_id)
 
-        if pipette_channels == len(wells):
-            for well_name in wells.keys():
-                wells[well_name] = TipRackWellState.USED
+        if layout is None:
+            return
 
-        elif columns and pipette_channels == len(columns[0]):
-            for column in columns:
-                if well_name in column:
-                    for well in column:
-                        wells[well] = TipRackWellState.USED
-                    break
+        well_index = layout.index_by_well_name.get(well_name)
 
+        if pipette_channels == len(layout.well_names):
+            used_mask = layout.all_wells_mask
+        elif well_index is None:
+            return
+        elif pipette_channels == layout.column_size:
+            used_mask = layout.column_masks[layout.column_index_by_well[well_index]]
         else:
-            wells[well_name] = TipRackWellState.USED
+            used_mask = 1 << well_index
+
+        self._state.used_tips_by_labware_id[labware_id] |= used_mask
 
 
 class TipView(HasState[TipState]):
@@ -138,44 +166,49 @@ class TipView(HasState[TipState]):
         self, labware_id: str, num_tips: int, starting_tip_name: Optional[str]
     ) -> Optional[str]:
         """Get the next available clean tip."""
-        wells = self._state.tips_by_labware_id.get(labware_id, {})
-        columns = self._state.column_by_labware_id.get(labware_id, [])
+        layout = self._state.layouts_by_labware_id.get(labware_id)
 
-        if columns and num_tips == len(columns[0]):
-            column_head = [column[0] for column in columns]
+        if layout is None or len(layout.well_names) == 0:
+            return None
+
+        used_tips = self._state.used_tips_by_labware_id[labware_id]
+
+        if num_tips == layout.column_size:
             starting_column_index = 0
+            starting_well_index = (
+                layout.index_by_well_name.get(starting_tip_name)
+                if starting_tip_name
+                else None
+            )
+
+            if starting_well_index is not None:
+                starting_column_index = layout.column_index_by_well[starting_well_index]
 
-            if starting_tip_name:
-                for idx, column in enumerate(columns):
-                    if starting_tip_name in column:
-                        if starting_tip_name not in column_head:
-                            starting_column_index = idx + 1
-                        else:
-                            starting_column_index = idx
+                if starting_tip_name not in layout.column_heads:
+                    starting_column_index += 1
 
-            for column in columns[starting_column_index:]:
-                if not any(wells[well] == TipRackWellState.USED for well in column):
-                    return column[0]
+            for column_index in range(starting_column_index, len(layout.column_masks)):
+                if used_tips & layout.column_masks[column_index] == 0:
+                    return layout.column_heads[column_index]
 
-        elif num_tips == len(wells.keys()):
-            if starting_tip_name and starting_tip_name != columns[0][0]:
+        elif num_tips == len(layout.well_names):
+            if starting_tip_name and starting_tip_name != layout.column_heads[0]:
                 return None
 
-            if not any(
-                tip_state == TipRackWellState.USED for tip_state in wells.values()
-            ):
-                return next(iter(wells))
+            if used_tips == 0:
+                return layout.well_names[0]
+
+        elif starting_tip_name is not None and not (
+            used_tips >> layout.index_by_well_name[starting_tip_name] & 1
+        ):
+            return starting_tip_name
 
         else:
-            for well_name, tip_state in wells.items():
-                seen_start = (
-                    starting_tip_name is None
-                    or well_name == starting_tip_name
-                    or wells[starting_tip_name] == TipRackWellState.USED
-                )
+            clean_tips = ~used_tips & layout.all_wells_mask
 
-                if seen_start and tip_state == TipRackWellState.CLEAN:
-                    return well_name
+            if clean_tips:
+                # isolate the lowest set bit to find the first clean tip
+                return layout.well_names[(clean_tips & -clean_tips).bit_length() - 1]
 
         return None
 
@@ -194,10 +227,13 @@ class TipView(HasState[TipState]):
             True if the labware is a tip rack and the well has a clean tip,
             otherwise False.
         """
-        tip_rack = self._state.tips_by_labware_id.get(labware_id)
-        well_state = tip_rack.get(well_name) if tip_rack else None
+        layout = self._state.layouts_by_labware_id.get(labware_id)
+        well_index = layout.index_by_well_name.get(well_name) if layout else None
+
+        if well_index is None:
+            return False
 
-        return well_state == TipRackWellState.CLEAN
+        return not self._state.used_tips_by_labware_id[labware_id] >> well_index & 1
 
     def get_tip_length(self, pipette_id: str) -> float:
         """Return the given pipette's tip length."""
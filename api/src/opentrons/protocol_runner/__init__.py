@@ -13,6 +13,12 @@ from .protocol_runner import (
     AnyRunner,
 )
 from .create_simulating_runner import create_simulating_runner
+from .duration_estimator import (
+    CommandDurationEstimate,
+    CommandDurationEstimator,
+    DurationEstimate,
+    estimate_duration,
+)
 
 __all__ = [
     "AbstractRunner",
@@ -23,4 +29,8 @@ __all__ = [
     "PythonAndLegacyRunner",
     "LiveRunner",
     "AnyRunner",
+    "CommandDurationEstimate",
+    "CommandDurationEstimator",
+    "DurationEstimate",
+    "estimate_duration",
 ]
@@ -8,11 +8,18 @@ from opentrons.protocol_engine import (
     DeckType,
     create_protocol_engine,
 )
-from opentrons.protocol_reader.protocol_source import ProtocolConfig
+from opentrons.protocol_reader.protocol_source import (
+    ProtocolConfig,
+    JsonProtocolConfig,
+)
 
 from opentrons_shared_data.robot.dev_types import RobotType
 
-from .legacy_wrappers import LegacySimulatingContextCreator
+from .legacy_wrappers import (
+    LEGACY_PYTHON_API_VERSION_CUTOFF,
+    LEGACY_JSON_SCHEMA_VERSION_CUTOFF,
+    LegacySimulatingContextCreator,
+)
 from .protocol_runner import create_protocol_runner, AbstractRunner
 
 
@@ -44,9 +51,14 @@ async def create_simulating_runner(
     simulating_hardware_api = await _build_hardware_simulator_for_robot_type(
         robot_type=robot_type
     )
+    use_virtual_pipettes = not feature_flags.disable_fast_protocol_upload()
 
-    # TODO(mc, 2021-08-25): move initial home to protocol engine
-    await simulating_hardware_api.home()
+    # With virtual pipettes, protocols that run through Protocol Engine only
+    # touch engine state, so the simulated hardware never has to be homed.
+    # Protocols that run through the legacy core still drive the hardware directly.
+    if not use_virtual_pipettes or _uses_legacy_core(protocol_config):
+        # TODO(mc, 2021-08-25): move initial home to protocol engine
+        await simulating_hardware_api.home()
 
     protocol_engine = await create_protocol_engine(
         hardware_api=simulating_hardware_api,
@@ -56,7 +68,7 @@ async def create_simulating_runner(
             ignore_pause=True,
             use_virtual_modules=True,
             use_virtual_gripper=True,
-            use_virtual_pipettes=(not feature_flags.disable_fast_protocol_upload()),
+            use_virtual_pipettes=use_virtual_pipettes,
         ),
     )
 
@@ -83,3 +95,10 @@ async def _build_hardware_simulator_for_robot_type(
         from opentrons.hardware_control.ot3api import OT3API
 
         return await OT3API.build_hardware_simulator()
+
+
+def _uses_legacy_core(protocol_config: ProtocolConfig) -> bool:
+    if isinstance(protocol_config, JsonProtocolConfig):
+        return protocol_config.schema_version < LEGACY_JSON_SCHEMA_VERSION_CUTOFF
+    else:
+        return protocol_config.api_version < LEGACY_PYTHON_API_VERSION_CUTOFF
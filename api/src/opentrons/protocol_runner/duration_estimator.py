@@ -0,0 +1,440 @@
+"""Estimate how long a protocol takes to run from its Protocol Engine commands.
+
+Unlike the legacy, broker-based `opentrons.protocols.duration.DurationEstimator`,
+this works from the commands of any protocol analysis, including JSON protocols
+and protocols for the OT-3, and uses the speed and acceleration limits
+that the robot's motion planning is configured with.
+"""
+import math
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Union
+
+from pydantic import BaseModel, Field
+from typing_extensions import Final
+
+from opentrons_shared_data.pipette.dev_types import PipetteNameType
+from opentrons_shared_data.robot.dev_types import RobotType
+
+from opentrons.config import robot_configs
+from opentrons.config.types import GantryLoad, OT3Config, RobotConfig
+from opentrons.hardware_control.types import OT3AxisKind
+from opentrons.motion_planning import MINIMUM_Z_MARGIN
+from opentrons.protocol_engine import (
+    Command,
+    DeckPoint,
+    DeckSlotLocation,
+    LabwareLocation,
+    ModuleLocation,
+    OnLabwareLocation,
+    commands,
+)
+from opentrons.protocols.duration.estimator import (
+    DurationEstimator as LegacyDurationEstimator,
+    START_MODULE_TEMPERATURE,
+)
+
+
+# Times for actions that happen in place, from the legacy DurationEstimator.
+# Determined by testing on hardware.
+PICK_UP_TIP_SECONDS: Final = 4.0
+DROP_TIP_SECONDS: Final = 10.0
+BLOW_OUT_SECONDS: Final = 0.5
+TOUCH_TIP_SECONDS: Final = 0.5
+
+# Thermocycler lid times, from the legacy DurationEstimator.
+# Hardware said these take about this long.
+THERMOCYCLER_LID_OPEN_CLOSE_SECONDS: Final = 24.0
+THERMOCYCLER_DEACTIVATE_LID_SECONDS: Final = 23.0
+THERMOCYCLER_SET_LID_TEMPERATURE_SECONDS: Final = 60.0
+
+# Commands mapped from legacy protocols report this placeholder position,
+# instead of where the pipette actually went.
+_UNKNOWN_POSITION: Final = DeckPoint(x=0, y=0, z=0)
+
+
+class CommandDurationEstimate(BaseModel):
+    """How long a single command is expected to take."""
+
+    commandId: str = Field(..., description="The ID of the estimated command.")
+    seconds: float = Field(..., description="The command's estimated duration.")
+
+
+class DurationEstimate(BaseModel):
+    """How long a protocol is expected to take to run."""
+
+    totalSeconds: float = Field(
+        ...,
+        description="The estimated duration of the whole protocol, in seconds.",
+    )
+    commands: List[CommandDurationEstimate] = Field(
+        ...,
+        description="The estimated duration of each command, in command order.",
+    )
+
+
+@dataclass(frozen=True)
+class AxisLimits:
+    """The speed and acceleration limits of a single gantry axis."""
+
+    max_speed: float
+    """Speed limit, in mm/s."""
+
+    acceleration: float
+    """Acceleration, in mm/s^2."""
+
+
+@dataclass(frozen=True)
+class GantryLimits:
+    """The speed and acceleration limits of the gantry's X, Y, and Z axes."""
+
+    x: AxisLimits
+    y: AxisLimits
+    z: AxisLimits
+
+
+def get_gantry_limits(
+    robot_config: Union[RobotConfig, OT3Config],
+    gantry_load: GantryLoad = GantryLoad.LOW_THROUGHPUT,
+) -> GantryLimits:
+    """Get the gantry's limits from a robot's config.
+
+    Arguments:
+        robot_config: The OT-2 or OT-3 config to read limits from.
+        gantry_load: What's loaded on an OT-3's gantry. Ignored for an OT-2.
+    """
+    if isinstance(robot_config, OT3Config):
+        max_speeds = robot_config.motion_settings.default_max_speed[gantry_load]
+        accelerations = robot_config.motion_settings.acceleration[gantry_load]
+        return GantryLimits(
+            x=AxisLimits(max_speeds[OT3AxisKind.X], accelerations[OT3AxisKind.X]),
+            y=AxisLimits(max_speeds[OT3AxisKind.Y], accelerations[OT3AxisKind.Y]),
+            z=AxisLimits(max_speeds[OT3AxisKind.Z], accelerations[OT3AxisKind.Z]),
+        )
+
+    return GantryLimits(
+        x=AxisLimits(
+            robot_config.default_max_speed["X"], robot_config.acceleration["X"]
+        ),
+        y=AxisLimits(
+            robot_config.default_max_speed["Y"], robot_config.acceleration["Y"]
+        ),
+        z=AxisLimits(
+            robot_config.default_max_speed["Z"], robot_config.acceleration["Z"]
+        ),
+    )
+
+
+def get_axis_move_time(
+    distance: float, limits: AxisLimits, speed: Optional[float] = None
+) -> float:
+    """Get how long a single axis takes to move a distance, in seconds.
+
+    The axis accelerates to its speed limit, cruises, and then decelerates,
+    or, if the move is too short to reach the speed limit, accelerates
+    halfway and decelerates the rest of the way.
+
+    Arguments:
+        distance: How far the axis moves, in mm.
+        limits: The axis's limits.
+        speed: A speed, in mm/s, that the move is capped at, if any.
+    """
+    distance = abs(distance)
+    max_speed = limits.max_speed if speed is None else min(speed, limits.max_speed)
+
+    if distance == 0 or max_speed <= 0 or limits.acceleration <= 0:
+        return 0.0
+
+    # How far the axis travels while accelerating to full speed and back down.
+    ramp_distance = max_speed**2 / limits.acceleration
+
+    if distance >= ramp_distance:
+        return distance / max_speed + max_speed / limits.acceleration
+
+    return 2 * math.sqrt(distance / limits.acceleration)
+
+
+class CommandDurationEstimator:
+    """Estimate the duration of Protocol Engine commands, one at a time.
+
+    Commands must be added in the order that they ran, because each
+    estimate depends on the state that earlier commands left the robot in,
+    like where the pipette is and what temperature each module is at.
+
+    Movements between wells are modeled as arcs: straight up to clear
+    the tallest labware and module loaded so far, across, and straight down,
+    with each segment taking as long as its slowest axis.
+    """
+
+    def __init__(
+        self,
+        robot_type: RobotType,
+        robot_config: Optional[Union[RobotConfig, OT3Config]] = None,
+    ) -> None:
+        """Initialize the estimator.
+
+        Arguments:
+            robot_type: The robot that the commands run on.
+            robot_config: The config to take gantry limits from.
+                If `None`, the robot's config is loaded from this machine,
+                falling back to defaults.
+        """
+        if robot_config is None:
+            robot_config = (
+                robot_configs.load_ot3()
+                if robot_type == "OT-3 Standard"
+                else robot_configs.load_ot2()
+            )
+
+        self._robot_config = robot_config
+        self._gantry_load = GantryLoad.LOW_THROUGHPUT
+        self._position: Optional[DeckPoint] = None
+        self._top_z_by_id: Dict[str, float] = {}
+        self._highest_z = 0.0
+        self._temperature_module_targets: Dict[str, float] = {}
+        self._temperature_module_temperatures: Dict[str, float] = {}
+        self._thermocycler_targets: Dict[str, float] = {}
+        self._thermocycler_holds: Dict[str, float] = {}
+        self._thermocycler_temperatures: Dict[str, float] = {}
+        self._estimates: List[CommandDurationEstimate] = []
+
+    def add(self, command: Command) -> float:
+        """Estimate how long a command takes, and add it to the total.
+
+        Returns:
+            The command's estimated duration, in seconds.
+        """
+        seconds = self._estimate(command)
+        self._estimates.append(
+            CommandDurationEstimate(commandId=command.id, seconds=seconds)
+        )
+        return seconds
+
+    def get_estimate(self) -> DurationEstimate:
+        """Get the estimated duration of every command added so far."""
+        return DurationEstimate(
+            totalSeconds=sum(e.seconds for e in self._estimates),
+            commands=list(self._estimates),
+        )
+
+    def _estimate(self, command: Command) -> float:  # noqa: C901
+        # Commands that failed, or never ran, did nothing to estimate.
+        if command.result is None:
+            return 0.0
+
+        if isinstance(command, commands.Home):
+            # Homing leaves the pipettes somewhere that commands don't report.
+            self._position = None
+            return 0.0
+
+        if isinstance(command, commands.LoadPipette):
+            if command.params.pipetteName == PipetteNameType.P1000_96:
+                self._gantry_load = GantryLoad.HIGH_THROUGHPUT
+            return 0.0
+
+        if isinstance(command, commands.LoadModule):
+            self._add_top_z(
+                command.result.moduleId,
+                command.result.definition.dimensions.bareOverallHeight,
+            )
+            return 0.0
+
+        if isinstance(command, commands.LoadLabware):
+            self._add_labware(
+                command.result.labwareId,
+                command.params.location,
+                command.result.definition.dimensions.zDimension,
+            )
+            return 0.0
+
+        if isinstance(command, commands.LoadAdapter):
+            self._add_labware(
+                command.result.adapterId,
+                command.params.location,
+                command.result.definition.dimensions.zDimension,
+            )
+            return 0.0
+
+        if isinstance(command, (commands.Aspirate, commands.Dispense)):
+            return self._estimate_move(command.result.position) + (
+                command.params.volume / command.params.flowRate
+            )
+
+        if isinstance(command, (commands.AspirateInPlace, commands.DispenseInPlace)):
+            return command.params.volume / command.params.flowRate
+
+        if isinstance(command, commands.PickUpTip):
+            return self._estimate_move(command.result.position) + PICK_UP_TIP_SECONDS
+
+        if isinstance(command, commands.DropTip):
+            return self._estimate_move(command.result.position) + DROP_TIP_SECONDS
+
+        if isinstance(command, commands.DropTipInPlace):
+            return DROP_TIP_SECONDS
+
+        if isinstance(command, commands.BlowOut):
+            return self._estimate_move(command.result.position) + BLOW_OUT_SECONDS
+
+        if isinstance(command, commands.BlowOutInPlace):
+            return BLOW_OUT_SECONDS
+
+        if isinstance(command, commands.TouchTip):
+            return self._estimate_move(command.result.position) + TOUCH_TIP_SECONDS
+
+        if isinstance(command, (commands.MoveToWell, commands.MoveToCoordinates)):
+            return self._estimate_move(
+                command.result.position, speed=command.params.speed
+            )
+
+        if isinstance(command, commands.MoveRelative):
+            return self._estimate_move(command.result.position)
+
+        if isinstance(command, commands.WaitForDuration):
+            return command.params.seconds
+
+        if isinstance(command, commands.temperature_module.SetTargetTemperature):
+            # The duration is accounted for when waiting for the temperature.
+            self._temperature_module_targets[
+                command.params.moduleId
+            ] = command.result.targetTemperature
+            return 0.0
+
+        if isinstance(command, commands.temperature_module.WaitForTemperature):
+            return self._estimate_temperature_module(command)
+
+        return self._estimate_thermocycler(command)
+
+    def _estimate_thermocycler(self, command: Command) -> float:
+        if isinstance(command, commands.thermocycler.SetTargetBlockTemperature):
+            self._thermocycler_targets[command.params.moduleId] = command.params.celsius
+            self._thermocycler_holds[command.params.moduleId] = (
+                command.params.holdTimeSeconds or 0.0
+            )
+            return 0.0
+
+        if isinstance(command, commands.thermocycler.WaitForBlockTemperature):
+            module_id = command.params.moduleId
+            target = self._thermocycler_targets.get(module_id)
+            if target is None:
+                return 0.0
+            transition = LegacyDurationEstimator.thermocycler_handler(
+                self._thermocycler_temperatures.get(
+                    module_id, START_MODULE_TEMPERATURE
+                ),
+                target,
+            )
+            self._thermocycler_temperatures[module_id] = target
+            return transition + self._thermocycler_holds.pop(module_id, 0.0)
+
+        if isinstance(command, commands.thermocycler.RunProfile):
+            module_id = command.params.moduleId
+            temperature = self._thermocycler_temperatures.get(
+                module_id, START_MODULE_TEMPERATURE
+            )
+            duration = 0.0
+            for step in command.params.profile:
+                duration += LegacyDurationEstimator.thermocycler_handler(
+                    temperature, step.celsius
+                )
+                duration += step.holdSeconds
+                temperature = step.celsius
+            self._thermocycler_temperatures[module_id] = temperature
+            return duration
+
+        if isinstance(
+            command, (commands.thermocycler.OpenLid, commands.thermocycler.CloseLid)
+        ):
+            return THERMOCYCLER_LID_OPEN_CLOSE_SECONDS
+
+        if isinstance(command, commands.thermocycler.DeactivateLid):
+            return THERMOCYCLER_DEACTIVATE_LID_SECONDS
+
+        if isinstance(command, commands.thermocycler.WaitForLidTemperature):
+            return THERMOCYCLER_SET_LID_TEMPERATURE_SECONDS
+
+        # Everything else, including Heater-Shaker and Magnetic Module commands
+        # and moving labware, is not modeled yet.
+        return 0.0
+
+    def _estimate_temperature_module(
+        self, command: commands.temperature_module.WaitForTemperature
+    ) -> float:
+        module_id = command.params.moduleId
+        target = command.params.celsius
+        if target is None:
+            target = self._temperature_module_targets.get(module_id)
+        if target is None:
+            return 0.0
+        current = self._temperature_module_temperatures.get(
+            module_id, START_MODULE_TEMPERATURE
+        )
+        self._temperature_module_temperatures[module_id] = target
+        return LegacyDurationEstimator.temperature_module(current, target)
+
+    def _add_top_z(self, item_id: str, top_z: float) -> None:
+        self._top_z_by_id[item_id] = top_z
+        self._highest_z = max(self._highest_z, top_z)
+
+    def _add_labware(
+        self, labware_id: str, location: LabwareLocation, height: float
+    ) -> None:
+        if isinstance(location, DeckSlotLocation):
+            base_z = 0.0
+        elif isinstance(location, ModuleLocation):
+            base_z = self._top_z_by_id.get(location.moduleId, 0.0)
+        elif isinstance(location, OnLabwareLocation):
+            base_z = self._top_z_by_id.get(location.labwareId, 0.0)
+        else:
+            # Labware off-deck is out of the way.
+            return
+        self._add_top_z(labware_id, base_z + height)
+
+    def _estimate_move(
+        self, destination: DeckPoint, speed: Optional[float] = None
+    ) -> float:
+        origin = self._position
+
+        if destination == _UNKNOWN_POSITION:
+            self._position = None
+            return 0.0
+
+        self._position = destination
+
+        if origin is None:
+            return 0.0
+
+        limits = get_gantry_limits(self._robot_config, self._gantry_load)
+        xy_time = max(
+            get_axis_move_time(destination.x - origin.x, limits.x, speed),
+            get_axis_move_time(destination.y - origin.y, limits.y, speed),
+        )
+
+        if xy_time == 0:
+            return get_axis_move_time(destination.z - origin.z, limits.z, speed)
+
+        travel_z = max(origin.z, destination.z, self._highest_z + MINIMUM_Z_MARGIN)
+        return (
+            get_axis_move_time(travel_z - origin.z, limits.z, speed)
+            + xy_time
+            + get_axis_move_time(travel_z - destination.z, limits.z, speed)
+        )
+
+
+def estimate_duration(
+    commands: Iterable[Command],
+    robot_type: RobotType,
+    robot_config: Optional[Union[RobotConfig, OT3Config]] = None,
+) -> DurationEstimate:
+    """Estimate how long a protocol's commands take to run.
+
+    Arguments:
+        commands: The commands of a protocol run or analysis, in order.
+        robot_type: The robot that the commands run on.
+        robot_config: The config to take gantry limits from.
+            If `None`, the robot's config is loaded from this machine.
+    """
+    estimator = CommandDurationEstimator(
+        robot_type=robot_type, robot_config=robot_config
+    )
+    for command in commands:
+        estimator.add(command)
+    return estimator.get_estimate()
@@ -15,7 +15,7 @@ from opentrons.protocol_reader import (
     JsonProtocolConfig,
     PythonProtocolConfig,
 )
-from opentrons.protocol_engine import ProtocolEngine, StateSummary, Command
+from opentrons.protocol_engine import ProtocolEngine, StateSummary, StateView, Command
 
 from .task_queue import TaskQueue
 from .json_file_reader import JsonFileReader
@@ -30,6 +30,10 @@ from .legacy_wrappers import (
     LegacyLoadInfo,
 )
 
+# How many JSON protocol commands to add to the ProtocolEngine
+# before yielding to the event loop.
+_COMMAND_BATCH_SIZE = 100
+
 
 class RunResult(NamedTuple):
     """Result data from a run, pulled from the ProtocolEngine."""
@@ -53,6 +57,15 @@ class AbstractRunner(ABC):
     def __init__(self, protocol_engine: ProtocolEngine) -> None:
         self._protocol_engine = protocol_engine
 
+    @property
+    def state_view(self) -> StateView:
+        """A live view of the run's ProtocolEngine state.
+
+        This can be read while the run is in progress,
+        for example to see the commands that it has produced so far.
+        """
+        return self._protocol_engine.state_view
+
     def was_started(self) -> bool:
         """Whether the run has been started.
 
@@ -209,9 +222,9 @@ class JsonRunner(AbstractRunner):
 
         # Add commands and liquids to the ProtocolEngine.
         #
-        # We yield on every iteration so that loading large protocols doesn't block the
-        # event loop. With a 24-step 10k-command protocol (See RQA-443), adding all the
-        # commands can take 3 to 7 seconds.
+        # We yield between batches of commands so that loading large protocols doesn't
+        # block the event loop. With a 24-step 10k-command protocol (See RQA-443),
+        # adding all the commands one at a time could take 3 to 7 seconds.
         #
         # It wouldn't be safe to do this in a worker thread because each addition
         # invokes the ProtocolEngine's ChangeNotifier machinery, which is not
@@ -227,8 +240,10 @@ class JsonRunner(AbstractRunner):
                 color=liquid.displayColor,
             )
             await _yield()
-        for command in commands:
-            self._protocol_engine.add_command(request=command)
+        for batch_start in range(0, len(commands), _COMMAND_BATCH_SIZE):
+            self._protocol_engine.add_commands(
+                requests=commands[batch_start : batch_start + _COMMAND_BATCH_SIZE]
+            )
             await _yield()
 
         self._task_queue.set_run_func(func=self._protocol_engine.wait_until_complete)
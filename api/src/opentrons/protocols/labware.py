@@ -7,8 +7,6 @@ import os
 from pathlib import Path
 from typing import Any, AnyStr, List, Dict, Optional, Union
 
-import jsonschema  # type: ignore
-
 from opentrons.protocols.api_support.util import ModifiedList
 from opentrons_shared_data import load_shared_data, get_shared_data_root
 from opentrons.protocols.api_support.constants import (
@@ -140,6 +138,9 @@ def verify_definition(
     :raises jsonschema.ValidationError: If the definition is not valid.
     :returns: The parsed definition
     """
+    # Imported here because jsonschema is slow to import.
+    import jsonschema  # type: ignore
+
     schema_body = load_shared_data("labware/schemas/2.json").decode("utf-8")
     labware_schema_v2 = json.loads(schema_body)
 
@@ -12,8 +12,6 @@ from io import BytesIO
 from zipfile import ZipFile
 from typing import Any, Dict, Optional, Union, Tuple, TYPE_CHECKING
 
-import jsonschema  # type: ignore
-
 from opentrons_shared_data.labware import load_schema as load_labware_schema
 from opentrons_shared_data.protocol import (
     Schema as JSONProtocolSchema,
@@ -33,6 +31,7 @@ from .types import (
     ApiDeprecationError,
 )
 from .bundle import extract_bundle
+from . import parse_cache
 
 if TYPE_CHECKING:
     from opentrons_shared_data.labware.dev_types import LabwareDefinition
@@ -124,6 +123,33 @@ def _parse_python(
     else:
         ast_filename = filename_checked
 
+    cache_key = parse_cache.get_cache_key(protocol_contents, ast_filename)
+    cached = parse_cache.load(cache_key)
+
+    if cached is None:
+        cached = _compile_python(protocol_contents, ast_filename)
+        parse_cache.save(cache_key, cached)
+
+    result = PythonProtocol(
+        text=protocol_contents,
+        filename=getattr(cached.contents, "co_filename", "<protocol>"),
+        contents=cached.contents,
+        metadata=cached.metadata,
+        api_level=cached.api_level,
+        robot_type=cached.robot_type,
+        bundled_labware=bundled_labware,
+        bundled_data=bundled_data,
+        bundled_python=bundled_python,
+        extra_labware=extra_labware,
+    )
+
+    return result
+
+
+def _compile_python(
+    protocol_contents: str, ast_filename: str
+) -> parse_cache.CachedPythonProtocol:
+    """Parse, check, and compile a Python protocol, without the cache."""
     parsed = ast.parse(protocol_contents, filename=ast_filename)
 
     static_info = extract_static_python_info(parsed)
@@ -136,21 +162,13 @@ def _parse_python(
     else:
         raise ApiDeprecationError(version)
 
-    result = PythonProtocol(
-        text=protocol_contents,
-        filename=getattr(protocol, "co_filename", "<protocol>"),
+    return parse_cache.CachedPythonProtocol(
         contents=protocol,
         metadata=static_info.metadata,
         api_level=version,
         robot_type=robot_type,
-        bundled_labware=bundled_labware,
-        bundled_data=bundled_data,
-        bundled_python=bundled_python,
-        extra_labware=extra_labware,
     )
 
-    return result
-
 
 def _parse_bundle(bundle: ZipFile, filename: Optional[str] = None) -> PythonProtocol:
     """Parse a bundled Python protocol"""
@@ -477,6 +495,10 @@ def _get_schema_for_protocol(version_num: int) -> JSONProtocolSchema:
 
 def validate_json(protocol_json: Dict[Any, Any]) -> Tuple[int, "JsonProtocolDef"]:
     """Validates a json protocol and returns its schema version"""
+    # Imported here because jsonschema is slow to import and
+    # most users of this module never validate a JSON protocol.
+    import jsonschema  # type: ignore
+
     # Check if this is actually a labware
     labware_schema_v2 = load_labware_schema()
     try:
@@ -0,0 +1,159 @@
+"""
+opentrons.protocols.parse_cache: an on-disk cache of parsed Python protocols
+
+Parsing a Python protocol means building its AST, statically extracting its
+metadata and requirements, and compiling it. The same protocol is parsed again
+on upload, on every analysis, on run creation, and when the robot server
+restarts, so this module keeps the results on disk, keyed by the protocol's
+contents. The compiled code object is stored with :py:mod:`marshal`, the same
+format Python uses for ``.pyc`` files, so the interpreter's bytecode version
+is part of the key.
+"""
+
+import hashlib
+import importlib.util
+import logging
+import marshal
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from types import CodeType
+from typing import Optional
+
+from opentrons_shared_data.robot.dev_types import RobotType
+
+from opentrons import config
+from opentrons._version import version as _opentrons_version
+
+from .api_support.types import APIVersion
+from .types import PythonProtocolMetadata
+
+MODULE_LOG = logging.getLogger(__name__)
+
+# Bump this whenever the layout of a cache entry changes.
+_ENTRY_FORMAT_VERSION = 1
+
+# The least recently used entries are removed once the cache holds more than this.
+MAX_CACHE_ENTRIES = 100
+
+
+@dataclass(frozen=True)
+class CachedPythonProtocol:
+    """The parts of a parsed Python protocol that depend only on its source."""
+
+    contents: CodeType
+    metadata: PythonProtocolMetadata
+    api_level: APIVersion
+    robot_type: RobotType
+
+
+def get_cache_key(protocol_contents: str, filename: str) -> str:
+    """Get the key that a protocol's parse results are cached under.
+
+    The key covers everything that the results depend on: the source,
+    the filename compiled into the code object, the interpreter's bytecode
+    version, and the version of this package, whose parsing rules may change.
+    """
+    key = hashlib.sha256()
+
+    for part in (
+        str(_ENTRY_FORMAT_VERSION).encode(),
+        _opentrons_version.encode(),
+        (sys.implementation.cache_tag or "").encode(),
+        importlib.util.MAGIC_NUMBER,
+        filename.encode(),
+        protocol_contents.encode(),
+    ):
+        # Length-prefix each part so that no two sets of parts collide.
+        key.update(len(part).to_bytes(8, "big"))
+        key.update(part)
+
+    return key.hexdigest()
+
+
+def load(key: str) -> Optional[CachedPythonProtocol]:
+    """Load a cached parse result, or return None if there is no usable one."""
+    path = _get_entry_path(key)
+
+    try:
+        serialized = path.read_bytes()
+    except OSError:
+        return None
+
+    try:
+        (
+            entry_format_version,
+            contents,
+            metadata,
+            (api_major, api_minor),
+            robot_type,
+        ) = marshal.loads(serialized)
+    except (EOFError, ValueError, TypeError):
+        MODULE_LOG.warning(f"Ignoring unreadable protocol parse cache entry {path}")
+        return None
+
+    if entry_format_version != _ENTRY_FORMAT_VERSION or not isinstance(
+        contents, CodeType
+    ):
+        return None
+
+    try:
+        # Mark the entry as recently used, so it's the last to be removed.
+        os.utime(path)
+    except OSError:
+        pass
+
+    return CachedPythonProtocol(
+        contents=contents,
+        metadata=metadata,
+        api_level=APIVersion(api_major, api_minor),
+        robot_type=robot_type,
+    )
+
+
+def save(key: str, entry: CachedPythonProtocol) -> None:
+    """Save a parse result to the cache.
+
+    Failing to write to the cache only makes the next parse slower,
+    so errors are logged instead of raised.
+    """
+    path = _get_entry_path(key)
+    serialized = marshal.dumps(
+        (
+            _ENTRY_FORMAT_VERSION,
+            entry.contents,
+            entry.metadata,
+            (entry.api_level.major, entry.api_level.minor),
+            entry.robot_type,
+        )
+    )
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path.write_bytes(serialized)
+        # Replace atomically, so concurrent readers never see a partial entry.
+        os.replace(temp_path, path)
+        _remove_least_recently_used(path.parent)
+    except OSError:
+        MODULE_LOG.exception(f"Could not write protocol parse cache entry {path}")
+
+
+def _get_entry_path(key: str) -> Path:
+    return config.get_opentrons_path("protocol_parse_cache_dir") / f"{key}.marshal"
+
+
+def _remove_least_recently_used(cache_dir: Path) -> None:
+    entries = list(cache_dir.glob("*.marshal"))
+
+    if len(entries) <= MAX_CACHE_ENTRIES:
+        return
+
+    entries.sort(key=lambda p: p.stat().st_mtime)
+
+    for entry_path in entries[: len(entries) - MAX_CACHE_ENTRIES]:
+        try:
+            entry_path.unlink()
+        except FileNotFoundError:
+            pass
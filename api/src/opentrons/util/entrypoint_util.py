@@ -7,8 +7,6 @@ from json import JSONDecodeError
 import pathlib
 from typing import Dict, Sequence, Union, TYPE_CHECKING
 
-from jsonschema import ValidationError  # type: ignore
-
 from opentrons.protocol_api import labware
 from opentrons.calibration_storage import helpers
 
@@ -33,6 +31,9 @@ def labware_from_paths(
     Returns:
         A dict, keyed by labware URI, where each value has the file path and the parsed def.
     """
+    # Imported here because jsonschema is slow to import.
+    from jsonschema import ValidationError  # type: ignore
+
     labware_defs: Dict[str, FoundLabware] = {}
 
     for strpath in paths:
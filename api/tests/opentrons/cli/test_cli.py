@@ -1,5 +1,7 @@
 """Test cli execution."""
+import importlib
 import json
+import os
 import tempfile
 import textwrap
 
@@ -9,7 +11,10 @@ from pathlib import Path
 import pytest
 from click.testing import CliRunner
 
-from opentrons.cli.analyze import analyze
+from opentrons.cli.analyze import AnalyzeResults, _analyze_protocol, analyze
+
+# `opentrons.cli.analyze` is shadowed by the command of the same name.
+analyze_module = importlib.import_module("opentrons.cli.analyze")
 
 
 def _list_fixtures(version: int) -> Iterator[Path]:
@@ -57,6 +62,29 @@ def test_analyze(
     assert "liquids" in analysis_output_json
     assert "modules" in analysis_output_json
 
+    duration_estimate = analysis_output_json["durationEstimate"]
+    assert [c["commandId"] for c in duration_estimate["commands"]] == [
+        c["id"] for c in analysis_output_json["commands"]
+    ]
+    assert duration_estimate["totalSeconds"] == pytest.approx(
+        sum(c["seconds"] for c in duration_estimate["commands"])
+    )
+
+
+def test_analyze_without_duration_estimate(monkeypatch: pytest.MonkeyPatch) -> None:
+    """It should still write an analysis if estimating its duration fails."""
+
+    def _raise(*args: object, **kwargs: object) -> None:
+        raise RuntimeError("oh no")
+
+    monkeypatch.setattr(analyze_module, "estimate_duration", _raise)
+
+    exit_code, analysis_output_json = _get_analysis_result([next(_list_fixtures(6))])
+
+    assert exit_code == 0
+    assert "commands" in analysis_output_json
+    assert "durationEstimate" not in analysis_output_json
+
 
 _DECK_DEFINITION_TEST_SLOT = 2
 _DECK_DEFINITION_TEST_LABWARE = "agilent_1_reservoir_290ml"
@@ -127,3 +155,138 @@ def test_analysis_deck_definition(
     # todo(mm, 2023-05-12): When protocols emit true Protocol Engine comment commands instead
     # of legacy commands, "legacyCommandText" should change to "message".
     assert comment_command["params"]["legacyCommandText"] == expected_point
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_analyze_batch(jobs: str, tmp_path: Path) -> None:
+    """It should analyze each given protocol separately and summarize the batch."""
+    fixture_paths = sorted(_list_fixtures(6))
+    output_dir = tmp_path / "output"
+
+    result = CliRunner().invoke(
+        analyze,
+        [
+            "--batch-output",
+            str(output_dir),
+            "--jobs",
+            jobs,
+            *[str(p.resolve()) for p in fixture_paths],
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+
+    summary = json.loads((output_dir / "summary.json").read_bytes())
+    assert [entry["source"] for entry in summary["protocols"]] == [
+        str(p.resolve()) for p in fixture_paths
+    ]
+
+    for fixture_path, entry in zip(fixture_paths, summary["protocols"]):
+        assert entry["status"] in ("ok", "not-ok")
+        assert entry["output"] == f"{fixture_path.stem}.json"
+        assert entry["seconds"] >= 0
+
+        analysis_output_json = json.loads((output_dir / entry["output"]).read_bytes())
+        assert "commands" in analysis_output_json
+        assert "pipettes" in analysis_output_json
+
+
+def test_analyze_batch_invalid_protocol(tmp_path: Path) -> None:
+    """It should report protocols with invalid files without stopping the batch."""
+    invalid_protocol_dir = tmp_path / "invalid"
+    invalid_protocol_dir.mkdir()
+    (invalid_protocol_dir / "protocol.txt").write_text("not a protocol")
+    fixture_path = next(_list_fixtures(6))
+    output_dir = tmp_path / "output"
+
+    result = CliRunner().invoke(
+        analyze,
+        [
+            "--batch-output",
+            str(output_dir),
+            "--jobs",
+            "1",
+            str(invalid_protocol_dir),
+            str(fixture_path.resolve()),
+        ],
+    )
+
+    assert result.exit_code != 0
+    assert "1 of 2 protocols had invalid files" in result.output
+
+    summary = json.loads((output_dir / "summary.json").read_bytes())
+    [invalid_entry, valid_entry] = summary["protocols"]
+
+    assert invalid_entry["status"] == "invalid"
+    assert "output" not in invalid_entry
+    assert invalid_entry["error"]
+    assert valid_entry["status"] in ("ok", "not-ok")
+    assert (output_dir / valid_entry["output"]).exists()
+
+
+def test_analyze_batch_unexpected_error(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """It should record unexpected errors per protocol without stopping the batch."""
+    [broken_path, fixture_path] = sorted(_list_fixtures(6))[:2]
+    output_dir = tmp_path / "output"
+
+    async def _analyze_or_raise(files_and_dirs: List[Path]) -> AnalyzeResults:
+        if files_and_dirs[0] == broken_path.resolve():
+            raise RuntimeError("oh no")
+        return await _analyze_protocol(files_and_dirs)
+
+    monkeypatch.setattr(analyze_module, "_analyze_protocol", _analyze_or_raise)
+
+    result = CliRunner().invoke(
+        analyze,
+        [
+            "--batch-output",
+            str(output_dir),
+            "--jobs",
+            "1",
+            str(broken_path.resolve()),
+            str(fixture_path.resolve()),
+        ],
+    )
+
+    assert result.exit_code != 0
+    assert "1 of 2 protocols could not be analyzed" in result.output
+
+    summary = json.loads((output_dir / "summary.json").read_bytes())
+    [error_entry, valid_entry] = summary["protocols"]
+
+    assert error_entry["status"] == "error"
+    assert error_entry["error"] == "RuntimeError: oh no"
+    assert valid_entry["status"] in ("ok", "not-ok")
+
+
+def test_analyze_batch_broken_pool(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """It should mark protocols as errors, and still summarize, if a worker dies."""
+    fixture_paths = sorted(_list_fixtures(6))[:2]
+    output_dir = tmp_path / "output"
+
+    async def _exit_worker(files_and_dirs: List[Path]) -> AnalyzeResults:
+        os._exit(1)
+
+    monkeypatch.setattr(analyze_module, "_analyze_protocol", _exit_worker)
+
+    result = CliRunner().invoke(
+        analyze,
+        [
+            "--batch-output",
+            str(output_dir),
+            "--jobs",
+            "2",
+            *[str(p.resolve()) for p in fixture_paths],
+        ],
+    )
+
+    assert result.exit_code != 0
+    assert "2 of 2 protocols could not be analyzed" in result.output
+
+    summary = json.loads((output_dir / "summary.json").read_bytes())
+    assert [entry["status"] for entry in summary["protocols"]] == ["error", "error"]
+    assert all("BrokenProcessPool" in entry["error"] for entry in summary["protocols"])
@@ -24,7 +24,9 @@ if TYPE_CHECKING:
 @pytest.fixture
 def state_store(decoy: Decoy) -> StateStore:
     """Get a mocked out StateStore instance."""
-    return decoy.mock(cls=StateStore)
+    state_store = decoy.mock(cls=StateStore)
+    decoy.when(state_store.config.use_virtual_pipettes).then_return(False)
+    return state_store
 
 
 @pytest.fixture
@@ -180,6 +182,34 @@ async def test_hardware_stopping_sequence_no_pipette(
     )
 
 
+async def test_hardware_stopping_sequence_virtual_pipettes(
+    decoy: Decoy,
+    state_store: StateStore,
+    hardware_api: HardwareAPI,
+    mock_tip_handler: TipHandler,
+    subject: HardwareStopper,
+) -> None:
+    """It should not drop tips or home when pipettes are virtual."""
+    decoy.when(state_store.config.use_virtual_pipettes).then_return(True)
+    decoy.when(state_store.pipettes.get_all_attached_tips()).then_return(
+        [
+            ("pipette-id", TipGeometry(length=1.0, volume=2.0, diameter=3.0)),
+        ]
+    )
+
+    await subject.do_stop_and_recover(drop_tips_and_home=True)
+
+    decoy.verify(await hardware_api.stop(home_after=False), times=1)
+    decoy.verify(await hardware_api.stop(home_after=True), times=0)
+    decoy.verify(
+        await mock_tip_handler.add_tip(
+            pipette_id="pipette-id",
+            tip=TipGeometry(length=1.0, volume=2.0, diameter=3.0),
+        ),
+        times=0,
+    )
+
+
 @pytest.mark.ot3_only
 async def test_hardware_stopping_sequence_with_gripper(
     decoy: Decoy,
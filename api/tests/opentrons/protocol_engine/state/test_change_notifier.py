@@ -54,3 +54,39 @@ async def test_multiple_subscribers(count: int) -> None:
     await asyncio.gather(task_1, task_2, task_3)
 
     assert results == [1, 2, 3]
+
+
+async def test_keyed_subscriber() -> None:
+    """Test that a keyed subscriber only wakes for its own key or a broadcast."""
+    subject = ChangeNotifier()
+    result = asyncio.create_task(subject.wait("key-1"))
+
+    await asyncio.sleep(0)
+    subject.notify([])
+    subject.notify(["key-2"])
+    await asyncio.sleep(0.1)
+    assert result.done() is False
+
+    subject.notify(["key-1"])
+    await result
+
+    result = asyncio.create_task(subject.wait("key-1"))
+    await asyncio.sleep(0)
+    subject.notify(None)
+    await result
+
+
+@pytest.mark.parametrize("waiter_count", [1, 10, 100])
+async def test_keyed_wake_ups_per_notify(waiter_count: int) -> None:
+    """A keyed notification should wake one waiter, regardless of waiter count."""
+    subject = ChangeNotifier()
+    tasks = [asyncio.create_task(subject.wait(f"key-{i}")) for i in range(waiter_count)]
+
+    await asyncio.sleep(0)
+    subject.notify(["key-0"])
+    await asyncio.sleep(0)
+
+    assert [task.done() for task in tasks].count(True) == 1
+
+    subject.notify(None)
+    await asyncio.gather(*tasks)
@@ -23,6 +23,7 @@ from opentrons.protocol_engine.state.commands import (
 
 from opentrons.protocol_engine.actions import (
     QueueCommandAction,
+    QueueCommandsAction,
     UpdateCommandAction,
     FailCommandAction,
     PlayAction,
@@ -82,6 +83,8 @@ def test_initial_state(
         commands_by_id=OrderedDict(),
         errors_by_id={},
         latest_command_hash=None,
+        latest_final_command_id=None,
+        failed_protocol_command_ids=OrderedSet(),
     )
 
 
@@ -265,6 +268,56 @@ def test_command_queue_with_hash() -> None:
     assert subject.state.latest_command_hash == "def456"
 
 
+def test_command_store_queues_command_batch() -> None:
+    """It should queue a batch of commands in order."""
+    setup_create = commands.HomeCreate(
+        params=commands.HomeParams(),
+        intent=commands.CommandIntent.SETUP,
+    )
+    protocol_create = commands.WaitForResumeCreate(
+        params=commands.WaitForResumeParams(message="hello world"),
+    )
+
+    subject = CommandStore(is_door_open=False, config=_make_config())
+    subject.handle_action(
+        QueueCommandsAction(
+            actions=[
+                QueueCommandAction(
+                    request=protocol_create,
+                    request_hash="abc123",
+                    created_at=datetime(year=2021, month=1, day=1),
+                    command_id="command-id-1",
+                ),
+                QueueCommandAction(
+                    request=setup_create,
+                    request_hash=None,
+                    created_at=datetime(year=2021, month=1, day=1),
+                    command_id="command-id-2",
+                ),
+                QueueCommandAction(
+                    request=protocol_create,
+                    request_hash="def456",
+                    created_at=datetime(year=2021, month=1, day=1),
+                    command_id="command-id-3",
+                ),
+            ]
+        )
+    )
+
+    assert subject.state.all_command_ids == [
+        "command-id-1",
+        "command-id-2",
+        "command-id-3",
+    ]
+    assert subject.state.commands_by_id["command-id-3"].index == 2
+    assert subject.state.commands_by_id["command-id-3"].command.key == "def456"
+    assert subject.state.queued_command_ids == OrderedSet(
+        ["command-id-1", "command-id-3"]
+    )
+    assert subject.state.queued_setup_command_ids == OrderedSet(["command-id-2"])
+    assert subject.state.latest_command_hash == "def456"
+
+
 def test_command_queue_and_unqueue() -> None:
     """It should queue on QueueCommandAction and dequeue on UpdateCommandAction."""
     queue_1 = QueueCommandAction(
@@ -499,6 +552,8 @@ def test_command_failure_clears_queues() -> None:
         "command-id-1": CommandEntry(index=0, command=expected_failed_1),
         "command-id-2": CommandEntry(index=1, command=expected_failed_2),
     }
+    assert subject.state.latest_final_command_id == "command-id-2"
+    assert subject.state.failed_protocol_command_ids == OrderedSet(["command-id-1"])
 
 
 def test_setup_command_failure_only_clears_setup_command_queue() -> None:
@@ -609,6 +664,8 @@ def test_setup_command_failure_only_clears_setup_command_queue() -> None:
         "command-id-2": CommandEntry(index=1, command=expected_failed_cmd_2),
         "command-id-3": CommandEntry(index=2, command=expected_failed_cmd_3),
     }
+    assert subject.state.latest_final_command_id == "command-id-3"
+    assert subject.state.failed_protocol_command_ids == OrderedSet()
 
 
 def test_command_store_preserves_handle_order() -> None:
@@ -660,6 +717,8 @@ def test_command_store_handles_pause_action(pause_source: PauseSource) -> None:
         commands_by_id=OrderedDict(),
         errors_by_id={},
         latest_command_hash=None,
+        latest_final_command_id=None,
+        failed_protocol_command_ids=OrderedSet(),
     )
 
 
@@ -682,6 +741,8 @@ def test_command_store_handles_play_action(pause_source: PauseSource) -> None:
         errors_by_id={},
         run_started_at=datetime(year=2021, month=1, day=1),
         latest_command_hash=None,
+        latest_final_command_id=None,
+        failed_protocol_command_ids=OrderedSet(),
     )
 
 
@@ -705,6 +766,8 @@ def test_command_store_handles_finish_action() -> None:
         errors_by_id={},
         run_started_at=datetime(year=2021, month=1, day=1),
         latest_command_hash=None,
+        latest_final_command_id=None,
+        failed_protocol_command_ids=OrderedSet(),
     )
 
 
@@ -738,6 +801,8 @@ def test_command_store_handles_stop_action() -> None:
         errors_by_id={},
         run_started_at=datetime(year=2021, month=1, day=1),
         latest_command_hash=None,
+        latest_final_command_id=None,
+        failed_protocol_command_ids=OrderedSet(),
     )
 
 
@@ -760,6 +825,8 @@ def test_command_store_cannot_restart_after_should_stop() -> None:
         errors_by_id={},
         run_started_at=None,
         latest_command_hash=None,
+        latest_final_command_id=None,
+        failed_protocol_command_ids=OrderedSet(),
     )
 
 
@@ -847,6 +914,8 @@ def test_command_store_saves_unknown_finish_error() -> None:
         },
         run_started_at=None,
         latest_command_hash=None,
+        latest_final_command_id=None,
+        failed_protocol_command_ids=OrderedSet(),
     )
 
 
@@ -887,6 +956,8 @@ def test_command_store_saves_correct_error_code() -> None:
         },
         run_started_at=None,
         latest_command_hash=None,
+        latest_final_command_id=None,
+        failed_protocol_command_ids=OrderedSet(),
     )
 
 
@@ -911,6 +982,8 @@ def test_command_store_ignores_stop_after_graceful_finish() -> None:
         errors_by_id={},
         run_started_at=datetime(year=2021, month=1, day=1),
         latest_command_hash=None,
+        latest_final_command_id=None,
+        failed_protocol_command_ids=OrderedSet(),
     )
 
 
@@ -935,6 +1008,8 @@ def test_command_store_ignores_finish_after_non_graceful_stop() -> None:
         errors_by_id={},
         run_started_at=datetime(year=2021, month=1, day=1),
         latest_command_hash=None,
+        latest_final_command_id=None,
+        failed_protocol_command_ids=OrderedSet(),
     )
 
 
@@ -982,6 +1057,8 @@ def test_command_store_handles_command_failed() -> None:
         errors_by_id={},
         run_started_at=None,
         latest_command_hash=None,
+        latest_final_command_id="command-id",
+        failed_protocol_command_ids=OrderedSet(["command-id"]),
     )
 
 
@@ -1004,6 +1081,8 @@ def test_handles_hardware_stopped() -> None:
         errors_by_id={},
         run_started_at=None,
         latest_command_hash=None,
+        latest_final_command_id=None,
+        failed_protocol_command_ids=OrderedSet(),
     )
 
 
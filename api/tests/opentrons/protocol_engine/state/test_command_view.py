@@ -52,6 +52,16 @@ def get_command_view(
         command.id: CommandEntry(index=index, command=command)
         for index, command in enumerate(commands)
     }
+    final_command_ids = [
+        command.id
+        for command in commands
+        if command.status in (cmd.CommandStatus.SUCCEEDED, cmd.CommandStatus.FAILED)
+    ]
+    failed_protocol_command_ids = [
+        command.id
+        for command in commands
+        if command.error is not None and command.intent != cmd.CommandIntent.SETUP
+    ]
 
     state = CommandState(
         queue_status=queue_status,
@@ -66,6 +76,8 @@ def get_command_view(
         commands_by_id=commands_by_id,
         run_started_at=run_started_at,
         latest_command_hash=latest_command_hash,
+        latest_final_command_id=final_command_ids[-1] if final_command_ids else None,
+        failed_protocol_command_ids=OrderedSet(failed_protocol_command_ids),
     )
 
     return CommandView(state=state)
@@ -693,6 +705,31 @@ def test_get_current() -> None:
     )
 
 
+def test_get_current_when_run_has_result() -> None:
+    """It should treat queued commands as current once the run has a result."""
+    command_1 = create_succeeded_command("command-id-1", command_key="key-1")
+    command_2 = create_queued_command("command-id-2", command_key="key-2")
+
+    subject = get_command_view(commands=[command_1, command_2])
+    assert subject.get_current() == CurrentCommand(
+        index=0,
+        command_id="command-id-1",
+        command_key="key-1",
+        created_at=command_1.createdAt,
+    )
+
+    subject = get_command_view(
+        commands=[command_1, command_2],
+        run_result=RunResult.STOPPED,
+    )
+    assert subject.get_current() == CurrentCommand(
+        index=1,
+        command_id="command-id-2",
+        command_key="key-2",
+        created_at=command_2.createdAt,
+    )
+
+
 def test_get_slice_empty() -> None:
     """It should return a slice from the tail if no current command."""
     subject = get_command_view(commands=[])
@@ -367,6 +367,28 @@ def test_get_all_labware_highest_z_no_equipment(
     assert result == 0
 
 
+def test_get_all_labware_highest_z_cached(
+    decoy: Decoy,
+    labware_view: LabwareView,
+    module_view: ModuleView,
+    subject: GeometryView,
+) -> None:
+    """It should recompute the highest Z only when labware or modules change."""
+    decoy.when(labware_view.get_generation()).then_return(1)
+    decoy.when(module_view.get_generation()).then_return(1)
+    decoy.when(module_view.get_all()).then_return([])
+    decoy.when(labware_view.get_all()).then_return([])
+
+    assert subject.get_all_labware_highest_z() == 0
+    assert subject.get_all_labware_highest_z() == 0
+    decoy.verify(labware_view.get_all(), times=1)
+
+    decoy.when(module_view.get_generation()).then_return(2)
+
+    assert subject.get_all_labware_highest_z() == 0
+    decoy.verify(labware_view.get_all(), times=2)
+
+
 def test_get_all_labware_highest_z(
     decoy: Decoy,
     well_plate_def: LabwareDefinition,
@@ -585,6 +607,34 @@ def test_get_well_position(
     )
 
 
+def test_get_well_position_missing_well(
+    decoy: Decoy,
+    well_plate_def: LabwareDefinition,
+    labware_view: LabwareView,
+    subject: GeometryView,
+) -> None:
+    """It should raise if the well does not exist in the labware."""
+    labware_data = LoadedLabware(
+        id="labware-id",
+        loadName="load-name",
+        definitionUri="definition-uri",
+        location=DeckSlotLocation(slotName=DeckSlotName.SLOT_4),
+        offsetId=None,
+    )
+
+    decoy.when(labware_view.get("labware-id")).then_return(labware_data)
+    decoy.when(labware_view.get_definition("labware-id")).then_return(well_plate_def)
+    decoy.when(labware_view.get_labware_offset_vector("labware-id")).then_return(
+        LabwareOffsetVector(x=0, y=0, z=0)
+    )
+    decoy.when(labware_view.get_slot_position(DeckSlotName.SLOT_4)).then_return(
+        Point(4, 5, 6)
+    )
+
+    with pytest.raises(errors.WellDoesNotExistError):
+        subject.get_well_position("labware-id", "Z42")
+
+
 def test_get_well_height(
     decoy: Decoy,
     well_plate_def: LabwareDefinition,
@@ -24,7 +24,11 @@ from opentrons.protocol_engine.actions import (
     AddLabwareDefinitionAction,
     UpdateCommandAction,
 )
-from opentrons.protocol_engine.state.labware import LabwareStore, LabwareState
+from opentrons.protocol_engine.state.labware import (
+    LabwareStore,
+    LabwareState,
+    get_deck_slots_by_id,
+)
 
 from .command_fixtures import (
     create_load_labware_command,
@@ -75,7 +79,9 @@ def test_initial_state(
             )
         },
         labware_offsets_by_id={},
+        labware_offset_ids_by_key={},
         definitions_by_uri={expected_trash_uri: ot2_fixed_trash_def},
+        deck_slots_by_id=get_deck_slots_by_id(ot2_standard_deck_def),
     )
 
 
@@ -106,6 +112,9 @@ def test_handles_add_labware_offset(
     )
 
     assert subject.state.labware_offsets_by_id == {"offset-id": resolved_offset}
+    assert subject.state.labware_offset_ids_by_key == {
+        ("offset-definition-uri", DeckSlotName.SLOT_1, None, None): "offset-id"
+    }
 
 
 def test_handles_load_labware(
@@ -257,6 +266,7 @@ def test_handles_move_labware(
         slotName=DeckSlotName.SLOT_4
     )
     assert subject.state.labware_by_id["my-labware-id"].offsetId == "my-new-offset"
+    assert subject.state.generation == 3
 
 
 def test_handles_move_labware_off_deck(
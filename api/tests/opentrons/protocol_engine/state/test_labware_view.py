@@ -35,6 +35,8 @@ from opentrons.protocol_engine.state.labware import (
     LabwareState,
     LabwareView,
     LabwareLoadParams,
+    get_labware_offset_key,
+    get_deck_slots_by_id,
 )
 
 
@@ -87,11 +89,19 @@ def get_labware_view(
     deck_definition: Optional[DeckDefinitionV3] = None,
 ) -> LabwareView:
     """Get a labware view test subject."""
+    labware_offsets_by_id = labware_offsets_by_id or {}
     state = LabwareState(
         labware_by_id=labware_by_id or {},
-        labware_offsets_by_id=labware_offsets_by_id or {},
+        labware_offsets_by_id=labware_offsets_by_id,
+        labware_offset_ids_by_key={
+            get_labware_offset_key(offset.definitionUri, offset.location): offset_id
+            for offset_id, offset in labware_offsets_by_id.items()
+        },
         definitions_by_uri=definitions_by_uri or {},
         deck_definition=deck_definition or cast(DeckDefinitionV3, {"fake": True}),
+        deck_slots_by_id=(
+            get_deck_slots_by_id(deck_definition) if deck_definition else {}
+        ),
     )
 
     return LabwareView(state=state)
@@ -668,6 +678,19 @@ def test_get_slot_definition_raises_with_bad_slot_name(
         subject.get_slot_definition(DeckSlotName.SLOT_A1)
 
 
+def test_get_slot_definition_ot3(ot3_standard_deck_def: DeckDefinitionV3) -> None:
+    """It should return a deck slot's definition from an OT-3 deck."""
+    subject = get_labware_view(deck_definition=ot3_standard_deck_def)
+
+    result = subject.get_slot_definition(DeckSlotName.SLOT_C2)
+
+    assert result["id"] == "C2"
+    assert result in ot3_standard_deck_def["locations"]["orderedSlots"]
+
+    with pytest.raises(errors.SlotDoesNotExistError):
+        subject.get_slot_definition(DeckSlotName.SLOT_5)
+
+
 def test_get_slot_position(ot2_standard_deck_def: DeckDefinitionV3) -> None:
     """It should get the absolute location of a deck slot's origin."""
     subject = get_labware_view(deck_definition=ot2_standard_deck_def)
@@ -158,6 +158,7 @@ def test_load_module(
         },
         substate_by_module_id={"module-id": expected_substate},
         module_offset_by_serial={},
+        generation=1,
     )
 
 
@@ -244,6 +245,7 @@ def test_add_module_action(
         },
         substate_by_module_id={"module-id": expected_substate},
         module_offset_by_serial={},
+        generation=1,
     )
 
 
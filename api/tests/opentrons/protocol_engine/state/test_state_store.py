@@ -7,7 +7,13 @@ from decoy import Decoy
 
 from opentrons_shared_data.deck.dev_types import DeckDefinitionV3
 
-from opentrons.protocol_engine.actions import PlayAction
+from opentrons.protocol_engine import commands
+from opentrons.protocol_engine.actions import (
+    PlayAction,
+    QueueCommandAction,
+    StopAction,
+    UpdateCommandAction,
+)
 from opentrons.protocol_engine.state import State, StateStore, Config
 from opentrons.protocol_engine.state.change_notifier import ChangeNotifier
 from opentrons.protocol_engine.types import DeckType
@@ -67,9 +73,63 @@ def test_notify_on_state_change(
     subject: StateStore,
 ) -> None:
     """It should notify state changes when actions are handled."""
-    decoy.verify(change_notifier.notify(), times=0)
+    decoy.verify(change_notifier.notify([]), times=0)
     subject.handle_action(PlayAction(requested_at=datetime(year=2021, month=1, day=1)))
-    decoy.verify(change_notifier.notify(), times=1)
+    decoy.verify(change_notifier.notify([]), times=1)
+
+
+def test_notify_changed_command_ids(
+    decoy: Decoy,
+    change_notifier: ChangeNotifier,
+    subject: StateStore,
+) -> None:
+    """It should notify which commands an action may have changed."""
+    subject.handle_action(
+        QueueCommandAction(
+            request=commands.WaitForResumeCreate(params=commands.WaitForResumeParams()),
+            request_hash=None,
+            created_at=datetime(year=2021, month=1, day=1),
+            command_id="command-id",
+        )
+    )
+    decoy.verify(change_notifier.notify(["command-id"]), times=1)
+
+    subject.handle_action(StopAction())
+    decoy.verify(change_notifier.notify(None), times=1)
+
+
+def test_handled_action_counts(subject: StateStore) -> None:
+    """It should only pass actions to the substores that handle them."""
+    subject.handle_action(PlayAction(requested_at=datetime(year=2021, month=1, day=1)))
+    subject.handle_action(
+        QueueCommandAction(
+            request=commands.WaitForResumeCreate(params=commands.WaitForResumeParams()),
+            request_hash=None,
+            created_at=datetime(year=2021, month=1, day=1),
+            command_id="command-id",
+        )
+    )
+    subject.handle_action(
+        UpdateCommandAction(
+            command=commands.WaitForResume(
+                id="command-id",
+                key="command-key",
+                createdAt=datetime(year=2021, month=1, day=1),
+                params=commands.WaitForResumeParams(),
+                status=commands.CommandStatus.RUNNING,
+            )
+        )
+    )
+
+    assert subject.get_handled_action_counts() == {
+        "commands": 3,
+        "pipettes": 1,
+        "labware": 1,
+        "modules": 1,
+        "liquids": 0,
+        "tips": 1,
+    }
+    assert subject.commands.get("command-id").status == commands.CommandStatus.RUNNING
 
 
 async def test_wait_for_state(
@@ -108,6 +168,22 @@ async def test_wait_for_state_short_circuit(
     decoy.verify(await change_notifier.wait(), times=0)
 
 
+async def test_wait_for_command(
+    decoy: Decoy,
+    change_notifier: ChangeNotifier,
+    subject: StateStore,
+) -> None:
+    """It should only wait for changes to the given command."""
+    check_condition: Callable[[str], Optional[str]] = decoy.mock()
+
+    decoy.when(check_condition("command-id")).then_return(None, "hello world")
+
+    result = await subject.wait_for_command(check_condition, command_id="command-id")
+    assert result == "hello world"
+
+    decoy.verify(await change_notifier.wait("command-id"), times=1)
+
+
 async def test_wait_for_already_true(decoy: Decoy, subject: StateStore) -> None:
     """It should signal immediately if condition is already met."""
     check_condition = decoy.mock()
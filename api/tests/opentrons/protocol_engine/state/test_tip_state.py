@@ -374,3 +374,88 @@ def test_drop_tip(
     )
     result = TipView(subject.state).get_tip_length("pipette-id")
     assert result == 0
+
+
+@pytest.mark.parametrize(
+    ("channels", "expected_pick_ups_per_rack"),
+    [(1, 96), (8, 12), (96, 1)],
+)
+def test_use_every_tip_across_tip_racks(
+    subject: TipStore,
+    labware_definition: LabwareDefinition,
+    channels: int,
+    expected_pick_ups_per_rack: int,
+) -> None:
+    """It should hand out every tip in every tip rack exactly once."""
+    tip_rack_ids = [f"tip-rack-{i}" for i in range(20)]
+
+    subject.handle_action(
+        actions.AddPipetteConfigAction(
+            pipette_id="pipette-id",
+            serial_number="pipette-serial",
+            config=LoadedStaticPipetteData(
+                channels=channels,
+                max_volume=15,
+                min_volume=3,
+                model="gen a",
+                display_name="display name",
+                flow_rates=FlowRates(
+                    default_aspirate={},
+                    default_dispense={},
+                    default_blow_out={},
+                ),
+                return_tip_scale=0,
+                nominal_tip_overlap={},
+                nozzle_offset_z=1.23,
+                home_position=4.56,
+            ),
+        )
+    )
+
+    for tip_rack_id in tip_rack_ids:
+        subject.handle_action(
+            actions.UpdateCommandAction(
+                command=commands.LoadLabware.construct(  # type: ignore[call-arg]
+                    result=commands.LoadLabwareResult.construct(
+                        labwareId=tip_rack_id,
+                        definition=labware_definition,
+                    )
+                )
+            )
+        )
+
+    pick_ups = []
+
+    for tip_rack_id in tip_rack_ids:
+        while True:
+            well_name = TipView(subject.state).get_next_tip(
+                labware_id=tip_rack_id,
+                num_tips=channels,
+                starting_tip_name=None,
+            )
+
+            if well_name is None:
+                break
+
+            pick_ups.append((tip_rack_id, well_name))
+            subject.handle_action(
+                actions.UpdateCommandAction(
+                    command=commands.PickUpTip.construct(  # type: ignore[call-arg]
+                        params=commands.PickUpTipParams.construct(
+                            pipetteId="pipette-id",
+                            labwareId=tip_rack_id,
+                            wellName=well_name,
+                        ),
+                        result=commands.PickUpTipResult.construct(
+                            position=DeckPoint(x=0, y=0, z=0), tipLength=1.23
+                        ),
+                    )
+                )
+            )
+
+    assert len(pick_ups) == len(tip_rack_ids) * expected_pick_ups_per_rack
+    assert len(set(pick_ups)) == len(pick_ups)
+    assert not any(
+        TipView(subject.state).has_clean_tip(tip_rack_id, "H12")
+        for tip_rack_id in tip_rack_ids
+    )
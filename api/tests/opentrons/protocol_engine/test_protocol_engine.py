@@ -48,6 +48,7 @@ from opentrons.protocol_engine.actions import (
     FinishAction,
     FinishErrorDetails,
     QueueCommandAction,
+    QueueCommandsAction,
     HardwareStoppedAction,
     ResetTipsAction,
 )
@@ -236,6 +237,88 @@ def test_add_command(
     assert result == queued
 
 
+def test_add_commands(
+    decoy: Decoy,
+    state_store: StateStore,
+    action_dispatcher: ActionDispatcher,
+    model_utils: ModelUtils,
+    subject: ProtocolEngine,
+) -> None:
+    """It should add a batch of commands to the state with a single action."""
+    created_at = datetime(year=2021, month=1, day=1)
+    request_1 = commands.WaitForResumeCreate(params=commands.WaitForResumeParams())
+    request_2 = commands.HomeCreate(params=commands.HomeParams())
+    queued_1 = commands.WaitForResume(
+        id="command-id-1",
+        key="command-key-1",
+        status=commands.CommandStatus.QUEUED,
+        createdAt=created_at,
+        params=commands.WaitForResumeParams(),
+    )
+    queued_2 = commands.Home(
+        id="command-id-2",
+        key="command-key-2",
+        status=commands.CommandStatus.QUEUED,
+        createdAt=created_at,
+        params=commands.HomeParams(),
+    )
+    queue_action_1 = QueueCommandAction(
+        command_id="command-id-1",
+        created_at=created_at,
+        request=request_1,
+        request_hash="123",
+    )
+    queue_action_2 = QueueCommandAction(
+        command_id="command-id-2",
+        created_at=created_at,
+        request=request_2,
+        request_hash="456",
+    )
+
+    robot_type: RobotType = "OT-2 Standard"
+    decoy.when(state_store.config).then_return(
+        Config(robot_type=robot_type, deck_type=DeckType.OT2_STANDARD)
+    )
+
+    decoy.when(
+        slot_standardization.standardize_command(request_1, robot_type)
+    ).then_return(request_1)
+    decoy.when(
+        slot_standardization.standardize_command(request_2, robot_type)
+    ).then_return(request_2)
+
+    decoy.when(model_utils.generate_id()).then_return("command-id-1", "command-id-2")
+    decoy.when(model_utils.get_timestamp()).then_return(created_at)
+    decoy.when(state_store.commands.get_latest_command_hash()).then_return("abc")
+    decoy.when(
+        commands.hash_command_params(create=request_1, last_hash="abc")
+    ).then_return("123")
+    decoy.when(
+        commands.hash_command_params(create=request_2, last_hash="123")
+    ).then_return("456")
+
+    decoy.when(
+        state_store.commands.validate_action_allowed(queue_action_1)
+    ).then_return(queue_action_1)
+    decoy.when(
+        state_store.commands.validate_action_allowed(queue_action_2)
+    ).then_return(queue_action_2)
+
+    def _stub_queued(*_a: object, **_k: object) -> None:
+        decoy.when(state_store.commands.get("command-id-1")).then_return(queued_1)
+        decoy.when(state_store.commands.get("command-id-2")).then_return(queued_2)
+
+    decoy.when(
+        action_dispatcher.dispatch(
+            QueueCommandsAction(actions=[queue_action_1, queue_action_2])
+        ),
+    ).then_do(_stub_queued)
+
+    result = subject.add_commands([request_1, request_2])
+
+    assert result == [queued_1, queued_2]
+
+
 async def test_add_and_execute_command(
     decoy: Decoy,
     state_store: StateStore,
@@ -313,8 +396,8 @@ async def test_add_and_execute_command(
     ).then_do(_stub_queued)
 
     decoy.when(
-        await state_store.wait_for(
-            condition=state_store.commands.get_command_is_final,
+        await state_store.wait_for_command(
+            state_store.commands.get_command_is_final,
             command_id="command-id",
         ),
     ).then_do(_stub_completed)
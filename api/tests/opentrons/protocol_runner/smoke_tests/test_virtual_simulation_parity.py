@@ -0,0 +1,93 @@
+"""Parity tests for analysis with and without virtual pipettes.
+
+With virtual pipettes, `create_simulating_runner` keeps the simulated hardware
+out of the way of Protocol Engine protocols. These tests check that doing so
+doesn't change what an analysis reports.
+"""
+import pytest
+from pathlib import Path
+from pytest_lazyfixture import lazy_fixture  # type: ignore[import]
+from typing import Any, Dict, List
+
+from opentrons_shared_data import get_shared_data_root
+from opentrons.config import feature_flags
+from opentrons.protocol_reader import ProtocolReader
+from opentrons.protocol_runner import RunResult, create_simulating_runner
+
+
+_IGNORED_KEYS = {"createdAt", "startedAt", "completedAt", "serialNumber"}
+
+
+async def _analyze(
+    protocol_file: Path,
+    use_virtual_pipettes: bool,
+    monkeypatch: pytest.MonkeyPatch,
+) -> RunResult:
+    monkeypatch.setattr(
+        feature_flags,
+        "disable_fast_protocol_upload",
+        lambda: not use_virtual_pipettes,
+    )
+    protocol_source = await ProtocolReader().read_saved(
+        files=[protocol_file],
+        directory=None,
+    )
+    subject = await create_simulating_runner(
+        robot_type=protocol_source.robot_type,
+        protocol_config=protocol_source.config,
+    )
+    return await subject.run(protocol_source)
+
+
+def _normalize(result: RunResult) -> Dict[str, Any]:
+    """Drop run-specific values, and number IDs in order of appearance."""
+    ids: Dict[str, str] = {}
+
+    def normalize_value(key: str, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {
+                k: normalize_value(k, v)
+                for k, v in value.items()
+                if k not in _IGNORED_KEYS
+            }
+        elif isinstance(value, list):
+            return [normalize_value(key, v) for v in value]
+        elif isinstance(value, str) and (key == "id" or key.endswith("Id")):
+            return ids.setdefault(value, f"id-{len(ids)}")
+        return value
+
+    commands: List[Dict[str, Any]] = [c.dict() for c in result.commands]
+    summary = result.state_summary.dict(exclude={"startedAt", "completedAt"})
+
+    return {
+        "commands": normalize_value("commands", commands),
+        "summary": normalize_value("summary", summary),
+    }
+
+
+@pytest.mark.parametrize(
+    "protocol_file",
+    [
+        lazy_fixture("json_protocol_file"),
+        lazy_fixture("python_protocol_file"),
+        lazy_fixture("legacy_python_protocol_file"),
+        lazy_fixture("legacy_json_protocol_file"),
+        get_shared_data_root() / "protocol/fixtures/6/simpleV6.json",
+        get_shared_data_root() / "protocol/fixtures/6/multipleTipracksWithTC.json",
+        get_shared_data_root() / "protocol/fixtures/6/heaterShakerCommands.json",
+        get_shared_data_root() / "protocol/fixtures/6/transferSettings.json",
+    ],
+)
+async def test_virtual_pipette_analysis_parity(
+    protocol_file: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Analysis with virtual pipettes should match analysis with hardware ones."""
+    hardware_result = await _analyze(
+        protocol_file, use_virtual_pipettes=False, monkeypatch=monkeypatch
+    )
+    virtual_result = await _analyze(
+        protocol_file, use_virtual_pipettes=True, monkeypatch=monkeypatch
+    )
+
+    assert _normalize(virtual_result) == _normalize(hardware_result)
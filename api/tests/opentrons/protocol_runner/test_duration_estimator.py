@@ -0,0 +1,336 @@
+"""Tests for opentrons.protocol_runner.duration_estimator."""
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import pytest
+
+from opentrons_shared_data.labware import load_definition
+from opentrons_shared_data.pipette.dev_types import PipetteNameType
+
+from opentrons.config import robot_configs
+from opentrons.config.types import GantryLoad
+from opentrons.motion_planning import MINIMUM_Z_MARGIN
+from opentrons.protocol_engine import DeckPoint, DeckSlotLocation, commands as cmd
+from opentrons.protocol_engine.types import LabwareLocation
+from opentrons.protocol_runner.duration_estimator import (
+    AxisLimits,
+    GantryLimits,
+    PICK_UP_TIP_SECONDS,
+    THERMOCYCLER_LID_OPEN_CLOSE_SECONDS,
+    estimate_duration,
+    get_axis_move_time,
+    get_gantry_limits,
+)
+from opentrons.protocols.duration.estimator import DurationEstimator
+from opentrons.protocols.models import LabwareDefinition
+from opentrons.types import DeckSlotName, MountType
+
+
+_OT2_CONFIG = robot_configs.build_config_ot2({})
+_OT2_LIMITS = get_gantry_limits(_OT2_CONFIG)
+
+
+def _succeeded(command_id: str) -> Dict[str, Any]:
+    """Get the fields of a succeeded command, other than its params and result."""
+    return {
+        "id": command_id,
+        "key": command_id,
+        "status": cmd.CommandStatus.SUCCEEDED,
+        "createdAt": datetime(year=2023, month=1, day=1),
+    }
+
+
+def _move_to(
+    command_id: str, x: float, y: float, z: float, speed: Optional[float] = None
+) -> cmd.MoveToCoordinates:
+    position = DeckPoint(x=x, y=y, z=z)
+    return cmd.MoveToCoordinates(
+        **_succeeded(command_id),
+        params=cmd.MoveToCoordinatesParams(
+            pipetteId="pipette-id", coordinates=position, speed=speed
+        ),
+        result=cmd.MoveToCoordinatesResult(position=position),
+    )
+
+
+def _load_labware(
+    command_id: str, labware_id: str, location: LabwareLocation
+) -> cmd.LoadLabware:
+    definition = LabwareDefinition.parse_obj(
+        load_definition("opentrons_96_tiprack_300ul", 1)
+    )
+    return cmd.LoadLabware(
+        **_succeeded(command_id),
+        params=cmd.LoadLabwareParams(
+            loadName="opentrons_96_tiprack_300ul",
+            namespace="opentrons",
+            version=1,
+            location=location,
+        ),
+        result=cmd.LoadLabwareResult(labwareId=labware_id, definition=definition),
+    )
+
+
+@pytest.mark.parametrize(
+    ("distance", "speed", "expected"),
+    [
+        # Long enough to reach full speed: 1s cruising plus 1s ramping.
+        (100, None, 2.0),
+        # Too short to reach full speed: accelerate halfway, decelerate halfway.
+        (25, None, 1.0),
+        (-25, None, 1.0),
+        (0, None, 0.0),
+        # Capped below the axis's speed limit.
+        (100, 50, 2.5),
+    ],
+)
+def test_get_axis_move_time(
+    distance: float, speed: Optional[float], expected: float
+) -> None:
+    """It should time a trapezoidal move profile."""
+    limits = AxisLimits(max_speed=100, acceleration=100)
+
+    assert get_axis_move_time(distance, limits, speed) == pytest.approx(expected)
+
+
+def test_get_gantry_limits_ot2() -> None:
+    """It should read the OT-2's limits from its config."""
+    assert _OT2_LIMITS == GantryLimits(
+        x=AxisLimits(_OT2_CONFIG.default_max_speed["X"], _OT2_CONFIG.acceleration["X"]),
+        y=AxisLimits(_OT2_CONFIG.default_max_speed["Y"], _OT2_CONFIG.acceleration["Y"]),
+        z=AxisLimits(_OT2_CONFIG.default_max_speed["Z"], _OT2_CONFIG.acceleration["Z"]),
+    )
+
+
+def test_get_gantry_limits_ot3() -> None:
+    """It should read the OT-3's limits for its gantry load from its config."""
+    config = robot_configs.build_config_ot3({})
+
+    low_throughput = get_gantry_limits(config, GantryLoad.LOW_THROUGHPUT)
+    high_throughput = get_gantry_limits(config, GantryLoad.HIGH_THROUGHPUT)
+
+    assert high_throughput.z.max_speed < low_throughput.z.max_speed
+
+
+def test_estimate_arc_move() -> None:
+    """It should move up over the tallest labware, across, and back down."""
+    labware = _load_labware(
+        "load-labware", "labware-id", DeckSlotLocation(slotName=DeckSlotName.SLOT_1)
+    )
+    labware_height = labware.result.definition.dimensions.zDimension  # type: ignore[union-attr]
+    travel_z = labware_height + MINIMUM_Z_MARGIN
+
+    result = estimate_duration(
+        [
+            labware,
+            _move_to("move-1", x=10, y=10, z=10),
+            _move_to("move-2", x=110, y=60, z=20),
+        ],
+        robot_type="OT-2 Standard",
+        robot_config=_OT2_CONFIG,
+    )
+
+    expected_move_seconds = (
+        get_axis_move_time(travel_z - 10, _OT2_LIMITS.z)
+        + max(
+            get_axis_move_time(100, _OT2_LIMITS.x),
+            get_axis_move_time(50, _OT2_LIMITS.y),
+        )
+        + get_axis_move_time(travel_z - 20, _OT2_LIMITS.z)
+    )
+
+    assert [c.commandId for c in result.commands] == [
+        "load-labware",
+        "move-1",
+        "move-2",
+    ]
+    assert [c.seconds for c in result.commands] == [
+        0,
+        # Where the pipette moved from isn't known.
+        0,
+        pytest.approx(expected_move_seconds),
+    ]
+    assert result.totalSeconds == pytest.approx(expected_move_seconds)
+
+
+def test_estimate_direct_move_with_speed() -> None:
+    """It should move straight in Z, capped at the command's speed."""
+    result = estimate_duration(
+        [
+            _move_to("move-1", x=10, y=10, z=10),
+            _move_to("move-2", x=10, y=10, z=50, speed=5),
+        ],
+        robot_type="OT-2 Standard",
+        robot_config=_OT2_CONFIG,
+    )
+
+    assert result.totalSeconds == pytest.approx(
+        get_axis_move_time(40, _OT2_LIMITS.z, speed=5)
+    )
+
+
+def test_estimate_ignores_unknown_positions() -> None:
+    """It should not time moves from or to positions that weren't reported."""
+    result = estimate_duration(
+        [
+            _move_to("move-1", x=10, y=10, z=10),
+            cmd.Home(
+                **_succeeded("home"),
+                params=cmd.HomeParams(),
+                result=cmd.HomeResult(),
+            ),
+            _move_to("move-2", x=100, y=100, z=100),
+            # Legacy protocols' commands report a placeholder position.
+            cmd.PickUpTip(
+                **_succeeded("pick-up-tip"),
+                params=cmd.PickUpTipParams(
+                    pipetteId="pipette-id", labwareId="labware-id", wellName="A1"
+                ),
+                result=cmd.PickUpTipResult(tipVolume=300, tipLength=50, tipDiameter=5),
+            ),
+        ],
+        robot_type="OT-2 Standard",
+        robot_config=_OT2_CONFIG,
+    )
+
+    assert result.totalSeconds == PICK_UP_TIP_SECONDS
+
+
+def test_estimate_ignores_failed_commands() -> None:
+    """It should not time commands without results."""
+    command = cmd.WaitForDuration(
+        **_succeeded("wait"),
+        params=cmd.WaitForDurationParams(seconds=42),
+        result=None,
+    ).copy(update={"status": cmd.CommandStatus.FAILED})
+
+    result = estimate_duration(
+        [command], robot_type="OT-2 Standard", robot_config=_OT2_CONFIG
+    )
+
+    assert result.totalSeconds == 0
+
+
+def test_estimate_liquid_handling() -> None:
+    """It should time aspirating and dispensing by volume and flow rate."""
+    result = estimate_duration(
+        [
+            cmd.AspirateInPlace(
+                **_succeeded("aspirate"),
+                params=cmd.AspirateInPlaceParams(
+                    pipetteId="pipette-id", volume=100, flowRate=50
+                ),
+                result=cmd.AspirateInPlaceResult(volume=100),
+            ),
+            cmd.WaitForDuration(
+                **_succeeded("wait"),
+                params=cmd.WaitForDurationParams(seconds=3),
+                result=cmd.WaitForDurationResult(),
+            ),
+            cmd.DispenseInPlace(
+                **_succeeded("dispense"),
+                params=cmd.DispenseInPlaceParams(
+                    pipetteId="pipette-id", volume=100, flowRate=25
+                ),
+                result=cmd.DispenseInPlaceResult(volume=100),
+            ),
+        ],
+        robot_type="OT-2 Standard",
+        robot_config=_OT2_CONFIG,
+    )
+
+    assert [c.seconds for c in result.commands] == [2, 3, 4]
+    assert result.totalSeconds == 9
+
+
+def test_estimate_96_channel_uses_high_throughput_limits() -> None:
+    """It should use the high-throughput limits once a 96-channel is loaded."""
+    config = robot_configs.build_config_ot3({})
+    limits = get_gantry_limits(config, GantryLoad.HIGH_THROUGHPUT)
+
+    result = estimate_duration(
+        [
+            cmd.LoadPipette(
+                **_succeeded("load-pipette"),
+                params=cmd.LoadPipetteParams(
+                    pipetteName=PipetteNameType.P1000_96, mount=MountType.LEFT
+                ),
+                result=cmd.LoadPipetteResult(pipetteId="pipette-id"),
+            ),
+            _move_to("move-1", x=10, y=10, z=10),
+            _move_to("move-2", x=10, y=10, z=110),
+        ],
+        robot_type="OT-3 Standard",
+        robot_config=config,
+    )
+
+    assert result.totalSeconds == pytest.approx(get_axis_move_time(100, limits.z))
+
+
+def test_estimate_modules() -> None:
+    """It should time temperature changes on each module separately."""
+    tc_module = cmd.thermocycler
+    temp_module = cmd.temperature_module
+
+    result = estimate_duration(
+        [
+            temp_module.SetTargetTemperature(
+                **_succeeded("set-temp"),
+                params=temp_module.SetTargetTemperatureParams(
+                    moduleId="temp-id", celsius=4
+                ),
+                result=temp_module.SetTargetTemperatureResult(targetTemperature=4),
+            ),
+            temp_module.WaitForTemperature(
+                **_succeeded("wait-temp"),
+                params=temp_module.WaitForTemperatureParams(moduleId="temp-id"),
+                result=temp_module.WaitForTemperatureResult(),
+            ),
+            tc_module.CloseLid(
+                **_succeeded("close-lid"),
+                params=tc_module.CloseLidParams(moduleId="tc-id"),
+                result=tc_module.CloseLidResult(),
+            ),
+            tc_module.SetTargetBlockTemperature(
+                **_succeeded("set-block"),
+                params=tc_module.SetTargetBlockTemperatureParams(
+                    moduleId="tc-id", celsius=95, holdTimeSeconds=30
+                ),
+                result=tc_module.SetTargetBlockTemperatureResult(
+                    targetBlockTemperature=95
+                ),
+            ),
+            tc_module.WaitForBlockTemperature(
+                **_succeeded("wait-block"),
+                params=tc_module.WaitForBlockTemperatureParams(moduleId="tc-id"),
+                result=tc_module.WaitForBlockTemperatureResult(),
+            ),
+            tc_module.RunProfile(
+                **_succeeded("run-profile"),
+                params=tc_module.RunProfileParams(
+                    moduleId="tc-id",
+                    profile=[
+                        tc_module.RunProfileStepParams(celsius=60, holdSeconds=10),
+                        tc_module.RunProfileStepParams(celsius=72, holdSeconds=20),
+                    ],
+                ),
+                result=tc_module.RunProfileResult(),
+            ),
+        ],
+        robot_type="OT-2 Standard",
+        robot_config=_OT2_CONFIG,
+    )
+
+    assert [c.seconds for c in result.commands] == [
+        0,
+        pytest.approx(DurationEstimator.temperature_module(25, 4)),
+        THERMOCYCLER_LID_OPEN_CLOSE_SECONDS,
+        0,
+        pytest.approx(DurationEstimator.thermocycler_handler(25, 95) + 30),
+        pytest.approx(
+            DurationEstimator.thermocycler_handler(95, 60)
+            + 10
+            + DurationEstimator.thermocycler_handler(60, 72)
+            + 20
+        ),
+    ]
@@ -14,7 +14,12 @@ from opentrons.hardware_control import API as HardwareAPI
 from opentrons.protocols.api_support.types import APIVersion
 from opentrons_shared_data.protocol.models.protocol_schema_v6 import ProtocolSchemaV6
 from opentrons_shared_data.labware.labware_definition import LabwareDefinition
-from opentrons.protocol_engine import ProtocolEngine, Liquid, commands as pe_commands
+from opentrons.protocol_engine import (
+    ProtocolEngine,
+    StateView,
+    Liquid,
+    commands as pe_commands,
+)
 from opentrons import protocol_reader
 from opentrons.protocol_reader import (
     ProtocolSource,
@@ -191,6 +196,26 @@ async def test_create_protocol_runner(
     )
 
 
+@pytest.mark.parametrize(
+    "subject",
+    [
+        (lazy_fixture("json_runner_subject")),
+        (lazy_fixture("legacy_python_runner_subject")),
+        (lazy_fixture("live_runner_subject")),
+    ],
+)
+def test_state_view(
+    decoy: Decoy,
+    protocol_engine: ProtocolEngine,
+    subject: AnyRunner,
+) -> None:
+    """It should expose the ProtocolEngine's live state view."""
+    state_view = decoy.mock(cls=StateView)
+    decoy.when(protocol_engine.state_view).then_return(state_view)
+
+    assert subject.state_view is state_view
+
+
 @pytest.mark.parametrize(
     "subject",
     [
@@ -357,23 +382,7 @@ async def test_load_json_runner(
         protocol_engine.add_liquid(
             id="water-id", name="water", description="water desc", color=None
         ),
-        protocol_engine.add_command(
-            request=pe_commands.WaitForResumeCreate(
-                params=pe_commands.WaitForResumeParams(message="hello")
-            )
-        ),
-        protocol_engine.add_command(
-            request=pe_commands.WaitForResumeCreate(
-                params=pe_commands.WaitForResumeParams(message="goodbye")
-            )
-        ),
-        protocol_engine.add_command(
-            request=pe_commands.LoadLiquidCreate(
-                params=pe_commands.LoadLiquidParams(
-                    liquidId="water-id", labwareId="labware-id", volumeByWell={"A1": 30}
-                )
-            ),
-        ),
+        protocol_engine.add_commands(requests=commands),
         task_queue.set_run_func(func=protocol_engine.wait_until_complete),
     )
 
@@ -473,3 +473,21 @@ def test_parse_extra_contents(get_labware_fixture, protocol_file, protocol):
 def test_parse_bad_structure(bad_protocol):
     with pytest.raises(MalformedProtocolError):
         parse(dedent(bad_protocol))
+
+
+def test_parse_python_cached(ot_config_tempdir, monkeypatch):
+    protocol_source = dedent(
+        """
+        metadata = {"apiLevel": "2.14", "protocolName": "Cached"}
+        def run(ctx): pass
+        """
+    )
+    first = parse(protocol_source, "protocol.py")
+
+    def _fail_compile(*args, **kwargs):
+        raise AssertionError("Protocol should have been parsed from the cache.")
+
+    monkeypatch.setattr("opentrons.protocols.parse._compile_python", _fail_compile)
+    second = parse(protocol_source, "protocol.py")
+
+    assert second == first
@@ -0,0 +1,78 @@
+"""Tests for opentrons.protocols.parse_cache."""
+import os
+from pathlib import Path
+
+import pytest
+
+from opentrons.protocols import parse_cache
+from opentrons.protocols.api_support.types import APIVersion
+from opentrons.protocols.parse_cache import CachedPythonProtocol
+
+
+@pytest.fixture
+def cache_dir(ot_config_tempdir: Path) -> Path:
+    """Use a temporary directory for the cache."""
+    return ot_config_tempdir / "protocol_parse_cache"
+
+
+def _make_entry(source: str = "def run(ctx): pass") -> CachedPythonProtocol:
+    return CachedPythonProtocol(
+        contents=compile(source, filename="protocol.py", mode="exec"),
+        metadata={"protocolName": "Cached"},
+        api_level=APIVersion(2, 14),
+        robot_type="OT-3 Standard",
+    )
+
+
+def test_save_and_load(cache_dir: Path) -> None:
+    """It should load what was saved under the same key."""
+    entry = _make_entry()
+
+    parse_cache.save("abc", entry)
+    result = parse_cache.load("abc")
+
+    assert result == entry
+    assert (cache_dir / "abc.marshal").exists()
+
+
+def test_load_missing(cache_dir: Path) -> None:
+    """It should return None for a key that was never saved."""
+    assert parse_cache.load("abc") is None
+
+
+def test_load_corrupt(cache_dir: Path) -> None:
+    """It should return None for an entry that can't be read."""
+    (cache_dir / "abc.marshal").write_bytes(b"\x00not marshal data")
+
+    assert parse_cache.load("abc") is None
+
+
+def test_get_cache_key() -> None:
+    """It should key on the protocol's contents and filename."""
+    key = parse_cache.get_cache_key("contents", "protocol.py")
+
+    assert key == parse_cache.get_cache_key("contents", "protocol.py")
+    assert key != parse_cache.get_cache_key("other contents", "protocol.py")
+    assert key != parse_cache.get_cache_key("contents", "other_protocol.py")
+    assert key != parse_cache.get_cache_key("contentsprotocol.py", "")
+
+
+def test_remove_least_recently_used(
+    cache_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """It should remove the least recently used entries once there are too many."""
+    monkeypatch.setattr(parse_cache, "MAX_CACHE_ENTRIES", 2)
+
+    parse_cache.save("first", _make_entry())
+    parse_cache.save("second", _make_entry())
+    os.utime(cache_dir / "first.marshal", (0, 0))
+    os.utime(cache_dir / "second.marshal", (1, 1))
+
+    # Using the first entry should make the second one the oldest.
+    assert parse_cache.load("first") is not None
+    parse_cache.save("third", _make_entry())
+
+    assert sorted(p.name for p in cache_dir.iterdir()) == [
+        "first.marshal",
+        "third.marshal",
+    ]
@@ -0,0 +1,79 @@
+"""Tests for what importing our entry points drags in.
+
+`opentrons_simulate` and `opentrons_execute` are often run from the command
+line, where every module imported at startup is a delay the user waits on.
+These tests use `python -X importtime` to make sure modules that are slow to
+import, and that those entry points don't always need, stay lazy, and that
+the entry points' import time doesn't regress.
+"""
+import statistics
+import subprocess
+import sys
+from typing import Dict
+
+import pytest
+
+
+# How long an entry point may take to import, as a multiple of how long
+# `opentrons` itself takes to import in the same interpreter. Timing both in
+# one run cancels out how fast, and how busy, the machine is.
+#
+# This is about 1.2 today. Importing `opentrons.protocol_engine` eagerly
+# again would push it above 2.
+_IMPORT_TIME_BUDGET_RATIO = 1.6
+
+# How many times to import an entry point before comparing the median run
+# against the budget, so that one slow run doesn't fail the test.
+_IMPORT_TIME_RUNS = 5
+
+_LAZY_MODULES = [
+    "jsonschema",
+    "pkg_resources",
+    "opentrons.hardware_control.backends.controller",
+    "opentrons.protocol_engine",
+]
+
+
+def _get_import_times(module: str) -> Dict[str, float]:
+    """Import `module` in a fresh interpreter.
+
+    Returns:
+        The cumulative import time, in seconds, of every module imported,
+        keyed by module name.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    import_times = {}
+
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:") :].split("|")
+        import_times[name.strip()] = int(cumulative_us) / 1_000_000
+
+    return import_times
+
+
+@pytest.mark.parametrize("module", ["opentrons.simulate", "opentrons.execute"])
+def test_entrypoint_import_is_lazy(module: str) -> None:
+    """It should not import slow modules that it doesn't always need."""
+    import_times = _get_import_times(module)
+
+    assert module in import_times
+    assert [m for m in _LAZY_MODULES if m in import_times] == []
+
+
+@pytest.mark.parametrize("module", ["opentrons.simulate", "opentrons.execute"])
+def test_entrypoint_import_time(module: str) -> None:
+    """It should import within its budget, relative to importing `opentrons`."""
+    ratios = []
+
+    for _ in range(_IMPORT_TIME_RUNS):
+        import_times = _get_import_times(module)
+        ratios.append(import_times[module] / import_times["opentrons"])
+
+    assert statistics.median(ratios) < _IMPORT_TIME_BUDGET_RATIO
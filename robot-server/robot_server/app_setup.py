@@ -9,6 +9,7 @@ from opentrons import __version__
 from .errors import exception_handlers
 from .hardware import start_initializing_hardware, clean_up_hardware
 from .persistence import start_initializing_persistence, clean_up_persistence
+from .protocols.dependencies import clean_up_analysis_executor
 from .router import router
 from .service import initialize_logging
 from .service.task_runner import (
@@ -71,6 +72,7 @@ async def on_shutdown() -> None:
         clean_up_hardware(app.state),
         clean_up_persistence(app.state),
         clean_up_task_runner(app.state),
+        clean_up_analysis_executor(app.state),
         return_exceptions=True,
     )
 
@@ -77,6 +77,11 @@ class Health(BaseModel):
         min_items=2,
         max_items=2,
     )
+    analysis_queue_depth: int = Field(
+        ...,
+        description="How many protocol analyses are waiting for a free"
+        " analysis worker process. Always 0 if analyses run in the server process.",
+    )
     links: HealthLinks
 
     class Config:
@@ -92,6 +97,7 @@ class Health(BaseModel):
                 "system_version": "1.2.1",
                 "maximum_protocol_api_version": [2, 8],
                 "minimum_protocol_api_version": [2, 0],
+                "analysis_queue_depth": 0,
                 "links": {
                     "apiLog": "/logs/api.log",
                     "serialLog": "/logs/serial.log",
@@ -1,7 +1,7 @@
 """HTTP routes and handlers for /health endpoints."""
 from dataclasses import dataclass
 from fastapi import APIRouter, Depends, status
-from typing import Dict, cast
+from typing import Dict, Optional, cast
 import logging
 import json
 
@@ -12,6 +12,8 @@ from server_utils.util import call_once
 
 from robot_server.hardware import get_hardware
 from robot_server.persistence import get_sql_engine as ensure_sql_engine_is_ready
+from robot_server.protocols.analysis_executor import AnalysisExecutor
+from robot_server.protocols.dependencies import get_started_analysis_executor
 from robot_server.service.legacy.models import V1BasicResponse
 from .models import Health, HealthLinks
 
@@ -115,6 +117,9 @@ async def get_health(
     # errors that would present in a confusing way.
     sql_engine: object = Depends(ensure_sql_engine_is_ready),
     versions: ComponentVersions = Depends(get_versions),
+    analysis_executor: Optional[AnalysisExecutor] = Depends(
+        get_started_analysis_executor
+    ),
 ) -> Health:
     """Get information about the health of the robot server.
 
@@ -131,6 +136,9 @@ async def get_health(
         system_version=versions.system_version,
         maximum_protocol_api_version=list(protocol_api.MAX_SUPPORTED_VERSION),
         minimum_protocol_api_version=list(protocol_api.MIN_SUPPORTED_VERSION),
+        analysis_queue_depth=(
+            analysis_executor.get_queue_depth() if analysis_executor is not None else 0
+        ),
         robot_model=(
             "OT-3 Standard"
             if config.feature_flags.enable_ot3_hardware_controller()
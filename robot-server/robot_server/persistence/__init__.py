@@ -2,6 +2,7 @@
 
 
 from ._database import create_sql_engine, sqlite_rowid
+from ._db_thread import run_in_db_thread
 from ._fastapi_dependencies import (
     start_initializing_persistence,
     clean_up_persistence,
@@ -14,8 +15,10 @@ from ._tables import (
     migration_table,
     protocol_table,
     analysis_table,
+    analysis_cache_table,
     run_table,
     action_table,
+    run_command_table,
 )
 
 
@@ -23,12 +26,15 @@ __all__ = [
     # database utilities and helpers
     "create_sql_engine",
     "sqlite_rowid",
+    "run_in_db_thread",
     # database tables
     "migration_table",
     "protocol_table",
     "analysis_table",
+    "analysis_cache_table",
     "run_table",
     "action_table",
+    "run_command_table",
     # initialization and teardown
     "start_initializing_persistence",
     "clean_up_persistence",
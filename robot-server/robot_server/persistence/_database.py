@@ -2,6 +2,7 @@
 from pathlib import Path
 
 import sqlalchemy
+from typing_extensions import Final
 
 from ._tables import add_tables_to_db
 from ._migrations import migrate
@@ -22,6 +23,14 @@ from ._migrations import migrate
 sqlite_rowid = sqlalchemy.column("_ROWID_")
 
 
+# How many prepared statements each connection keeps for reuse.
+# This should cover every distinct statement that the stores run.
+_PREPARED_STATEMENT_CACHE_SIZE: Final = 256
+
+# How much of the database each connection keeps in memory. SQLite defaults to 2 MiB.
+_PAGE_CACHE_SIZE_KIB: Final = 4 * 1024
+
+
 def create_sql_engine(path: Path) -> sqlalchemy.engine.Engine:
     """Create a SQL engine with tables and migrations.
 
@@ -47,17 +56,39 @@ def _open_db_no_cleanup(db_file_path: Path) -> sqlalchemy.engine.Engine:
         # sqlite://<hostname>/<path>
         # where <hostname> is empty.
         f"sqlite:///{db_file_path}",
+        # For SQLite files, SQLAlchemy defaults to opening a new connection
+        # for every transaction. Keep them open instead, so each connection's
+        # settings and prepared statements are reused.
+        poolclass=sqlalchemy.pool.QueuePool,
+        connect_args={
+            # Pooled connections are handed between threads,
+            # but only ever used by one thread at a time.
+            "check_same_thread": False,
+            "cached_statements": _PREPARED_STATEMENT_CACHE_SIZE,
+        },
     )
 
-    # Enable foreign key support in sqlite
-    # https://docs.sqlalchemy.org/en/14/dialects/sqlite.html#foreign-key-support
     @sqlalchemy.event.listens_for(engine, "connect")  # type: ignore[misc]
     def _set_sqlite_pragma(
         dbapi_connection: sqlalchemy.engine.CursorResult,
         connection_record: sqlalchemy.engine.CursorResult,
     ) -> None:
         cursor = dbapi_connection.cursor()
+        # Enable foreign key support in sqlite
+        # https://docs.sqlalchemy.org/en/14/dialects/sqlite.html#foreign-key-support
         cursor.execute("PRAGMA foreign_keys=ON;")
+        # Write-ahead logging lets reads proceed while a write is in progress,
+        # and commits with one sequential write instead of rewriting pages
+        # in place, which is much faster on SD cards.
+        # https://www.sqlite.org/wal.html
+        cursor.execute("PRAGMA journal_mode=WAL;")
+        # Sync the write-ahead log to storage on every commit, so a commit
+        # survives a power loss. Runs save their commands in batches while they
+        # progress, so that losing power mid-run only loses the latest batch.
+        # NORMAL would only sync at checkpoints, which can be many batches apart.
+        cursor.execute("PRAGMA synchronous=FULL;")
+        # A negative size is in KiB, instead of pages.
+        cursor.execute(f"PRAGMA cache_size=-{_PAGE_CACHE_SIZE_KIB};")
         cursor.close()
 
     return engine
@@ -0,0 +1,47 @@
+"""A dedicated thread for blocking database work."""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+
+_T = TypeVar("_T")
+
+
+# SQLite only allows one writer at a time anyway, so one thread is enough.
+# Unlike anyio's shared worker threads, this one isn't busy parsing
+# protocols and analyses when a quick query needs to run.
+#
+# What runs here:
+#   * Every query of CompletedAnalysisStore, reads included.
+#   * Pages of a run's commands (RunStore.get_commands_slice), which clients
+#     poll and which aren't memoized.
+#   * Writes made while a run or analysis may be in progress: saving a run's
+#     commands and state (RunStore.insert_commands, update_run_state),
+#     run actions (RunStore.insert_action), protocols and their sources
+#     (ProtocolStore.insert, and sources re-read from protocol files),
+#     and the legacy row re-encoder's reads and writes.
+#
+# What doesn't: RunStore's and ProtocolStore's other reads stay synchronous
+# on the event loop, since they're memoized with lru_cache and most calls
+# are cache hits. So do their other writes, like creating and removing runs,
+# which happen between runs.
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="robot_server_db")
+
+
+async def run_in_db_thread(function: Callable[..., _T], *args: object) -> _T:
+    """Run a blocking database function in the database thread.
+
+    Calls run one at a time, in the order they're made. Like
+    `anyio.to_thread.run_sync()`, cancelling the caller doesn't interrupt
+    the function: the cancellation takes effect once the function returns,
+    so its transaction is never left half-done.
+    """
+    future = asyncio.get_running_loop().run_in_executor(
+        _executor, functools.partial(function, *args)
+    )
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        await asyncio.wait([future])
+        raise
@@ -1,4 +1,5 @@
 import asyncio
+import contextlib
 import logging
 from pathlib import Path
 from typing import Optional
@@ -17,6 +18,7 @@ from server_utils.fastapi_utils.app_state import (
 from robot_server.errors import ErrorDetails
 
 from ._database import create_sql_engine
+from ._legacy_row_reencoding import reencode_legacy_rows
 from ._persistence_directory import (
     PersistenceResetter,
     prepare as prepare_persistence_directory,
@@ -35,6 +37,9 @@ _directory_init_task_accessor = AppStateAccessor["asyncio.Task[Path]"](
 _sql_engine_init_task_accessor = AppStateAccessor["asyncio.Task[SQLEngine]"](
     "persistence_sql_engine_init_task"
 )
+_legacy_row_reencoding_task_accessor = AppStateAccessor["asyncio.Task[None]"](
+    "persistence_legacy_row_reencoding_task"
+)
 
 
 class DatabaseNotYetInitialized(ErrorDetails):
@@ -106,14 +111,44 @@ def start_initializing_persistence(
         app_state=app_state, value=sql_engine_init_task
     )
 
+    legacy_row_reencoding_task = asyncio.create_task(
+        _reencode_legacy_rows_and_log(sql_engine_init_task)
+    )
+    _legacy_row_reencoding_task_accessor.set_on(
+        app_state=app_state, value=legacy_row_reencoding_task
+    )
+
+
+async def _reencode_legacy_rows_and_log(
+    sql_engine_init_task: "asyncio.Task[SQLEngine]",
+) -> None:
+    try:
+        sql_engine = await sql_engine_init_task
+    except Exception:
+        # Already logged by start_initializing_persistence().
+        return
+
+    try:
+        await reencode_legacy_rows(sql_engine)
+    except Exception:
+        _log.exception("Exception re-encoding legacy database rows in the background.")
+
 
 async def clean_up_persistence(app_state: AppState) -> None:
     """Clean up the persistence layer.
 
     This should be called exactly once at server shutdown.
     """
+    legacy_row_reencoding_task = _legacy_row_reencoding_task_accessor.get_from(
+        app_state=app_state
+    )
     sql_engine_init_task = _sql_engine_init_task_accessor.get_from(app_state=app_state)
     directory_init_task = _directory_init_task_accessor.get_from(app_state=app_state)
+    if legacy_row_reencoding_task is not None:
+        # Whatever's left will be re-encoded the next time the server starts.
+        legacy_row_reencoding_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await legacy_row_reencoding_task
     if sql_engine_init_task is not None:
         sql_engine = await sql_engine_init_task
         sql_engine.dispose()
@@ -0,0 +1,169 @@
+"""Re-encode stored data that older robot-server versions pickled.
+
+Legacy pickles stay readable, so this isn't a schema migration that has to
+finish before the server starts. It runs in the background instead, a few rows
+at a time, so that reading those rows gets faster without delaying startup.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import anyio
+import sqlalchemy
+from typing_extensions import Final
+
+from . import compressed_json
+from ._db_thread import run_in_db_thread
+from ._tables import analysis_table, analysis_cache_table, run_table
+
+
+_log = logging.getLogger(__name__)
+
+# How many rows to read, re-encode, and write back at a time.
+_BATCH_SIZE: Final = 5
+
+# How long to yield the database to other work between batches.
+_PAUSE_BETWEEN_BATCHES_SECONDS: Final = 0.5
+
+# Each column that may hold legacy pickles, and the primary key of its table.
+_ENCODED_COLUMNS: Final[List[Tuple[sqlalchemy.Column, sqlalchemy.Column]]] = [
+    (analysis_table.c.id, analysis_table.c.completed_analysis),
+    (analysis_cache_table.c.cache_key, analysis_cache_table.c.completed_analysis),
+    (run_table.c.id, run_table.c.state_summary),
+]
+
+
+@dataclass(frozen=True)
+class _LegacyRowBatch:
+    key_column: sqlalchemy.Column
+    data_column: sqlalchemy.Column
+    rows: List[Tuple[str, bytes]]
+
+
+# The key, legacy data, and re-encoded data of each row to update.
+_ReencodedRows = List[Tuple[str, bytes, bytes]]
+
+
+class LegacyRowReencoder:
+    """Re-encode legacy pickled rows with `compressed_json`, one batch at a time.
+
+    Rows are visited in primary key order, so each row is only tried once,
+    even if it can't be re-encoded.
+    """
+
+    def __init__(
+        self, sql_engine: sqlalchemy.engine.Engine, batch_size: int = _BATCH_SIZE
+    ) -> None:
+        self._sql_engine = sql_engine
+        self._batch_size = batch_size
+        self._column_index = 0
+        self._last_keys: Dict[int, str] = {}
+
+    def reencode_batch(self) -> bool:
+        """Re-encode the next batch of legacy rows, all in the calling thread.
+
+        Returns:
+            Whether every legacy row has now been visited.
+        """
+        batch = self.read_batch()
+
+        if batch is not None:
+            self.write_batch(batch, _reencode_rows(batch))
+
+        return self._column_index >= len(_ENCODED_COLUMNS)
+
+    def read_batch(self) -> Optional[_LegacyRowBatch]:
+        """Read the next batch of legacy rows, which may be empty.
+
+        Returns:
+            The batch, or `None` if every legacy row was already visited.
+        """
+        if self._column_index >= len(_ENCODED_COLUMNS):
+            return None
+
+        key_column, data_column = _ENCODED_COLUMNS[self._column_index]
+        statement = (
+            sqlalchemy.select(key_column, data_column)
+            .where(data_column.is_not(None))
+            .where(
+                sqlalchemy.func.substr(data_column, 1, len(compressed_json.MAGIC))
+                != compressed_json.MAGIC
+            )
+            .order_by(key_column)
+            .limit(self._batch_size)
+        )
+        last_key = self._last_keys.get(self._column_index)
+        if last_key is not None:
+            statement = statement.where(key_column > last_key)
+
+        with self._sql_engine.begin() as transaction:
+            rows = [(key, data) for key, data in transaction.execute(statement)]
+
+        if len(rows) < self._batch_size:
+            self._column_index += 1
+        else:
+            self._last_keys[self._column_index] = rows[-1][0]
+
+        return _LegacyRowBatch(
+            key_column=key_column, data_column=data_column, rows=rows
+        )
+
+    def write_batch(self, batch: _LegacyRowBatch, reencoded: _ReencodedRows) -> None:
+        """Write back re-encoded rows from a batch, in one short transaction."""
+        if not reencoded:
+            return
+
+        with self._sql_engine.begin() as transaction:
+            for key, legacy_data, reencoded_data in reencoded:
+                # Only replace the data that was just read,
+                # in case something else has written newer data since.
+                transaction.execute(
+                    sqlalchemy.update(batch.key_column.table)
+                    .where(batch.key_column == key)
+                    .where(batch.data_column == legacy_data)
+                    .values({batch.data_column.name: reencoded_data})
+                )
+
+
+def _reencode_rows(batch: _LegacyRowBatch) -> _ReencodedRows:
+    """Re-encode a batch's rows, skipping any that can't be.
+
+    This is CPU-heavy, so do it outside of any transaction,
+    to avoid holding SQLite's write lock.
+    """
+    reencoded: _ReencodedRows = []
+
+    for key, legacy_data in batch.rows:
+        try:
+            reencoded_data = compressed_json.dumps(compressed_json.loads(legacy_data))
+        except Exception:
+            _log.warning(
+                f'Could not re-encode "{key}" in {batch.key_column.table.name}.'
+                f" Leaving it as a legacy pickle.",
+                exc_info=True,
+            )
+            continue
+        reencoded.append((key, legacy_data, reencoded_data))
+
+    return reencoded
+
+
+async def reencode_legacy_rows(sql_engine: sqlalchemy.engine.Engine) -> None:
+    """Re-encode all legacy pickled rows, in the background.
+
+    Rows are read and written in the database thread, like other database work,
+    and re-encoded in a worker thread, so the database thread stays free for
+    requests in the meantime. This can be cancelled between steps.
+    """
+    reencoder = LegacyRowReencoder(sql_engine)
+
+    while True:
+        batch = await run_in_db_thread(reencoder.read_batch)
+
+        if batch is None:
+            return
+
+        reencoded = await anyio.to_thread.run_sync(_reencode_rows, batch)
+        await run_in_db_thread(reencoder.write_batch, batch, reencoded)
+        await asyncio.sleep(_PAUSE_BETWEEN_BATCHES_SECONDS)
@@ -23,17 +23,43 @@ Database schema versions:
     - `run_table.commands` column added
     - `run_table.engine_status` column added
     - `run_table._updated_at` column added
+- Version 2
+    - `analysis_cache_table` added
+- Version 3
+    - `protocol_table.source` column added
+- Version 4
+    - `run_command_table` added
+    - Commands copied from `run_table.commands` to `run_command_table`
+- Version 5
+    - Index added on `action_table.run_id`
+- Version 6
+    - `analysis_table.completed_analysis`, `analysis_cache_table.completed_analysis`,
+      and `run_table.state_summary` are written as compressed JSON
+      (see `compressed_json`) instead of pickles. Existing pickled rows stay
+      readable, and are re-encoded in the background after startup.
+    - Downgrading below this version is not supported. Older software
+      can't read the compressed JSON rows, so their analyses and runs will fail
+      to load.
+- Version 7
+    - `run_table.commands` cleared. It's been superseded by `run_command_table`
+      since version 4, and was only kept for downgrades below version 6.
+- Version 8
+    - `protocol_table.content_hash` column added, with an index
+    - Filled in from each protocol's stored `source`, where it has one
 """
+import json
 import logging
 from datetime import datetime, timezone
-from typing import Optional
+from enum import Enum
+from typing import Any, Dict, Optional
 from typing_extensions import Final
 
 import sqlalchemy
+from pydantic.json import pydantic_encoder
 
-from ._tables import migration_table, run_table
+from ._tables import migration_table, protocol_table, run_table, run_command_table
 
-_LATEST_SCHEMA_VERSION: Final = 1
+_LATEST_SCHEMA_VERSION: Final = 8
 
 _log = logging.getLogger(__name__)
 
@@ -54,6 +80,28 @@ def migrate(sql_engine: sqlalchemy.engine.Engine) -> None:
             if version < 1:
                 _migrate_0_to_1(transaction)
 
+            # Version 2 only added a new table,
+            # which SQLAlchemy has already created.
+
+            if version < 3:
+                _migrate_2_to_3(transaction)
+
+            if version < 4:
+                _migrate_3_to_4(transaction)
+
+            if version < 5:
+                _migrate_4_to_5(transaction)
+
+            # Version 6 only changed how new rows are encoded.
+            # Existing rows are re-encoded in the background after startup,
+            # by `_legacy_row_reencoding`.
+
+            if version < 7:
+                _migrate_6_to_7(transaction)
+
+            if version < 8:
+                _migrate_7_to_8(transaction)
+
             _log.info(
                 f"Migrated database from schema {version}"
                 f" to version {_LATEST_SCHEMA_VERSION}"
@@ -135,3 +183,123 @@ def _migrate_0_to_1(transaction: sqlalchemy.engine.Connection) -> None:
     transaction.execute(add_commands_column)
     transaction.execute(add_status_column)
     transaction.execute(add_updated_at_column)
+
+
+def _migrate_2_to_3(transaction: sqlalchemy.engine.Connection) -> None:
+    """Migrate to schema version 3.
+
+    This migration adds the following nullable column to the protocol table:
+
+    - Column("source", sqlalchemy.String, nullable=True)
+    """
+    add_source_column = sqlalchemy.text("ALTER TABLE protocol ADD source VARCHAR")
+
+    transaction.execute(add_source_column)
+
+
+def _migrate_3_to_4(transaction: sqlalchemy.engine.Connection) -> None:
+    """Migrate to schema version 4.
+
+    SQLAlchemy has already created the new run command table. This migration
+    fills it with the commands of existing runs, from the run table's
+    pickled `commands` column.
+
+    The `commands` column is cleared later, by `_migrate_6_to_7`.
+    """
+    select_run_commands = sqlalchemy.select(run_table.c.id, run_table.c.commands).where(
+        run_table.c.commands.is_not(None)
+    )
+
+    for row in transaction.execute(select_run_commands).all():
+        command_rows = [
+            _convert_legacy_command_to_sql_values(
+                run_id=row.id, index_in_run=index, command=command
+            )
+            for index, command in enumerate(row.commands)
+        ]
+
+        if len(command_rows) > 0:
+            transaction.execute(sqlalchemy.insert(run_command_table), command_rows)
+
+
+def _migrate_4_to_5(transaction: sqlalchemy.engine.Connection) -> None:
+    """Migrate to schema version 5.
+
+    This migration adds an index on the action table's `run_id` column.
+    SQLAlchemy only creates the indexes of tables that it creates itself,
+    so existing action tables need theirs created here.
+    """
+    add_run_id_index = sqlalchemy.text(
+        "CREATE INDEX IF NOT EXISTS ix_action_run_id ON action (run_id)"
+    )
+
+    transaction.execute(add_run_id_index)
+
+
+def _migrate_6_to_7(transaction: sqlalchemy.engine.Connection) -> None:
+    """Migrate to schema version 7.
+
+    This migration clears the run table's legacy `commands` column.
+    Its commands were copied to the run command table by `_migrate_3_to_4`,
+    and software that could still read the column can't read version 6
+    databases anyway, so it was only taking up space.
+    """
+    clear_run_commands = (
+        sqlalchemy.update(run_table)
+        .where(run_table.c.commands.is_not(None))
+        .values(commands=None)
+    )
+
+    transaction.execute(clear_run_commands)
+
+
+def _migrate_7_to_8(transaction: sqlalchemy.engine.Connection) -> None:
+    """Migrate to schema version 8.
+
+    This migration adds the following nullable, indexed column to the protocol table,
+    and fills it in from the content hash in each protocol's stored source:
+
+    - Column("content_hash", sqlalchemy.String, index=True, nullable=True)
+
+    Protocols without a stored source get their content hash
+    when their source is first read from their files.
+    """
+    add_content_hash_column = sqlalchemy.text(
+        "ALTER TABLE protocol ADD content_hash VARCHAR"
+    )
+    add_content_hash_index = sqlalchemy.text(
+        "CREATE INDEX IF NOT EXISTS ix_protocol_content_hash"
+        " ON protocol (content_hash)"
+    )
+    select_sources = sqlalchemy.select(
+        protocol_table.c.id, protocol_table.c.source
+    ).where(protocol_table.c.source.is_not(None))
+
+    transaction.execute(add_content_hash_column)
+    transaction.execute(add_content_hash_index)
+
+    for row in transaction.execute(select_sources).all():
+        try:
+            content_hash = json.loads(row.source)["contentHash"]
+        except (ValueError, KeyError, TypeError):
+            continue
+
+        transaction.execute(
+            sqlalchemy.update(protocol_table)
+            .where(protocol_table.c.id == row.id)
+            .values(content_hash=content_hash)
+        )
+
+
+def _convert_legacy_command_to_sql_values(
+    run_id: str, index_in_run: int, command: Dict[str, Any]
+) -> Dict[str, object]:
+    status = command["status"]
+
+    return {
+        "run_id": run_id,
+        "index_in_run": index_in_run,
+        "command_id": command["id"],
+        "command_status": status.value if isinstance(status, Enum) else status,
+        "command": json.dumps(command, default=pydantic_encoder),
+    }
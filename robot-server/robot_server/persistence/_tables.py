@@ -32,6 +32,12 @@ protocol_table = sqlalchemy.Table(
         nullable=False,
     ),
     sqlalchemy.Column("protocol_key", sqlalchemy.String, nullable=True),
+    # column added in schema v3
+    sqlalchemy.Column("source", sqlalchemy.String, nullable=True),
+    # column added in schema v8
+    # Null until the protocol's source has been read, for protocols added
+    # by software that didn't store a source.
+    sqlalchemy.Column("content_hash", sqlalchemy.String, index=True, nullable=True),
 )
 
 analysis_table = sqlalchemy.Table(
@@ -54,6 +60,26 @@ analysis_table = sqlalchemy.Table(
         sqlalchemy.String,
         nullable=False,
     ),
+    # Encoded with `compressed_json`. Older rows may still hold legacy pickles.
+    sqlalchemy.Column(
+        "completed_analysis",
+        sqlalchemy.LargeBinary,
+        nullable=False,
+    ),
+)
+
+# Completed analyses keyed by everything that determines their contents,
+# so that identical protocols don't have to be re-analyzed.
+# Rows aren't tied to any protocol, so they outlive protocol deletion.
+analysis_cache_table = sqlalchemy.Table(
+    "analysis_cache",
+    _metadata,
+    sqlalchemy.Column(
+        "cache_key",
+        sqlalchemy.String,
+        primary_key=True,
+    ),
+    # Encoded with `compressed_json`. Older rows may still hold legacy pickles.
     sqlalchemy.Column(
         "completed_analysis",
         sqlalchemy.LargeBinary,
@@ -82,12 +108,15 @@ run_table = sqlalchemy.Table(
         nullable=True,
     ),
     # column added in schema v1
+    # Encoded with `compressed_json`. Older rows may still hold legacy pickles.
     sqlalchemy.Column(
         "state_summary",
-        sqlalchemy.PickleType(pickler=legacy_pickle),
+        sqlalchemy.LargeBinary,
         nullable=True,
     ),
     # column added in schema v1
+    # Superseded by run_command_table in schema v4, and cleared in schema v7.
+    # No longer read or written.
     sqlalchemy.Column(
         "commands",
         sqlalchemy.PickleType(pickler=legacy_pickle),
@@ -113,11 +142,39 @@ action_table = sqlalchemy.Table(
         "run_id",
         sqlalchemy.String,
         sqlalchemy.ForeignKey("run.id"),
+        # index added in schema v5
+        index=True,
         nullable=False,
     ),
 )
 
 
+# One row per command of a run, so that commands can be read one at a time
+# instead of loading a run's entire command list.
+# Table added in schema v4.
+run_command_table = sqlalchemy.Table(
+    "run_command",
+    _metadata,
+    sqlalchemy.Column("row_id", sqlalchemy.Integer, primary_key=True),
+    sqlalchemy.Column(
+        "run_id",
+        sqlalchemy.String,
+        sqlalchemy.ForeignKey("run.id"),
+        nullable=False,
+    ),
+    sqlalchemy.Column("index_in_run", sqlalchemy.Integer, nullable=False),
+    sqlalchemy.Column("command_id", sqlalchemy.String, nullable=False),
+    sqlalchemy.Column("command_status", sqlalchemy.String, nullable=False),
+    # The command, serialized as JSON.
+    sqlalchemy.Column("command", sqlalchemy.String, nullable=False),
+    # SQLite backs this constraint with an index, for slicing a run's commands.
+    sqlalchemy.UniqueConstraint("run_id", "index_in_run"),
+    sqlalchemy.Index(
+        "ix_run_command_run_id_command_id", "run_id", "command_id", unique=True
+    ),
+)
+
+
 def add_tables_to_db(sql_engine: sqlalchemy.engine.Engine) -> None:
     """Create the necessary database tables to back all data stores.
 
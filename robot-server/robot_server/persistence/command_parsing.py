@@ -0,0 +1,33 @@
+"""Parse stored ProtocolEngine commands without trying every command type."""
+from functools import lru_cache
+from typing import Any, Dict, Type
+
+from pydantic import parse_obj_as
+from typing_extensions import get_args
+
+from opentrons.protocol_engine.commands import Command
+
+
+def parse_command(obj: object) -> Command:
+    """Parse a command from the data returned by `Command.dict()` or its JSON.
+
+    `parse_obj_as(Command, obj)` tries each type in the `Command` union in turn,
+    validating fields, like the command's timestamps, until one succeeds.
+    This looks up the command's type by its `commandType` instead, which is
+    much faster when parsing a whole analysis or run.
+    """
+    if isinstance(obj, dict):
+        command_class = _get_command_classes().get(obj.get("commandType"))
+        if command_class is not None:
+            return command_class.parse_obj(obj)
+
+    # Fall back to the union so unknown commands fail with the usual errors.
+    return parse_obj_as(Command, obj)  # type: ignore[arg-type]
+
+
+@lru_cache(maxsize=1)
+def _get_command_classes() -> Dict[Any, Type[Command]]:
+    return {
+        command_class.__fields__["commandType"].default: command_class
+        for command_class in get_args(Command)
+    }
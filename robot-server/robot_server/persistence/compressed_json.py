@@ -0,0 +1,62 @@
+"""Encode large stored objects as versioned, compressed JSON.
+
+Older robot-server versions pickled these objects. Pickles are slow to load,
+since each stored type has to be looked up by name (see `legacy_pickle`),
+and they can only be read back by Python code that knows those types.
+
+Data encoded by this module starts with a short header, so it can be told apart
+from legacy pickles, which `loads()` still reads.
+"""
+import json
+import zlib
+from typing import Any
+
+from pydantic.json import pydantic_encoder
+from typing_extensions import Final
+
+from . import legacy_pickle
+
+
+# Everything encoded by `dumps()` starts with this.
+# Pickles never start with a null byte, so this can't be mistaken for one.
+MAGIC: Final = b"\x00OTJ"
+
+# Bump this whenever the encoding below changes, and keep decoding older versions.
+FORMAT_VERSION: Final = 1
+
+_HEADER: Final = MAGIC + bytes([FORMAT_VERSION])
+
+# Higher levels only shrink analyses a little more, for several times the CPU time.
+_COMPRESSION_LEVEL: Final = 1
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode a Pydantic model, or plain data containing them, as compressed JSON.
+
+    The result holds the same data as `model.dict()`, with the values that
+    JSON can't represent, like datetimes and enums, encoded the way Pydantic
+    encodes them. Pass what `loads()` returns to `parse_obj()` to get the model back.
+    """
+    encoded = json.dumps(obj, default=pydantic_encoder, separators=(",", ":"))
+    return _HEADER + zlib.compress(encoded.encode("utf-8"), _COMPRESSION_LEVEL)
+
+
+def loads(data: bytes) -> object:
+    """Decode data encoded by `dumps()`, or pickled by an older robot-server version.
+
+    Raises:
+        ValueError: The data was encoded by a newer version of this module.
+    """
+    if not is_compressed_json(data):
+        return legacy_pickle.loads(data)
+
+    format_version = data[len(MAGIC)]
+    if format_version != FORMAT_VERSION:
+        raise ValueError(f"Unknown stored data format version {format_version}.")
+
+    return json.loads(zlib.decompress(data[len(_HEADER) :]))
+
+
+def is_compressed_json(data: bytes) -> bool:
+    """Return whether the data was encoded by `dumps()`, as opposed to pickled."""
+    return data.startswith(MAGIC)
@@ -0,0 +1,242 @@
+"""Run protocol analyses in a pool of worker processes."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import traceback
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Optional, Tuple
+
+import anyio
+
+from opentrons import protocol_runner
+from opentrons.protocol_reader import ProtocolSource
+
+
+log = logging.getLogger(__name__)
+
+# Modules to import in the fork server before any worker is forked from it,
+# so that each new worker starts with them already imported.
+#
+# create_simulating_runner imports OT3API inline, the first time it's asked to
+# simulate an OT-3, which costs more than building and homing the simulator
+# itself. Modules that fail to import, like OT3API on an OT-2, are skipped.
+_WORKER_PRELOAD_MODULES = [
+    "opentrons.protocol_runner",
+    "opentrons.hardware_control.ot3api",
+]
+
+
+class AnalysisTimeoutError(RuntimeError):
+    """Raised when an analysis takes longer than it's allowed to."""
+
+
+class AnalysisWorkerError(RuntimeError):
+    """Raised when an analysis fails unexpectedly inside a worker process.
+
+    The message is the traceback of the original error in the worker.
+    """
+
+
+class AnalysisExecutor:
+    """Run protocol analyses in a bounded pool of worker processes.
+
+    Running an analysis in the server process means a heavy protocol
+    competes with HTTP handling and the hardware event loop for the GIL.
+    This executor instead keeps a fixed number of worker processes, forked
+    with the `opentrons` package already imported, and hands each one
+    a single analysis at a time. Analyses beyond the pool size wait in a queue.
+
+    Cancelling an analysis, or letting it time out, kills its worker process
+    and replaces it with a fresh one.
+    """
+
+    def __init__(self, worker_count: int, timeout: Optional[float] = None) -> None:
+        """Initialize the executor. Call `start` before analyzing anything.
+
+        Arguments:
+            worker_count: How many worker processes to keep running.
+            timeout: How long, in seconds, a single analysis may run
+                once a worker has picked it up. `None` means no limit.
+        """
+        assert worker_count > 0, "An AnalysisExecutor needs at least one worker."
+        self._worker_count = worker_count
+        self._timeout = timeout
+        self._context = multiprocessing.get_context("forkserver")
+        self._context.set_forkserver_preload(_WORKER_PRELOAD_MODULES)
+        self._workers: List[_Worker] = []
+        self._idle_workers: Optional["asyncio.Queue[_Worker]"] = None
+        self._queue_depth = 0
+        self._tasks_by_analysis_id: Dict[str, "asyncio.Task[Any]"] = {}
+
+    async def start(self) -> None:
+        """Start the pool's worker processes."""
+        idle_workers: "asyncio.Queue[_Worker]" = asyncio.Queue()
+
+        for _ in range(self._worker_count):
+            worker = await anyio.to_thread.run_sync(_Worker, self._context)
+            self._workers.append(worker)
+            idle_workers.put_nowait(worker)
+
+        self._idle_workers = idle_workers
+
+    async def close(self) -> None:
+        """Cancel all analyses and stop every worker process."""
+        for task in list(self._tasks_by_analysis_id.values()):
+            task.cancel()
+
+        workers = self._workers
+        self._workers = []
+
+        for worker in workers:
+            await anyio.to_thread.run_sync(worker.stop)
+
+    def get_queue_depth(self) -> int:
+        """Get the number of analyses waiting for a free worker."""
+        return self._queue_depth
+
+    def cancel(self, analysis_id: str) -> bool:
+        """Cancel an analysis, whether it's still queued or already running.
+
+        Returns:
+            Whether an analysis with the given ID was found to cancel.
+        """
+        task = self._tasks_by_analysis_id.get(analysis_id)
+
+        if task is None:
+            return False
+
+        task.cancel()
+        return True
+
+    async def analyze(
+        self,
+        analysis_id: str,
+        protocol_source: ProtocolSource,
+    ) -> protocol_runner.RunResult:
+        """Analyze a protocol in a worker process, waiting for a free one first.
+
+        Raises:
+            AnalysisTimeoutError: The analysis ran for longer than the timeout.
+            AnalysisWorkerError: The analysis raised an unexpected error,
+                or its worker process exited before finishing it.
+            asyncio.CancelledError: The analysis was cancelled with `cancel`.
+        """
+        assert self._idle_workers is not None, "AnalysisExecutor was not started."
+        current_task = asyncio.current_task()
+        assert current_task is not None
+        self._tasks_by_analysis_id[analysis_id] = current_task
+
+        try:
+            worker = await self._get_idle_worker(analysis_id)
+            succeeded, payload = await self._run_on_worker(worker, protocol_source)
+        finally:
+            del self._tasks_by_analysis_id[analysis_id]
+
+        if not succeeded:
+            raise AnalysisWorkerError(payload)
+
+        result: protocol_runner.RunResult = payload
+        return result
+
+    async def _get_idle_worker(self, analysis_id: str) -> _Worker:
+        assert self._idle_workers is not None
+        self._queue_depth += 1
+        log.info(
+            f'Queued analysis "{analysis_id}";'
+            f" {self._queue_depth} analyses waiting for a worker."
+        )
+
+        try:
+            return await self._idle_workers.get()
+        finally:
+            self._queue_depth -= 1
+
+    async def _run_on_worker(
+        self, worker: _Worker, protocol_source: ProtocolSource
+    ) -> Tuple[bool, Any]:
+        assert self._idle_workers is not None
+        worker_is_reusable = False
+
+        try:
+            worker.connection.send(protocol_source)
+            response: Tuple[bool, Any] = await asyncio.wait_for(
+                asyncio.get_running_loop().run_in_executor(
+                    None, worker.connection.recv
+                ),
+                timeout=self._timeout,
+            )
+            worker_is_reusable = True
+            return response
+
+        except asyncio.TimeoutError as e:
+            raise AnalysisTimeoutError(
+                f"Analysis did not complete within {self._timeout} seconds."
+            ) from e
+
+        except (EOFError, OSError) as e:
+            # The worker process died, or its pipe broke, before it could reply.
+            raise AnalysisWorkerError(
+                f"Analysis worker process exited unexpectedly: {e!r}"
+            ) from e
+
+        finally:
+            if not worker_is_reusable:
+                # The worker may still be busy, so replace it with a fresh one.
+                await self._replace_worker(worker)
+            else:
+                self._idle_workers.put_nowait(worker)
+
+    async def _replace_worker(self, worker: _Worker) -> None:
+        assert self._idle_workers is not None
+        await anyio.to_thread.run_sync(worker.stop)
+
+        if worker in self._workers:
+            self._workers.remove(worker)
+            new_worker = await anyio.to_thread.run_sync(_Worker, self._context)
+            self._workers.append(new_worker)
+            self._idle_workers.put_nowait(new_worker)
+
+
+class _Worker:
+    """A worker process and the parent's end of a pipe to it."""
+
+    def __init__(self, context: Any) -> None:
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_run_worker,
+            args=(child_connection,),
+            name="protocol-analysis-worker",
+            daemon=True,
+        )
+        self.process.start()
+        child_connection.close()
+
+    def stop(self) -> None:
+        self.process.terminate()
+        self.process.join()
+        self.connection.close()
+
+
+def _run_worker(connection: Connection) -> None:
+    """Analyze protocol sources from the connection until it closes."""
+    while True:
+        try:
+            protocol_source: ProtocolSource = connection.recv()
+        except EOFError:
+            return
+
+        try:
+            result = asyncio.run(_analyze(protocol_source))
+            connection.send((True, result))
+        except Exception:
+            connection.send((False, traceback.format_exc()))
+
+
+async def _analyze(protocol_source: ProtocolSource) -> protocol_runner.RunResult:
+    runner = await protocol_runner.create_simulating_runner(
+        robot_type=protocol_source.robot_type,
+        protocol_config=protocol_source.config,
+    )
+    return await runner.run(protocol_source)
@@ -2,7 +2,7 @@
 # TODO(mc, 2021-08-25): add modules to simulation result
 from enum import Enum
 from pydantic import BaseModel, Field
-from typing import List, Union
+from typing import List, Optional, Union
 from typing_extensions import Literal
 
 from opentrons.protocol_engine import (
@@ -13,6 +13,7 @@ from opentrons.protocol_engine import (
     LoadedPipette,
     Liquid,
 )
+from opentrons.protocol_runner import DurationEstimate
 
 
 class AnalysisStatus(str, Enum):
@@ -45,13 +46,34 @@ class AnalysisSummary(BaseModel):
 
 
 class PendingAnalysis(BaseModel):
-    """A protocol analysis that is on-going."""
+    """A protocol analysis that is on-going.
+
+    While the protocol is being simulated, this reports the equipment
+    it has loaded so far. Use `GET /protocols/{protocolId}/analyses/{analysisId}/commands`
+    to page through the commands it has produced so far.
+    """
 
     id: str = Field(..., description="Unique identifier of this analysis resource")
     status: Literal[AnalysisStatus.PENDING] = Field(
         AnalysisStatus.PENDING,
         description="Status marking the analysis as pending",
     )
+    pipettes: List[LoadedPipette] = Field(
+        default_factory=list,
+        description="Pipettes that the protocol has loaded so far",
+    )
+    labware: List[LoadedLabware] = Field(
+        default_factory=list,
+        description="Labware that the protocol has loaded so far",
+    )
+    modules: List[LoadedModule] = Field(
+        default_factory=list,
+        description="Modules that the protocol has loaded so far",
+    )
+    liquids: List[Liquid] = Field(
+        default_factory=list,
+        description="Liquids that the protocol has loaded so far",
+    )
 
 
 class CompletedAnalysis(BaseModel):
@@ -114,6 +136,14 @@ class CompletedAnalysis(BaseModel):
         default_factory=list,
         description="Liquids used by the protocol",
     )
+    durationEstimate: Optional[DurationEstimate] = Field(
+        None,
+        description=(
+            "How long the protocol is expected to take to run,"
+            " overall and per command."
+            " Absent if the analysis could not produce an estimate."
+        ),
+    )
 
 
 ProtocolAnalysis = Union[PendingAnalysis, CompletedAnalysis]
@@ -2,20 +2,29 @@
 from __future__ import annotations
 
 
+from hashlib import md5
 from logging import getLogger
 from typing import Dict, List, Optional
 from typing_extensions import Final
 
 import sqlalchemy
 
+from opentrons_shared_data.robot.dev_types import RobotType
+from opentrons._version import version as _opentrons_version
+from opentrons.config import feature_flags
 from opentrons.protocol_engine import (
     Command,
+    CommandSlice,
     ErrorOccurrence,
     LoadedPipette,
     LoadedLabware,
     LoadedModule,
     Liquid,
+    StateView,
 )
+from opentrons.protocol_runner import DurationEstimate
+
+from robot_server._version import version as _robot_server_version
 
 from .analysis_models import (
     AnalysisSummary,
@@ -57,6 +66,29 @@ _CURRENT_ANALYZER_VERSION: Final = "initial"
 _CACHE_MAX_SIZE: Final = 32
 
 
+def get_analysis_cache_key(content_hash: str, robot_type: RobotType) -> str:
+    """Get a key identifying everything that determines a protocol's analysis.
+
+    Two analyses with the same key are expected to have the same results,
+    so a completed analysis can be reused for any protocol with a matching key.
+
+    Args:
+        content_hash: The `ProtocolSource.content_hash` of the protocol's files.
+        robot_type: The robot type that the protocol is analyzed for.
+    """
+    key_parts = [
+        content_hash,
+        robot_type,
+        _CURRENT_ANALYZER_VERSION,
+        # Any software update may change how protocols simulate.
+        _opentrons_version,
+        _robot_server_version,
+        # Changes whether analysis uses virtual pipettes. See create_simulating_runner.
+        str(feature_flags.disable_fast_protocol_upload()),
+    ]
+    return md5("\n".join(key_parts).encode("utf-8")).hexdigest()
+
+
 class AnalysisNotFoundError(ValueError):
     """Exception raised if a given analysis is not found."""
 
@@ -114,6 +146,21 @@ class AnalysisStore:
         )
         return _summarize_pending(pending_analysis=new_pending_analysis)
 
+    def attach_live_state(self, analysis_id: str, state_view: StateView) -> None:
+        """Attach the live state of a running simulation to a pending analysis.
+
+        Until the analysis completes, its equipment and commands
+        will be read from this state, so clients can see partial results.
+
+        Args:
+            analysis_id: The ID of the pending analysis.
+                Must point to a valid pending analysis.
+            state_view: The state of the ProtocolEngine simulating the protocol.
+        """
+        self._pending_store.attach_live_state(
+            analysis_id=analysis_id, state_view=state_view
+        )
+
     async def update(
         self,
         analysis_id: str,
@@ -123,6 +170,8 @@ class AnalysisStore:
         pipettes: List[LoadedPipette],
         errors: List[ErrorOccurrence],
         liquids: List[Liquid],
+        duration_estimate: Optional[DurationEstimate] = None,
+        cache_key: Optional[str] = None,
     ) -> None:
         """Promote a pending analysis to completed, adding details of its results.
 
@@ -136,7 +185,10 @@ class AnalysisStore:
             errors: See `CompletedAnalysis.errors`. Also used to infer whether
                 the completed analysis result is `OK` or `NOT_OK`.
             liquids: See `CompletedAnalysis.liquids`.
+            duration_estimate: See `CompletedAnalysis.durationEstimate`.
             robot_type: See `CompletedAnalysis.robotType`.
+            cache_key: If provided, also cache the completed analysis under
+                this key, from `get_analysis_cache_key()`, for `update_from_cache()`.
         """
         protocol_id = self._pending_store.get_protocol_id(analysis_id=analysis_id)
 
@@ -159,7 +211,50 @@ class AnalysisStore:
             pipettes=pipettes,
             errors=errors,
             liquids=liquids,
+            durationEstimate=duration_estimate,
+        )
+        await self._add_completed(
+            protocol_id=protocol_id, completed_analysis=completed_analysis
+        )
+
+        if cache_key is not None:
+            await self._completed_store.add_to_cache(
+                cache_key=cache_key, completed_analysis=completed_analysis
+            )
+
+    async def update_from_cache(self, analysis_id: str, cache_key: str) -> bool:
+        """Promote a pending analysis to completed, using a cached analysis's results.
+
+        Args:
+            analysis_id: The ID of the analysis to promote.
+                Must point to a valid pending analysis.
+            cache_key: The key from `get_analysis_cache_key()` to look up.
+
+        Returns:
+            Whether a cached analysis was found. If not, the analysis stays pending.
+        """
+        protocol_id = self._pending_store.get_protocol_id(analysis_id=analysis_id)
+
+        assert (
+            protocol_id is not None
+        ), "Analysis ID to update must be for a valid pending analysis."
+
+        cached_analysis = await self._completed_store.get_by_cache_key(
+            cache_key=cache_key
         )
+
+        if cached_analysis is None:
+            return False
+
+        await self._add_completed(
+            protocol_id=protocol_id,
+            completed_analysis=cached_analysis.copy(update={"id": analysis_id}),
+        )
+        return True
+
+    async def _add_completed(
+        self, protocol_id: str, completed_analysis: CompletedAnalysis
+    ) -> None:
         completed_analysis_resource = CompletedAnalysisResource(
             id=completed_analysis.id,
             protocol_id=protocol_id,
@@ -170,7 +265,7 @@ class AnalysisStore:
             completed_analysis_resource=completed_analysis_resource
         )
 
-        self._pending_store.remove(analysis_id=analysis_id)
+        self._pending_store.remove(analysis_id=completed_analysis.id)
 
     async def get(self, analysis_id: str) -> ProtocolAnalysis:
         """Get a single protocol analysis by its ID.
@@ -190,6 +285,55 @@ class AnalysisStore:
         else:
             raise AnalysisNotFoundError(analysis_id=analysis_id)
 
+    async def get_command_slice(
+        self,
+        analysis_id: str,
+        cursor: int,
+        length: int,
+    ) -> CommandSlice:
+        """Get a slice of an analysis's commands.
+
+        For a pending analysis, these are the commands that its simulation
+        has produced so far, if its live state is attached.
+
+        Args:
+            analysis_id: The ID of the analysis to pull commands from.
+            cursor: The starting index of the slice in the whole collection.
+            length: Number of commands to return.
+
+        Returns:
+            A collection of commands as well as the actual cursor used and
+            the total length of the collection.
+
+        Raises:
+            AnalysisNotFoundError
+        """
+        if self._pending_store.get_protocol_id(analysis_id=analysis_id) is not None:
+            state_view = self._pending_store.get_live_state(analysis_id=analysis_id)
+            if state_view is None:
+                return CommandSlice(commands=[], cursor=0, total_length=0)
+            return state_view.commands.get_slice(cursor=cursor, length=length)
+
+        completed_analysis_resource = await self._completed_store.get_by_id(
+            analysis_id=analysis_id
+        )
+
+        if completed_analysis_resource is None:
+            raise AnalysisNotFoundError(analysis_id=analysis_id)
+
+        commands = completed_analysis_resource.completed_analysis.commands
+        commands_length = len(commands)
+
+        # start is inclusive, stop is exclusive
+        actual_cursor = max(0, min(cursor, commands_length - 1))
+        stop = min(commands_length, actual_cursor + length)
+
+        return CommandSlice(
+            commands=commands[actual_cursor:stop],
+            cursor=actual_cursor,
+            total_length=commands_length,
+        )
+
     def get_summaries_by_protocol(self, protocol_id: str) -> List[AnalysisSummary]:
         """Get summaries of all analyses for a protocol, in order from oldest first.
 
@@ -243,6 +387,7 @@ class _PendingAnalysisStore:
         self._analyses_by_id: Dict[str, PendingAnalysis] = {}
         self._analysis_ids_by_protocol_id: Dict[str, str] = {}
         self._protocol_ids_by_analysis_id: Dict[str, str] = {}
+        self._state_views_by_analysis_id: Dict[str, StateView] = {}
 
     def add(self, protocol_id: str, analysis_id: str) -> PendingAnalysis:
         """Add a new pending analysis and associate it with the given protocol."""
@@ -268,9 +413,39 @@ class _PendingAnalysisStore:
         del self._analyses_by_id[analysis_id]
         del self._analysis_ids_by_protocol_id[protocol_id]
         del self._protocol_ids_by_analysis_id[analysis_id]
+        self._state_views_by_analysis_id.pop(analysis_id, None)
+
+    def attach_live_state(self, analysis_id: str, state_view: StateView) -> None:
+        """Read the given pending analysis's partial results from the given state.
+
+        The given analysis must exist.
+        """
+        assert (
+            analysis_id in self._analyses_by_id
+        ), "Analysis ID must be for a valid pending analysis."
+
+        self._state_views_by_analysis_id[analysis_id] = state_view
+
+    def get_live_state(self, analysis_id: str) -> Optional[StateView]:
+        """Return the live state attached to the given analysis, if any."""
+        return self._state_views_by_analysis_id.get(analysis_id, None)
 
     def get(self, analysis_id: str) -> Optional[PendingAnalysis]:
-        return self._analyses_by_id.get(analysis_id, None)
+        pending_analysis = self._analyses_by_id.get(analysis_id, None)
+        state_view = self._state_views_by_analysis_id.get(analysis_id, None)
+
+        if pending_analysis is None or state_view is None:
+            return pending_analysis
+
+        state_summary = state_view.get_summary()
+
+        return PendingAnalysis.construct(
+            id=analysis_id,
+            pipettes=state_summary.pipettes,
+            labware=state_summary.labware,
+            modules=state_summary.modules,
+            liquids=state_summary.liquids,
+        )
 
     def get_by_protocol(self, protocol_id: str) -> Optional[PendingAnalysis]:
         """Return the pending analysis associated with the given protocol, if any."""
@@ -278,7 +453,7 @@ class _PendingAnalysisStore:
         if analysis_id is None:
             return None
         else:
-            return self._analyses_by_id[analysis_id]
+            return self.get(analysis_id=analysis_id)
 
     def get_protocol_id(self, analysis_id: str) -> Optional[str]:
         """Return the ID of the protocol that's associated with the given analysis."""
@@ -7,8 +7,13 @@ from dataclasses import dataclass
 import sqlalchemy
 import anyio
 
-from robot_server.persistence import analysis_table, sqlite_rowid
-from robot_server.persistence import legacy_pickle
+from robot_server.persistence import (
+    analysis_table,
+    analysis_cache_table,
+    run_in_db_thread,
+    sqlite_rowid,
+)
+from robot_server.persistence import command_parsing, compressed_json
 
 from .analysis_models import CompletedAnalysis
 from .analysis_memcache import MemoryCache
@@ -16,6 +21,22 @@ from .analysis_memcache import MemoryCache
 
 _log = getLogger(__name__)
 
+# How many analyses to keep in the analysis cache table. See `add_to_cache()`.
+_ANALYSIS_CACHE_MAX_SIZE = 32
+
+
+def _parse_completed_analysis(
+    serialized_completed_analysis: bytes,
+) -> CompletedAnalysis:
+    obj = compressed_json.loads(serialized_completed_analysis)
+    assert isinstance(obj, dict)
+
+    # Commands are most of an analysis, so parse them the fast way,
+    # and then the rest of the analysis without them.
+    commands = [command_parsing.parse_command(c) for c in obj["commands"]]
+    completed_analysis = CompletedAnalysis.parse_obj({**obj, "commands": []})
+    return completed_analysis.copy(update={"commands": commands})
+
 
 @dataclass
 class CompletedAnalysisResource:
@@ -41,7 +62,7 @@ class CompletedAnalysisResource:
         """
 
         def serialize_completed_analysis() -> bytes:
-            return legacy_pickle.dumps(self.completed_analysis.dict())
+            return compressed_json.dumps(self.completed_analysis)
 
         serialized_completed_analysis = await anyio.to_thread.run_sync(
             serialize_completed_analysis,
@@ -82,13 +103,9 @@ class CompletedAnalysisResource:
         protocol_id = sql_row.protocol_id
         assert isinstance(protocol_id, str)
 
-        def parse_completed_analysis() -> CompletedAnalysis:
-            return CompletedAnalysis.parse_obj(
-                legacy_pickle.loads(sql_row.completed_analysis)
-            )
-
         completed_analysis = await anyio.to_thread.run_sync(
-            parse_completed_analysis,
+            _parse_completed_analysis,
+            sql_row.completed_analysis,
             # Cancellation may orphan the worker thread,
             # but that should be harmless in this case.
             cancellable=True,
@@ -119,10 +136,12 @@ class CompletedAnalysisStore:
         sql_engine: sqlalchemy.engine.Engine,
         memory_cache: MemoryCache[str, CompletedAnalysisResource],
         current_analyzer_version: str,
+        cache_max_size: int = _ANALYSIS_CACHE_MAX_SIZE,
     ) -> None:
         self._sql_engine = sql_engine
         self._memcache = memory_cache
         self._current_analyzer_version = current_analyzer_version
+        self._cache_max_size = cache_max_size
 
     async def get_by_id(self, analysis_id: str) -> Optional[CompletedAnalysisResource]:
         """Return the analysis with the given ID, if it exists."""
@@ -133,11 +152,14 @@ class CompletedAnalysisStore:
         statement = sqlalchemy.select(analysis_table).where(
             analysis_table.c.id == analysis_id
         )
-        with self._sql_engine.begin() as transaction:
-            try:
-                result = transaction.execute(statement).one()
-            except sqlalchemy.exc.NoResultFound:
-                return None
+
+        def select_analysis() -> Optional[sqlalchemy.engine.Row]:
+            with self._sql_engine.begin() as transaction:
+                return transaction.execute(statement).one_or_none()
+
+        result = await run_in_db_thread(select_analysis)
+        if result is None:
+            return None
         resource = await CompletedAnalysisResource.from_sql_row(
             result, self._current_analyzer_version
         )
@@ -157,10 +179,12 @@ class CompletedAnalysisStore:
             .where(analysis_table.c.protocol_id == protocol_id)
             .order_by(sqlite_rowid)
         )
-        with self._sql_engine.begin() as transaction:
-            ordered_analyses_for_protocol = [
-                row.id for row in transaction.execute(id_statement).all()
-            ]
+
+        def select_analysis_ids() -> List[str]:
+            with self._sql_engine.begin() as transaction:
+                return [row.id for row in transaction.execute(id_statement).all()]
+
+        ordered_analyses_for_protocol = await run_in_db_thread(select_analysis_ids)
 
         analysis_set = set(ordered_analyses_for_protocol)
         cached_analyses = {
@@ -187,8 +211,12 @@ class CompletedAnalysisStore:
                 .where(analysis_table.c.id.in_(uncached_analyses))
                 .order_by(sqlite_rowid)
             )
-            with self._sql_engine.begin() as transaction:
-                results = transaction.execute(statement).all()
+
+            def select_analyses() -> List[sqlalchemy.engine.Row]:
+                with self._sql_engine.begin() as transaction:
+                    return transaction.execute(statement).all()
+
+            results = await run_in_db_thread(select_analyses)
             for r in results:
                 resource = await CompletedAnalysisResource.from_sql_row(
                     r, self._current_analyzer_version
@@ -224,8 +252,83 @@ class CompletedAnalysisStore:
         statement = analysis_table.insert().values(
             await completed_analysis_resource.to_sql_values()
         )
-        with self._sql_engine.begin() as transaction:
-            transaction.execute(statement)
+
+        def insert_analysis() -> None:
+            with self._sql_engine.begin() as transaction:
+                transaction.execute(statement)
+
+        await run_in_db_thread(insert_analysis)
         self._memcache.insert(
             completed_analysis_resource.id, completed_analysis_resource
         )
+
+    async def get_by_cache_key(self, cache_key: str) -> Optional[CompletedAnalysis]:
+        """Return the cached analysis with the given cache key, if there is one.
+
+        The returned analysis keeps the ID it was originally stored with.
+        """
+        statement = sqlalchemy.select(analysis_cache_table.c.completed_analysis).where(
+            analysis_cache_table.c.cache_key == cache_key
+        )
+
+        def select_serialized_analysis() -> Optional[bytes]:
+            with self._sql_engine.begin() as transaction:
+                return transaction.execute(statement).scalar_one_or_none()
+
+        serialized_completed_analysis = await run_in_db_thread(
+            select_serialized_analysis
+        )
+
+        if serialized_completed_analysis is None:
+            return None
+
+        return await anyio.to_thread.run_sync(
+            _parse_completed_analysis,
+            serialized_completed_analysis,
+            # Cancellation may orphan the worker thread,
+            # but that should be harmless in this case.
+            cancellable=True,
+        )
+
+    async def add_to_cache(
+        self, cache_key: str, completed_analysis: CompletedAnalysis
+    ) -> None:
+        """Cache an analysis under the given key, replacing any existing entry.
+
+        Only the most recently cached analyses are kept.
+        """
+
+        def serialize_completed_analysis() -> bytes:
+            return compressed_json.dumps(completed_analysis)
+
+        serialized_completed_analysis = await anyio.to_thread.run_sync(
+            serialize_completed_analysis,
+            # Cancellation may orphan the worker thread,
+            # but that should be harmless in this case.
+            cancellable=True,
+        )
+
+        delete_existing_statement = sqlalchemy.delete(analysis_cache_table).where(
+            analysis_cache_table.c.cache_key == cache_key
+        )
+        insert_statement = analysis_cache_table.insert().values(
+            cache_key=cache_key,
+            completed_analysis=serialized_completed_analysis,
+        )
+        # Rows are inserted in order, so the oldest entries have the lowest row IDs.
+        delete_oldest_statement = sqlalchemy.delete(analysis_cache_table).where(
+            sqlite_rowid.not_in(
+                sqlalchemy.select(sqlite_rowid)
+                .select_from(analysis_cache_table)
+                .order_by(sqlite_rowid.desc())
+                .limit(self._cache_max_size)
+            )
+        )
+
+        def replace_cached_analysis() -> None:
+            with self._sql_engine.begin() as transaction:
+                transaction.execute(delete_existing_statement)
+                transaction.execute(insert_statement)
+                transaction.execute(delete_oldest_statement)
+
+        await run_in_db_thread(replace_cached_analysis)
@@ -3,6 +3,7 @@
 
 from asyncio import Lock as AsyncLock
 from pathlib import Path
+from typing import Optional
 from typing_extensions import Final
 import logging
 
@@ -19,6 +20,7 @@ from server_utils.fastapi_utils.app_state import (
 )
 from robot_server.deletion_planner import ProtocolDeletionPlanner
 from robot_server.persistence import get_sql_engine, get_persistence_directory
+from robot_server.service.task_runner import TaskRunner, get_task_runner
 from robot_server.settings import get_settings
 
 from .protocol_auto_deleter import ProtocolAutoDeleter
@@ -26,6 +28,7 @@ from .protocol_store import (
     ProtocolStore,
 )
 from .protocol_analyzer import ProtocolAnalyzer
+from .analysis_executor import AnalysisExecutor
 from .analysis_store import AnalysisStore
 
 
@@ -38,6 +41,9 @@ _protocol_store_accessor = AppStateAccessor[ProtocolStore]("protocol_store")
 
 _analysis_store_accessor = AppStateAccessor[AnalysisStore]("analysis_store")
 
+_analysis_executor_init_lock = AsyncLock()
+_analysis_executor_accessor = AppStateAccessor[AnalysisExecutor]("analysis_executor")
+
 _protocol_directory_init_lock = AsyncLock()
 _protocol_directory_accessor = AppStateAccessor[Path]("protocol_directory")
 
@@ -77,6 +83,7 @@ async def get_protocol_store(
     sql_engine: SQLEngine = Depends(get_sql_engine),
     protocol_directory: Path = Depends(get_protocol_directory),
     protocol_reader: ProtocolReader = Depends(get_protocol_reader),
+    task_runner: TaskRunner = Depends(get_task_runner),
 ) -> ProtocolStore:
     """Get a singleton ProtocolStore to keep track of created protocols."""
     async with _protocol_store_init_lock:
@@ -88,6 +95,7 @@ async def get_protocol_store(
                 protocol_reader=protocol_reader,
             )
             _protocol_store_accessor.set_on(app_state, protocol_store)
+            task_runner.run(protocol_store.warm_up)
 
         return protocol_store
 
@@ -106,12 +114,59 @@ async def get_analysis_store(
     return analysis_store
 
 
+async def get_analysis_executor(
+    app_state: AppState = Depends(get_app_state),
+) -> Optional[AnalysisExecutor]:
+    """Get the singleton pool of analysis worker processes, if one is configured."""
+    settings = get_settings()
+
+    if settings.analysis_worker_count == 0:
+        return None
+
+    async with _analysis_executor_init_lock:
+        analysis_executor = _analysis_executor_accessor.get_from(app_state)
+
+        if analysis_executor is None:
+            analysis_executor = AnalysisExecutor(
+                worker_count=settings.analysis_worker_count,
+                timeout=settings.analysis_timeout_seconds,
+            )
+            await analysis_executor.start()
+            _analysis_executor_accessor.set_on(app_state, analysis_executor)
+
+        return analysis_executor
+
+
+async def get_started_analysis_executor(
+    app_state: AppState = Depends(get_app_state),
+) -> Optional[AnalysisExecutor]:
+    """Get the pool of analysis worker processes, if it's already been started.
+
+    Unlike `get_analysis_executor`, this never starts the pool, so endpoints that
+    only need to inspect or cancel queued analyses don't pay for starting it.
+    """
+    return _analysis_executor_accessor.get_from(app_state)
+
+
+async def clean_up_analysis_executor(app_state: AppState) -> None:
+    """Stop the analysis worker processes, if they were started.
+
+    Intended to be called just once, when the server shuts down.
+    """
+    analysis_executor = _analysis_executor_accessor.get_from(app_state)
+
+    if analysis_executor is not None:
+        await analysis_executor.close()
+
+
 async def get_protocol_analyzer(
     analysis_store: AnalysisStore = Depends(get_analysis_store),
+    analysis_executor: Optional[AnalysisExecutor] = Depends(get_analysis_executor),
 ) -> ProtocolAnalyzer:
     """Construct a ProtocolAnalyzer for a single request."""
     return ProtocolAnalyzer(
         analysis_store=analysis_store,
+        analysis_executor=analysis_executor,
     )
 
 
@@ -1,10 +1,19 @@
 """Protocol analysis module."""
 import logging
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import uuid4
 
 from opentrons import protocol_runner
+from opentrons.protocol_engine import ErrorOccurrence
 
 from .protocol_store import ProtocolResource
-from .analysis_store import AnalysisStore
+from .analysis_store import AnalysisStore, get_analysis_cache_key
+from .analysis_executor import (
+    AnalysisExecutor,
+    AnalysisTimeoutError,
+    AnalysisWorkerError,
+)
 
 
 log = logging.getLogger(__name__)
@@ -16,24 +25,80 @@ class ProtocolAnalyzer:
     def __init__(
         self,
         analysis_store: AnalysisStore,
+        analysis_executor: Optional[AnalysisExecutor] = None,
     ) -> None:
-        """Initialize the analyzer and its dependencies."""
+        """Initialize the analyzer and its dependencies.
+
+        Arguments:
+            analysis_store: Where to store completed analyses.
+            analysis_executor: A pool of worker processes to run analyses in.
+                If `None`, analyses run in this process.
+        """
         self._analysis_store = analysis_store
+        self._analysis_executor = analysis_executor
 
     async def analyze(
         self,
         protocol_resource: ProtocolResource,
         analysis_id: str,
     ) -> None:
-        """Analyze a given protocol, storing the analysis when complete."""
-        runner = await protocol_runner.create_simulating_runner(
+        """Analyze a given protocol, storing the analysis when complete.
+
+        If an identical protocol was already analyzed under the same conditions,
+        its analysis is reused instead of simulating the protocol again.
+        """
+        cache_key = get_analysis_cache_key(
+            content_hash=protocol_resource.source.content_hash,
             robot_type=protocol_resource.source.robot_type,
-            protocol_config=protocol_resource.source.config,
         )
-        result = await runner.run(protocol_resource.source)
+
+        if await self._analysis_store.update_from_cache(
+            analysis_id=analysis_id, cache_key=cache_key
+        ):
+            log.info(f'Completed analysis "{analysis_id}" from cache.')
+            return
+
+        if self._analysis_executor is not None:
+            try:
+                result = await self._analysis_executor.analyze(
+                    analysis_id=analysis_id,
+                    protocol_source=protocol_resource.source,
+                )
+            except AnalysisTimeoutError as e:
+                log.warning(f'Analysis "{analysis_id}" timed out.')
+                await self._store_failed_analysis(analysis_id=analysis_id, error=e)
+                return
+            except (AnalysisWorkerError, EOFError, OSError) as e:
+                log.warning(f'Analysis "{analysis_id}" failed in its worker: {e}')
+                await self._store_failed_analysis(analysis_id=analysis_id, error=e)
+                return
+
+        else:
+            runner = await protocol_runner.create_simulating_runner(
+                robot_type=protocol_resource.source.robot_type,
+                protocol_config=protocol_resource.source.config,
+            )
+            # Let clients see the analysis's results so far while it runs.
+            # This isn't possible when analyzing in a worker process.
+            self._analysis_store.attach_live_state(
+                analysis_id=analysis_id, state_view=runner.state_view
+            )
+            result = await runner.run(protocol_resource.source)
 
         log.info(f'Completed analysis "{analysis_id}".')
 
+        duration_estimate: Optional[protocol_runner.DurationEstimate]
+
+        try:
+            duration_estimate = protocol_runner.estimate_duration(
+                commands=result.commands,
+                robot_type=protocol_resource.source.robot_type,
+            )
+        except Exception:
+            # The estimate is only a convenience, so don't fail the analysis over it.
+            log.exception(f'Could not estimate duration of analysis "{analysis_id}".')
+            duration_estimate = None
+
         await self._analysis_store.update(
             analysis_id=analysis_id,
             commands=result.commands,
@@ -42,4 +107,25 @@ class ProtocolAnalyzer:
             pipettes=result.state_summary.pipettes,
             errors=result.state_summary.errors,
             liquids=result.state_summary.liquids,
+            duration_estimate=duration_estimate,
+            cache_key=cache_key,
+        )
+
+    async def _store_failed_analysis(self, analysis_id: str, error: Exception) -> None:
+        """Complete an analysis that couldn't run with a single error and no results."""
+        await self._analysis_store.update(
+            analysis_id=analysis_id,
+            commands=[],
+            labware=[],
+            modules=[],
+            pipettes=[],
+            errors=[
+                ErrorOccurrence(
+                    id=str(uuid4()),
+                    createdAt=datetime.now(tz=timezone.utc),
+                    errorType=type(error).__name__,
+                    detail=str(error),
+                )
+            ],
+            liquids=[],
         )
@@ -1,27 +1,45 @@
 """Store and retrieve information about uploaded protocols."""
 from __future__ import annotations
 
+import asyncio
+import json
 from dataclasses import dataclass
 from datetime import datetime
 from functools import lru_cache
 from logging import getLogger
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Union
 
-from anyio import Path as AsyncPath, create_task_group
+from anyio import Path as AsyncPath
 import sqlalchemy
 
-from opentrons.protocol_reader import ProtocolReader, ProtocolSource
+from opentrons._version import version as _opentrons_version
+from opentrons.protocol_reader import (
+    JsonProtocolConfig,
+    ProtocolFileRole,
+    ProtocolReader,
+    ProtocolSource,
+    ProtocolSourceFile,
+    ProtocolType,
+    PythonProtocolConfig,
+)
+from opentrons.protocols.api_support.types import APIVersion
 from robot_server.persistence import (
     analysis_table,
     protocol_table,
     run_table,
     sqlite_rowid,
+    run_in_db_thread,
 )
 
 
 _CACHE_ENTRIES = 32
 
+# Bump this whenever the format of `protocol_table.source` changes.
+# Sources stored in any other format, or by any other version of the `opentrons`
+# package, are re-read from the protocol's files.
+_SOURCE_FORMAT_VERSION = 1
+
 
 _log = getLogger(__name__)
 
@@ -88,6 +106,8 @@ class ProtocolStore:
         *,
         _sql_engine: sqlalchemy.engine.Engine,
         _sources_by_id: Dict[str, ProtocolSource],
+        _protocols_directory: Optional[Path] = None,
+        _protocol_reader: Optional[ProtocolReader] = None,
     ) -> None:
         """Do not call directly.
 
@@ -95,6 +115,10 @@ class ProtocolStore:
         """
         self._sql_engine = _sql_engine
         self._sources_by_id = _sources_by_id
+        self._protocols_directory = _protocols_directory
+        self._protocol_reader = _protocol_reader
+        self._source_reads_by_id: Dict[str, "asyncio.Task[ProtocolSource]"] = {}
+        self._source_errors_by_id: Dict[str, Exception] = {}
 
     @classmethod
     def create_empty(
@@ -127,6 +151,12 @@ class ProtocolStore:
         They are allowed to contain no data, in which case this is equivalent to
         `create_empty()`.
 
+        This doesn't read any protocol files. Each protocol's `ProtocolSource`
+        is loaded from the database, where `insert()` stores it. Protocols
+        without a usable stored source, like ones added by older software,
+        have theirs read from their files the first time they're accessed,
+        or by `warm_up()`.
+
         Params:
             sql_engine: A reference to the database that this ProtocolStore should
                 use as its backing storage.
@@ -136,87 +166,169 @@ class ProtocolStore:
                 This is expected to have one subdirectory per protocol,
                 named after its protocol ID.
             protocol_reader: An interface to compute `ProtocolSource`s from protocol
-                files while rehydrating.
+                files that don't have one stored in the database.
         """
         # The SQL database is the canonical source of which protocols
         # have been added successfully.
-        expected_ids = set(
-            r.protocol_id for r in cls._sql_get_all_from_engine(sql_engine=sql_engine)
+        stored_sources_by_id = cls._sql_get_stored_sources_from_engine(
+            sql_engine=sql_engine
         )
 
-        sources_by_id = await _compute_protocol_sources(
-            expected_protocol_ids=expected_ids,
+        await _check_protocol_directory(
+            expected_protocol_ids=set(stored_sources_by_id.keys()),
             protocols_directory=AsyncPath(protocols_directory),
-            protocol_reader=protocol_reader,
+        )
+
+        sources_by_id: Dict[str, ProtocolSource] = {}
+
+        for protocol_id, stored_source in stored_sources_by_id.items():
+            source = (
+                _parse_stored_source(
+                    stored_source=stored_source,
+                    directory=protocols_directory / protocol_id,
+                )
+                if stored_source is not None
+                else None
+            )
+
+            if source is not None:
+                sources_by_id[protocol_id] = source
+
+        _log.info(
+            f"Rehydrated {len(sources_by_id)} protocol sources from the database;"
+            f" {len(stored_sources_by_id) - len(sources_by_id)} left to read."
         )
 
         return ProtocolStore(
             _sql_engine=sql_engine,
             _sources_by_id=sources_by_id,
+            _protocols_directory=protocols_directory,
+            _protocol_reader=protocol_reader,
+        )
+
+    async def warm_up(self) -> None:
+        """Read every protocol source that `rehydrate()` couldn't load.
+
+        Intended to run as a background task after `rehydrate()`,
+        so those sources are ready before anything asks for them.
+        Reading them concurrently with requests that need them is safe:
+        each protocol's files are only read once.
+        """
+        unread_ids = [
+            protocol_id
+            for protocol_id in self.get_all_ids()
+            if protocol_id not in self._sources_by_id
+        ]
+        # Failures are logged by `_read_source()`.
+        await asyncio.gather(
+            *(self._get_source(protocol_id) for protocol_id in unread_ids),
+            return_exceptions=True,
         )
 
-    def insert(self, resource: ProtocolResource) -> None:
+    async def insert(self, resource: ProtocolResource) -> None:
         """Insert a protocol resource into the store.
 
         The resource must have a unique ID.
         """
-        self._sql_insert(
-            resource=_DBProtocolResource(
+        await run_in_db_thread(
+            self._sql_insert,
+            _DBProtocolResource(
                 protocol_id=resource.protocol_id,
                 created_at=resource.created_at,
                 protocol_key=resource.protocol_key,
-            )
+            ),
+            resource.source,
         )
         self._sources_by_id[resource.protocol_id] = resource.source
         self._clear_caches()
 
-    @lru_cache(maxsize=_CACHE_ENTRIES)
-    def get(self, protocol_id: str) -> ProtocolResource:
+    async def get(self, protocol_id: str) -> ProtocolResource:
         """Get a single protocol by ID.
 
         Raises:
-            ProtocolNotFoundError
+            ProtocolNotFoundError: The protocol isn't in the store,
+                or its files can't be read.
         """
         sql_resource = self._sql_get(protocol_id=protocol_id)
+
+        try:
+            source = await self._get_source(sql_resource.protocol_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            raise ProtocolNotFoundError(protocol_id=protocol_id) from e
+
         return ProtocolResource(
             protocol_id=sql_resource.protocol_id,
             created_at=sql_resource.created_at,
             protocol_key=sql_resource.protocol_key,
-            source=self._sources_by_id[sql_resource.protocol_id],
+            source=source,
         )
 
-    @lru_cache(maxsize=_CACHE_ENTRIES)
-    def get_all(self) -> List[ProtocolResource]:
-        """Get all protocols currently saved in this store."""
+    async def get_all(self) -> List[ProtocolResource]:
+        """Get all protocols currently saved in this store.
+
+        Protocols whose files can't be read are left out. Once a protocol's files
+        have failed to read, `get_all_ids()`, `has()`, and `get_id_by_hash()`
+        leave it out, too, and `get()` treats it as not found. It can still
+        be removed, and it's still counted by `get_usage_info()`,
+        so it can be auto-deleted.
+        """
         all_sql_resources = self._sql_get_all()
+        sources = await asyncio.gather(
+            *(self._get_source(r.protocol_id) for r in all_sql_resources),
+            return_exceptions=True,
+        )
         return [
             ProtocolResource(
                 protocol_id=r.protocol_id,
                 created_at=r.created_at,
                 protocol_key=r.protocol_key,
-                source=self._sources_by_id[r.protocol_id],
+                source=source,
             )
-            for r in all_sql_resources
+            for r, source in zip(all_sql_resources, sources)
+            if isinstance(source, ProtocolSource)
         ]
 
     @lru_cache(maxsize=_CACHE_ENTRIES)
     def get_all_ids(self) -> List[str]:
-        """Get all protocol ids currently saved in this store."""
+        """Get all protocol ids currently saved in this store.
+
+        Like `get_all()`, this leaves out protocols whose files couldn't be read.
+        """
         select_ids = sqlalchemy.select(protocol_table.c.id).order_by(sqlite_rowid)
         with self._sql_engine.begin() as transaction:
-            protocol_ids = transaction.execute(select_ids).scalars().all()
-        return protocol_ids
+            protocol_ids: List[str] = transaction.execute(select_ids).scalars().all()
+        return [p for p in protocol_ids if p not in self._source_errors_by_id]
 
     def get_id_by_hash(self, hash: str) -> Optional[str]:
-        """Get all protocol hashes keyed by protocol id."""
-        for p in self.get_all():
-            if p.source.content_hash == hash:
-                return p.protocol_id
-        return None
+        """Get the ID of the oldest protocol with the given content hash, if any.
+
+        This only looks at the database, so it never has to read protocol files.
+        Protocols added by older software only have a content hash once their
+        source has been read; see `warm_up()`.
+        """
+        statement = (
+            sqlalchemy.select(protocol_table.c.id)
+            .where(protocol_table.c.content_hash == hash)
+            .order_by(sqlite_rowid)
+        )
+        with self._sql_engine.begin() as transaction:
+            protocol_ids: List[str] = transaction.execute(statement).scalars().all()
+
+        return next(
+            (p for p in protocol_ids if p not in self._source_errors_by_id), None
+        )
 
     @lru_cache(maxsize=_CACHE_ENTRIES)
     def has(self, protocol_id: str) -> bool:
-        """Check for the presence of a protocol ID in the store."""
+        """Check for the presence of a protocol ID in the store.
+
+        Like `get_all()`, this leaves out protocols whose files couldn't be read.
+        """
+        if protocol_id in self._source_errors_by_id:
+            return False
+
         statement = sqlalchemy.select(protocol_table).where(
             protocol_table.c.id == protocol_id
         )
@@ -243,12 +355,28 @@ class ProtocolStore:
         """
         self._sql_remove(protocol_id=protocol_id)
 
-        deleted_source = self._sources_by_id.pop(protocol_id)
-        protocol_dir = deleted_source.directory
+        deleted_source = self._sources_by_id.pop(protocol_id, None)
+        source_read = self._source_reads_by_id.pop(protocol_id, None)
+        self._source_errors_by_id.pop(protocol_id, None)
+
+        if source_read is not None:
+            source_read.cancel()
+
+        if deleted_source is not None:
+            protocol_dir = deleted_source.directory
+
+            for source_file in deleted_source.files:
+                source_file.path.unlink()
+            if protocol_dir:
+                protocol_dir.rmdir()
+
+        else:
+            # The protocol's source was never read, so go by its directory instead.
+            assert self._protocols_directory is not None
+            protocol_dir = self._protocols_directory / protocol_id
 
-        for source_file in deleted_source.files:
-            source_file.path.unlink()
-        if protocol_dir:
+            for protocol_file in protocol_dir.iterdir():
+                protocol_file.unlink()
             protocol_dir.rmdir()
 
         self._clear_caches()
@@ -308,13 +436,92 @@ class ProtocolStore:
             )
         return referencing_run_ids
 
-    def _sql_insert(self, resource: _DBProtocolResource) -> None:
+    async def _get_source(self, protocol_id: str) -> ProtocolSource:
+        source = self._sources_by_id.get(protocol_id)
+
+        if source is not None:
+            return source
+
+        # Don't retry protocols whose files couldn't be read.
+        # They're unlikely to become readable without a software update.
+        source_error = self._source_errors_by_id.get(protocol_id)
+
+        if source_error is not None:
+            raise source_error
+
+        source_read = self._source_reads_by_id.get(protocol_id)
+
+        if source_read is None:
+            source_read = asyncio.create_task(self._read_source(protocol_id))
+            self._source_reads_by_id[protocol_id] = source_read
+
+        # Shield the read, since other callers may be waiting on it, too.
+        return await asyncio.shield(source_read)
+
+    async def _read_source(self, protocol_id: str) -> ProtocolSource:
+        """Read a protocol's source from its files, and store it for next time."""
+        assert (
+            self._protocols_directory is not None and self._protocol_reader is not None
+        ), "Protocols added with insert() should already have a source."
+
+        try:
+            # Given that the protocol is in the database, we trust that the files
+            # in its subdirectory are correct. No extra files, and no files missing.
+            #
+            # This is a safe assumption as long as:
+            #  * Nobody has tampered with file the storage.
+            #  * We don't try to compute the source of any protocol whose insertion
+            #    failed halfway through and left files behind.
+            protocol_subdirectory = AsyncPath(self._protocols_directory / protocol_id)
+            protocol_files = [Path(f) async for f in protocol_subdirectory.iterdir()]
+            source = await self._protocol_reader.read_saved(
+                files=protocol_files,
+                directory=Path(protocol_subdirectory),
+                files_are_prevalidated=True,
+            )
+
+        except asyncio.CancelledError:
+            raise
+
+        except Exception as e:
+            _log.warning(
+                f"Could not read protocol {protocol_id}'s source.", exc_info=True
+            )
+            self._source_errors_by_id[protocol_id] = e
+            self._clear_caches()
+            raise
+
+        else:
+            self._sources_by_id[protocol_id] = source
+            await run_in_db_thread(self._sql_update_source, protocol_id, source)
+            return source
+
+        finally:
+            self._source_reads_by_id.pop(protocol_id, None)
+
+    def _sql_insert(
+        self, resource: _DBProtocolResource, source: ProtocolSource
+    ) -> None:
         statement = sqlalchemy.insert(protocol_table).values(
-            _convert_dataclass_to_sql_values(resource=resource)
+            {
+                **_convert_dataclass_to_sql_values(resource=resource),
+                "source": _serialize_source(source),
+                "content_hash": source.content_hash,
+            }
+        )
+        with self._sql_engine.begin() as transaction:
+            transaction.execute(statement)
+
+    def _sql_update_source(self, protocol_id: str, source: ProtocolSource) -> None:
+        statement = (
+            sqlalchemy.update(protocol_table)
+            .where(protocol_table.c.id == protocol_id)
+            .values(source=_serialize_source(source), content_hash=source.content_hash)
         )
         with self._sql_engine.begin() as transaction:
             transaction.execute(statement)
 
+    @lru_cache(maxsize=_CACHE_ENTRIES)
     def _sql_get(self, protocol_id: str) -> _DBProtocolResource:
         statement = sqlalchemy.select(protocol_table).where(
             protocol_table.c.id == protocol_id
@@ -326,17 +533,21 @@ class ProtocolStore:
                 raise ProtocolNotFoundError(protocol_id=protocol_id) from e
         return _convert_sql_row_to_dataclass(sql_row=matching_row)
 
+    @lru_cache(maxsize=_CACHE_ENTRIES)
     def _sql_get_all(self) -> List[_DBProtocolResource]:
-        return self._sql_get_all_from_engine(sql_engine=self._sql_engine)
+        statement = sqlalchemy.select(protocol_table)
+        with self._sql_engine.begin() as transaction:
+            all_rows = transaction.execute(statement).all()
+        return [_convert_sql_row_to_dataclass(sql_row=row) for row in all_rows]
 
     @staticmethod
-    def _sql_get_all_from_engine(
+    def _sql_get_stored_sources_from_engine(
         sql_engine: sqlalchemy.engine.Engine,
-    ) -> List[_DBProtocolResource]:
-        statement = sqlalchemy.select(protocol_table)
+    ) -> Dict[str, Optional[str]]:
+        statement = sqlalchemy.select(protocol_table.c.id, protocol_table.c.source)
         with sql_engine.begin() as transaction:
             all_rows = transaction.execute(statement).all()
-        return [_convert_sql_row_to_dataclass(sql_row=row) for row in all_rows]
+        return {row.id: row.source for row in all_rows}
 
     def _sql_remove(self, protocol_id: str) -> None:
         delete_analyses_statement = sqlalchemy.delete(analysis_table).where(
@@ -366,48 +577,26 @@ class ProtocolStore:
             raise ProtocolNotFoundError(protocol_id=protocol_id)
 
     def _clear_caches(self) -> None:
-        self.get.cache_clear()
+        self._sql_get.cache_clear()
         self.get_all_ids.cache_clear()
-        self.get_all.cache_clear()
+        self._sql_get_all.cache_clear()
         self.has.cache_clear()
 
 
-# TODO(mm, 2022-04-18):
-# Restructure to degrade gracefully in the face of ProtocolReader failures.
-#
-# * ProtocolStore.get_all() should omit protocols for which it failed to compute
-#   a ProtocolSource.
-# * ProtocolStore.get(id) should continue to raise an exception if it failed to compute
-#   that protocol's ProtocolSource.
-async def _compute_protocol_sources(
+async def _check_protocol_directory(
     expected_protocol_ids: Set[str],
     protocols_directory: AsyncPath,
-    protocol_reader: ProtocolReader,
-) -> Dict[str, ProtocolSource]:
-    """Compute `ProtocolSource` objects from protocol source files.
-
-    We don't store these `ProtocolSource` objects in the SQL database because
-    they're big, deep, complex, and unstable, so migrations and compatibility
-    would be painful. Instead, we compute them based on the stored files,
-    and keep them in memory.
+) -> None:
+    """Check that every expected protocol has a subdirectory of files.
 
     Params:
-        expected_protocol_ids: The ID of every protocol for which to compute a
-            `ProtocolSource`.
+        expected_protocol_ids: The ID of every protocol in the database.
         protocols_directory: A directory containing one subdirectory per protocol
-            named by protocol ID. Scanned for files to pass to `protocol_reader`.
-        protocol_reader: An interface to use to compute `ProtocolSource`s.
-
-    Returns:
-        A map from protocol ID to computed `ProtocolSource`.
+            named by protocol ID.
 
     Raises:
-        Exception: This is not expected to raise anything,
-            but it might if a software update makes ProtocolReader reject files
-            that it formerly accepted.
+        SubdirectoryMissingError: A protocol's subdirectory is missing.
     """
-    sources_by_id: Dict[str, ProtocolSource] = {}
-
     directory_members = [m async for m in protocols_directory.iterdir()]
     directory_member_names = set(m.name for m in directory_members)
     extra_members = directory_member_names - expected_protocol_ids
@@ -427,37 +616,91 @@ async def _compute_protocol_sources(
             f"Missing subdirectories for protocols: {missing_members}"
         )
 
-    async def compute_source(
-        protocol_id: str, protocol_subdirectory: AsyncPath
-    ) -> None:
-        # Given that the expected protocol subdirectory exists,
-        # we trust that the files in it are correct.
-        # No extra files, and no files missing.
-        #
-        # This is a safe assumption as long as:
-        #  * Nobody has tampered with file the storage.
-        #  * We don't try to compute the source of any protocol whose insertion
-        #    failed halfway through and left files behind.
-        protocol_files = [Path(f) async for f in protocol_subdirectory.iterdir()]
-        protocol_source = await protocol_reader.read_saved(
-            files=protocol_files,
-            directory=Path(protocol_subdirectory),
-            files_are_prevalidated=True,
-        )
-        sources_by_id[protocol_id] = protocol_source
 
-    async with create_task_group() as task_group:
-        # Use a TaskGroup instead of asyncio.gather() so,
-        # if any task raises an unexpected exception,
-        # it cancels every other task and raises an exception to signal the bug.
-        for protocol_id in expected_protocol_ids:
-            protocol_subdirectory = protocols_directory / protocol_id
-            task_group.start_soon(compute_source, protocol_id, protocol_subdirectory)
+def _serialize_source(source: ProtocolSource) -> str:
+    """Serialize the parts of a `ProtocolSource` that are costly to compute.
+
+    `ProtocolSource` is a complex, unstable internal type, so it isn't stored
+    as-is. File paths are stored relative to the protocol's directory,
+    and the format is versioned so that changes to it never need a migration:
+    a source stored in an unknown format is just re-read from its files.
+    """
+    config: Dict[str, Any]
+
+    if isinstance(source.config, PythonProtocolConfig):
+        config = {
+            "protocolType": source.config.protocol_type.value,
+            "apiVersion": str(source.config.api_version),
+        }
+    else:
+        config = {
+            "protocolType": source.config.protocol_type.value,
+            "schemaVersion": source.config.schema_version,
+        }
+
+    return json.dumps(
+        {
+            "formatVersion": _SOURCE_FORMAT_VERSION,
+            "opentronsVersion": _opentrons_version,
+            "mainFile": source.main_file.name,
+            "contentHash": source.content_hash,
+            "files": [
+                {"name": f.path.name, "role": f.role.value} for f in source.files
+            ],
+            "metadata": source.metadata,
+            "robotType": source.robot_type,
+            "config": config,
+        }
+    )
 
-    for id in expected_protocol_ids:
-        assert id in sources_by_id
 
-    return sources_by_id
+def _parse_stored_source(
+    stored_source: str, directory: Path
+) -> Optional[ProtocolSource]:
+    """Parse a source stored by `_serialize_source()`.
+
+    Returns:
+        The parsed source, or `None` if it's in an unknown format,
+        or was stored by a different version of the `opentrons` package,
+        which might read the protocol's files differently.
+    """
+    try:
+        parsed = json.loads(stored_source)
+
+        if (
+            parsed["formatVersion"] != _SOURCE_FORMAT_VERSION
+            or parsed.get("opentronsVersion") != _opentrons_version
+        ):
+            return None
+
+        stored_config = parsed["config"]
+        config: Union[PythonProtocolConfig, JsonProtocolConfig]
+
+        if stored_config["protocolType"] == ProtocolType.PYTHON.value:
+            config = PythonProtocolConfig(
+                api_version=APIVersion.from_string(stored_config["apiVersion"])
+            )
+        else:
+            config = JsonProtocolConfig(schema_version=stored_config["schemaVersion"])
+
+        return ProtocolSource(
+            directory=directory,
+            main_file=directory / parsed["mainFile"],
+            content_hash=parsed["contentHash"],
+            files=[
+                ProtocolSourceFile(
+                    path=directory / f["name"], role=ProtocolFileRole(f["role"])
+                )
+                for f in parsed["files"]
+            ],
+            metadata=parsed["metadata"],
+            robot_type=parsed["robotType"],
+            config=config,
+        )
+
+    except (ValueError, KeyError, TypeError, AttributeError):
+        _log.warning(f"Ignoring unreadable stored protocol source in {directory}.")
+        return None
 
 
 @dataclass(frozen=True)
@@ -4,10 +4,10 @@ from textwrap import dedent
 from datetime import datetime
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, File, UploadFile, status, Form
+from fastapi import APIRouter, Depends, File, UploadFile, status, Form, Query
 from pydantic import BaseModel, Field
 from typing import List, Optional, Union
-from typing_extensions import Literal
+from typing_extensions import Final, Literal
 
 from opentrons.protocol_reader import (
     ProtocolReader,
@@ -16,6 +16,7 @@ from opentrons.protocol_reader import (
     FileHasher,
 )
 from opentrons_shared_data.robot.dev_types import RobotType
+from opentrons.protocol_engine import Command
 from robot_server.errors import ErrorDetails, ErrorBody
 from robot_server.hardware import get_robot_type
 from robot_server.service.task_runner import TaskRunner, get_task_runner
@@ -33,7 +34,8 @@ from .protocol_auto_deleter import ProtocolAutoDeleter
 from .protocol_models import Protocol, ProtocolFile, Metadata
 from .protocol_analyzer import ProtocolAnalyzer
 from .analysis_store import AnalysisStore, AnalysisNotFoundError
-from .analysis_models import ProtocolAnalysis
+from .analysis_models import ProtocolAnalysis, AnalysisStatus
+from .analysis_executor import AnalysisExecutor
 from .protocol_store import (
     ProtocolStore,
     ProtocolResource,
@@ -46,6 +48,7 @@ from .dependencies import (
     get_protocol_store,
     get_analysis_store,
     get_protocol_analyzer,
+    get_started_analysis_executor,
     get_protocol_directory,
     get_file_reader_writer,
     get_file_hasher,
@@ -54,6 +57,8 @@ from .dependencies import (
 
 log = logging.getLogger(__name__)
 
+_DEFAULT_ANALYSIS_COMMAND_LIST_LENGTH: Final = 20
+
 
 class ProtocolNotFound(ErrorDetails):
     """An error returned when a given protocol cannot be found."""
@@ -181,7 +186,7 @@ async def create_protocol(
     cached_protocol_id = protocol_store.get_id_by_hash(content_hash)
 
     if cached_protocol_id is not None:
-        resource = protocol_store.get(protocol_id=cached_protocol_id)
+        resource = await protocol_store.get(protocol_id=cached_protocol_id)
         analyses = analysis_store.get_summaries_by_protocol(
             protocol_id=cached_protocol_id
         )
@@ -237,7 +242,7 @@ async def create_protocol(
     )
 
     protocol_auto_deleter.make_room_for_new_protocol()
-    protocol_store.insert(protocol_resource)
+    await protocol_store.insert(protocol_resource)
 
     task_runner.run(
         protocol_analyzer.analyze,
@@ -283,7 +288,7 @@ async def get_protocols(
         protocol_store: In-memory database of protocol resources.
         analysis_store: In-memory database of protocol analyses.
     """
-    protocol_resources = protocol_store.get_all()
+    protocol_resources = await protocol_store.get_all()
     data = [
         Protocol.construct(
             id=r.protocol_id,
@@ -348,7 +353,7 @@ async def get_protocol_by_id(
         analysis_store: In-memory database of protocol analyses.
     """
     try:
-        resource = protocol_store.get(protocol_id=protocolId)
+        resource = await protocol_store.get(protocol_id=protocolId)
     except ProtocolNotFoundError as e:
         raise ProtocolNotFound(detail=str(e)).as_error(status.HTTP_404_NOT_FOUND)
 
@@ -396,13 +401,26 @@ async def get_protocol_by_id(
 async def delete_protocol_by_id(
     protocolId: str,
     protocol_store: ProtocolStore = Depends(get_protocol_store),
+    analysis_store: AnalysisStore = Depends(get_analysis_store),
+    analysis_executor: Optional[AnalysisExecutor] = Depends(
+        get_started_analysis_executor
+    ),
 ) -> PydanticResponse[SimpleEmptyBody]:
     """Delete an uploaded protocol by ID.
 
     Arguments:
         protocolId: Protocol identifier to delete, pulled from URL.
         protocol_store: In-memory database of protocol resources.
+        analysis_store: In-memory database of protocol analyses.
+        analysis_executor: Pool of analysis worker processes, if it's running,
+            in which to cancel the protocol's pending analysis.
     """
+    pending_analysis_ids = [
+        a.id
+        for a in analysis_store.get_summaries_by_protocol(protocol_id=protocolId)
+        if a.status == AnalysisStatus.PENDING
+    ]
+
     try:
         protocol_store.remove(protocol_id=protocolId)
 
@@ -412,6 +430,10 @@ async def delete_protocol_by_id(
     except ProtocolUsedByRunError as e:
         raise ProtocolUsedByRun(detail=str(e)).as_error(status.HTTP_409_CONFLICT) from e
 
+    if analysis_executor is not None:
+        for analysis_id in pending_analysis_ids:
+            analysis_executor.cancel(analysis_id)
+
     return await PydanticResponse.create(
         content=SimpleEmptyBody.construct(),
         status_code=status.HTTP_200_OK,
@@ -494,3 +516,70 @@ async def get_protocol_analysis_by_id(
         ) from error
 
     return await PydanticResponse.create(content=SimpleBody.construct(data=analysis))
+
+
+@protocols_router.get(
+    path="/protocols/{protocolId}/analyses/{analysisId}/commands",
+    summary="Get a page of one of a protocol's analysis commands",
+    description=(
+        "Get a page of the commands in one of a protocol's analyses."
+        " While the analysis is pending, these are the commands that it has"
+        " produced so far, so clients can page through them as they're generated."
+        " Use `meta.totalLength` to see how many commands there are in all."
+    ),
+    responses={
+        status.HTTP_200_OK: {"model": SimpleMultiBody[Command]},
+        status.HTTP_404_NOT_FOUND: {
+            "model": ErrorBody[Union[ProtocolNotFound, AnalysisNotFound]]
+        },
+    },
+)
+async def get_protocol_analysis_commands(
+    protocolId: str,
+    analysisId: str,
+    cursor: int = Query(
+        0,
+        description="The starting index of the desired first command in the list.",
+    ),
+    pageLength: int = Query(
+        _DEFAULT_ANALYSIS_COMMAND_LIST_LENGTH,
+        description="The maximum number of commands in the list to return.",
+    ),
+    protocol_store: ProtocolStore = Depends(get_protocol_store),
+    analysis_store: AnalysisStore = Depends(get_analysis_store),
+) -> PydanticResponse[SimpleMultiBody[Command]]:
+    """Get a slice of a protocol analysis's commands.
+
+    Arguments:
+        protocolId: The ID of the protocol, pulled from the URL.
+        analysisId: The ID of the analysis, pulled from the URL.
+        cursor: Cursor index for the collection response.
+        pageLength: Maximum number of items to return.
+        protocol_store: Protocol resource storage.
+        analysis_store: Analysis resource storage.
+    """
+    if not protocol_store.has(protocolId):
+        raise ProtocolNotFound(detail=f"Protocol {protocolId} not found").as_error(
+            status.HTTP_404_NOT_FOUND
+        )
+
+    try:
+        command_slice = await analysis_store.get_command_slice(
+            analysis_id=analysisId,
+            cursor=cursor,
+            length=pageLength,
+        )
+    except AnalysisNotFoundError as error:
+        raise AnalysisNotFound(detail=str(error)).as_error(
+            status.HTTP_404_NOT_FOUND
+        ) from error
+
+    return await PydanticResponse.create(
+        content=SimpleMultiBody.construct(
+            data=command_slice.commands,
+            meta=MultiBodyMeta(
+                cursor=command_slice.cursor,
+                totalLength=command_slice.total_length,
+            ),
+        )
+    )
@@ -0,0 +1,112 @@
+"""A ProtocolEngine plugin to save a run's commands while the run progresses."""
+import asyncio
+from collections import deque
+from logging import getLogger
+from typing import Deque, List, Optional, Tuple
+
+from typing_extensions import Final
+
+from opentrons.protocol_engine import AbstractPlugin, actions as pe_actions
+from opentrons.protocol_engine.commands import Command, CommandStatus
+
+from .run_store import RunStore
+
+log = getLogger(__name__)
+
+# How many finished commands to save at once.
+_BATCH_SIZE: Final = 20
+
+_FINISHED_STATUSES: Final = {CommandStatus.SUCCEEDED, CommandStatus.FAILED}
+
+
+class CommandPersistencePlugin(AbstractPlugin):
+    """Save a run's finished commands to the database in small batches.
+
+    Otherwise, a run's commands are only saved when the run is cleared,
+    all at once. That's a long pause at the end of a long run, and if the
+    robot loses power mid-run, none of the run's commands are saved.
+
+    Finished commands never change, so this saves them in run order,
+    as soon as a batch of them is ready. Saving the rest, when the run
+    is cleared, only has to cover the commands that this hasn't.
+
+    Batches are saved by a background task, one at a time, so that
+    actions aren't held up waiting for the database. Each saved batch is
+    synced to storage when it's committed, so a crash or power loss mid-run
+    only loses the commands that weren't saved in a batch yet.
+    """
+
+    def __init__(self, run_id: str, run_store: RunStore) -> None:
+        """Initialize the plugin.
+
+        Arguments:
+            run_id: The run that this plugin's engine belongs to.
+                It must already be in the `run_store`.
+            run_store: Where to save the run's commands.
+        """
+        self._run_id = run_id
+        self._run_store = run_store
+        self._queued_command_count = 0
+        self._queued_batches: Deque[Tuple[int, List[Command]]] = deque()
+        self._save_task: Optional["asyncio.Task[None]"] = None
+        self._failed = False
+
+    def handle_action(self, action: pe_actions.Action) -> None:
+        """Queue any new batches of finished commands to be saved.
+
+        Plugins see each action before the engine's state does,
+        so a command is only seen as finished on the next command action
+        after the one that finished it.
+        """
+        if not self._failed and isinstance(
+            action, (pe_actions.UpdateCommandAction, pe_actions.FailCommandAction)
+        ):
+            self._queue_finished_batches()
+
+            if self._queued_batches and (
+                self._save_task is None or self._save_task.done()
+            ):
+                self._save_task = asyncio.create_task(self._save_queued_batches())
+
+    async def teardown(self) -> None:
+        """Wait for every queued batch to be saved."""
+        if self._save_task is not None:
+            await self._save_task
+
+    def _queue_finished_batches(self) -> None:
+        while True:
+            command_slice = self.state.commands.get_slice(
+                cursor=self._queued_command_count, length=_BATCH_SIZE
+            )
+            batch = command_slice.commands
+
+            if (
+                command_slice.cursor != self._queued_command_count
+                or len(batch) < _BATCH_SIZE
+                or any(c.status not in _FINISHED_STATUSES for c in batch)
+            ):
+                return
+
+            self._queued_batches.append((self._queued_command_count, batch))
+            self._queued_command_count += len(batch)
+
+    async def _save_queued_batches(self) -> None:
+        while self._queued_batches:
+            first_index, batch = self._queued_batches[0]
+
+            try:
+                await self._run_store.insert_commands(
+                    run_id=self._run_id,
+                    first_index=first_index,
+                    commands=batch,
+                )
+            except Exception:
+                # Clearing the run will still save every command, so a failure
+                # here shouldn't interrupt the run. Stop trying, though,
+                # to keep the saved commands contiguous.
+                log.exception(f'Could not save commands of run "{self._run_id}"')
+                self._failed = True
+                self._queued_batches.clear()
+                return
+
+            self._queued_batches.popleft()
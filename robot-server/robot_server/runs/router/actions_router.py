@@ -109,7 +109,7 @@ async def create_run_action(
     ):
         await maintenance_engine_store.clear()
     try:
-        action = run_controller.create_action(
+        action = await run_controller.create_action(
             action_id=action_id,
             action_type=action_type,
             created_at=created_at,
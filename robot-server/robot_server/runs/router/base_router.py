@@ -153,7 +153,7 @@ async def create_run(
     #  Check if we can consolidate to one place.
     if protocol_id is not None:
         try:
-            protocol_resource = protocol_store.get(protocol_id=protocol_id)
+            protocol_resource = await protocol_store.get(protocol_id=protocol_id)
         except ProtocolNotFoundError as e:
             raise ProtocolNotFound(detail=str(e)).as_error(status.HTTP_404_NOT_FOUND)
 
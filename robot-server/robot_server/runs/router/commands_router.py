@@ -255,7 +255,7 @@ async def get_run_commands(
         run_data_manager: Run data retrieval interface.
     """
     try:
-        command_slice = run_data_manager.get_commands_slice(
+        command_slice = await run_data_manager.get_commands_slice(
             run_id=runId,
             cursor=cursor,
             length=pageLength,
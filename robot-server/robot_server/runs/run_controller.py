@@ -34,7 +34,7 @@ class RunController:
         self._engine_store = engine_store
         self._run_store = run_store
 
-    def create_action(
+    async def create_action(
         self,
         action_id: str,
         action_type: RunActionType,
@@ -82,13 +82,13 @@ class RunController:
         except ProtocolEngineError as e:
             raise RunActionNotAllowedError(message=e.message, wrapping=[e]) from e
 
-        self._run_store.insert_action(run_id=self._run_id, action=action)
+        await self._run_store.insert_action(run_id=self._run_id, action=action)
 
         return action
 
     async def _run_protocol_and_insert_result(self) -> None:
         result = await self._engine_store.runner.run()
-        self._run_store.update_run_state(
+        await self._run_store.update_run_state(
             run_id=self._run_id,
             summary=result.state_summary,
             commands=result.commands,
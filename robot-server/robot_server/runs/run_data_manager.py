@@ -16,6 +16,7 @@ from opentrons.protocol_engine import (
 from robot_server.protocols import ProtocolResource
 from robot_server.service.task_runner import TaskRunner
 
+from .command_persistence_plugin import CommandPersistencePlugin
 from .engine_store import EngineStore
 from .run_store import RunResource, RunStore
 from .run_models import Run
@@ -106,7 +107,7 @@ class RunDataManager:
         prev_run_id = self._engine_store.current_run_id
         if prev_run_id is not None:
             prev_run_result = await self._engine_store.clear()
-            self._run_store.update_run_state(
+            await self._run_store.update_run_state(
                 run_id=prev_run_id,
                 summary=prev_run_result.state_summary,
                 commands=prev_run_result.commands,
@@ -122,6 +123,10 @@ class RunDataManager:
             created_at=created_at,
             protocol_id=protocol.protocol_id if protocol is not None else None,
         )
+        # Save the run's commands as it goes, now that the run is in the store.
+        self._engine_store.engine.add_plugin(
+            CommandPersistencePlugin(run_id=run_id, run_store=self._run_store)
+        )
 
         return _build_run(
             run_resource=run_resource,
@@ -231,7 +236,7 @@ class RunDataManager:
 
         if next_current is False:
             commands, state_summary = await self._engine_store.clear()
-            run_resource = self._run_store.update_run_state(
+            run_resource = await self._run_store.update_run_state(
                 run_id=run_id,
                 summary=state_summary,
                 commands=commands,
@@ -246,7 +251,7 @@ class RunDataManager:
             current=next_current,
         )
 
-    def get_commands_slice(
+    async def get_commands_slice(
         self,
         run_id: str,
         cursor: Optional[int],
@@ -269,7 +274,7 @@ class RunDataManager:
             return the_slice
 
         # Let exception propagate
-        return self._run_store.get_commands_slice(
+        return await self._run_store.get_commands_slice(
             run_id=run_id, cursor=cursor, length=length
         )
 
@@ -1,18 +1,25 @@
 """Runs' on-db store."""
+import json
 from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime
 from functools import lru_cache
-from typing import Any, Dict, List, Optional, cast
+from typing import Dict, List, Optional
 
 import sqlalchemy
-from pydantic import parse_obj_as
 
 from opentrons.util.helpers import utc_now
 from opentrons.protocol_engine import StateSummary, CommandSlice
-from opentrons.protocol_engine.commands import Command
-
-from robot_server.persistence import run_table, action_table, sqlite_rowid
+from opentrons.protocol_engine.commands import Command, CommandStatus
+
+from robot_server.persistence import (
+    run_table,
+    action_table,
+    run_command_table,
+    sqlite_rowid,
+    run_in_db_thread,
+)
+from robot_server.persistence import command_parsing, compressed_json
 from robot_server.protocols import ProtocolNotFoundError
 
 from .action_models import RunAction, RunActionType
@@ -20,6 +27,9 @@ from .run_models import RunNotFoundError
 
 _CACHE_ENTRIES = 32
 
+# Commands with these statuses won't change anymore.
+_FINISHED_COMMAND_STATUSES = {CommandStatus.SUCCEEDED, CommandStatus.FAILED}
+
 
 @dataclass(frozen=True)
 class RunResource:
@@ -50,7 +60,7 @@ class RunStore:
         """Initialize a RunStore with sql engine."""
         self._sql_engine = sql_engine
 
-    def update_run_state(
+    async def update_run_state(
         self,
         run_id: str,
         summary: StateSummary,
@@ -58,6 +68,9 @@ class RunStore:
     ) -> RunResource:
         """Update the run's state summary and commands list.
 
+        Finished commands that were already saved, in the same place in the run,
+        by `insert_commands` or an earlier update, are not written again.
+
         Args:
             run_id: The run to update
             summary: The run's equipment and status summary.
@@ -75,7 +88,6 @@ class RunStore:
             .values(
                 _convert_state_to_sql_values(
                     run_id=run_id,
-                    commands=commands,
                     state_summary=summary,
                     engine_status=summary.status,
                 )
@@ -88,21 +100,81 @@ class RunStore:
         select_actions = sqlalchemy.select(action_table).where(
             action_table.c.run_id == run_id
         )
+        select_saved_commands = (
+            sqlalchemy.select(
+                run_command_table.c.command_id, run_command_table.c.command_status
+            )
+            .where(run_command_table.c.run_id == run_id)
+            .order_by(run_command_table.c.index_in_run)
+        )
 
-        with self._sql_engine.begin() as transaction:
-            transaction.execute(update_run)
+        def update() -> RunResource:
+            with self._sql_engine.begin() as transaction:
+                transaction.execute(update_run)
 
-            try:
-                run_row = transaction.execute(select_run_resource).one()
-            except sqlalchemy.exc.NoResultFound:
-                raise RunNotFoundError(run_id=run_id)
+                try:
+                    run_row = transaction.execute(select_run_resource).one()
+                except sqlalchemy.exc.NoResultFound:
+                    raise RunNotFoundError(run_id=run_id)
 
-            action_rows = transaction.execute(select_actions).all()
+                action_rows = transaction.execute(select_actions).all()
+
+                saved_rows = transaction.execute(select_saved_commands).all()
+                unchanged_count = _count_unchanged_commands(saved_rows, commands)
+                transaction.execute(
+                    sqlalchemy.delete(run_command_table).where(
+                        run_command_table.c.run_id == run_id,
+                        run_command_table.c.index_in_run >= unchanged_count,
+                    )
+                )
+                self._insert_commands(
+                    transaction,
+                    run_id=run_id,
+                    first_index=unchanged_count,
+                    commands=commands[unchanged_count:],
+                )
 
+            return _convert_row_to_run(row=run_row, action_rows=action_rows)
+
+        run_resource = await run_in_db_thread(update)
         self._clear_caches()
-        return _convert_row_to_run(row=run_row, action_rows=action_rows)
+        return run_resource
+
+    async def insert_commands(
+        self, run_id: str, first_index: int, commands: List[Command]
+    ) -> None:
+        """Save some of a run's commands, without touching the rest.
 
-    def insert_action(self, run_id: str, action: RunAction) -> None:
+        This lets a run's finished commands be saved while the run continues.
+
+        Args:
+            run_id: The run that the commands belong to.
+            first_index: The index, in the whole run, of the first given command.
+            commands: Consecutive commands of the run. They must not
+                already be saved.
+
+        Raises:
+            RunNotFoundError: The given run ID was not found in the store.
+        """
+
+        def insert() -> None:
+            with self._sql_engine.begin() as transaction:
+                try:
+                    self._insert_commands(
+                        transaction,
+                        run_id=run_id,
+                        first_index=first_index,
+                        commands=commands,
+                    )
+                except sqlalchemy.exc.IntegrityError as e:
+                    if not self._run_exists(transaction, run_id):
+                        raise RunNotFoundError(run_id=run_id) from e
+                    raise
+
+        await run_in_db_thread(insert)
+        self._clear_caches()
+
+    async def insert_action(self, run_id: str, action: RunAction) -> None:
         """Insert a run action into the store.
 
         Args:
@@ -116,12 +188,14 @@ class RunStore:
             _convert_action_to_sql_values(run_id=run_id, action=action),
         )
 
-        with self._sql_engine.begin() as transaction:
-            try:
-                transaction.execute(insert)
-            except sqlalchemy.exc.IntegrityError as e:
-                raise RunNotFoundError(run_id=run_id) from e
+        def insert_row() -> None:
+            with self._sql_engine.begin() as transaction:
+                try:
+                    transaction.execute(insert)
+                except sqlalchemy.exc.IntegrityError as e:
+                    raise RunNotFoundError(run_id=run_id) from e
 
+        await run_in_db_thread(insert_row)
         self._clear_caches()
 
     def insert(
@@ -205,29 +279,33 @@ class RunStore:
 
     @lru_cache(maxsize=_CACHE_ENTRIES)
     def get_all(self, length: Optional[int] = None) -> List[RunResource]:
-        """Get all known run resources.
+        """Get known run resources, oldest first.
+
+        Args:
+            length: If given, only get this many of the most recently created runs.
 
         Returns:
-            All stored run entries.
+            The stored run entries.
         """
-        select_runs = sqlalchemy.select(_run_columns)
+        select_runs = sqlalchemy.select(_run_columns).order_by(sqlite_rowid.desc())
         select_actions = sqlalchemy.select(action_table).order_by(sqlite_rowid.asc())
         actions_by_run_id = defaultdict(list)
 
-        with self._sql_engine.begin() as transaction:
-            if length is not None:
-                select_runs = (
-                    select_runs.limit(length)
+        if length is not None:
+            select_runs = select_runs.limit(length)
+            # Only fetch the actions of the selected runs,
+            # which the index on action.run_id makes cheap.
+            select_actions = select_actions.where(
+                action_table.c.run_id.in_(
+                    sqlalchemy.select(run_table.c.id)
                     .order_by(sqlite_rowid.desc())
                     .limit(length)
                 )
-                # need to select the last inserted runs and return by asc order
-                runs = list(reversed(transaction.execute(select_runs).all()))
-            else:
-                runs = transaction.execute(
-                    select_runs.order_by(sqlite_rowid.asc())
-                ).all()
+            )
 
+        with self._sql_engine.begin() as transaction:
+            # Select the last inserted runs, and return them in ascending order.
+            runs = list(reversed(transaction.execute(select_runs).all()))
             actions = transaction.execute(select_actions).all()
 
         for action_row in actions:
@@ -257,28 +335,12 @@ class RunStore:
             row = transaction.execute(select_run_data).one()
 
         return (
-            StateSummary.parse_obj(row.state_summary)
+            StateSummary.parse_obj(compressed_json.loads(row.state_summary))
             if row.state_summary is not None
             else None
         )
 
-    @lru_cache(maxsize=_CACHE_ENTRIES)
-    def _get_all_unparsed_commands(self, run_id: str) -> List[Dict[str, Any]]:
-        select_run_commands = sqlalchemy.select(run_table.c.commands).where(
-            run_table.c.id == run_id
-        )
-
-        with self._sql_engine.begin() as transaction:
-            try:
-                row = transaction.execute(select_run_commands).one()
-            except sqlalchemy.exc.NoResultFound:
-                raise RunNotFoundError(run_id=run_id)
-
-        return (
-            cast(List[Dict[str, Any]], row.commands) if row.commands is not None else []
-        )
-
-    def get_commands_slice(
+    async def get_commands_slice(
         self,
         run_id: str,
         length: int,
@@ -286,6 +348,10 @@ class RunStore:
     ) -> CommandSlice:
         """Get a slice of run commands from the store.
 
+        Only the rows of the requested commands are read and parsed.
+        Clients page through a run's commands often, so unlike the memoized
+        reads, this runs in the database thread instead of on the event loop.
+
         Args:
             run_id: Run ID to pull commands from.
             length: Number of commands to return.
@@ -298,25 +364,45 @@ class RunStore:
         Raises:
             RunNotFoundError: The given run ID was not found.
         """
-        command_intent_dicts = self._get_all_unparsed_commands(run_id)
-        commands_length = len(command_intent_dicts)
-        if cursor is None:
-            cursor = commands_length - length
-
-        # start is inclusive, stop is exclusive
-        actual_cursor = max(0, min(cursor, commands_length - 1))
-        stop = min(commands_length, actual_cursor + length)
-        sliced_commands: List[Command] = [
-            parse_obj_as(Command, command)  # type: ignore[arg-type]
-            for command in command_intent_dicts[actual_cursor:stop]
-        ]
-
-        return CommandSlice(
-            cursor=actual_cursor,
-            total_length=commands_length,
-            commands=sliced_commands,
+        select_commands_length = sqlalchemy.select(sqlalchemy.func.count()).where(
+            run_command_table.c.run_id == run_id
         )
 
+        def read_slice() -> CommandSlice:
+            with self._sql_engine.begin() as transaction:
+                if not self._run_exists(transaction, run_id):
+                    raise RunNotFoundError(run_id=run_id)
+
+                commands_length: int = transaction.execute(
+                    select_commands_length
+                ).scalar()
+                requested_cursor = (
+                    commands_length - length if cursor is None else cursor
+                )
+
+                # start is inclusive, stop is exclusive
+                actual_cursor = max(0, min(requested_cursor, commands_length - 1))
+                stop = min(commands_length, actual_cursor + length)
+
+                select_slice = (
+                    sqlalchemy.select(run_command_table.c.command)
+                    .where(
+                        run_command_table.c.run_id == run_id,
+                        run_command_table.c.index_in_run >= actual_cursor,
+                        run_command_table.c.index_in_run < stop,
+                    )
+                    .order_by(run_command_table.c.index_in_run)
+                )
+                slice_rows = transaction.execute(select_slice).all()
+
+            return CommandSlice(
+                cursor=actual_cursor,
+                total_length=commands_length,
+                commands=[_convert_sql_row_to_command(row) for row in slice_rows],
+            )
+
+        return await run_in_db_thread(read_slice)
+
     @lru_cache(maxsize=_CACHE_ENTRIES)
     def get_command(self, run_id: str, command_id: str) -> Command:
         """Get run command by id.
@@ -332,21 +418,20 @@ class RunStore:
             RunNotFoundError: The given run ID was not found in the store.
             CommandNotFoundError: The given command ID was not found in the store.
         """
-        select_run_commands = sqlalchemy.select(run_table.c.commands).where(
-            run_table.c.id == run_id
+        select_command = sqlalchemy.select(run_command_table.c.command).where(
+            run_command_table.c.run_id == run_id,
+            run_command_table.c.command_id == command_id,
         )
+
         with self._sql_engine.begin() as transaction:
-            try:
-                row = transaction.execute(select_run_commands).one()
-            except sqlalchemy.exc.NoResultFound as e:
-                raise RunNotFoundError(run_id=run_id) from e
+            row = transaction.execute(select_command).first()
 
-        try:
-            command = next(c for c in row.commands if c["id"] == command_id)
-        except StopIteration as e:
-            raise CommandNotFoundError(command_id=command_id) from e
+            if row is None:
+                if not self._run_exists(transaction, run_id):
+                    raise RunNotFoundError(run_id=run_id)
+                raise CommandNotFoundError(command_id=command_id)
 
-        return parse_obj_as(Command, command)  # type: ignore[arg-type]
+        return _convert_sql_row_to_command(row)
 
     def remove(self, run_id: str) -> None:
         """Remove a run by its unique identifier.
@@ -361,8 +446,12 @@ class RunStore:
         delete_actions = sqlalchemy.delete(action_table).where(
             action_table.c.run_id == run_id
         )
+        delete_commands = sqlalchemy.delete(run_command_table).where(
+            run_command_table.c.run_id == run_id
+        )
         with self._sql_engine.begin() as transaction:
             transaction.execute(delete_actions)
+            transaction.execute(delete_commands)
             result = transaction.execute(delete_run)
 
         if result.rowcount < 1:
@@ -376,7 +465,33 @@ class RunStore:
         self.get_all.cache_clear()
         self.get_state_summary.cache_clear()
         self.get_command.cache_clear()
-        self._get_all_unparsed_commands.cache_clear()
+
+    @staticmethod
+    def _insert_commands(
+        transaction: sqlalchemy.engine.Connection,
+        run_id: str,
+        first_index: int,
+        commands: List[Command],
+    ) -> None:
+        if len(commands) > 0:
+            transaction.execute(
+                sqlalchemy.insert(run_command_table),
+                [
+                    _convert_command_to_sql_values(
+                        run_id=run_id,
+                        index_in_run=first_index + offset,
+                        command=command,
+                    )
+                    for offset, command in enumerate(commands)
+                ],
+            )
+
+    @staticmethod
+    def _run_exists(transaction: sqlalchemy.engine.Connection, run_id: str) -> bool:
+        select_run_id = sqlalchemy.select(run_table.c.id).where(
+            run_table.c.id == run_id
+        )
+        return transaction.execute(select_run_id).first() is not None
 
 
 # The columns that must be present in a row passed to _convert_row_to_run().
@@ -431,12 +546,44 @@ def _convert_action_to_sql_values(action: RunAction, run_id: str) -> Dict[str, o
 def _convert_state_to_sql_values(
     run_id: str,
     state_summary: StateSummary,
-    commands: List[Command],
     engine_status: str,
 ) -> Dict[str, object]:
     return {
-        "state_summary": state_summary.dict(),
+        "state_summary": compressed_json.dumps(state_summary),
         "engine_status": engine_status,
-        "commands": [command.dict() for command in commands],
         "_updated_at": utc_now(),
     }
+
+
+def _convert_command_to_sql_values(
+    run_id: str, index_in_run: int, command: Command
+) -> Dict[str, object]:
+    return {
+        "run_id": run_id,
+        "index_in_run": index_in_run,
+        "command_id": command.id,
+        "command_status": command.status.value,
+        "command": command.json(),
+    }
+
+
+def _count_unchanged_commands(
+    saved_rows: List[sqlalchemy.engine.Row], commands: List[Command]
+) -> int:
+    """Count the leading saved commands that don't need to be saved again."""
+    count = 0
+
+    for row, command in zip(saved_rows, commands):
+        if (
+            row.command_id != command.id
+            or row.command_status != command.status.value
+            or command.status not in _FINISHED_COMMAND_STATUSES
+        ):
+            break
+        count += 1
+
+    return count
+
+
+def _convert_sql_row_to_command(row: sqlalchemy.engine.Row) -> Command:
+    return command_parsing.parse_command(json.loads(row.command))
@@ -94,5 +94,25 @@ class RobotServerSettings(BaseSettings):
         ),
     )
 
+    analysis_worker_count: int = Field(
+        default=1,
+        ge=0,
+        description=(
+            "How many worker processes to run protocol analyses in."
+            " If this is 0, analyses run inside the server process,"
+            " which lets clients see an analysis's results while it's running."
+        ),
+    )
+
+    analysis_timeout_seconds: typing.Optional[float] = Field(
+        default=None,
+        gt=0,
+        description=(
+            "How long a protocol analysis may run in a worker process"
+            " before it's stopped and recorded as failed."
+            " Only applies if `analysis_worker_count` is greater than 0."
+        ),
+    )
+
     class Config:
         env_prefix = "OT_ROBOT_SERVER_"
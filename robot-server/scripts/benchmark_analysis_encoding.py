@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Compare how fast stored analyses are encoded and decoded, legacy pickle vs. JSON.
+
+Usage: python scripts/benchmark_analysis_encoding.py [command_count] [repeats]
+"""
+
+import timeit
+from datetime import datetime, timezone
+from sys import argv
+from typing import Any, Callable, Dict, List
+
+from opentrons.protocol_engine import (
+    DeckPoint,
+    WellLocation,
+    commands as pe_commands,
+)
+
+from robot_server.persistence import compressed_json, legacy_pickle
+from robot_server.protocols.analysis_models import AnalysisResult, CompletedAnalysis
+from robot_server.protocols.completed_analysis_store import _parse_completed_analysis
+
+
+def _make_analysis(command_count: int) -> CompletedAnalysis:
+    created_at = datetime(year=2023, month=1, day=1, tzinfo=timezone.utc)
+    commands: List[pe_commands.Command] = []
+
+    for i in range(command_count):
+        common: Dict[str, Any] = {
+            "id": f"command-{i}",
+            "key": f"command-key-{i}",
+            "status": pe_commands.CommandStatus.SUCCEEDED,
+            "createdAt": created_at,
+            "startedAt": created_at,
+            "completedAt": created_at,
+        }
+        position = DeckPoint(x=i, y=i, z=i)
+        if i % 2 == 0:
+            commands.append(
+                pe_commands.Aspirate(
+                    **common,
+                    params=pe_commands.AspirateParams(
+                        pipetteId="pipette-id",
+                        labwareId="labware-id",
+                        wellName="A1",
+                        wellLocation=WellLocation(),
+                        volume=50,
+                        flowRate=92.86,
+                    ),
+                    result=pe_commands.AspirateResult(volume=50, position=position),
+                )
+            )
+        else:
+            commands.append(
+                pe_commands.MoveToWell(
+                    **common,
+                    params=pe_commands.MoveToWellParams(
+                        pipetteId="pipette-id",
+                        labwareId="labware-id",
+                        wellName="B2",
+                        wellLocation=WellLocation(),
+                    ),
+                    result=pe_commands.MoveToWellResult(position=position),
+                )
+            )
+
+    return CompletedAnalysis(
+        id="analysis-id",
+        result=AnalysisResult.OK,
+        pipettes=[],
+        labware=[],
+        modules=[],
+        commands=commands,
+        errors=[],
+        liquids=[],
+    )
+
+
+def _time(label: str, function: Callable[[], object], repeats: int) -> None:
+    best = min(timeit.repeat(function, number=1, repeat=repeats))
+    print(f"{label:<32}{best * 1000:>10.1f} ms")
+
+
+def main(command_count: int, repeats: int) -> None:
+    """Print the size of an encoded analysis, and how long each step takes."""
+    analysis = _make_analysis(command_count)
+    pickled = legacy_pickle.dumps(analysis.dict())
+    encoded = compressed_json.dumps(analysis)
+
+    print(f"Analysis with {command_count} commands, best of {repeats}:")
+    print(f"{'legacy pickle size':<32}{len(pickled) / 1024:>10.1f} KiB")
+    print(f"{'compressed JSON size':<32}{len(encoded) / 1024:>10.1f} KiB")
+
+    _time("legacy pickle encode", lambda: legacy_pickle.dumps(analysis.dict()), repeats)
+    _time("compressed JSON encode", lambda: compressed_json.dumps(analysis), repeats)
+    _time("legacy pickle decode", lambda: legacy_pickle.loads(pickled), repeats)
+    _time("compressed JSON decode", lambda: compressed_json.loads(encoded), repeats)
+    _time(
+        "legacy pickle decode + parse",
+        lambda: CompletedAnalysis.parse_obj(legacy_pickle.loads(pickled)),
+        repeats,
+    )
+    _time(
+        "compressed JSON decode + parse",
+        lambda: _parse_completed_analysis(encoded),
+        repeats,
+    )
+
+
+if __name__ == "__main__":
+    main(
+        command_count=int(argv[1]) if len(argv) > 1 else 5000,
+        repeats=int(argv[2]) if len(argv) > 2 else 5,
+    )
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""Time common run, protocol, and analysis store operations against a real database.
+
+Usage: python scripts/benchmark_persistence.py [directory] [iterations] [commands]
+
+Storage speed matters more than CPU speed for most of these, so to approximate
+a robot, point `directory` at an SD card or a slow USB stick.
+By default, a temporary directory is used.
+"""
+
+import asyncio
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from sys import argv
+from typing import Awaitable, Callable, List, Union
+
+import sqlalchemy
+
+from opentrons.protocol_engine import (
+    EngineStatus,
+    StateSummary,
+    commands as pe_commands,
+)
+from opentrons.protocol_reader import JsonProtocolConfig, ProtocolSource
+
+from robot_server.persistence import create_sql_engine
+from robot_server.protocols.analysis_memcache import MemoryCache
+from robot_server.protocols.analysis_models import AnalysisResult, CompletedAnalysis
+from robot_server.protocols.completed_analysis_store import (
+    CompletedAnalysisResource,
+    CompletedAnalysisStore,
+)
+from robot_server.protocols.protocol_store import ProtocolResource, ProtocolStore
+from robot_server.runs.action_models import RunAction, RunActionType
+from robot_server.runs.run_store import RunStore
+
+
+_CREATED_AT = datetime(year=2023, month=1, day=1, tzinfo=timezone.utc)
+
+
+def _make_commands(count: int) -> List[pe_commands.Command]:
+    return [
+        pe_commands.WaitForDuration(
+            id=f"command-{i}",
+            key=f"command-{i}",
+            status=pe_commands.CommandStatus.SUCCEEDED,
+            createdAt=_CREATED_AT,
+            params=pe_commands.WaitForDurationParams(seconds=1),
+            result=pe_commands.WaitForDurationResult(),
+        )
+        for i in range(count)
+    ]
+
+
+def _make_state_summary() -> StateSummary:
+    return StateSummary(
+        status=EngineStatus.SUCCEEDED,
+        errors=[],
+        labware=[],
+        pipettes=[],
+        modules=[],
+        labwareOffsets=[],
+        liquids=[],
+    )
+
+
+def _make_protocol(protocol_id: str) -> ProtocolResource:
+    return ProtocolResource(
+        protocol_id=protocol_id,
+        created_at=_CREATED_AT,
+        source=ProtocolSource(
+            directory=None,
+            main_file=Path("protocol.json"),
+            config=JsonProtocolConfig(schema_version=6),
+            files=[],
+            metadata={},
+            robot_type="OT-2 Standard",
+            content_hash=protocol_id,
+        ),
+        protocol_key=None,
+    )
+
+
+def _make_analysis_store(
+    sql_engine: sqlalchemy.engine.Engine,
+) -> CompletedAnalysisStore:
+    # A new memory cache for each store, so reads go to the database.
+    return CompletedAnalysisStore(
+        sql_engine=sql_engine,
+        memory_cache=MemoryCache(1, str, CompletedAnalysisResource),
+        current_analyzer_version="benchmark",
+    )
+
+
+async def _time(
+    label: str,
+    function: Callable[[int], Union[object, Awaitable[object]]],
+    iterations: int,
+) -> None:
+    start = time.perf_counter()
+    for i in range(iterations):
+        result = function(i)
+        if isinstance(result, Awaitable):
+            await result
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40}{elapsed / iterations * 1000:>10.2f} ms")
+
+
+async def main(directory: Path, iterations: int, command_count: int) -> None:
+    """Time each store operation, and print the mean time per call."""
+    sql_engine = create_sql_engine(directory / "benchmark.db")
+    commands = _make_commands(command_count)
+    state_summary = _make_state_summary()
+    analysis = CompletedAnalysis(
+        id="analysis",
+        result=AnalysisResult.OK,
+        pipettes=[],
+        labware=[],
+        modules=[],
+        commands=commands,
+        errors=[],
+        liquids=[],
+    )
+
+    print(f"{iterations} iterations, {command_count} commands per run or analysis:")
+
+    try:
+        protocol_store = ProtocolStore.create_empty(sql_engine=sql_engine)
+        await _time(
+            "ProtocolStore.insert",
+            lambda i: protocol_store.insert(_make_protocol(f"protocol-{i}")),
+            iterations,
+        )
+        await _time(
+            "ProtocolStore.get_all_ids (uncached)",
+            lambda i: ProtocolStore.create_empty(sql_engine=sql_engine).get_all_ids(),
+            iterations,
+        )
+
+        run_store = RunStore(sql_engine=sql_engine)
+        await _time(
+            "RunStore.insert",
+            lambda i: run_store.insert(
+                run_id=f"run-{i}", protocol_id=None, created_at=_CREATED_AT
+            ),
+            iterations,
+        )
+        await _time(
+            "RunStore.insert_action",
+            lambda i: run_store.insert_action(
+                run_id=f"run-{i}",
+                action=RunAction(
+                    id=f"action-{i}",
+                    createdAt=_CREATED_AT,
+                    actionType=RunActionType.PLAY,
+                ),
+            ),
+            iterations,
+        )
+        await _time(
+            "RunStore.update_run_state",
+            lambda i: run_store.update_run_state(
+                run_id=f"run-{i}", summary=state_summary, commands=commands
+            ),
+            iterations,
+        )
+        await _time(
+            "RunStore.get (uncached)",
+            lambda i: RunStore(sql_engine=sql_engine).get(run_id=f"run-{i}"),
+            iterations,
+        )
+        await _time(
+            "RunStore.get_all (uncached)",
+            lambda i: RunStore(sql_engine=sql_engine).get_all(),
+            iterations,
+        )
+        await _time(
+            "RunStore.get_state_summary (uncached)",
+            lambda i: RunStore(sql_engine=sql_engine).get_state_summary(
+                run_id=f"run-{i}"
+            ),
+            iterations,
+        )
+        await _time(
+            "RunStore.get_commands_slice (20)",
+            lambda i: run_store.get_commands_slice(
+                run_id=f"run-{i}", cursor=command_count // 2, length=20
+            ),
+            iterations,
+        )
+        await _time(
+            "RunStore.get_command",
+            lambda i: run_store.get_command(
+                run_id=f"run-{i}", command_id=f"command-{command_count // 2}"
+            ),
+            iterations,
+        )
+
+        analysis_store = _make_analysis_store(sql_engine)
+        await _time(
+            "CompletedAnalysisStore.add",
+            lambda i: analysis_store.add(
+                CompletedAnalysisResource(
+                    id=f"analysis-{i}",
+                    protocol_id=f"protocol-{i}",
+                    analyzer_version="benchmark",
+                    completed_analysis=analysis.copy(update={"id": f"analysis-{i}"}),
+                )
+            ),
+            iterations,
+        )
+        await _time(
+            "CompletedAnalysisStore.get_by_id",
+            lambda i: _make_analysis_store(sql_engine).get_by_id(f"analysis-{i}"),
+            iterations,
+        )
+
+    finally:
+        sql_engine.dispose()
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory(
+        dir=argv[1] if len(argv) > 1 else None
+    ) as directory:
+        asyncio.run(
+            main(
+                directory=Path(directory),
+                iterations=int(argv[2]) if len(argv) > 2 else 50,
+                command_count=int(argv[3]) if len(argv) > 3 else 500,
+            )
+        )
@@ -28,6 +28,7 @@ def test_get_health(
         "system_version": "mytestsystemversion",
         "minimum_protocol_api_version": list(MIN_SUPPORTED_VERSION),
         "maximum_protocol_api_version": list(MAX_SUPPORTED_VERSION),
+        "analysis_queue_depth": 0,
         "robot_model": "OT-2 Standard",
         "links": {
             "apiLog": "/logs/api.log",
@@ -22,6 +22,7 @@ def check_health_response(response: Response) -> None:
         "robot_model": "OT-2 Standard",
         "minimum_protocol_api_version": minimum_version,
         "maximum_protocol_api_version": maximum_version,
+        "analysis_queue_depth": 0,
         "links": {
             "apiLog": "/logs/api.log",
             "serialLog": "/logs/serial.log",
@@ -0,0 +1,35 @@
+"""Tests for robot_server.persistence.command_parsing."""
+import json
+from datetime import datetime
+
+import pytest
+from pydantic import ValidationError
+
+from opentrons.protocol_engine import commands as pe_commands
+
+from robot_server.persistence.command_parsing import parse_command
+
+
+@pytest.fixture
+def command() -> pe_commands.Command:
+    """Get a command whose type isn't first in the `Command` union."""
+    return pe_commands.WaitForResume(
+        id="command-id",
+        key="command-key",
+        status=pe_commands.CommandStatus.SUCCEEDED,
+        createdAt=datetime(year=2023, month=1, day=1),
+        params=pe_commands.WaitForResumeParams(message="hello world"),
+        result=pe_commands.WaitForResumeResult(),
+    )
+
+
+def test_parse_command(command: pe_commands.Command) -> None:
+    """It should parse a command from its dict or its JSON."""
+    assert parse_command(command.dict()) == command
+    assert parse_command(json.loads(command.json())) == command
+
+
+def test_parse_unknown_command(command: pe_commands.Command) -> None:
+    """It should raise a validation error for unknown command types."""
+    with pytest.raises(ValidationError):
+        parse_command({**command.dict(), "commandType": "notACommand"})
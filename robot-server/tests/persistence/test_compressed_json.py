@@ -0,0 +1,48 @@
+"""Tests for robot_server.persistence.compressed_json."""
+import pickle
+from datetime import datetime, timezone
+
+import pytest
+
+from opentrons.protocol_engine import EngineStatus, StateSummary
+
+from robot_server.persistence import compressed_json
+
+
+@pytest.fixture
+def state_summary() -> StateSummary:
+    """Get a model with values that JSON can't represent directly."""
+    return StateSummary(
+        status=EngineStatus.SUCCEEDED,
+        errors=[],
+        labware=[],
+        pipettes=[],
+        modules=[],
+        labwareOffsets=[],
+        liquids=[],
+        startedAt=datetime(year=2023, month=1, day=1, tzinfo=timezone.utc),
+    )
+
+
+def test_round_trip(state_summary: StateSummary) -> None:
+    """It should encode a model so that it can be parsed back."""
+    encoded = compressed_json.dumps(state_summary)
+
+    assert compressed_json.is_compressed_json(encoded)
+    assert StateSummary.parse_obj(compressed_json.loads(encoded)) == state_summary
+
+
+def test_loads_legacy_pickle(state_summary: StateSummary) -> None:
+    """It should read data that older versions pickled."""
+    legacy_data = pickle.dumps(state_summary.dict())
+
+    assert not compressed_json.is_compressed_json(legacy_data)
+    assert StateSummary.parse_obj(compressed_json.loads(legacy_data)) == state_summary
+
+
+def test_loads_unknown_format_version() -> None:
+    """It should refuse data encoded by a newer version."""
+    data = compressed_json.MAGIC + bytes([compressed_json.FORMAT_VERSION + 1])
+
+    with pytest.raises(ValueError, match="format version"):
+        compressed_json.loads(data)
@@ -0,0 +1,44 @@
+"""Tests for robot_server.persistence._database."""
+from pathlib import Path
+
+import sqlalchemy
+
+from robot_server.persistence import create_sql_engine
+
+
+def test_connection_settings(tmp_path: Path) -> None:
+    """It should tune each connection for the robot's storage."""
+    sql_engine = create_sql_engine(tmp_path / "test.db")
+
+    try:
+        with sql_engine.begin() as transaction:
+            settings = {
+                pragma: transaction.execute(
+                    sqlalchemy.text(f"PRAGMA {pragma}")
+                ).scalar_one()
+                for pragma in ("foreign_keys", "journal_mode", "synchronous")
+            }
+    finally:
+        sql_engine.dispose()
+
+    assert settings == {
+        "foreign_keys": 1,
+        "journal_mode": "wal",
+        # FULL
+        "synchronous": 2,
+    }
+
+
+def test_connections_are_reused(tmp_path: Path) -> None:
+    """It should keep connections open between transactions."""
+    sql_engine = create_sql_engine(tmp_path / "test.db")
+
+    try:
+        with sql_engine.connect() as connection:
+            first_connection = connection.connection.connection
+        with sql_engine.connect() as connection:
+            second_connection = connection.connection.connection
+    finally:
+        sql_engine.dispose()
+
+    assert first_connection is second_connection
@@ -0,0 +1,55 @@
+"""Tests for robot_server.persistence._db_thread."""
+import asyncio
+import threading
+from typing import List
+
+import pytest
+
+from robot_server.persistence import run_in_db_thread
+
+
+async def test_run_in_db_thread() -> None:
+    """It should run every function in the same thread, off the event loop."""
+    thread_ids = [
+        await run_in_db_thread(threading.get_ident),
+        await run_in_db_thread(threading.get_ident),
+    ]
+
+    assert thread_ids[0] == thread_ids[1]
+    assert thread_ids[0] != threading.get_ident()
+    assert await run_in_db_thread(max, 1, 2) == 2
+
+
+async def test_run_in_db_thread_raises() -> None:
+    """It should raise the function's exception."""
+
+    def fail() -> None:
+        raise RuntimeError("oh no")
+
+    with pytest.raises(RuntimeError, match="oh no"):
+        await run_in_db_thread(fail)
+
+
+async def test_cancel_waits_for_function() -> None:
+    """It should let the function finish before the cancellation takes effect."""
+    started = threading.Event()
+    finish = threading.Event()
+    finished: List[bool] = []
+
+    def work() -> None:
+        started.set()
+        finish.wait(timeout=5)
+        finished.append(True)
+
+    task = asyncio.create_task(run_in_db_thread(work))
+    await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+    task.cancel()
+    await asyncio.sleep(0.01)
+
+    assert not task.done()
+
+    finish.set()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert finished == [True]
@@ -0,0 +1,212 @@
+"""Tests for robot_server.persistence._legacy_row_reencoding."""
+import pickle
+from datetime import datetime, timezone
+
+import pytest
+import sqlalchemy
+from sqlalchemy.engine import Engine
+
+from robot_server.persistence import (
+    analysis_table,
+    analysis_cache_table,
+    compressed_json,
+    protocol_table,
+    run_table,
+)
+from robot_server.persistence import _legacy_row_reencoding
+from robot_server.persistence._legacy_row_reencoding import (
+    LegacyRowReencoder,
+    reencode_legacy_rows,
+)
+
+
+def _created_at() -> datetime:
+    return datetime(year=2023, month=1, day=1, tzinfo=timezone.utc)
+
+
+def test_reencode_legacy_rows(sql_engine: Engine) -> None:
+    """It should re-encode every legacy pickled row, and leave other rows alone."""
+    legacy_analyses = {f"analysis-{i}": {"id": f"analysis-{i}"} for i in range(7)}
+    new_analysis = compressed_json.dumps({"id": "new-analysis"})
+    legacy_summary = {"status": "succeeded", "startedAt": _created_at()}
+
+    with sql_engine.begin() as transaction:
+        transaction.execute(
+            sqlalchemy.insert(protocol_table).values(
+                id="protocol-id", created_at=_created_at()
+            )
+        )
+        for analysis_id, analysis in legacy_analyses.items():
+            transaction.execute(
+                sqlalchemy.insert(analysis_table).values(
+                    id=analysis_id,
+                    protocol_id="protocol-id",
+                    analyzer_version="",
+                    completed_analysis=pickle.dumps(analysis),
+                )
+            )
+        transaction.execute(
+            sqlalchemy.insert(analysis_table).values(
+                id="new-analysis",
+                protocol_id="protocol-id",
+                analyzer_version="",
+                completed_analysis=new_analysis,
+            )
+        )
+        transaction.execute(
+            sqlalchemy.insert(analysis_cache_table).values(
+                cache_key="cache-key",
+                completed_analysis=pickle.dumps({"id": "cached-analysis"}),
+            )
+        )
+        transaction.execute(
+            sqlalchemy.insert(run_table).values(
+                id="run-id",
+                created_at=_created_at(),
+                state_summary=pickle.dumps(legacy_summary),
+            )
+        )
+        transaction.execute(
+            sqlalchemy.insert(run_table).values(
+                id="run-without-summary", created_at=_created_at()
+            )
+        )
+
+    subject = LegacyRowReencoder(sql_engine, batch_size=3)
+    batch_count = 1
+    while not subject.reencode_batch():
+        batch_count += 1
+
+    with sql_engine.begin() as transaction:
+        analyses = dict(
+            transaction.execute(
+                sqlalchemy.select(
+                    analysis_table.c.id, analysis_table.c.completed_analysis
+                )
+            ).all()
+        )
+        cached_analysis = transaction.execute(
+            sqlalchemy.select(analysis_cache_table.c.completed_analysis)
+        ).scalar_one()
+        state_summaries = dict(
+            transaction.execute(
+                sqlalchemy.select(run_table.c.id, run_table.c.state_summary)
+            ).all()
+        )
+
+    # 3 batches for the analyses, plus 1 each for the cache and runs.
+    assert batch_count == 5
+    assert analyses.pop("new-analysis") == new_analysis
+    assert {
+        analysis_id: compressed_json.loads(data)
+        for analysis_id, data in analyses.items()
+    } == legacy_analyses
+    assert all(compressed_json.is_compressed_json(data) for data in analyses.values())
+    assert compressed_json.loads(cached_analysis) == {"id": "cached-analysis"}
+    assert compressed_json.loads(state_summaries["run-id"]) == {
+        "status": "succeeded",
+        "startedAt": "2023-01-01T00:00:00+00:00",
+    }
+    assert state_summaries["run-without-summary"] is None
+
+
+async def test_reencode_legacy_rows_in_background(
+    sql_engine: Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """It should re-encode every batch when run as a background task."""
+    monkeypatch.setattr(_legacy_row_reencoding, "_PAUSE_BETWEEN_BATCHES_SECONDS", 0)
+
+    with sql_engine.begin() as transaction:
+        for i in range(7):
+            transaction.execute(
+                sqlalchemy.insert(run_table).values(
+                    id=f"run-{i}",
+                    created_at=_created_at(),
+                    state_summary=pickle.dumps({"status": "succeeded"}),
+                )
+            )
+
+    await reencode_legacy_rows(sql_engine)
+
+    with sql_engine.begin() as transaction:
+        state_summaries = (
+            transaction.execute(sqlalchemy.select(run_table.c.state_summary))
+            .scalars()
+            .all()
+        )
+
+    assert len(state_summaries) == 7
+    assert all(compressed_json.is_compressed_json(data) for data in state_summaries)
+
+
+def test_reencode_skips_unreadable_rows(sql_engine: Engine) -> None:
+    """It should leave rows that it can't re-encode, and still finish."""
+    with sql_engine.begin() as transaction:
+        transaction.execute(
+            sqlalchemy.insert(run_table).values(
+                id="run-id",
+                created_at=_created_at(),
+                state_summary=b"not a pickle",
+            )
+        )
+
+    subject = LegacyRowReencoder(sql_engine, batch_size=1)
+
+    assert not subject.reencode_batch()  # analysis_table
+    assert not subject.reencode_batch()  # analysis_cache_table
+    assert not subject.reencode_batch()  # run_table, first row
+    assert subject.reencode_batch()  # run_table, after the last row
+
+    with sql_engine.begin() as transaction:
+        state_summary = transaction.execute(
+            sqlalchemy.select(run_table.c.state_summary)
+        ).scalar_one()
+
+    assert state_summary == b"not a pickle"
+
+
+def test_reencode_keeps_rows_written_while_reencoding(
+    sql_engine: Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """It should re-encode outside of a transaction, and not overwrite newer data."""
+    newer_summary = compressed_json.dumps({"status": "failed"})
+
+    with sql_engine.begin() as transaction:
+        for run_id, status in [("run-1", "succeeded"), ("run-2", "stopped")]:
+            transaction.execute(
+                sqlalchemy.insert(run_table).values(
+                    id=run_id,
+                    created_at=_created_at(),
+                    state_summary=pickle.dumps({"status": status}),
+                )
+            )
+
+    real_dumps = compressed_json.dumps
+
+    def dumps_while_run_updates(obj: object) -> bytes:
+        # Writing run-2 while it's re-encoded would fail with "database is locked"
+        # if the re-encoder held a transaction open after writing run-1.
+        if obj == {"status": "stopped"}:
+            with sql_engine.begin() as transaction:
+                transaction.execute(
+                    sqlalchemy.update(run_table)
+                    .where(run_table.c.id == "run-2")
+                    .values(state_summary=newer_summary)
+                )
+        return real_dumps(obj)
+
+    monkeypatch.setattr(compressed_json, "dumps", dumps_while_run_updates)
+
+    subject = LegacyRowReencoder(sql_engine)
+    while not subject.reencode_batch():
+        pass
+
+    with sql_engine.begin() as transaction:
+        state_summaries = dict(
+            transaction.execute(
+                sqlalchemy.select(run_table.c.id, run_table.c.state_summary)
+            ).all()
+        )
+
+    assert compressed_json.loads(state_summaries["run-1"]) == {"status": "succeeded"}
+    assert state_summaries["run-2"] == newer_summary
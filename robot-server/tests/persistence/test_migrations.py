@@ -1,11 +1,14 @@
 """Test SQL database migrations."""
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Generator
+from typing import Generator, List
 
 import pytest
 import sqlalchemy
 from pytest_lazyfixture import lazy_fixture  # type: ignore[import]
 
+from opentrons.protocol_engine import commands as pe_commands
+
 from robot_server.persistence import create_sql_engine
 from robot_server.persistence import (
     migration_table,
@@ -13,10 +16,51 @@ from robot_server.persistence import (
     action_table,
     protocol_table,
     analysis_table,
+    analysis_cache_table,
+    run_command_table,
 )
+from robot_server.runs.run_store import RunStore
+
+
+TABLES = [
+    run_table,
+    action_table,
+    protocol_table,
+    analysis_table,
+    analysis_cache_table,
+    run_command_table,
+]
+
+
+def _create_protocol_table_v2(sql_engine: sqlalchemy.engine.Engine) -> None:
+    """Replace the protocol table with one matching schema versions 0 through 2."""
+    sql_engine.execute("DROP TABLE protocol")
+    sql_engine.execute(
+        """
+        CREATE TABLE protocol (
+            id VARCHAR NOT NULL,
+            created_at DATETIME NOT NULL,
+            protocol_key VARCHAR,
+            PRIMARY KEY (id)
+        )
+        """
+    )
 
 
-TABLES = [run_table, action_table, protocol_table, analysis_table]
+def _create_protocol_table_v7(sql_engine: sqlalchemy.engine.Engine) -> None:
+    """Replace the protocol table with one matching schema versions 3 through 7."""
+    sql_engine.execute("DROP TABLE protocol")
+    sql_engine.execute(
+        """
+        CREATE TABLE protocol (
+            id VARCHAR NOT NULL,
+            created_at DATETIME NOT NULL,
+            protocol_key VARCHAR,
+            source VARCHAR,
+            PRIMARY KEY (id)
+        )
+        """
+    )
 
 
 @pytest.fixture
@@ -24,8 +68,12 @@ def database_v0(tmp_path: Path) -> Path:
     """Create a database matching schema version 0."""
     db_path = tmp_path / "migration-test-v0.db"
     sql_engine = create_sql_engine(db_path)
+    sql_engine.execute("DROP INDEX ix_action_run_id")
     sql_engine.execute("DROP TABLE migration")
+    sql_engine.execute("DROP TABLE analysis_cache")
+    sql_engine.execute("DROP TABLE run_command")
     sql_engine.execute("DROP TABLE run")
+    _create_protocol_table_v2(sql_engine)
     sql_engine.execute(
         """
         CREATE TABLE run (
@@ -46,6 +94,91 @@ def database_v1(tmp_path: Path) -> Path:
     """Create a database matching schema version 1."""
     db_path = tmp_path / "migration-test-v1.db"
     sql_engine = create_sql_engine(db_path)
+    sql_engine.execute("DROP INDEX ix_action_run_id")
+    sql_engine.execute("DROP TABLE analysis_cache")
+    sql_engine.execute("DROP TABLE run_command")
+    _create_protocol_table_v2(sql_engine)
+    sql_engine.execute("UPDATE migration SET version = 1")
+    sql_engine.dispose()
+    return db_path
+
+
+@pytest.fixture
+def database_v2(tmp_path: Path) -> Path:
+    """Create a database matching schema version 2."""
+    db_path = tmp_path / "migration-test-v2.db"
+    sql_engine = create_sql_engine(db_path)
+    sql_engine.execute("DROP INDEX ix_action_run_id")
+    sql_engine.execute("DROP TABLE run_command")
+    _create_protocol_table_v2(sql_engine)
+    sql_engine.execute("UPDATE migration SET version = 2")
+    sql_engine.dispose()
+    return db_path
+
+
+@pytest.fixture
+def database_v3(tmp_path: Path) -> Path:
+    """Create a database matching schema version 3."""
+    db_path = tmp_path / "migration-test-v3.db"
+    sql_engine = create_sql_engine(db_path)
+    sql_engine.execute("DROP INDEX ix_action_run_id")
+    sql_engine.execute("DROP TABLE run_command")
+    _create_protocol_table_v7(sql_engine)
+    sql_engine.execute("UPDATE migration SET version = 3")
+    sql_engine.dispose()
+    return db_path
+
+
+@pytest.fixture
+def database_v4(tmp_path: Path) -> Path:
+    """Create a database matching schema version 4."""
+    db_path = tmp_path / "migration-test-v4.db"
+    sql_engine = create_sql_engine(db_path)
+    sql_engine.execute("DROP INDEX ix_action_run_id")
+    _create_protocol_table_v7(sql_engine)
+    sql_engine.execute("UPDATE migration SET version = 4")
+    sql_engine.dispose()
+    return db_path
+
+
+@pytest.fixture
+def database_v5(tmp_path: Path) -> Path:
+    """Create a database matching schema version 5."""
+    db_path = tmp_path / "migration-test-v5.db"
+    sql_engine = create_sql_engine(db_path)
+    _create_protocol_table_v7(sql_engine)
+    sql_engine.execute("UPDATE migration SET version = 5")
+    sql_engine.dispose()
+    return db_path
+
+
+@pytest.fixture
+def database_v6(tmp_path: Path) -> Path:
+    """Create a database matching schema version 6."""
+    db_path = tmp_path / "migration-test-v6.db"
+    sql_engine = create_sql_engine(db_path)
+    _create_protocol_table_v7(sql_engine)
+    sql_engine.execute("UPDATE migration SET version = 6")
+    sql_engine.dispose()
+    return db_path
+
+
+@pytest.fixture
+def database_v7(tmp_path: Path) -> Path:
+    """Create a database matching schema version 7."""
+    db_path = tmp_path / "migration-test-v7.db"
+    sql_engine = create_sql_engine(db_path)
+    _create_protocol_table_v7(sql_engine)
+    sql_engine.execute("UPDATE migration SET version = 7")
+    sql_engine.dispose()
+    return db_path
+
+
+@pytest.fixture
+def database_v8(tmp_path: Path) -> Path:
+    """Create a database matching schema version 8."""
+    db_path = tmp_path / "migration-test-v8.db"
+    sql_engine = create_sql_engine(db_path)
     sql_engine.dispose()
     return db_path
 
@@ -64,19 +197,136 @@ def subject(database_path: Path) -> Generator[sqlalchemy.engine.Engine, None, No
 
 
 @pytest.mark.parametrize(
-    "database_path",
+    ("database_path", "expected_versions"),
     [
-        lazy_fixture("database_v0"),
-        lazy_fixture("database_v1"),
+        (lazy_fixture("database_v0"), [8]),
+        (lazy_fixture("database_v1"), [1, 8]),
+        (lazy_fixture("database_v2"), [2, 8]),
+        (lazy_fixture("database_v3"), [3, 8]),
+        (lazy_fixture("database_v4"), [4, 8]),
+        (lazy_fixture("database_v5"), [5, 8]),
+        (lazy_fixture("database_v6"), [6, 8]),
+        (lazy_fixture("database_v7"), [7, 8]),
+        (lazy_fixture("database_v8"), [8]),
     ],
 )
-def test_migration(subject: sqlalchemy.engine.Engine) -> None:
+def test_migration(
+    subject: sqlalchemy.engine.Engine, expected_versions: List[int]
+) -> None:
     """It should migrate a table."""
     migrations = subject.execute(sqlalchemy.select(migration_table)).all()
 
-    assert [m.version for m in migrations] == [1]
+    assert [m.version for m in migrations] == expected_versions
 
     # all table queries work without raising
     for table in TABLES:
         values = subject.execute(sqlalchemy.select(table)).all()
         assert values == []
+
+    action_indexes = sqlalchemy.inspect(subject).get_indexes(action_table.name)
+    assert [index["column_names"] for index in action_indexes] == [["run_id"]]
+
+    protocol_indexes = sqlalchemy.inspect(subject).get_indexes(protocol_table.name)
+    assert [index["column_names"] for index in protocol_indexes] == [["content_hash"]]
+
+
+async def test_migrate_run_commands(database_v3: Path) -> None:
+    """It should copy commands from the run table's blob to their own rows."""
+    commands = [
+        pe_commands.WaitForResume(
+            id=f"command-{i}",
+            key=f"command-key-{i}",
+            createdAt=datetime(year=2023, month=1, day=1, tzinfo=timezone.utc),
+            status=pe_commands.CommandStatus.SUCCEEDED,
+            params=pe_commands.WaitForResumeParams(message=f"message {i}"),
+            result=pe_commands.WaitForResumeResult(),
+        )
+        for i in range(3)
+    ]
+    # Open the database without migrating it, to add a run as version 3 would.
+    sql_engine = sqlalchemy.create_engine(f"sqlite:///{database_v3}")
+    sql_engine.execute(
+        sqlalchemy.insert(run_table).values(
+            id="run-id",
+            created_at=datetime.now(tz=timezone.utc),
+            commands=[c.dict() for c in commands],
+        )
+    )
+    sql_engine.dispose()
+
+    subject = create_sql_engine(database_v3)
+
+    try:
+        run_store = RunStore(sql_engine=subject)
+        assert run_store.get_command(run_id="run-id", command_id="command-1") == (
+            commands[1]
+        )
+        command_slice = await run_store.get_commands_slice(
+            run_id="run-id", length=3, cursor=0
+        )
+        assert command_slice.commands == commands
+        assert [
+            row.command_status
+            for row in subject.execute(sqlalchemy.select(run_command_table)).all()
+        ] == ["succeeded", "succeeded", "succeeded"]
+        assert subject.execute(sqlalchemy.select(run_table.c.commands)).all() == [
+            (None,)
+        ]
+    finally:
+        subject.dispose()
+
+
+def test_migrate_clears_legacy_run_commands(database_v6: Path) -> None:
+    """It should clear the legacy commands blob of runs migrated earlier."""
+    # Open the database without migrating it, to add a run as version 6 would.
+    sql_engine = sqlalchemy.create_engine(f"sqlite:///{database_v6}")
+    sql_engine.execute(
+        sqlalchemy.insert(run_table).values(
+            id="run-id",
+            created_at=datetime.now(tz=timezone.utc),
+            commands=[{"id": "command-id"}],
+        )
+    )
+    sql_engine.dispose()
+
+    subject = create_sql_engine(database_v6)
+
+    try:
+        assert subject.execute(sqlalchemy.select(run_table.c.commands)).all() == [
+            (None,)
+        ]
+    finally:
+        subject.dispose()
+
+
+def test_migrate_protocol_content_hashes(database_v7: Path) -> None:
+    """It should fill in protocols' content hashes from their stored sources."""
+    # Open the database without migrating it, to add protocols as version 7 would.
+    sql_engine = sqlalchemy.create_engine(f"sqlite:///{database_v7}")
+    sql_engine.execute(
+        sqlalchemy.insert(protocol_table),
+        [
+            {
+                "id": "stored-source-id",
+                "created_at": datetime.now(tz=timezone.utc),
+                "source": '{"contentHash": "abc123"}',
+            },
+            {
+                "id": "no-source-id",
+                "created_at": datetime.now(tz=timezone.utc),
+                "source": None,
+            },
+        ],
+    )
+    sql_engine.dispose()
+
+    subject = create_sql_engine(database_v7)
+
+    try:
+        rows = subject.execute(
+            sqlalchemy.select(protocol_table.c.id, protocol_table.c.content_hash)
+        ).all()
+    finally:
+        subject.dispose()
+
+    assert sorted(rows) == [("no-source-id", None), ("stored-source-id", "abc123")]
@@ -32,10 +32,22 @@ EXPECTED_STATEMENTS = [
         id VARCHAR NOT NULL,
         created_at DATETIME NOT NULL,
         protocol_key VARCHAR,
+        source VARCHAR,
+        content_hash VARCHAR,
         PRIMARY KEY (id)
     )
     """,
     """
+    CREATE INDEX ix_protocol_content_hash ON protocol (content_hash)
+    """,
+    """
+    CREATE TABLE analysis_cache (
+        cache_key VARCHAR NOT NULL,
+        completed_analysis BLOB NOT NULL,
+        PRIMARY KEY (cache_key)
+    )
+    """,
+    """
     CREATE TABLE analysis (
         id VARCHAR NOT NULL,
         protocol_id VARCHAR NOT NULL,
@@ -71,6 +83,25 @@ EXPECTED_STATEMENTS = [
         FOREIGN KEY(run_id) REFERENCES run (id)
     )
     """,
+    """
+    CREATE INDEX ix_action_run_id ON action (run_id)
+    """,
+    """
+    CREATE TABLE run_command (
+        row_id INTEGER NOT NULL,
+        run_id VARCHAR NOT NULL,
+        index_in_run INTEGER NOT NULL,
+        command_id VARCHAR NOT NULL,
+        command_status VARCHAR NOT NULL,
+        command VARCHAR NOT NULL,
+        PRIMARY KEY (row_id),
+        UNIQUE (run_id, index_in_run),
+        FOREIGN KEY(run_id) REFERENCES run (id)
+    )
+    """,
+    """
+    CREATE UNIQUE INDEX ix_run_command_run_id_command_id ON run_command (run_id, command_id)
+    """,
 ]
 
 
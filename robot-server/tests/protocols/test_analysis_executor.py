@@ -0,0 +1,100 @@
+"""Tests for the AnalysisExecutor."""
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator
+
+import pytest
+
+from opentrons.protocol_reader import ProtocolReader, ProtocolSource
+
+from robot_server.protocols.analysis_executor import (
+    AnalysisExecutor,
+    AnalysisTimeoutError,
+    AnalysisWorkerError,
+)
+
+
+@pytest.fixture
+async def protocol_source() -> ProtocolSource:
+    """Get a protocol source to analyze."""
+    protocol_file = (
+        Path(__file__).parent.parent / "integration" / "protocols" / "simple_v6.json"
+    )
+    return await ProtocolReader().read_saved(files=[protocol_file], directory=None)
+
+
+@pytest.fixture
+async def subject() -> AsyncIterator[AnalysisExecutor]:
+    """Get an AnalysisExecutor test subject with a single worker."""
+    executor = AnalysisExecutor(worker_count=1, timeout=60)
+    await executor.start()
+    yield executor
+    await executor.close()
+
+
+async def test_analyze(
+    subject: AnalysisExecutor, protocol_source: ProtocolSource
+) -> None:
+    """It should analyze a protocol in a worker process."""
+    result = await subject.analyze(
+        analysis_id="analysis-id", protocol_source=protocol_source
+    )
+
+    assert result.state_summary.errors == []
+    assert len(result.commands) > 0
+
+
+async def test_queue_and_cancel(
+    subject: AnalysisExecutor, protocol_source: ProtocolSource
+) -> None:
+    """It should queue analyses beyond the pool size, and cancel them."""
+    first = asyncio.create_task(
+        subject.analyze(analysis_id="analysis-1", protocol_source=protocol_source)
+    )
+    second = asyncio.create_task(
+        subject.analyze(analysis_id="analysis-2", protocol_source=protocol_source)
+    )
+    await asyncio.sleep(0)
+
+    assert subject.get_queue_depth() == 1
+
+    assert subject.cancel("analysis-1") is True
+    assert subject.cancel("not-an-analysis") is False
+
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+    # The second analysis should get a fresh worker to replace the cancelled one.
+    result = await second
+    assert result.state_summary.errors == []
+    assert subject.get_queue_depth() == 0
+
+
+async def test_timeout(protocol_source: ProtocolSource) -> None:
+    """It should raise if an analysis takes longer than the timeout."""
+    subject = AnalysisExecutor(worker_count=1, timeout=0.001)
+    await subject.start()
+
+    try:
+        with pytest.raises(AnalysisTimeoutError):
+            await subject.analyze(
+                analysis_id="analysis-id", protocol_source=protocol_source
+            )
+    finally:
+        await subject.close()
+
+
+async def test_worker_died(
+    subject: AnalysisExecutor, protocol_source: ProtocolSource
+) -> None:
+    """It should raise, and replace the worker, if a worker process dies."""
+    subject._workers[0].process.kill()
+    subject._workers[0].process.join()
+
+    with pytest.raises(AnalysisWorkerError):
+        await subject.analyze(analysis_id="analysis-1", protocol_source=protocol_source)
+
+    result = await subject.analyze(
+        analysis_id="analysis-2", protocol_source=protocol_source
+    )
+    assert result.state_summary.errors == []
@@ -1,6 +1,8 @@
 """Tests for the AnalysisStore interface."""
 import pytest
+from decoy import Decoy
 
+from dataclasses import replace
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import List, NamedTuple
@@ -11,6 +13,10 @@ from opentrons_shared_data.pipette.dev_types import PipetteNameType
 
 from opentrons.types import MountType, DeckSlotName
 from opentrons.protocol_engine import (
+    CommandSlice,
+    StateSummary,
+    StateView,
+    EngineStatus,
     commands as pe_commands,
     errors as pe_errors,
     types as pe_types,
@@ -27,9 +33,11 @@ from robot_server.protocols.analysis_models import (
     PendingAnalysis,
     CompletedAnalysis,
 )
+from robot_server.protocols import analysis_store
 from robot_server.protocols.analysis_store import (
     AnalysisStore,
     AnalysisNotFoundError,
+    get_analysis_cache_key,
 )
 from robot_server.protocols.protocol_store import (
     ProtocolStore,
@@ -78,7 +86,7 @@ def make_dummy_protocol_resource(protocol_id: str) -> ProtocolResource:
 
 async def test_get_empty(subject: AnalysisStore, protocol_store: ProtocolStore) -> None:
     """It should return an empty list if no analysis saved."""
-    protocol_store.insert(make_dummy_protocol_resource("protocol-id"))
+    await protocol_store.insert(make_dummy_protocol_resource("protocol-id"))
 
     full_result = await subject.get_by_protocol("protocol-id")
     summaries_result = subject.get_summaries_by_protocol("protocol-id")
@@ -94,7 +102,7 @@ async def test_add_pending(
     subject: AnalysisStore, protocol_store: ProtocolStore
 ) -> None:
     """It should add a pending analysis to the store."""
-    protocol_store.insert(make_dummy_protocol_resource(protocol_id="protocol-id"))
+    await protocol_store.insert(make_dummy_protocol_resource(protocol_id="protocol-id"))
 
     expected_analysis = PendingAnalysis(id="analysis-id")
     expected_summary = AnalysisSummary(
@@ -114,7 +122,7 @@ async def test_returned_in_order_added(
     subject: AnalysisStore, protocol_store: ProtocolStore
 ) -> None:
     """It should return analyses from least-recently-added to most-recently-added."""
-    protocol_store.insert(make_dummy_protocol_resource(protocol_id="protocol-id"))
+    await protocol_store.insert(make_dummy_protocol_resource(protocol_id="protocol-id"))
 
     for analysis_id in ["analysis-id-1", "analysis-id-2", "analysis-id-3"]:
         subject.add_pending(protocol_id="protocol-id", analysis_id=analysis_id)
@@ -148,7 +156,7 @@ async def test_update_adds_details_and_completes_analysis(
     subject: AnalysisStore, protocol_store: ProtocolStore
 ) -> None:
     """It should add details to the stored analysis and mark it completed."""
-    protocol_store.insert(make_dummy_protocol_resource(protocol_id="protocol-id"))
+    await protocol_store.insert(make_dummy_protocol_resource(protocol_id="protocol-id"))
 
     labware = pe_types.LoadedLabware(
         id="labware-id",
@@ -192,6 +200,193 @@ async def test_update_adds_details_and_completes_analysis(
     assert await subject.get_by_protocol("protocol-id") == [result]
 
 
+async def test_attach_live_state(
+    decoy: Decoy, subject: AnalysisStore, protocol_store: ProtocolStore
+) -> None:
+    """It should report a pending analysis's partial results from its live state."""
+    await protocol_store.insert(make_dummy_protocol_resource(protocol_id="protocol-id"))
+    state_view = decoy.mock(cls=StateView)
+
+    pipette = pe_types.LoadedPipette(
+        id="pipette-id",
+        pipetteName=PipetteNameType.P300_SINGLE,
+        mount=MountType.LEFT,
+    )
+
+    decoy.when(state_view.get_summary()).then_return(
+        StateSummary(
+            status=EngineStatus.RUNNING,
+            errors=[],
+            labware=[],
+            pipettes=[pipette],
+            modules=[],
+            labwareOffsets=[],
+            liquids=[],
+        )
+    )
+
+    subject.add_pending(protocol_id="protocol-id", analysis_id="analysis-id")
+    subject.attach_live_state(analysis_id="analysis-id", state_view=state_view)
+
+    expected_analysis = PendingAnalysis(id="analysis-id", pipettes=[pipette])
+
+    assert await subject.get("analysis-id") == expected_analysis
+    assert await subject.get_by_protocol("protocol-id") == [expected_analysis]
+
+
+async def test_get_command_slice(
+    decoy: Decoy, subject: AnalysisStore, protocol_store: ProtocolStore
+) -> None:
+    """It should get a slice of pending and completed analyses' commands."""
+    await protocol_store.insert(make_dummy_protocol_resource(protocol_id="protocol-id"))
+    state_view = decoy.mock(cls=StateView)
+
+    commands: List[pe_commands.Command] = [
+        pe_commands.WaitForResume(
+            id=f"command-id-{i}",
+            key=f"command-key-{i}",
+            status=pe_commands.CommandStatus.SUCCEEDED,
+            createdAt=datetime(year=2022, month=2, day=2),
+            params=pe_commands.WaitForResumeParams(message="hello world"),
+        )
+        for i in range(3)
+    ]
+    live_slice = CommandSlice(commands=commands[:1], cursor=0, total_length=1)
+
+    decoy.when(state_view.commands.get_slice(cursor=0, length=2)).then_return(
+        live_slice
+    )
+
+    subject.add_pending(protocol_id="protocol-id", analysis_id="analysis-id")
+
+    assert await subject.get_command_slice(
+        analysis_id="analysis-id", cursor=0, length=2
+    ) == CommandSlice(commands=[], cursor=0, total_length=0)
+
+    subject.attach_live_state(analysis_id="analysis-id", state_view=state_view)
+
+    assert (
+        await subject.get_command_slice(analysis_id="analysis-id", cursor=0, length=2)
+        == live_slice
+    )
+
+    await subject.update(
+        analysis_id="analysis-id",
+        labware=[],
+        pipettes=[],
+        modules=[],
+        commands=commands,
+        errors=[],
+        liquids=[],
+    )
+
+    assert await subject.get_command_slice(
+        analysis_id="analysis-id", cursor=1, length=5
+    ) == CommandSlice(commands=commands[1:], cursor=1, total_length=3)
+
+    with pytest.raises(AnalysisNotFoundError, match="other-analysis-id"):
+        await subject.get_command_slice(
+            analysis_id="other-analysis-id", cursor=0, length=2
+        )
+
+
+async def test_update_from_cache(
+    subject: AnalysisStore, protocol_store: ProtocolStore, tmp_path: Path
+) -> None:
+    """It should complete a pending analysis with a cached analysis's results."""
+    protocol_directory = tmp_path / "protocol-1"
+    protocol_directory.mkdir()
+    deletable_protocol_resource = make_dummy_protocol_resource(protocol_id="protocol-1")
+    await protocol_store.insert(
+        replace(
+            deletable_protocol_resource,
+            source=replace(
+                deletable_protocol_resource.source, directory=protocol_directory
+            ),
+        )
+    )
+    await protocol_store.insert(make_dummy_protocol_resource(protocol_id="protocol-2"))
+
+    labware = pe_types.LoadedLabware(
+        id="labware-id",
+        loadName="load-name",
+        definitionUri="namespace/load-name/42",
+        location=pe_types.DeckSlotLocation(slotName=DeckSlotName.SLOT_1),
+        offsetId=None,
+    )
+
+    subject.add_pending(protocol_id="protocol-1", analysis_id="analysis-1")
+    subject.add_pending(protocol_id="protocol-2", analysis_id="analysis-2")
+
+    assert (
+        await subject.update_from_cache(analysis_id="analysis-1", cache_key="key")
+        is False
+    )
+
+    await subject.update(
+        analysis_id="analysis-1",
+        labware=[labware],
+        pipettes=[],
+        modules=[],
+        commands=[],
+        errors=[],
+        liquids=[],
+        cache_key="key",
+    )
+
+    # The cache should survive the original protocol's deletion.
+    protocol_store.remove(protocol_id="protocol-1")
+
+    assert (
+        await subject.update_from_cache(analysis_id="analysis-2", cache_key="key")
+        is True
+    )
+    assert await subject.get("analysis-2") == CompletedAnalysis(
+        id="analysis-2",
+        result=AnalysisResult.OK,
+        labware=[labware],
+        pipettes=[],
+        modules=[],
+        commands=[],
+        errors=[],
+        liquids=[],
+    )
+    assert subject.get_summaries_by_protocol("protocol-2") == [
+        AnalysisSummary(id="analysis-2", status=AnalysisStatus.COMPLETED)
+    ]
+
+
+def test_get_analysis_cache_key() -> None:
+    """It should key analyses by content hash and robot type."""
+    key = get_analysis_cache_key(content_hash="abc123", robot_type="OT-2 Standard")
+
+    assert key == get_analysis_cache_key(
+        content_hash="abc123", robot_type="OT-2 Standard"
+    )
+    assert key != get_analysis_cache_key(
+        content_hash="def456", robot_type="OT-2 Standard"
+    )
+    assert key != get_analysis_cache_key(
+        content_hash="abc123", robot_type="OT-3 Standard"
+    )
+
+
+@pytest.mark.parametrize(
+    "version_attribute", ["_opentrons_version", "_robot_server_version"]
+)
+def test_get_analysis_cache_key_changes_with_version(
+    monkeypatch: pytest.MonkeyPatch, version_attribute: str
+) -> None:
+    """It should not reuse analyses made by other software versions."""
+    key = get_analysis_cache_key(content_hash="abc123", robot_type="OT-2 Standard")
+
+    monkeypatch.setattr(analysis_store, version_attribute, "999.0.0")
+
+    assert key != get_analysis_cache_key(
+        content_hash="abc123", robot_type="OT-2 Standard"
+    )
+
+
 class AnalysisResultSpec(NamedTuple):
     """Spec data for analysis result tests."""
 
@@ -239,7 +434,7 @@ async def test_update_infers_status_from_errors(
     expected_result: AnalysisResult,
 ) -> None:
     """It should decide the analysis result based on whether there are errors."""
-    protocol_store.insert(make_dummy_protocol_resource(protocol_id="protocol-id"))
+    await protocol_store.insert(make_dummy_protocol_resource(protocol_id="protocol-id"))
     subject.add_pending(protocol_id="protocol-id", analysis_id="analysis-id")
     await subject.update(
         analysis_id="analysis-id",
@@ -99,7 +99,7 @@ async def test_get_by_analysis_id_prefers_cache(
 ) -> None:
     """It should return analyses without using SQL the second time the analyses are accessed."""
     resource = _completed_analysis_resource("analysis-id", "protocol-id")
-    protocol_store.insert(make_dummy_protocol_resource("protocol-id"))
+    await protocol_store.insert(make_dummy_protocol_resource("protocol-id"))
     # When we retrieve a resource via its id we should see it query the cache, and it should
     # return the identity-same resource
     decoy.when(memcache.get("analysis-id")).then_return(resource)
@@ -115,7 +115,7 @@ async def test_get_by_analysis_falls_back_to_sql(
 ) -> None:
     """It should return analyses from sql if they are not cached."""
     resource = _completed_analysis_resource("analysis-id", "protocol-id")
-    protocol_store.insert(make_dummy_protocol_resource("protocol-id"))
+    await protocol_store.insert(make_dummy_protocol_resource("protocol-id"))
     await subject.add(resource)
     # the analysis is not cached
     decoy.when(memcache.get("analysis-id")).then_raise(KeyError())
@@ -133,7 +133,7 @@ async def test_get_by_analysis_id_caches_results(
 ) -> None:
     """It should cache successful fetches from sql."""
     resource = _completed_analysis_resource("analysis-id", "protocol-id")
-    protocol_store.insert(make_dummy_protocol_resource("protocol-id"))
+    await protocol_store.insert(make_dummy_protocol_resource("protocol-id"))
     await subject.add(resource)
     # the analysis is not cached
     decoy.when(memcache.get("analysis-id")).then_raise(KeyError())
@@ -149,8 +149,8 @@ async def test_get_ids_by_protocol(
     resource_1 = _completed_analysis_resource("analysis-id-1", "protocol-id-1")
     resource_2 = _completed_analysis_resource("analysis-id-2", "protocol-id-1")
     resource_3 = _completed_analysis_resource("analysis-id-3", "protocol-id-2")
-    protocol_store.insert(make_dummy_protocol_resource("protocol-id-1"))
-    protocol_store.insert(make_dummy_protocol_resource("protocol-id-2"))
+    await protocol_store.insert(make_dummy_protocol_resource("protocol-id-1"))
+    await protocol_store.insert(make_dummy_protocol_resource("protocol-id-2"))
     await subject.add(resource_1)
     await subject.add(resource_2)
     await subject.add(resource_3)
@@ -170,8 +170,8 @@ async def test_get_by_protocol(
     resource_1 = _completed_analysis_resource("analysis-id-1", "protocol-id-1")
     resource_2 = _completed_analysis_resource("analysis-id-2", "protocol-id-1")
     resource_3 = _completed_analysis_resource("analysis-id-3", "protocol-id-2")
-    protocol_store.insert(make_dummy_protocol_resource("protocol-id-1"))
-    protocol_store.insert(make_dummy_protocol_resource("protocol-id-2"))
+    await protocol_store.insert(make_dummy_protocol_resource("protocol-id-1"))
+    await protocol_store.insert(make_dummy_protocol_resource("protocol-id-2"))
     decoy.when(memcache.insert("analysis-id-1", resource_1)).then_return(None)
     decoy.when(memcache.insert("analysis-id-2", resource_2)).then_return(None)
     decoy.when(memcache.insert("analysis-id-3", resource_3)).then_return(None)
@@ -185,3 +185,30 @@ async def test_get_by_protocol(
     decoy.when(memcache.insert("analysis-id-1", resource_1)).then_return(None)
     resources = await subject.get_by_protocol("protocol-id-1")
     assert resources == [resource_1, resource_2]
+
+
+async def test_analysis_cache(
+    memcache: MemoryCache[str, CompletedAnalysisResource],
+    sql_engine: Engine,
+) -> None:
+    """It should cache analyses by key, keeping only the most recent ones."""
+    subject = CompletedAnalysisStore(sql_engine, memcache, "2", cache_max_size=2)
+
+    analysis_1 = _completed_analysis_resource("analysis-1", "protocol-id")
+    analysis_2 = _completed_analysis_resource("analysis-2", "protocol-id")
+    analysis_3 = _completed_analysis_resource("analysis-3", "protocol-id")
+
+    assert await subject.get_by_cache_key("key-1") is None
+
+    await subject.add_to_cache("key-1", analysis_1.completed_analysis)
+    await subject.add_to_cache("key-2", analysis_2.completed_analysis)
+    assert await subject.get_by_cache_key("key-1") == analysis_1.completed_analysis
+
+    # Re-adding a key should replace its entry and make it the most recent.
+    await subject.add_to_cache("key-1", analysis_3.completed_analysis)
+    assert await subject.get_by_cache_key("key-1") == analysis_3.completed_analysis
+
+    await subject.add_to_cache("key-3", analysis_1.completed_analysis)
+    assert await subject.get_by_cache_key("key-2") is None
+    assert await subject.get_by_cache_key("key-1") == analysis_3.completed_analysis
+    assert await subject.get_by_cache_key("key-3") == analysis_1.completed_analysis
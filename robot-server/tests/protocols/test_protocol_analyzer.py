@@ -1,6 +1,6 @@
 """Tests for the ProtocolAnalyzer."""
 import pytest
-from decoy import Decoy
+from decoy import Decoy, matchers
 from datetime import datetime
 from pathlib import Path
 
@@ -9,6 +9,7 @@ from opentrons_shared_data.pipette.dev_types import PipetteNameType
 from opentrons.types import MountType, DeckSlotName
 from opentrons.protocol_engine import (
     StateSummary,
+    StateView,
     EngineStatus,
     commands as pe_commands,
     errors as pe_errors,
@@ -17,9 +18,17 @@ from opentrons.protocol_engine import (
 import opentrons.protocol_runner as protocol_runner
 from opentrons.protocol_reader import ProtocolSource, JsonProtocolConfig
 
-from robot_server.protocols.analysis_store import AnalysisStore
+from robot_server.protocols.analysis_store import (
+    AnalysisStore,
+    get_analysis_cache_key,
+)
 from robot_server.protocols.protocol_store import ProtocolResource
 from robot_server.protocols.protocol_analyzer import ProtocolAnalyzer
+from robot_server.protocols.analysis_executor import (
+    AnalysisExecutor,
+    AnalysisTimeoutError,
+    AnalysisWorkerError,
+)
 
 
 @pytest.fixture(autouse=True)
@@ -37,6 +46,31 @@ def analysis_store(decoy: Decoy) -> AnalysisStore:
     return decoy.mock(cls=AnalysisStore)
 
 
+@pytest.fixture
+def analysis_executor(decoy: Decoy) -> AnalysisExecutor:
+    """Get a mocked out AnalysisExecutor."""
+    return decoy.mock(cls=AnalysisExecutor)
+
+
+@pytest.fixture
+def protocol_resource() -> ProtocolResource:
+    """Get a protocol resource to analyze."""
+    return ProtocolResource(
+        protocol_id="protocol-id",
+        created_at=datetime(year=2021, month=1, day=1),
+        source=ProtocolSource(
+            directory=Path("/dev/null"),
+            main_file=Path("/dev/null/abc.json"),
+            config=JsonProtocolConfig(schema_version=123),
+            files=[],
+            metadata={},
+            robot_type="OT-3 Standard",
+            content_hash="abc123",
+        ),
+        protocol_key="dummy-data-111",
+    )
+
+
 @pytest.fixture
 def subject(
     analysis_store: AnalysisStore,
@@ -98,6 +132,7 @@ async def test_analyze(
     )
 
     json_runner = decoy.mock(cls=protocol_runner.JsonRunner)
+    state_view = decoy.mock(cls=StateView)
 
     decoy.when(
         await protocol_runner.create_simulating_runner(
@@ -106,6 +141,8 @@ async def test_analyze(
         )
     ).then_return(json_runner)
 
+    decoy.when(json_runner.state_view).then_return(state_view)
+
     decoy.when(await json_runner.run(protocol_resource.source)).then_return(
         protocol_runner.RunResult(
             commands=[analysis_command],
@@ -128,6 +165,9 @@ async def test_analyze(
     )
 
     decoy.verify(
+        analysis_store.attach_live_state(
+            analysis_id="analysis-id", state_view=state_view
+        ),
         await analysis_store.update(
             analysis_id="analysis-id",
             commands=[analysis_command],
@@ -136,5 +176,251 @@ async def test_analyze(
             pipettes=[analysis_pipette],
             errors=[analysis_error],
             liquids=[],
+            duration_estimate=protocol_runner.DurationEstimate(
+                totalSeconds=0,
+                commands=[
+                    protocol_runner.CommandDurationEstimate(
+                        commandId="command-id", seconds=0
+                    )
+                ],
+            ),
+            cache_key=get_analysis_cache_key(
+                content_hash="abc123", robot_type="OT-3 Standard"
+            ),
+        ),
+    )
+
+
+async def test_analyze_in_executor(
+    decoy: Decoy,
+    analysis_store: AnalysisStore,
+    analysis_executor: AnalysisExecutor,
+    protocol_resource: ProtocolResource,
+) -> None:
+    """It should run the analysis in the executor's worker processes, if given."""
+    subject = ProtocolAnalyzer(
+        analysis_store=analysis_store,
+        analysis_executor=analysis_executor,
+    )
+
+    analysis_command = pe_commands.WaitForResume(
+        id="command-id",
+        key="command-key",
+        status=pe_commands.CommandStatus.SUCCEEDED,
+        createdAt=datetime(year=2022, month=2, day=2),
+        params=pe_commands.WaitForResumeParams(message="hello world"),
+    )
+
+    decoy.when(
+        await analysis_executor.analyze(
+            analysis_id="analysis-id",
+            protocol_source=protocol_resource.source,
+        )
+    ).then_return(
+        protocol_runner.RunResult(
+            commands=[analysis_command],
+            state_summary=StateSummary(
+                status=EngineStatus.SUCCEEDED,
+                errors=[],
+                labware=[],
+                pipettes=[],
+                modules=[],
+                labwareOffsets=[],
+                liquids=[],
+            ),
+        )
+    )
+
+    await subject.analyze(
+        protocol_resource=protocol_resource,
+        analysis_id="analysis-id",
+    )
+
+    decoy.verify(
+        await protocol_runner.create_simulating_runner(
+            robot_type="OT-3 Standard",
+            protocol_config=JsonProtocolConfig(schema_version=123),
+        ),
+        times=0,
+    )
+    decoy.verify(
+        await analysis_store.update(
+            analysis_id="analysis-id",
+            commands=[analysis_command],
+            labware=[],
+            modules=[],
+            pipettes=[],
+            errors=[],
+            liquids=[],
+            duration_estimate=protocol_runner.DurationEstimate(
+                totalSeconds=0,
+                commands=[
+                    protocol_runner.CommandDurationEstimate(
+                        commandId="command-id", seconds=0
+                    )
+                ],
+            ),
+            cache_key=get_analysis_cache_key(
+                content_hash="abc123", robot_type="OT-3 Standard"
+            ),
+        ),
+    )
+
+
+async def test_analyze_without_duration_estimate(
+    decoy: Decoy,
+    analysis_store: AnalysisStore,
+    analysis_executor: AnalysisExecutor,
+    protocol_resource: ProtocolResource,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """It should still store the analysis if estimating its duration fails."""
+    subject = ProtocolAnalyzer(
+        analysis_store=analysis_store,
+        analysis_executor=analysis_executor,
+    )
+
+    def _raise_estimate_error(*args: object, **kwargs: object) -> None:
+        raise RuntimeError("oh no")
+
+    monkeypatch.setattr(protocol_runner, "estimate_duration", _raise_estimate_error)
+
+    decoy.when(
+        await analysis_executor.analyze(
+            analysis_id="analysis-id",
+            protocol_source=protocol_resource.source,
+        )
+    ).then_return(
+        protocol_runner.RunResult(
+            commands=[],
+            state_summary=StateSummary(
+                status=EngineStatus.SUCCEEDED,
+                errors=[],
+                labware=[],
+                pipettes=[],
+                modules=[],
+                labwareOffsets=[],
+                liquids=[],
+            ),
+        )
+    )
+
+    await subject.analyze(
+        protocol_resource=protocol_resource,
+        analysis_id="analysis-id",
+    )
+
+    decoy.verify(
+        await analysis_store.update(
+            analysis_id="analysis-id",
+            commands=[],
+            labware=[],
+            modules=[],
+            pipettes=[],
+            errors=[],
+            liquids=[],
+            duration_estimate=None,
+            cache_key=get_analysis_cache_key(
+                content_hash="abc123", robot_type="OT-3 Standard"
+            ),
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        AnalysisTimeoutError("oh no"),
+        AnalysisWorkerError("oh no"),
+        EOFError("oh no"),
+        OSError("oh no"),
+    ],
+)
+async def test_analyze_in_executor_error(
+    decoy: Decoy,
+    analysis_store: AnalysisStore,
+    analysis_executor: AnalysisExecutor,
+    protocol_resource: ProtocolResource,
+    error: Exception,
+) -> None:
+    """It should store a failed analysis if the executor times out or fails."""
+    subject = ProtocolAnalyzer(
+        analysis_store=analysis_store,
+        analysis_executor=analysis_executor,
+    )
+
+    decoy.when(
+        await analysis_executor.analyze(
+            analysis_id="analysis-id",
+            protocol_source=protocol_resource.source,
+        )
+    ).then_raise(error)
+
+    await subject.analyze(
+        protocol_resource=protocol_resource,
+        analysis_id="analysis-id",
+    )
+
+    errors_captor = matchers.Captor()
+    decoy.verify(
+        await analysis_store.update(
+            analysis_id="analysis-id",
+            commands=[],
+            labware=[],
+            modules=[],
+            pipettes=[],
+            errors=errors_captor,
+            liquids=[],
+        ),
+    )
+    assert len(errors_captor.value) == 1
+    assert errors_captor.value[0].errorType == type(error).__name__
+    assert errors_captor.value[0].detail == "oh no"
+
+
+async def test_analyze_from_cache(
+    decoy: Decoy,
+    analysis_store: AnalysisStore,
+    analysis_executor: AnalysisExecutor,
+    protocol_resource: ProtocolResource,
+) -> None:
+    """It should reuse a cached analysis instead of running a new one."""
+    subject = ProtocolAnalyzer(
+        analysis_store=analysis_store,
+        analysis_executor=analysis_executor,
+    )
+
+    decoy.when(
+        await analysis_store.update_from_cache(
+            analysis_id="analysis-id",
+            cache_key=get_analysis_cache_key(
+                content_hash="abc123", robot_type="OT-3 Standard"
+            ),
+        )
+    ).then_return(True)
+
+    await subject.analyze(
+        protocol_resource=protocol_resource,
+        analysis_id="analysis-id",
+    )
+
+    decoy.verify(
+        await analysis_executor.analyze(
+            analysis_id="analysis-id",
+            protocol_source=protocol_resource.source,
+        ),
+        times=0,
+    )
+    decoy.verify(
+        await analysis_store.update(
+            analysis_id=matchers.Anything(),
+            commands=matchers.Anything(),
+            labware=matchers.Anything(),
+            modules=matchers.Anything(),
+            pipettes=matchers.Anything(),
+            errors=matchers.Anything(),
+            liquids=matchers.Anything(),
         ),
+        ignore_extra_args=True,
+        times=0,
     )
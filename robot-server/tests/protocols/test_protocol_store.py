@@ -1,10 +1,15 @@
 """Tests for the ProtocolStore interface."""
+import shutil
+
 import pytest
+import sqlalchemy
 from datetime import datetime, timezone
+from decoy import Decoy, matchers
 from pathlib import Path
 
 from opentrons.protocols.api_support.types import APIVersion
 from opentrons.protocol_reader import (
+    ProtocolReader,
     ProtocolSource,
     ProtocolSourceFile,
     ProtocolFileRole,
@@ -12,13 +17,16 @@ from opentrons.protocol_reader import (
     PythonProtocolConfig,
 )
 
+from robot_server.protocols import protocol_store
 from robot_server.protocols.protocol_store import (
     ProtocolStore,
     ProtocolResource,
     ProtocolUsageInfo,
     ProtocolNotFoundError,
     ProtocolUsedByRunError,
+    SubdirectoryMissingError,
 )
+from robot_server.persistence import protocol_table
 
 from robot_server.runs.run_store import RunStore
 
@@ -66,8 +74,8 @@ async def test_insert_and_get_protocol(
 
     assert subject.has("protocol-id") is False
 
-    subject.insert(protocol_resource)
-    result = subject.get("protocol-id")
+    await subject.insert(protocol_resource)
+    result = await subject.get("protocol-id")
 
     assert result == protocol_resource
     assert subject.has("protocol-id") is True
@@ -105,20 +113,22 @@ async def test_insert_with_duplicate_key_raises(
         ),
         protocol_key="dummy-data-222",
     )
-    subject.insert(protocol_resource_1)
+    await subject.insert(protocol_resource_1)
 
     # Don't care what it raises. Exception type is not part of the public interface.
     # We just care that it doesn't corrupt the database.
     with pytest.raises(Exception):
-        subject.insert(protocol_resource_2)
+        await subject.insert(protocol_resource_2)
 
-    assert subject.get_all() == [protocol_resource_1]  # No traces of the failed insert.
+    assert await subject.get_all() == [
+        protocol_resource_1
+    ]  # No traces of the failed insert.
 
 
 async def test_get_missing_protocol_raises(subject: ProtocolStore) -> None:
     """It should raise an error when protocol not found."""
     with pytest.raises(ProtocolNotFoundError, match="protocol-id"):
-        subject.get("protocol-id")
+        await subject.get("protocol-id")
 
 
 async def test_get_all_protocols(
@@ -157,9 +167,9 @@ async def test_get_all_protocols(
         protocol_key="dummy-data-222",
     )
 
-    subject.insert(resource_1)
-    subject.insert(resource_2)
-    result = subject.get_all()
+    await subject.insert(resource_1)
+    await subject.insert(resource_2)
+    result = await subject.get_all()
 
     assert result == [resource_1, resource_2]
 
@@ -193,7 +203,7 @@ async def test_remove_protocol(
         protocol_key="dummy-data-111",
     )
 
-    subject.insert(protocol_resource)
+    await subject.insert(protocol_resource)
     subject.remove("protocol-id")
 
     assert directory.exists() is False
@@ -201,7 +211,7 @@ async def test_remove_protocol(
     assert other_file.exists() is False
 
     with pytest.raises(ProtocolNotFoundError, match="protocol-id"):
-        subject.get("protocol-id")
+        await subject.get("protocol-id")
 
 
 def test_remove_missing_protocol_raises(
@@ -212,7 +222,7 @@ def test_remove_missing_protocol_raises(
         subject.remove("protocol-id")
 
 
-def test_remove_protocol_conflict(
+async def test_remove_protocol_conflict(
     run_store: RunStore,
     subject: ProtocolStore,
 ) -> None:
@@ -232,7 +242,7 @@ def test_remove_protocol_conflict(
         protocol_key=None,
     )
 
-    subject.insert(protocol_resource)
+    await subject.insert(protocol_resource)
     run_store.insert(
         run_id="run-id",
         protocol_id="protocol-id",
@@ -243,7 +253,7 @@ def test_remove_protocol_conflict(
         subject.remove("protocol-id")
 
 
-def test_get_usage_info(
+async def test_get_usage_info(
     subject: ProtocolStore,
     run_store: RunStore,
 ) -> None:
@@ -280,8 +290,8 @@ def test_get_usage_info(
         protocol_key=None,
     )
 
-    subject.insert(protocol_resource_1)
-    subject.insert(protocol_resource_2)
+    await subject.insert(protocol_resource_1)
+    await subject.insert(protocol_resource_2)
 
     # get_usage_info() should return results in insertion order.
     # Protocols not used by any runs should have is_used_by_run=False.
@@ -329,7 +339,7 @@ def test_get_usage_info(
     ]
 
 
-def test_get_referencing_run_ids(
+async def test_get_referencing_run_ids(
     subject: ProtocolStore,
     run_store: RunStore,
 ) -> None:
@@ -349,7 +359,7 @@ def test_get_referencing_run_ids(
         protocol_key=None,
     )
 
-    subject.insert(protocol_resource_1)
+    await subject.insert(protocol_resource_1)
     # Still no runs, so we should still get back an empty list
     assert subject.get_referencing_run_ids("protocol-id-1") == []
 
@@ -373,7 +383,7 @@ def test_get_referencing_run_ids(
     assert subject.get_referencing_run_ids("protocol-id-1") == []
 
 
-def test_get_protocol_ids(
+async def test_get_protocol_ids(
     subject: ProtocolStore,
 ) -> None:
     """It should return a list of protocol ids."""
@@ -409,14 +419,331 @@ def test_get_protocol_ids(
 
     assert subject.get_all_ids() == []
 
-    subject.insert(protocol_resource_1)
+    await subject.insert(protocol_resource_1)
 
     assert subject.get_all_ids() == ["protocol-id-1"]
 
-    subject.insert(protocol_resource_2)
+    await subject.insert(protocol_resource_2)
     assert subject.get_all_ids() == ["protocol-id-1", "protocol-id-2"]
 
     subject.remove(protocol_id="protocol-id-1")
     subject.remove(protocol_id="protocol-id-2")
 
     assert subject.get_all_ids() == []
+
+
+async def test_get_id_by_hash(
+    decoy: Decoy,
+    sql_engine: SQLEngine,
+    protocol_file_directory: Path,
+    subject: ProtocolStore,
+) -> None:
+    """It should find the oldest protocol with a content hash, without reading files."""
+    protocol_reader = decoy.mock(cls=ProtocolReader)
+    await subject.insert(_make_stored_protocol(protocol_file_directory, "first-id"))
+    await subject.insert(_make_stored_protocol(protocol_file_directory, "second-id"))
+
+    rehydrated = await ProtocolStore.rehydrate(
+        sql_engine=sql_engine,
+        protocols_directory=protocol_file_directory,
+        protocol_reader=protocol_reader,
+    )
+
+    assert rehydrated.get_id_by_hash("abc123") == "first-id"
+    assert rehydrated.get_id_by_hash("not-a-hash") is None
+    decoy.verify(
+        await protocol_reader.read_saved(
+            files=matchers.Anything(),
+            directory=matchers.Anything(),
+            files_are_prevalidated=matchers.Anything(),
+        ),
+        times=0,
+    )
+
+
+def _make_stored_protocol(
+    protocols_directory: Path, protocol_id: str
+) -> ProtocolResource:
+    """Create the files of a stored protocol, and return its resource."""
+    directory = protocols_directory / protocol_id
+    main_file = directory / "protocol.py"
+    labware_file = directory / "labware.json"
+
+    directory.mkdir()
+    main_file.touch()
+    labware_file.touch()
+
+    return ProtocolResource(
+        protocol_id=protocol_id,
+        created_at=datetime(year=2021, month=1, day=1, tzinfo=timezone.utc),
+        source=ProtocolSource(
+            directory=directory,
+            main_file=main_file,
+            config=PythonProtocolConfig(api_version=APIVersion(2, 14)),
+            files=[
+                ProtocolSourceFile(path=main_file, role=ProtocolFileRole.MAIN),
+                ProtocolSourceFile(path=labware_file, role=ProtocolFileRole.LABWARE),
+            ],
+            metadata={"protocolName": "Stored protocol", "created": 123},
+            robot_type="OT-3 Standard",
+            content_hash="abc123",
+        ),
+        protocol_key="dummy-data-111",
+    )
+
+
+def _forget_stored_sources(sql_engine: SQLEngine) -> None:
+    """Clear stored sources, like those of protocols added before schema v3."""
+    with sql_engine.begin() as transaction:
+        transaction.execute(
+            sqlalchemy.update(protocol_table).values(source=None, content_hash=None)
+        )
+
+
+async def test_rehydrate_from_stored_sources(
+    decoy: Decoy,
+    sql_engine: SQLEngine,
+    protocol_file_directory: Path,
+    subject: ProtocolStore,
+) -> None:
+    """It should rehydrate protocol sources from the database, without reading files."""
+    protocol_reader = decoy.mock(cls=ProtocolReader)
+    protocol_resource = _make_stored_protocol(protocol_file_directory, "protocol-id")
+    await subject.insert(protocol_resource)
+
+    rehydrated = await ProtocolStore.rehydrate(
+        sql_engine=sql_engine,
+        protocols_directory=protocol_file_directory,
+        protocol_reader=protocol_reader,
+    )
+
+    assert await rehydrated.get("protocol-id") == protocol_resource
+    assert await rehydrated.get_all() == [protocol_resource]
+    decoy.verify(
+        await protocol_reader.read_saved(
+            files=matchers.Anything(),
+            directory=matchers.Anything(),
+            files_are_prevalidated=matchers.Anything(),
+        ),
+        times=0,
+    )
+
+
+async def test_rehydrate_reads_unstored_sources_lazily(
+    decoy: Decoy,
+    sql_engine: SQLEngine,
+    protocol_file_directory: Path,
+    subject: ProtocolStore,
+) -> None:
+    """It should read sources that aren't in the database on first access."""
+    protocol_reader = decoy.mock(cls=ProtocolReader)
+    protocol_resource = _make_stored_protocol(protocol_file_directory, "protocol-id")
+    await subject.insert(protocol_resource)
+    _forget_stored_sources(sql_engine)
+
+    decoy.when(
+        await protocol_reader.read_saved(
+            files=matchers.Anything(),
+            directory=protocol_file_directory / "protocol-id",
+            files_are_prevalidated=True,
+        )
+    ).then_return(protocol_resource.source)
+
+    rehydrated = await ProtocolStore.rehydrate(
+        sql_engine=sql_engine,
+        protocols_directory=protocol_file_directory,
+        protocol_reader=protocol_reader,
+    )
+
+    # Without a stored source, the protocol's content hash isn't known yet.
+    assert rehydrated.get_id_by_hash("abc123") is None
+    assert await rehydrated.get("protocol-id") == protocol_resource
+    assert rehydrated.get_id_by_hash("abc123") == "protocol-id"
+
+    # Any further reads would return None.
+    decoy.reset()
+
+    assert await rehydrated.get("protocol-id") == protocol_resource
+
+    # The read source should have been stored for the next rehydration.
+    rehydrated_again = await ProtocolStore.rehydrate(
+        sql_engine=sql_engine,
+        protocols_directory=protocol_file_directory,
+        protocol_reader=protocol_reader,
+    )
+
+    assert await rehydrated_again.get("protocol-id") == protocol_resource
+
+
+async def test_rehydrate_rereads_sources_stored_by_other_versions(
+    decoy: Decoy,
+    sql_engine: SQLEngine,
+    protocol_file_directory: Path,
+    subject: ProtocolStore,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """It should re-read sources stored by a different opentrons version."""
+    protocol_reader = decoy.mock(cls=ProtocolReader)
+    protocol_resource = _make_stored_protocol(protocol_file_directory, "protocol-id")
+    await subject.insert(protocol_resource)
+    monkeypatch.setattr(protocol_store, "_opentrons_version", "999.0.0")
+
+    read_count = 0
+
+    async def read_saved(*args: object, **kwargs: object) -> ProtocolSource:
+        nonlocal read_count
+        read_count += 1
+        return protocol_resource.source
+
+    decoy.when(
+        await protocol_reader.read_saved(
+            files=matchers.Anything(),
+            directory=protocol_file_directory / "protocol-id",
+            files_are_prevalidated=True,
+        )
+    ).then_do(read_saved)
+
+    rehydrated = await ProtocolStore.rehydrate(
+        sql_engine=sql_engine,
+        protocols_directory=protocol_file_directory,
+        protocol_reader=protocol_reader,
+    )
+    await rehydrated.warm_up()
+
+    assert read_count == 1
+    assert await rehydrated.get("protocol-id") == protocol_resource
+
+
+async def test_unreadable_protocol(
+    decoy: Decoy,
+    sql_engine: SQLEngine,
+    protocol_file_directory: Path,
+    subject: ProtocolStore,
+) -> None:
+    """It should treat unreadable protocols as missing, and not read them again."""
+    protocol_reader = decoy.mock(cls=ProtocolReader)
+    readable_resource = _make_stored_protocol(protocol_file_directory, "readable")
+    unreadable_resource = _make_stored_protocol(protocol_file_directory, "unreadable")
+    await subject.insert(readable_resource)
+    await subject.insert(unreadable_resource)
+    _forget_stored_sources(sql_engine)
+
+    read_count = 0
+
+    async def read_saved(*args: object, **kwargs: object) -> ProtocolSource:
+        nonlocal read_count
+        read_count += 1
+        raise RuntimeError("oh no")
+
+    decoy.when(
+        await protocol_reader.read_saved(
+            files=matchers.Anything(),
+            directory=protocol_file_directory / "readable",
+            files_are_prevalidated=True,
+        )
+    ).then_return(readable_resource.source)
+    decoy.when(
+        await protocol_reader.read_saved(
+            files=matchers.Anything(),
+            directory=protocol_file_directory / "unreadable",
+            files_are_prevalidated=True,
+        )
+    ).then_do(read_saved)
+
+    rehydrated = await ProtocolStore.rehydrate(
+        sql_engine=sql_engine,
+        protocols_directory=protocol_file_directory,
+        protocol_reader=protocol_reader,
+    )
+    await rehydrated.warm_up()
+
+    assert await rehydrated.get_all() == [readable_resource]
+    assert await rehydrated.get_all() == [readable_resource]
+
+    assert rehydrated.get_all_ids() == ["readable"]
+    assert rehydrated.has("readable") is True
+    assert rehydrated.has("unreadable") is False
+    assert rehydrated.get_id_by_hash("abc123") == "readable"
+
+    with pytest.raises(ProtocolNotFoundError):
+        await rehydrated.get("unreadable")
+
+    assert read_count == 1
+
+    # It should still be removable.
+    rehydrated.remove("unreadable")
+    assert not (protocol_file_directory / "unreadable").exists()
+
+
+async def test_warm_up(
+    decoy: Decoy,
+    sql_engine: SQLEngine,
+    protocol_file_directory: Path,
+    subject: ProtocolStore,
+) -> None:
+    """It should read every unstored source ahead of time."""
+    protocol_reader = decoy.mock(cls=ProtocolReader)
+    protocol_resource = _make_stored_protocol(protocol_file_directory, "protocol-id")
+    await subject.insert(protocol_resource)
+    _forget_stored_sources(sql_engine)
+
+    decoy.when(
+        await protocol_reader.read_saved(
+            files=matchers.Anything(),
+            directory=protocol_file_directory / "protocol-id",
+            files_are_prevalidated=True,
+        )
+    ).then_return(protocol_resource.source)
+
+    rehydrated = await ProtocolStore.rehydrate(
+        sql_engine=sql_engine,
+        protocols_directory=protocol_file_directory,
+        protocol_reader=protocol_reader,
+    )
+    await rehydrated.warm_up()
+
+    # Any further reads would return None.
+    decoy.reset()
+
+    assert await rehydrated.get_all() == [protocol_resource]
+
+
+async def test_remove_unread_protocol(
+    decoy: Decoy,
+    sql_engine: SQLEngine,
+    protocol_file_directory: Path,
+    subject: ProtocolStore,
+) -> None:
+    """It should remove a protocol's files even if its source was never read."""
+    protocol_resource = _make_stored_protocol(protocol_file_directory, "protocol-id")
+    await subject.insert(protocol_resource)
+    _forget_stored_sources(sql_engine)
+
+    rehydrated = await ProtocolStore.rehydrate(
+        sql_engine=sql_engine,
+        protocols_directory=protocol_file_directory,
+        protocol_reader=decoy.mock(cls=ProtocolReader),
+    )
+    rehydrated.remove("protocol-id")
+
+    assert (protocol_file_directory / "protocol-id").exists() is False
+    assert rehydrated.get_all_ids() == []
+
+
+async def test_rehydrate_missing_subdirectory_raises(
+    decoy: Decoy,
+    sql_engine: SQLEngine,
+    protocol_file_directory: Path,
+    subject: ProtocolStore,
+) -> None:
+    """It should raise if a stored protocol's files are missing."""
+    protocol_resource = _make_stored_protocol(protocol_file_directory, "protocol-id")
+    await subject.insert(protocol_resource)
+    shutil.rmtree(protocol_file_directory / "protocol-id")
+
+    with pytest.raises(SubdirectoryMissingError):
+        await ProtocolStore.rehydrate(
+            sql_engine=sql_engine,
+            protocols_directory=protocol_file_directory,
+            protocol_reader=decoy.mock(cls=ProtocolReader),
+        )
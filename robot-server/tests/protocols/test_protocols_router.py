@@ -6,6 +6,7 @@ from fastapi import UploadFile
 from pathlib import Path
 
 from opentrons.protocols.api_support.types import APIVersion
+from opentrons.protocol_engine import CommandSlice, commands as pe_commands
 
 from opentrons.protocol_reader import (
     FileReaderWriter,
@@ -25,6 +26,7 @@ from robot_server.service.json_api import SimpleEmptyBody, MultiBodyMeta
 from robot_server.service.task_runner import TaskRunner
 from robot_server.protocols.analysis_store import AnalysisStore, AnalysisNotFoundError
 from robot_server.protocols.protocol_analyzer import ProtocolAnalyzer
+from robot_server.protocols.analysis_executor import AnalysisExecutor
 from robot_server.protocols.protocol_auto_deleter import ProtocolAutoDeleter
 from robot_server.protocols.analysis_models import (
     AnalysisStatus,
@@ -56,6 +58,7 @@ from robot_server.protocols.router import (
     delete_protocol_by_id,
     get_protocol_analyses,
     get_protocol_analysis_by_id,
+    get_protocol_analysis_commands,
 )
 
 
@@ -112,7 +115,7 @@ async def test_get_protocols_no_protocols(
     protocol_store: ProtocolStore,
 ) -> None:
     """It should return an empty collection response with no protocols loaded."""
-    decoy.when(protocol_store.get_all()).then_return([])
+    decoy.when(await protocol_store.get_all()).then_return([])
 
     result = await get_protocols(protocol_store=protocol_store)
 
@@ -183,7 +186,7 @@ async def test_get_protocols(
         key="dummy-key-222",
     )
 
-    decoy.when(protocol_store.get_all()).then_return([resource_1, resource_2])
+    decoy.when(await protocol_store.get_all()).then_return([resource_1, resource_2])
     decoy.when(analysis_store.get_summaries_by_protocol("abc")).then_return(
         [analysis_1]
     )
@@ -259,7 +262,9 @@ async def test_get_protocol_by_id(
         status=AnalysisStatus.COMPLETED,
     )
 
-    decoy.when(protocol_store.get(protocol_id="protocol-id")).then_return(resource)
+    decoy.when(await protocol_store.get(protocol_id="protocol-id")).then_return(
+        resource
+    )
     decoy.when(
         analysis_store.get_summaries_by_protocol(protocol_id="protocol-id")
     ).then_return([analysis_summary])
@@ -295,7 +300,7 @@ async def test_get_protocol_not_found(
     """It should return a 404 error when requesting a non-existent protocol."""
     not_found_error = ProtocolNotFoundError("protocol-id")
 
-    decoy.when(protocol_store.get(protocol_id="protocol-id")).then_raise(
+    decoy.when(await protocol_store.get(protocol_id="protocol-id")).then_raise(
         not_found_error
     )
 
@@ -372,7 +377,7 @@ async def test_create_protocol(
         analysis_store.add_pending(protocol_id="protocol-id", analysis_id="analysis-id")
     ).then_return(pending_analysis)
 
-    decoy.when(protocol_store.get_all()).then_return([])
+    decoy.when(await protocol_store.get_all()).then_return([])
 
     result = await create_protocol(
         files=[protocol_file],
@@ -406,7 +411,7 @@ async def test_create_protocol(
 
     decoy.verify(
         protocol_auto_deleter.make_room_for_new_protocol(),
-        protocol_store.insert(protocol_resource),
+        await protocol_store.insert(protocol_resource),
         task_runner.run(
             protocol_analyzer.analyze,
             analysis_id="analysis-id",
@@ -426,7 +431,7 @@ async def test_create_protocol_not_readable(
     decoy.when(await file_reader_writer.read(files=matchers.Anything())).then_return([])
     decoy.when(await file_hasher.hash(files=[])).then_return("abc123")
 
-    decoy.when(protocol_store.get_all()).then_return([])
+    decoy.when(await protocol_store.get_all()).then_return([])
 
     decoy.when(
         await protocol_reader.save(
@@ -486,7 +491,7 @@ async def test_create_protocol_different_robot_type(
         )
     )
 
-    decoy.when(protocol_store.get_all()).then_return([])
+    decoy.when(await protocol_store.get_all()).then_return([])
 
     with pytest.raises(ApiError) as exc_info:
         await create_protocol(
@@ -506,9 +511,19 @@ async def test_create_protocol_different_robot_type(
 async def test_delete_protocol_by_id(
     decoy: Decoy,
     protocol_store: ProtocolStore,
+    analysis_store: AnalysisStore,
 ) -> None:
     """It should remove a single protocol file."""
-    result = await delete_protocol_by_id("protocol-id", protocol_store=protocol_store)
+    decoy.when(
+        analysis_store.get_summaries_by_protocol(protocol_id="protocol-id")
+    ).then_return([])
+
+    result = await delete_protocol_by_id(
+        "protocol-id",
+        protocol_store=protocol_store,
+        analysis_store=analysis_store,
+        analysis_executor=None,
+    )
 
     decoy.verify(protocol_store.remove(protocol_id="protocol-id"))
 
@@ -516,19 +531,59 @@ async def test_delete_protocol_by_id(
     assert result.status_code == 200
 
 
+async def test_delete_protocol_cancels_pending_analysis(
+    decoy: Decoy,
+    protocol_store: ProtocolStore,
+    analysis_store: AnalysisStore,
+) -> None:
+    """It should cancel the deleted protocol's pending analysis."""
+    analysis_executor = decoy.mock(cls=AnalysisExecutor)
+
+    decoy.when(
+        analysis_store.get_summaries_by_protocol(protocol_id="protocol-id")
+    ).then_return(
+        [
+            AnalysisSummary(id="completed-id", status=AnalysisStatus.COMPLETED),
+            AnalysisSummary(id="pending-id", status=AnalysisStatus.PENDING),
+        ]
+    )
+
+    await delete_protocol_by_id(
+        "protocol-id",
+        protocol_store=protocol_store,
+        analysis_store=analysis_store,
+        analysis_executor=analysis_executor,
+    )
+
+    decoy.verify(
+        protocol_store.remove(protocol_id="protocol-id"),
+        analysis_executor.cancel("pending-id"),
+    )
+    decoy.verify(analysis_executor.cancel("completed-id"), times=0)
+
+
 async def test_delete_protocol_not_found(
     decoy: Decoy,
     protocol_store: ProtocolStore,
+    analysis_store: AnalysisStore,
 ) -> None:
     """It should 404 if the protocol to delete is not found."""
     not_found_error = ProtocolNotFoundError("protocol-id")
 
+    decoy.when(
+        analysis_store.get_summaries_by_protocol(protocol_id="protocol-id")
+    ).then_return([])
     decoy.when(protocol_store.remove(protocol_id="protocol-id")).then_raise(
         not_found_error
     )
 
     with pytest.raises(ApiError) as exc_info:
-        await delete_protocol_by_id("protocol-id", protocol_store=protocol_store)
+        await delete_protocol_by_id(
+            "protocol-id",
+            protocol_store=protocol_store,
+            analysis_store=analysis_store,
+            analysis_executor=None,
+        )
 
     assert exc_info.value.status_code == 404
 
@@ -536,16 +591,25 @@ async def test_delete_protocol_not_found(
 async def test_delete_protocol_run_exists(
     decoy: Decoy,
     protocol_store: ProtocolStore,
+    analysis_store: AnalysisStore,
 ) -> None:
     """It should 404 if the protocol to delete is not found."""
     run_exists_error = ProtocolUsedByRunError("protocol-id")
 
+    decoy.when(
+        analysis_store.get_summaries_by_protocol(protocol_id="protocol-id")
+    ).then_return([])
     decoy.when(protocol_store.remove(protocol_id="protocol-id")).then_raise(
         run_exists_error
     )
 
     with pytest.raises(ApiError) as exc_info:
-        await delete_protocol_by_id("protocol-id", protocol_store=protocol_store)
+        await delete_protocol_by_id(
+            "protocol-id",
+            protocol_store=protocol_store,
+            analysis_store=analysis_store,
+            analysis_executor=None,
+        )
 
     assert exc_info.value.status_code == 409
 
@@ -663,3 +727,87 @@ async def test_get_protocol_analysis_by_id_analysis_not_found(
 
     assert exc_info.value.status_code == 404
     assert exc_info.value.content["errors"][0]["id"] == "AnalysisNotFound"
+
+
+async def test_get_protocol_analysis_commands(
+    decoy: Decoy,
+    protocol_store: ProtocolStore,
+    analysis_store: AnalysisStore,
+) -> None:
+    """It should get a page of an analysis's commands."""
+    command = pe_commands.WaitForResume(
+        id="command-id",
+        key="command-key",
+        status=pe_commands.CommandStatus.SUCCEEDED,
+        createdAt=datetime(year=2022, month=2, day=2),
+        params=pe_commands.WaitForResumeParams(message="hello world"),
+    )
+
+    decoy.when(protocol_store.has("protocol-id")).then_return(True)
+    decoy.when(
+        await analysis_store.get_command_slice(
+            analysis_id="analysis-id", cursor=1, length=1
+        )
+    ).then_return(CommandSlice(commands=[command], cursor=1, total_length=3))
+
+    result = await get_protocol_analysis_commands(
+        protocolId="protocol-id",
+        analysisId="analysis-id",
+        cursor=1,
+        pageLength=1,
+        protocol_store=protocol_store,
+        analysis_store=analysis_store,
+    )
+
+    assert result.status_code == 200
+    assert result.content.data == [command]
+    assert result.content.meta == MultiBodyMeta(cursor=1, totalLength=3)
+
+
+async def test_get_protocol_analysis_commands_protocol_not_found(
+    decoy: Decoy,
+    protocol_store: ProtocolStore,
+    analysis_store: AnalysisStore,
+) -> None:
+    """It should 404 if the protocol does not exist."""
+    decoy.when(protocol_store.has("protocol-id")).then_return(False)
+
+    with pytest.raises(ApiError) as exc_info:
+        await get_protocol_analysis_commands(
+            protocolId="protocol-id",
+            analysisId="analysis-id",
+            cursor=0,
+            pageLength=20,
+            protocol_store=protocol_store,
+            analysis_store=analysis_store,
+        )
+
+    assert exc_info.value.status_code == 404
+    assert exc_info.value.content["errors"][0]["id"] == "ProtocolNotFound"
+
+
+async def test_get_protocol_analysis_commands_analysis_not_found(
+    decoy: Decoy,
+    protocol_store: ProtocolStore,
+    analysis_store: AnalysisStore,
+) -> None:
+    """It should 404 if the analysis does not exist."""
+    decoy.when(protocol_store.has("protocol-id")).then_return(True)
+    decoy.when(
+        await analysis_store.get_command_slice(
+            analysis_id="analysis-id", cursor=0, length=20
+        )
+    ).then_raise(AnalysisNotFoundError("oh no"))
+
+    with pytest.raises(ApiError) as exc_info:
+        await get_protocol_analysis_commands(
+            protocolId="protocol-id",
+            analysisId="analysis-id",
+            cursor=0,
+            pageLength=20,
+            protocol_store=protocol_store,
+            analysis_store=analysis_store,
+        )
+
+    assert exc_info.value.status_code == 404
+    assert exc_info.value.content["errors"][0]["id"] == "AnalysisNotFound"
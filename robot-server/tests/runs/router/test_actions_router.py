@@ -41,7 +41,7 @@ async def test_create_run_action(
     )
     decoy.when(mock_maintenance_engine_store.current_run_id).then_return(None)
     decoy.when(
-        mock_run_controller.create_action(
+        await mock_run_controller.create_action(
             action_id=action_id,
             action_type=action_type,
             created_at=created_at,
@@ -79,7 +79,7 @@ async def test_play_action_clears_maintenance_run(
     )
     decoy.when(mock_maintenance_engine_store.current_run_id).then_return("some-id")
     decoy.when(
-        mock_run_controller.create_action(
+        await mock_run_controller.create_action(
             action_id=action_id,
             action_type=action_type,
             created_at=created_at,
@@ -124,7 +124,7 @@ async def test_create_play_action_not_allowed(
 
     decoy.when(mock_maintenance_engine_store.current_run_id).then_return(None)
     decoy.when(
-        mock_run_controller.create_action(
+        await mock_run_controller.create_action(
             action_id=action_id,
             action_type=action_type,
             created_at=created_at,
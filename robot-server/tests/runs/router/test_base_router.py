@@ -141,7 +141,7 @@ async def test_create_protocol_run(
         liquids=[],
     )
 
-    decoy.when(mock_protocol_store.get(protocol_id=protocol_id)).then_return(
+    decoy.when(await mock_protocol_store.get(protocol_id=protocol_id)).then_return(
         protocol_resource
     )
 
@@ -176,7 +176,9 @@ async def test_create_protocol_run_bad_protocol_id(
     """It should 404 if a protocol for a run does not exist."""
     error = ProtocolNotFoundError("protocol-id")
 
-    decoy.when(mock_protocol_store.get(protocol_id="protocol-id")).then_raise(error)
+    decoy.when(await mock_protocol_store.get(protocol_id="protocol-id")).then_raise(
+        error
+    )
 
     with pytest.raises(ApiError) as exc_info:
         await create_run(
@@ -277,7 +277,7 @@ async def test_get_run_commands(
         )
     )
     decoy.when(
-        mock_run_data_manager.get_commands_slice(
+        await mock_run_data_manager.get_commands_slice(
             run_id="run-id",
             cursor=None,
             length=42,
@@ -333,7 +333,9 @@ async def test_get_run_commands_empty(
     """It should return an empty commands list if no commands."""
     decoy.when(mock_run_data_manager.get_current_command("run-id")).then_return(None)
     decoy.when(
-        mock_run_data_manager.get_commands_slice(run_id="run-id", cursor=21, length=42)
+        await mock_run_data_manager.get_commands_slice(
+            run_id="run-id", cursor=21, length=42
+        )
     ).then_return(CommandSlice(commands=[], cursor=0, total_length=0))
 
     result = await get_run_commands(
@@ -357,7 +359,9 @@ async def test_get_run_commands_not_found(
     not_found_error = RunNotFoundError("oh no")
 
     decoy.when(
-        mock_run_data_manager.get_commands_slice(run_id="run-id", cursor=21, length=42)
+        await mock_run_data_manager.get_commands_slice(
+            run_id="run-id", cursor=21, length=42
+        )
     ).then_raise(not_found_error)
     decoy.when(mock_run_data_manager.get_current_command(run_id="run-id")).then_raise(
         not_found_error
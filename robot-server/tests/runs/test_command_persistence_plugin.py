@@ -0,0 +1,243 @@
+"""Tests for robot_server.runs.command_persistence_plugin."""
+import asyncio
+from datetime import datetime
+from typing import List
+
+import pytest
+from decoy import Decoy, matchers
+
+from opentrons.protocol_engine import (
+    CommandSlice,
+    StateView,
+    actions as pe_actions,
+    commands as pe_commands,
+)
+
+from robot_server.runs.command_persistence_plugin import CommandPersistencePlugin
+from robot_server.runs.run_store import RunStore
+
+
+@pytest.fixture
+def mock_state_view(decoy: Decoy) -> StateView:
+    """Get a mock StateView."""
+    return decoy.mock(cls=StateView)
+
+
+@pytest.fixture
+def mock_action_dispatcher(decoy: Decoy) -> pe_actions.ActionDispatcher:
+    """Get a mock ActionDispatcher."""
+    return decoy.mock(cls=pe_actions.ActionDispatcher)
+
+
+@pytest.fixture
+def mock_run_store(decoy: Decoy) -> RunStore:
+    """Get a mock RunStore."""
+    return decoy.mock(cls=RunStore)
+
+
+@pytest.fixture
+def subject(
+    mock_state_view: StateView,
+    mock_action_dispatcher: pe_actions.ActionDispatcher,
+    mock_run_store: RunStore,
+) -> CommandPersistencePlugin:
+    """Get a configured CommandPersistencePlugin with its dependencies mocked out."""
+    plugin = CommandPersistencePlugin(run_id="run-id", run_store=mock_run_store)
+    plugin._configure(state=mock_state_view, action_dispatcher=mock_action_dispatcher)
+    return plugin
+
+
+def _make_commands(
+    first_index: int,
+    count: int,
+    status: pe_commands.CommandStatus = pe_commands.CommandStatus.SUCCEEDED,
+) -> List[pe_commands.Command]:
+    return [
+        pe_commands.WaitForResume(
+            id=f"command-{i}",
+            key=f"command-{i}",
+            status=status,
+            createdAt=datetime(year=2023, month=1, day=1),
+            params=pe_commands.WaitForResumeParams(),
+        )
+        for i in range(first_index, first_index + count)
+    ]
+
+
+def _update_action() -> pe_actions.UpdateCommandAction:
+    return pe_actions.UpdateCommandAction(command=_make_commands(0, 1)[0])
+
+
+async def test_saves_finished_batches(
+    decoy: Decoy,
+    mock_state_view: StateView,
+    mock_run_store: RunStore,
+    subject: CommandPersistencePlugin,
+) -> None:
+    """It should save each full batch of finished commands, in order."""
+    first_batch = _make_commands(0, 20)
+    second_batch = _make_commands(20, 20)
+
+    decoy.when(mock_state_view.commands.get_slice(cursor=0, length=20)).then_return(
+        CommandSlice(commands=first_batch, cursor=0, total_length=45)
+    )
+    decoy.when(mock_state_view.commands.get_slice(cursor=20, length=20)).then_return(
+        CommandSlice(commands=second_batch, cursor=20, total_length=45)
+    )
+    decoy.when(mock_state_view.commands.get_slice(cursor=40, length=20)).then_return(
+        CommandSlice(commands=_make_commands(40, 5), cursor=40, total_length=45)
+    )
+
+    subject.handle_action(_update_action())
+    await subject.teardown()
+
+    decoy.verify(
+        await mock_run_store.insert_commands(
+            run_id="run-id", first_index=0, commands=first_batch
+        ),
+        await mock_run_store.insert_commands(
+            run_id="run-id", first_index=20, commands=second_batch
+        ),
+    )
+    decoy.verify(
+        await mock_run_store.insert_commands(
+            run_id="run-id", first_index=40, commands=matchers.Anything()
+        ),
+        times=0,
+    )
+
+
+async def test_skips_unfinished_batch(
+    decoy: Decoy,
+    mock_state_view: StateView,
+    mock_run_store: RunStore,
+    subject: CommandPersistencePlugin,
+) -> None:
+    """It should not save a batch until all of its commands are finished."""
+    batch = _make_commands(0, 19) + _make_commands(
+        19, 1, status=pe_commands.CommandStatus.RUNNING
+    )
+
+    decoy.when(mock_state_view.commands.get_slice(cursor=0, length=20)).then_return(
+        CommandSlice(commands=batch, cursor=0, total_length=25)
+    )
+
+    subject.handle_action(_update_action())
+    await subject.teardown()
+
+    decoy.verify(
+        await mock_run_store.insert_commands(
+            run_id=matchers.Anything(),
+            first_index=matchers.Anything(),
+            commands=matchers.Anything(),
+        ),
+        times=0,
+    )
+
+
+async def test_ignores_other_actions(
+    decoy: Decoy,
+    mock_state_view: StateView,
+    mock_run_store: RunStore,
+    subject: CommandPersistencePlugin,
+) -> None:
+    """It should only check for finished commands on command actions."""
+    decoy.when(mock_state_view.commands.get_slice(cursor=0, length=20)).then_return(
+        CommandSlice(commands=_make_commands(0, 20), cursor=0, total_length=20)
+    )
+
+    subject.handle_action(pe_actions.PlayAction(requested_at=datetime.now()))
+    await subject.teardown()
+
+    decoy.verify(
+        await mock_run_store.insert_commands(
+            run_id=matchers.Anything(),
+            first_index=matchers.Anything(),
+            commands=matchers.Anything(),
+        ),
+        times=0,
+    )
+
+
+async def test_stops_after_store_error(
+    decoy: Decoy,
+    mock_state_view: StateView,
+    mock_run_store: RunStore,
+    subject: CommandPersistencePlugin,
+) -> None:
+    """It should stop saving commands once saving a batch fails."""
+    batch = _make_commands(0, 20)
+    insert_attempts: List[int] = []
+
+    async def _raise_insert_error(*args: object, **kwargs: object) -> None:
+        insert_attempts.append(1)
+        raise RuntimeError("oh no")
+
+    decoy.when(mock_state_view.commands.get_slice(cursor=0, length=20)).then_return(
+        CommandSlice(commands=batch, cursor=0, total_length=20)
+    )
+    decoy.when(mock_state_view.commands.get_slice(cursor=20, length=20)).then_return(
+        CommandSlice(commands=[], cursor=20, total_length=20)
+    )
+    decoy.when(
+        await mock_run_store.insert_commands(
+            run_id="run-id", first_index=0, commands=batch
+        )
+    ).then_do(_raise_insert_error)
+
+    subject.handle_action(_update_action())
+    await subject.teardown()
+    subject.handle_action(_update_action())
+    await subject.teardown()
+
+    assert len(insert_attempts) == 1
+
+
+async def test_saves_without_blocking_actions(
+    decoy: Decoy,
+    mock_state_view: StateView,
+    mock_run_store: RunStore,
+    subject: CommandPersistencePlugin,
+) -> None:
+    """It should save batches in the background, in order, while actions go on."""
+    first_batch = _make_commands(0, 20)
+    second_batch = _make_commands(20, 20)
+    saved_indices: List[int] = []
+    unblock_insert = asyncio.Event()
+
+    async def _slow_insert(run_id: str, first_index: int, commands: object) -> None:
+        await unblock_insert.wait()
+        saved_indices.append(first_index)
+
+    decoy.when(mock_state_view.commands.get_slice(cursor=0, length=20)).then_return(
+        CommandSlice(commands=first_batch, cursor=0, total_length=20)
+    )
+    decoy.when(mock_state_view.commands.get_slice(cursor=20, length=20)).then_return(
+        CommandSlice(commands=[], cursor=20, total_length=20)
+    )
+    decoy.when(
+        await mock_run_store.insert_commands(
+            run_id="run-id",
+            first_index=matchers.Anything(),
+            commands=matchers.Anything(),
+        )
+    ).then_do(_slow_insert)
+
+    subject.handle_action(_update_action())
+    await asyncio.sleep(0)
+
+    decoy.when(mock_state_view.commands.get_slice(cursor=20, length=20)).then_return(
+        CommandSlice(commands=second_batch, cursor=20, total_length=40)
+    )
+    decoy.when(mock_state_view.commands.get_slice(cursor=40, length=20)).then_return(
+        CommandSlice(commands=[], cursor=40, total_length=40)
+    )
+    subject.handle_action(_update_action())
+    await asyncio.sleep(0)
+
+    assert saved_indices == []
+
+    unblock_insert.set()
+    await subject.teardown()
+
+    assert saved_indices == [0, 20]
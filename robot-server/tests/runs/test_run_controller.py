@@ -98,7 +98,7 @@ async def test_create_play_action_to_resume(
     decoy.when(mock_engine_store.runner).then_return(mock_json_runner)
     decoy.when(mock_json_runner.was_started()).then_return(True)
 
-    result = subject.create_action(
+    result = await subject.create_action(
         action_id="some-action-id",
         action_type=RunActionType.PLAY,
         created_at=datetime(year=2021, month=1, day=1),
@@ -110,7 +110,7 @@ async def test_create_play_action_to_resume(
         createdAt=datetime(year=2021, month=1, day=1),
     )
 
-    decoy.verify(mock_run_store.insert_action(run_id, result), times=1)
+    decoy.verify(await mock_run_store.insert_action(run_id, result), times=1)
     decoy.verify(mock_json_runner.play(), times=1)
     decoy.verify(await mock_json_runner.run(), times=0)
 
@@ -130,7 +130,7 @@ async def test_create_play_action_to_start(
     decoy.when(mock_engine_store.runner).then_return(mock_python_runner)
     decoy.when(mock_python_runner.was_started()).then_return(False)
 
-    result = subject.create_action(
+    result = await subject.create_action(
         action_id="some-action-id",
         action_type=RunActionType.PLAY,
         created_at=datetime(year=2021, month=1, day=1),
@@ -142,7 +142,7 @@ async def test_create_play_action_to_start(
         createdAt=datetime(year=2021, month=1, day=1),
     )
 
-    decoy.verify(mock_run_store.insert_action(run_id, result), times=1)
+    decoy.verify(await mock_run_store.insert_action(run_id, result), times=1)
 
     background_task_captor = matchers.Captor()
     decoy.verify(mock_task_runner.run(background_task_captor))
@@ -157,7 +157,7 @@ async def test_create_play_action_to_start(
     await background_task_captor.value()
 
     decoy.verify(
-        mock_run_store.update_run_state(
+        await mock_run_store.update_run_state(
             run_id=run_id,
             summary=engine_state_summary,
             commands=protocol_commands,
@@ -174,7 +174,7 @@ async def test_create_pause_action(
     subject: RunController,
 ) -> None:
     """It should resume a run."""
-    result = subject.create_action(
+    result = await subject.create_action(
         action_id="some-action-id",
         action_type=RunActionType.PAUSE,
         created_at=datetime(year=2021, month=1, day=1),
@@ -186,7 +186,7 @@ async def test_create_pause_action(
         createdAt=datetime(year=2021, month=1, day=1),
     )
 
-    decoy.verify(mock_run_store.insert_action(run_id, result), times=1)
+    decoy.verify(await mock_run_store.insert_action(run_id, result), times=1)
     decoy.verify(mock_engine_store.runner.pause(), times=1)
 
 
@@ -199,7 +199,7 @@ async def test_create_stop_action(
     subject: RunController,
 ) -> None:
     """It should resume a run."""
-    result = subject.create_action(
+    result = await subject.create_action(
         action_id="some-action-id",
         action_type=RunActionType.STOP,
         created_at=datetime(year=2021, month=1, day=1),
@@ -211,7 +211,7 @@ async def test_create_stop_action(
         createdAt=datetime(year=2021, month=1, day=1),
     )
 
-    decoy.verify(mock_run_store.insert_action(run_id, result), times=1)
+    decoy.verify(await mock_run_store.insert_action(run_id, result), times=1)
     decoy.verify(mock_task_runner.run(mock_engine_store.runner.stop), times=1)
 
 
@@ -239,7 +239,7 @@ async def test_action_not_allowed(
     decoy.when(mock_engine_store.runner.pause()).then_raise(exception)
 
     with pytest.raises(RunActionNotAllowedError, match="oh no"):
-        subject.create_action(
+        await subject.create_action(
             action_id="whatever",
             action_type=action_type,
             created_at=datetime(year=2021, month=1, day=1),
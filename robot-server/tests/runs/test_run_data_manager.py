@@ -22,6 +22,7 @@ from opentrons.protocol_engine import (
 )
 
 from robot_server.protocols import ProtocolResource
+from robot_server.runs.command_persistence_plugin import CommandPersistencePlugin
 from robot_server.runs.engine_store import EngineStore, EngineConflictError
 from robot_server.runs.run_data_manager import RunDataManager, RunNotCurrentError
 from robot_server.runs.run_models import Run, RunNotFoundError
@@ -152,6 +153,9 @@ async def test_create(
         modules=engine_state_summary.modules,
         liquids=engine_state_summary.liquids,
     )
+    decoy.verify(
+        mock_engine_store.engine.add_plugin(matchers.IsA(CommandPersistencePlugin))
+    )
 
 
 async def test_create_with_options(
@@ -490,7 +494,7 @@ async def test_update_current(
     )
 
     decoy.when(
-        mock_run_store.update_run_state(
+        await mock_run_store.update_run_state(
             run_id=run_id,
             summary=engine_state_summary,
             commands=[run_command],
@@ -538,7 +542,7 @@ async def test_update_current_noop(
 
     decoy.verify(await mock_engine_store.clear(), times=0)
     decoy.verify(
-        mock_run_store.update_run_state(
+        await mock_run_store.update_run_state(
             run_id=run_id,
             summary=matchers.Anything(),
             commands=matchers.Anything(),
@@ -621,7 +625,7 @@ async def test_create_archives_existing(
     )
 
     decoy.verify(
-        mock_run_store.update_run_state(
+        await mock_run_store.update_run_state(
             run_id=run_id_old,
             summary=engine_state_summary,
             commands=[run_command],
@@ -629,7 +633,7 @@ async def test_create_archives_existing(
     )
 
 
-def test_get_commands_slice_from_db(
+async def test_get_commands_slice_from_db(
     decoy: Decoy,
     subject: RunDataManager,
     mock_run_store: RunStore,
@@ -652,14 +656,14 @@ def test_get_commands_slice_from_db(
     )
 
     decoy.when(
-        mock_run_store.get_commands_slice(run_id="run_id", cursor=1, length=2)
+        await mock_run_store.get_commands_slice(run_id="run_id", cursor=1, length=2)
     ).then_return(expected_command_slice)
-    result = subject.get_commands_slice(run_id="run_id", cursor=1, length=2)
+    result = await subject.get_commands_slice(run_id="run_id", cursor=1, length=2)
 
     assert expected_command_slice == result
 
 
-def test_get_commands_slice_current_run(
+async def test_get_commands_slice_current_run(
     decoy: Decoy,
     subject: RunDataManager,
     mock_engine_store: EngineStore,
@@ -685,20 +689,20 @@ def test_get_commands_slice_current_run(
         mock_engine_store.engine.state_view.commands.get_slice(1, 2)
     ).then_return(expected_command_slice)
 
-    result = subject.get_commands_slice("run-id", 1, 2)
+    result = await subject.get_commands_slice("run-id", 1, 2)
 
     assert expected_command_slice == result
 
 
-def test_get_commands_slice_from_db_run_not_found(
+async def test_get_commands_slice_from_db_run_not_found(
     decoy: Decoy, subject: RunDataManager, mock_run_store: RunStore
 ) -> None:
     """Should get a sliced command list from run store."""
     decoy.when(
-        mock_run_store.get_commands_slice(run_id="run-id", cursor=1, length=2)
+        await mock_run_store.get_commands_slice(run_id="run-id", cursor=1, length=2)
     ).then_raise(RunNotFoundError(run_id="run-id"))
     with pytest.raises(RunNotFoundError):
-        subject.get_commands_slice(run_id="run-id", cursor=1, length=2)
+        await subject.get_commands_slice(run_id="run-id", cursor=1, length=2)
 
 
 def test_get_current_command(
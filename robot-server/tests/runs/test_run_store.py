@@ -104,7 +104,7 @@ def state_summary() -> StateSummary:
     )
 
 
-def test_update_run_state(
+async def test_update_run_state(
     subject: RunStore,
     state_summary: StateSummary,
     protocol_commands: List[pe_commands.Command],
@@ -121,15 +121,15 @@ def test_update_run_state(
         protocol_id=None,
         created_at=datetime(year=2021, month=1, day=1, tzinfo=timezone.utc),
     )
-    subject.insert_action(run_id="run-id", action=action)
+    await subject.insert_action(run_id="run-id", action=action)
 
-    result = subject.update_run_state(
+    result = await subject.update_run_state(
         run_id="run-id",
         summary=state_summary,
         commands=protocol_commands,
     )
     run_summary_result = subject.get_state_summary(run_id="run-id")
-    commands_result = subject.get_commands_slice(
+    commands_result = await subject.get_commands_slice(
         run_id="run-id",
         length=len(protocol_commands),
         cursor=0,
@@ -145,14 +145,75 @@ def test_update_run_state(
     assert commands_result.commands == protocol_commands
 
 
-def test_update_state_run_not_found(
+async def test_update_run_state_replaces_commands(
+    subject: RunStore,
+    state_summary: StateSummary,
+    protocol_commands: List[pe_commands.Command],
+) -> None:
+    """It should replace the commands stored by an earlier update."""
+    subject.insert(
+        run_id="run-id", protocol_id=None, created_at=datetime.now(timezone.utc)
+    )
+    await subject.update_run_state(
+        run_id="run-id", summary=state_summary, commands=protocol_commands
+    )
+    await subject.update_run_state(
+        run_id="run-id", summary=state_summary, commands=protocol_commands[1:]
+    )
+
+    result = await subject.get_commands_slice(run_id="run-id", cursor=0, length=999)
+
+    assert result.commands == protocol_commands[1:]
+    with pytest.raises(CommandNotFoundError):
+        subject.get_command(run_id="run-id", command_id="pause-1")
+
+
+async def test_insert_commands(
+    subject: RunStore,
+    state_summary: StateSummary,
+    protocol_commands: List[pe_commands.Command],
+) -> None:
+    """It should keep inserted commands that a later update leaves unchanged."""
+    subject.insert(
+        run_id="run-id", protocol_id=None, created_at=datetime.now(timezone.utc)
+    )
+    await subject.insert_commands(
+        run_id="run-id", first_index=0, commands=protocol_commands[:2]
+    )
+
+    result = await subject.get_commands_slice(run_id="run-id", cursor=0, length=999)
+    assert result.commands == protocol_commands[:2]
+
+    await subject.update_run_state(
+        run_id="run-id", summary=state_summary, commands=protocol_commands
+    )
+    result = await subject.get_commands_slice(run_id="run-id", cursor=0, length=999)
+
+    assert result.commands == protocol_commands
+    assert subject.get_command(run_id="run-id", command_id="pause-3") == (
+        protocol_commands[2]
+    )
+
+
+async def test_insert_commands_run_not_found(
+    subject: RunStore,
+    protocol_commands: List[pe_commands.Command],
+) -> None:
+    """It should raise if the run doesn't exist."""
+    with pytest.raises(RunNotFoundError, match="run-not-found"):
+        await subject.insert_commands(
+            run_id="run-not-found", first_index=0, commands=protocol_commands
+        )
+
+
+async def test_update_state_run_not_found(
     subject: RunStore,
     state_summary: StateSummary,
     protocol_commands: List[pe_commands.Command],
 ) -> None:
     """It should be able to catch the exception raised by insert."""
     with pytest.raises(RunNotFoundError, match="run-not-found"):
-        subject.update_run_state(
+        await subject.update_run_state(
             run_id="run-not-found",
             summary=state_summary,
             commands=protocol_commands,
@@ -175,7 +236,7 @@ def test_add_run(subject: RunStore) -> None:
     )
 
 
-def test_insert_actions_missing_run_id(subject: RunStore) -> None:
+async def test_insert_actions_missing_run_id(subject: RunStore) -> None:
     """Should not be able to insert an action with a run id that does not exist."""
     action = RunAction(
         actionType=RunActionType.PLAY,
@@ -184,7 +245,7 @@ def test_insert_actions_missing_run_id(subject: RunStore) -> None:
     )
 
     with pytest.raises(RunNotFoundError, match="missing-run-id"):
-        subject.insert_action(run_id="missing-run-id", action=action)
+        await subject.insert_action(run_id="missing-run-id", action=action)
 
 
 def test_insert_run_missing_protocol_id(subject: RunStore) -> None:
@@ -215,7 +276,7 @@ def test_get_run_no_actions(subject: RunStore) -> None:
     )
 
 
-def test_get_run(subject: RunStore) -> None:
+async def test_get_run(subject: RunStore) -> None:
     """It can get a previously stored run entry."""
     action = RunAction(
         actionType=RunActionType.PLAY,
@@ -229,7 +290,7 @@ def test_get_run(subject: RunStore) -> None:
         created_at=datetime(year=2021, month=1, day=1, tzinfo=timezone.utc),
     )
 
-    subject.insert_action("run-id", action)
+    await subject.insert_action("run-id", action)
 
     result = subject.get(run_id="run-id")
 
@@ -318,7 +379,37 @@ def test_get_all_runs(
     assert result == expected_result
 
 
-def test_remove_run(subject: RunStore) -> None:
+async def test_get_all_runs_actions(subject: RunStore) -> None:
+    """It gets the actions of the runs it returns, in order."""
+    actions = {}
+
+    for i in range(3):
+        run_id = f"run-id-{i}"
+        subject.insert(
+            run_id=run_id,
+            protocol_id=None,
+            created_at=datetime(year=2021, month=1, day=1 + i, tzinfo=timezone.utc),
+        )
+        actions[run_id] = [
+            RunAction(
+                id=f"{run_id}-{action_type.value}",
+                actionType=action_type,
+                createdAt=datetime(year=2022, month=1, day=1 + i, tzinfo=timezone.utc),
+            )
+            for action_type in (RunActionType.PLAY, RunActionType.STOP)
+        ]
+        for action in actions[run_id]:
+            await subject.insert_action(run_id=run_id, action=action)
+
+    result = subject.get_all(length=2)
+
+    assert [(run.run_id, run.actions) for run in result] == [
+        ("run-id-1", actions["run-id-1"]),
+        ("run-id-2", actions["run-id-2"]),
+    ]
+
+
+async def test_remove_run(subject: RunStore) -> None:
     """It can remove a previously stored run entry."""
     action = RunAction(
         actionType=RunActionType.PLAY,
@@ -331,7 +422,7 @@ def test_remove_run(subject: RunStore) -> None:
         protocol_id=None,
         created_at=datetime(year=2021, month=1, day=1, tzinfo=timezone.utc),
     )
-    subject.insert_action(run_id="run-id", action=action)
+    await subject.insert_action(run_id="run-id", action=action)
     subject.remove(run_id="run-id")
 
     assert subject.get_all(length=20) == []
@@ -343,7 +434,7 @@ def test_remove_run_missing_id(subject: RunStore) -> None:
         subject.remove(run_id="run-id")
 
 
-def test_insert_actions_no_run(subject: RunStore) -> None:
+async def test_insert_actions_no_run(subject: RunStore) -> None:
     """Insert actions with a run that doesn't exist should raise an exception."""
     action = RunAction(
         actionType=RunActionType.PLAY,
@@ -352,17 +443,19 @@ def test_insert_actions_no_run(subject: RunStore) -> None:
     )
 
     with pytest.raises(Exception):
-        subject.insert_action(run_id="run-id-996", action=action)
+        await subject.insert_action(run_id="run-id-996", action=action)
 
 
-def test_get_state_summary(subject: RunStore, state_summary: StateSummary) -> None:
+async def test_get_state_summary(
+    subject: RunStore, state_summary: StateSummary
+) -> None:
     """It should be able to get store run data."""
     subject.insert(
         run_id="run-id",
         protocol_id=None,
         created_at=datetime(year=2021, month=1, day=1, tzinfo=timezone.utc),
     )
-    subject.update_run_state(run_id="run-id", summary=state_summary, commands=[])
+    await subject.update_run_state(run_id="run-id", summary=state_summary, commands=[])
     result = subject.get_state_summary(run_id="run-id")
     assert result == state_summary
 
@@ -395,7 +488,7 @@ def test_has_no_run_id(subject: RunStore) -> None:
     assert result is False
 
 
-def test_get_command(
+async def test_get_command(
     subject: RunStore,
     protocol_commands: List[pe_commands.Command],
     state_summary: StateSummary,
@@ -404,7 +497,7 @@ def test_get_command(
     subject.insert(
         run_id="run-id", protocol_id=None, created_at=datetime.now(timezone.utc)
     )
-    subject.update_run_state(
+    await subject.update_run_state(
         run_id="run-id",
         summary=state_summary,
         commands=protocol_commands,
@@ -421,7 +514,7 @@ def test_get_command(
         ("run-id", "not-command-id", CommandNotFoundError),
     ],
 )
-def test_get_command_raise_exception(
+async def test_get_command_raise_exception(
     subject: RunStore,
     protocol_commands: List[pe_commands.Command],
     state_summary: StateSummary,
@@ -433,7 +526,7 @@ def test_get_command_raise_exception(
     subject.insert(
         run_id="run-id", protocol_id=None, created_at=datetime.now(timezone.utc)
     )
-    subject.update_run_state(
+    await subject.update_run_state(
         run_id="run-id",
         summary=state_summary,
         commands=protocol_commands,
@@ -442,7 +535,7 @@ def test_get_command_raise_exception(
         subject.get_command(run_id=input_run_id, command_id=input_command_id)
 
 
-def test_get_command_slice(
+async def test_get_command_slice(
     subject: RunStore,
     protocol_commands: List[pe_commands.Command],
     state_summary: StateSummary,
@@ -453,12 +546,12 @@ def test_get_command_slice(
         protocol_id=None,
         created_at=datetime(year=2021, month=1, day=1, tzinfo=timezone.utc),
     )
-    subject.update_run_state(
+    await subject.update_run_state(
         run_id="run-id",
         summary=state_summary,
         commands=protocol_commands,
     )
-    result = subject.get_commands_slice(
+    result = await subject.get_commands_slice(
         run_id="run-id", cursor=0, length=len(protocol_commands)
     )
 
@@ -484,7 +577,7 @@ def test_get_command_slice(
         (999, 2, 2, ["pause-3"]),
     ],
 )
-def test_get_commands_slice_clamping(
+async def test_get_commands_slice_clamping(
     subject: RunStore,
     protocol_commands: List[pe_commands.Command],
     state_summary: StateSummary,
@@ -499,12 +592,12 @@ def test_get_commands_slice_clamping(
         protocol_id=None,
         created_at=datetime(year=2021, month=1, day=1, tzinfo=timezone.utc),
     )
-    subject.update_run_state(
+    await subject.update_run_state(
         run_id="run-id",
         summary=state_summary,
         commands=protocol_commands,
     )
-    result = subject.get_commands_slice(
+    result = await subject.get_commands_slice(
         run_id="run-id", cursor=input_cursor, length=input_length
     )
 
@@ -515,7 +608,7 @@ def test_get_commands_slice_clamping(
     ] == expected_command_ids
 
 
-def test_get_run_command_slice_none(subject: RunStore) -> None:
+async def test_get_run_command_slice_none(subject: RunStore) -> None:
     """It should return None if no commands stored."""
     subject.insert(
         run_id="run-id",
@@ -523,14 +616,14 @@ def test_get_run_command_slice_none(subject: RunStore) -> None:
         created_at=datetime(year=2021, month=1, day=1, tzinfo=timezone.utc),
     )
 
-    result = subject.get_commands_slice(run_id="run-id", length=999, cursor=None)
+    result = await subject.get_commands_slice(run_id="run-id", length=999, cursor=None)
     assert result == CommandSlice(commands=[], cursor=0, total_length=0)
 
 
-def test_get_commands_slice_run_not_found(subject: RunStore) -> None:
+async def test_get_commands_slice_run_not_found(subject: RunStore) -> None:
     """Should raise an error RunNotFoundError."""
     subject.insert(
         run_id="run-id", protocol_id=None, created_at=datetime.now(timezone.utc)
     )
     with pytest.raises(RunNotFoundError):
-        subject.get_commands_slice(run_id="not-run-id", cursor=1, length=3)
+        await subject.get_commands_slice(run_id="not-run-id", cursor=1, length=3)